@@ -32,6 +32,7 @@ from routes.collaboration import collaboration_bp
 from routes.dependencies import dependencies_bp
 from routes.reports import reports_bp
 from routes.settings import settings_bp
+from routes.search import search_bp
 from utils.cors import setup_cors
 from flask_jwt_extended import JWTManager
 from utils.cors import setup_cors
@@ -106,16 +107,29 @@ else:
 # 데이터베이스 초기화
 db.init_app(app)
 migrate = Migrate(app, db)
+# TestResult 저장 시 분석 롤업을 갱신하는 after_flush 리스너 등록
+import services.analytics_rollup_service  # noqa: F401
+# TestCase 저장 시 대시보드 상태별 카운터를 증감하는 after_flush 리스너 등록
+import services.dashboard_summary_service  # noqa: F401
+# 요청 중 TestCase 변경을 flush 단위로 모아 히스토리에 일괄 기록하는 after_flush 리스너 등록
+import utils.history_tracker  # noqa: F401
+# 테스트 케이스/템플릿/성능 테스트 저장 시 검색 색인을 갱신하는 after_flush 리스너 등록
+import services.search_service  # noqa: F401
 
 # JWT 초기화 및 콜백 설정
 jwt = JWTManager(app)
 
 # SocketIO 초기화 (CORS 설정 포함)
-# 기본값은 threading으로 고정 (eventlet에서 요청이 멈추는 현상 방지)
+# 기본값은 threading (python app.py 개발 서버). eventlet/gevent는 몽키패치를 먼저 하는 wsgi.py(gunicorn)에서만 사용
+# (패치 없이 eventlet 모드로 실행하면 요청이 멈추는 현상이 있었음)
+# Redis 메시지 큐로 다른 웹 서버 프로세스/노드와 Celery 워커가 보낸 이벤트도 연결된 클라이언트에 전달
+from utils.socketio_emitter import message_queue_url, SOCKETIO_CHANNEL
 socketio = SocketIO(
     app,
     cors_allowed_origins="*",
-    async_mode='threading',
+    async_mode=os.environ.get('SOCKETIO_ASYNC_MODE', 'threading'),
+    message_queue=message_queue_url(),
+    channel=SOCKETIO_CHANNEL,
     logger=True,
     engineio_logger=True
 )
@@ -168,6 +182,11 @@ app.register_blueprint(collaboration_bp, url_prefix='/api/collaboration')
 app.register_blueprint(dependencies_bp)
 app.register_blueprint(reports_bp)
 app.register_blueprint(settings_bp)
+app.register_blueprint(search_bp)
+
+# test-scripts 탐색기용 트리 인덱스 초기 스캔 및 파일 감시 시작
+from services.script_tree_service import script_tree_service
+script_tree_service.start()
 
 # 헬퍼 함수들
 def create_cors_response(data=None, status_code=200):
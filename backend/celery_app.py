@@ -2,6 +2,7 @@
 Celery 애플리케이션 설정
 """
 from celery import Celery
+from celery.signals import worker_init
 import os
 from dotenv import load_dotenv
 
@@ -41,7 +42,51 @@ celery_app.conf.update(
 celery_app.conf.task_routes = {
     'tasks.execute_test_case': {'queue': 'test_execution'},
     'tasks.execute_test_case_batch': {'queue': 'test_execution'},
+    'tasks.execute_batch_item': {'queue': 'test_execution'},
+    'tasks.finalize_test_case_batch': {'queue': 'test_execution'},
+    'tasks.reap_test_case_batch': {'queue': 'test_execution'},
     'tasks.execute_automation_test': {'queue': 'automation'},
     'tasks.execute_performance_test': {'queue': 'performance'},
+    'tasks.import_testcases_excel': {'queue': 'test_execution'},
+    # 결과 후속 처리(알림, 슬랙, 실시간 전송, 요약, CI/CD)는 실행 큐와 분리
+    'tasks.consume_result_events': {'queue': 'events'},
+    'tasks.flush_slack_digest': {'queue': 'events'},
+    'tasks.send_slack_message': {'queue': 'events'},
+    # 결과에서 파생된 집계의 주기 갱신/보정 (beat)
+    'tasks.refresh_flaky_test_scores': {'queue': 'events'},
+    'tasks.reconcile_dashboard_summary': {'queue': 'events'},
+    'tasks.rebuild_analytics_rollups': {'queue': 'events'},
 }
+# 라우팅되지 않은 태스크도 문서의 -Q 목록에 있는 큐로 보냄 (기본 'celery' 큐는 소비하는 워커가 없음)
+celery_app.conf.task_default_queue = 'test_execution'
 
+# 주기 작업 (celery beat)
+celery_app.conf.beat_schedule = {
+    # FLAKY_SCORE_WINDOWS(기본 7, 14, 30, 90일)의 Flaky 테스트 점수 갱신 (API는 저장된 점수만 조회)
+    'refresh-flaky-test-scores': {
+        'task': 'tasks.refresh_flaky_test_scores',
+        'schedule': float(os.getenv('FLAKY_SCORE_REFRESH_INTERVAL', 600)),
+    },
+    # 증분 갱신되는 대시보드 카운터를 원본 TestCases 기준으로 보정
+    'reconcile-dashboard-summary': {
+        'task': 'tasks.reconcile_dashboard_summary',
+        'schedule': float(os.getenv('DASHBOARD_RECONCILE_INTERVAL', 3600)),
+    },
+    # 증분 갱신되는 분석 롤업의 최근 구간을 원본 TestResults 기준으로 재집계 (실행이 적은 시간대 권장)
+    'rebuild-analytics-rollups': {
+        'task': 'tasks.rebuild_analytics_rollups',
+        'schedule': float(os.getenv('ANALYTICS_ROLLUP_REBUILD_INTERVAL', 86400)),
+    },
+    # 발행 시 예약된 소비에서 빠진 이벤트와 재시도 대상(RESULT_EVENT_RETRY_IDLE_MS 경과) 정리
+    'drain-result-events': {
+        'task': 'tasks.consume_result_events',
+        'schedule': 15.0,
+    },
+}
+
+
+@worker_init.connect
+def _use_socketio_message_queue(**kwargs):
+    """워커에는 Socket.IO 클라이언트가 없으므로 이벤트를 Redis 메시지 큐로만 보내 웹 서버가 전달하게 함"""
+    from utils.socketio_emitter import use_write_only_emitter
+    use_write_only_emitter()
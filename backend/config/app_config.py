@@ -90,6 +90,12 @@ def get_database_engine_options(database_url):
             'pool_recycle': 300,
         }
 
+        # gunicorn eventlet/gevent 워커는 프로세스당 많은 요청을 동시에 처리하므로 풀 크기를 환경 변수로 조정
+        if os.environ.get('DB_POOL_SIZE'):
+            options['pool_size'] = int(os.environ['DB_POOL_SIZE'])
+        if os.environ.get('DB_MAX_OVERFLOW'):
+            options['max_overflow'] = int(os.environ['DB_MAX_OVERFLOW'])
+
         if 'mysql' in database_url:
             options['connect_args'] = {
                 'connect_timeout': 10,
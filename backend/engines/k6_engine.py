@@ -1,13 +1,53 @@
 import os
+import shutil
 import subprocess
+import tempfile
+from engines.k6_metrics import parse_k6_json
+from utils.streaming_runner import run_streaming
+
+K6_RESULT_FILENAME = 'result.json'
+
+
+def _new_output_dir():
+    """실행마다 별도의 k6 JSON 출력 디렉토리 생성 (같은 스크립트 디렉토리의 동시 실행 충돌 방지)"""
+    return tempfile.mkdtemp(prefix='k6-run-')
+
+
+def _build_result(returncode, stdout, stderr, output_path, log_path=None):
+    """
+    k6 종료 코드와 JSON 출력 집계 결과로 실행 결과 구성 (임계값 실패로 종료된 경우에도 메트릭 포함)
+
+    output/error는 마지막 EXECUTION_OUTPUT_TAIL_BYTES만, 전체 출력은 log_path의 gzip 로그
+    """
+    metrics = parse_k6_json(output_path)
+    if returncode == 0:
+        result = {'status': 'Pass', 'output': stdout}
+    else:
+        result = {'status': 'Fail', 'error': stderr, 'output': stdout}
+    result['log_path'] = log_path
+    if metrics:
+        result.update({
+            'response_time_avg': metrics['http_req_duration'].get('avg', 0.0),
+            'throughput': metrics['request_rate'] or 0.0,
+            'error_rate': metrics['error_rate'],
+            'metrics': metrics
+        })
+    return result
+
 
 # k6 엔진 클래스 정의
 class K6Engine:
     def __init__(self):
         self.k6_path = 'k6'  # k6 실행 파일 경로
     
-    def execute_test(self, script_path, env_vars=None):
-        """k6 성능 테스트 실행"""
+    def execute_test(self, script_path, env_vars=None, on_output=None, log_prefix='k6'):
+        """
+        k6 성능 테스트 실행 (utils/streaming_runner로 출력을 스트리밍하고 전체 출력은 gzip 로그로 저장)
+
+        Args:
+            on_output: on_output(lines, dropped) - EXECUTION_STREAM_INTERVAL마다 모은 출력 줄
+            log_prefix: 로그 파일명 접두어
+        """
         try:
             # 절대 경로로 변환
             if not os.path.isabs(script_path):
@@ -29,39 +69,32 @@ class K6Engine:
             if env_vars:
                 env.update(env_vars)
             
-            # k6 명령어 구성
-            cmd = [self.k6_path, 'run', script_path, '--out', 'json=result.json']
+            # k6 명령어 구성 (JSON 출력은 실행별 임시 디렉토리에 기록)
+            output_dir = _new_output_dir()
+            output_path = os.path.join(output_dir, K6_RESULT_FILENAME)
+            cmd = [self.k6_path, 'run', script_path, '--out', f'json={output_path}']
             
-            # k6 실행
-            result = subprocess.run(
-                cmd,
-                env=env,
-                capture_output=True,
-                text=True,
-                timeout=1800,  # 30분 타임아웃으로 증가
-                cwd=os.path.dirname(script_path)  # 스크립트 디렉토리에서 실행
-            )
-            
-            # 결과 파싱
-            if result.returncode == 0:
-                return {
-                    'status': 'Pass',
-                    'output': result.stdout,
-                    'response_time_avg': 0.0,  # 실제로는 JSON 결과에서 파싱
-                    'throughput': 0.0,
-                    'error_rate': 0.0
-                }
-            else:
-                return {
-                    'status': 'Fail',
-                    'error': result.stderr,
-                    'output': result.stdout
-                }
+            try:
+                # k6 실행
+                result = run_streaming(
+                    cmd,
+                    env=env,
+                    timeout=1800,  # 30분 타임아웃으로 증가
+                    cwd=os.path.dirname(script_path),  # 스크립트 디렉토리에서 실행
+                    on_output=on_output,
+                    log_prefix=log_prefix
+                )
                 
-        except subprocess.TimeoutExpired:
+                # 결과 파싱
+                return _build_result(result.returncode, result.stdout, result.stderr, output_path, result.log_path)
+            finally:
+                shutil.rmtree(output_dir, ignore_errors=True)
+                
+        except subprocess.TimeoutExpired as e:
             return {
                 'status': 'Error',
-                'error': 'k6 실행 시간 초과'
+                'error': 'k6 실행 시간 초과',
+                'log_path': getattr(e, 'log_path', None)
             }
         except Exception as e:
             return {
@@ -74,8 +107,8 @@ class DockerK6Engine:
     def __init__(self):
         self.docker_image = 'grafana/k6:latest'
     
-    def execute_test(self, script_path, env_vars=None):
-        """Docker를 사용한 k6 성능 테스트 실행"""
+    def execute_test(self, script_path, env_vars=None, on_output=None, log_prefix='k6'):
+        """Docker를 사용한 k6 성능 테스트 실행 (출력 스트리밍/로그는 K6Engine과 동일)"""
         try:
             # 절대 경로로 변환
             if not os.path.isabs(script_path):
@@ -95,13 +128,16 @@ class DockerK6Engine:
             script_dir = os.path.dirname(script_path)
             script_name = os.path.basename(script_path)
             
-            # Docker 명령어 구성
+            # Docker 명령어 구성 (JSON 출력은 실행별 임시 디렉토리를 /out으로 마운트해 기록)
+            output_dir = _new_output_dir()
+            output_path = os.path.join(output_dir, K6_RESULT_FILENAME)
             cmd = [
                 'docker', 'run', '--rm',
                 '-v', f'{script_dir}:/scripts',
+                '-v', f'{output_dir}:/out',
                 '-w', '/scripts',
                 self.docker_image,
-                'run', script_name, '--out', 'json=result.json'
+                'run', script_name, '--out', f'json=/out/{K6_RESULT_FILENAME}'
             ]
             
             # 환경 변수 설정
@@ -110,35 +146,26 @@ class DockerK6Engine:
                 for key, value in env_vars.items():
                     cmd.extend(['-e', f'{key}={value}'])
             
-            # Docker 실행
-            result = subprocess.run(
-                cmd,
-                env=env,
-                capture_output=True,
-                text=True,
-                timeout=300  # 5분 타임아웃
-            )
-            
-            # 결과 파싱
-            if result.returncode == 0:
-                return {
-                    'status': 'Pass',
-                    'output': result.stdout,
-                    'response_time_avg': 0.0,  # 실제로는 JSON 결과에서 파싱
-                    'throughput': 0.0,
-                    'error_rate': 0.0
-                }
-            else:
-                return {
-                    'status': 'Fail',
-                    'error': result.stderr,
-                    'output': result.stdout
-                }
+            try:
+                # Docker 실행
+                result = run_streaming(
+                    cmd,
+                    env=env,
+                    timeout=300,  # 5분 타임아웃
+                    on_output=on_output,
+                    log_prefix=log_prefix
+                )
+                
+                # 결과 파싱
+                return _build_result(result.returncode, result.stdout, result.stderr, output_path, result.log_path)
+            finally:
+                shutil.rmtree(output_dir, ignore_errors=True)
                 
-        except subprocess.TimeoutExpired:
+        except subprocess.TimeoutExpired as e:
             return {
                 'status': 'Error',
-                'error': 'k6 실행 시간 초과'
+                'error': 'k6 실행 시간 초과',
+                'log_path': getattr(e, 'log_path', None)
             }
         except Exception as e:
             return {
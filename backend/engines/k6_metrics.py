@@ -0,0 +1,262 @@
+"""
+k6 JSON(NDJSON) 출력 스트리밍 파서
+`k6 run --out json=<파일>` 결과를 한 줄씩 읽어 지연 시간 백분위, 요청률, 에러율, 태그별 통계를 집계한다.
+샘플을 모두 보관하지 않고 로그 스케일 히스토그램에 누적하므로 실행 길이와 무관하게 메모리 사용량이 일정하다.
+"""
+import gzip
+import json
+import math
+from datetime import datetime
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 히스토그램 버킷 상대 오차 (1%)
+HISTOGRAM_PRECISION = 0.01
+PERCENTILES = (50, 90, 95, 99)
+# 태그별 통계를 집계할 태그 키와 키당 최대 값 수 (초과분은 '__other__'로 합산)
+BREAKDOWN_TAGS = ('name', 'method', 'status', 'scenario', 'group')
+MAX_TAG_VALUES = 100
+OTHER_TAG_VALUE = '__other__'
+
+
+class StreamingHistogram:
+    """로그 스케일 버킷 히스토그램 (값의 상대 오차 HISTOGRAM_PRECISION 이내로 백분위 추정)"""
+
+    _log_base = math.log1p(HISTOGRAM_PRECISION)
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self.zero_count = 0
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        if value <= 0:
+            self.zero_count += 1
+            return
+        index = int(math.floor(math.log(value) / self._log_base))
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def percentile(self, pct):
+        if self.count == 0:
+            return None
+        rank = max(1, int(math.ceil(self.count * pct / 100.0)))
+        if rank <= self.zero_count:
+            return 0.0
+        seen = self.zero_count
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                # 버킷 중앙값을 대표값으로 사용하되 관측된 최소/최대 범위로 제한
+                value = math.exp((index + 0.5) * self._log_base)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def summary(self):
+        if self.count == 0:
+            return {'count': 0}
+        result = {
+            'count': self.count,
+            'avg': round(self.total / self.count, 3),
+            'min': round(self.min, 3),
+            'max': round(self.max, 3)
+        }
+        for pct in PERCENTILES:
+            result[f'p{pct}'] = round(self.percentile(pct), 3)
+        return result
+
+
+class _TagStats:
+    """태그 값 하나에 대한 요청 수/실패 수/지연 시간 히스토그램"""
+
+    def __init__(self):
+        self.requests = 0
+        self.failed = 0
+        self.duration = StreamingHistogram()
+
+    def summary(self):
+        return {
+            'requests': self.requests,
+            'failed': self.failed,
+            'error_rate': round(self.failed / self.requests, 4) if self.requests else 0.0,
+            'duration': self.duration.summary()
+        }
+
+
+def _parse_time(value):
+    """k6 RFC3339 타임스탬프 파싱 (나노초 자릿수는 마이크로초로 절삭)"""
+    if not value:
+        return None
+    try:
+        main, _, rest = value.partition('.')
+        if rest:
+            digits = ''
+            while rest and rest[0].isdigit():
+                digits, rest = digits + rest[0], rest[1:]
+            value = f"{main}.{digits[:6].ljust(6, '0')}{rest}"
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+
+class K6MetricsAggregator:
+    """k6 NDJSON 레코드를 받아 누적 집계"""
+
+    def __init__(self):
+        self.duration = StreamingHistogram()
+        self.iteration_duration = StreamingHistogram()
+        self.requests = 0
+        self.failed_requests = 0
+        self.failed_samples = 0
+        self.has_failed_metric = False
+        self.checks_passed = 0
+        self.checks_total = 0
+        self.iterations = 0
+        self.data_received = 0.0
+        self.data_sent = 0.0
+        self.max_vus = 0
+        self.first_time = None
+        self.last_time = None
+        self.breakdowns = {tag: {} for tag in BREAKDOWN_TAGS}
+        self.invalid_lines = 0
+
+    def _tag_stats(self, tags):
+        for tag in BREAKDOWN_TAGS:
+            value = tags.get(tag)
+            if value in (None, ''):
+                continue
+            values = self.breakdowns[tag]
+            if value not in values and len(values) >= MAX_TAG_VALUES:
+                value = OTHER_TAG_VALUE
+            stats = values.get(value)
+            if stats is None:
+                stats = values[value] = _TagStats()
+            yield stats
+
+    def feed_line(self, line):
+        line = line.strip()
+        if not line:
+            return
+        try:
+            record = json.loads(line)
+        except ValueError:
+            self.invalid_lines += 1
+            return
+        if record.get('type') == 'Point':
+            self.add_point(record.get('metric'), record.get('data') or {})
+
+    def add_point(self, metric, data):
+        value = data.get('value')
+        if value is None:
+            return
+        tags = data.get('tags') or {}
+
+        timestamp = data.get('time')
+        if timestamp:
+            if self.first_time is None:
+                self.first_time = timestamp
+            self.last_time = timestamp
+
+        if metric == 'http_req_duration':
+            self.duration.add(value)
+            for stats in self._tag_stats(tags):
+                stats.duration.add(value)
+        elif metric == 'http_reqs':
+            self.requests += int(value)
+            failed = self._is_failed_request(tags)
+            if failed:
+                self.failed_requests += int(value)
+            for stats in self._tag_stats(tags):
+                stats.requests += int(value)
+                if failed:
+                    stats.failed += int(value)
+        elif metric == 'http_req_failed':
+            self.has_failed_metric = True
+            if value:
+                self.failed_samples += 1
+        elif metric == 'checks':
+            self.checks_total += 1
+            if value:
+                self.checks_passed += 1
+        elif metric == 'iterations':
+            self.iterations += int(value)
+        elif metric == 'iteration_duration':
+            self.iteration_duration.add(value)
+        elif metric == 'data_received':
+            self.data_received += value
+        elif metric == 'data_sent':
+            self.data_sent += value
+        elif metric == 'vus':
+            self.max_vus = max(self.max_vus, int(value))
+
+    @staticmethod
+    def _is_failed_request(tags):
+        """http_reqs 포인트의 실패 여부 (expected_response 태그 우선, 없으면 상태 코드로 판단)"""
+        expected = tags.get('expected_response')
+        if expected is not None:
+            return str(expected).lower() != 'true'
+        try:
+            status = int(tags.get('status', 0))
+        except (TypeError, ValueError):
+            return True
+        return status == 0 or status >= 400
+
+    def elapsed_seconds(self):
+        start, end = _parse_time(self.first_time), _parse_time(self.last_time)
+        if not start or not end:
+            return None
+        return max((end - start).total_seconds(), 0.0)
+
+    def summary(self):
+        elapsed = self.elapsed_seconds()
+        # http_req_failed 메트릭이 있으면(k6 v0.31+) 그 값을, 없으면 상태 코드 기반 추정값을 사용
+        failed = self.failed_samples if self.has_failed_metric else self.failed_requests
+        return {
+            'requests': self.requests,
+            'failed_requests': failed,
+            'request_rate': round(self.requests / elapsed, 3) if elapsed else None,
+            'error_rate': round(failed / self.requests, 4) if self.requests else 0.0,
+            'http_req_duration': self.duration.summary(),
+            'iteration_duration': self.iteration_duration.summary(),
+            'iterations': self.iterations,
+            'checks': {
+                'passed': self.checks_passed,
+                'total': self.checks_total,
+                'pass_rate': round(self.checks_passed / self.checks_total, 4) if self.checks_total else None
+            },
+            'data_received_bytes': int(self.data_received),
+            'data_sent_bytes': int(self.data_sent),
+            'max_vus': self.max_vus,
+            'duration_seconds': round(elapsed, 3) if elapsed is not None else None,
+            'breakdowns': {
+                tag: {value: stats.summary() for value, stats in values.items()}
+                for tag, values in self.breakdowns.items() if values
+            }
+        }
+
+
+def parse_k6_json(path):
+    """
+    k6 JSON 출력 파일을 스트리밍으로 읽어 집계 결과 반환 (.gz 파일 지원)
+
+    Returns:
+        dict: K6MetricsAggregator.summary() 결과, 파일이 없으면 None
+    """
+    opener = gzip.open if path.endswith('.gz') else open
+    aggregator = K6MetricsAggregator()
+    try:
+        with opener(path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                aggregator.feed_line(line)
+    except FileNotFoundError:
+        return None
+    if aggregator.invalid_lines:
+        logger.warning(f"k6 결과 파싱 중 잘못된 줄 {aggregator.invalid_lines}개 무시: {path}")
+    return aggregator.summary()
@@ -0,0 +1,35 @@
+"""
+gunicorn 설정 (운영 서버)
+
+    SERVER_ASYNC_MODE=eventlet gunicorn -c gunicorn.conf.py wsgi:app
+
+- eventlet(기본) 또는 gevent 워커: 테스트 실행(subprocess 최대 300초), Jira/슬랙 HTTP 호출처럼 오래 걸리는 요청이
+  OS 스레드를 점유하지 않고 워커당 GUNICORN_WORKER_CONNECTIONS개까지 동시에 처리된다.
+- Socket.IO 롱폴링은 같은 프로세스로 돌아와야 하므로 워커를 여러 개 쓰려면 로드밸런서 sticky session이 필요하다.
+  기본은 워커 1개이고, 노드/프로세스 간 이벤트 전달은 Redis 메시지 큐(utils/socketio_emitter.py)가 담당한다.
+  APScheduler 스케줄은 워커마다 로드되므로 워커를 늘리면 스케줄 실행이 중복된다 (확장은 노드 단위로).
+- DB 연결 풀(DB_POOL_SIZE/DB_MAX_OVERFLOW)은 워커당 동시 요청 수에 맞춰 늘린다.
+"""
+import os
+
+SERVER_ASYNC_MODE = os.environ.get('SERVER_ASYNC_MODE', 'eventlet').lower()
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('GUNICORN_WORKERS', 1))
+worker_class = {
+    'eventlet': 'eventlet',
+    # gevent에서 웹소켓을 처리하려면 gevent-websocket 워커 필요
+    'gevent': 'geventwebsocket.gunicorn.workers.GeventWebSocketWorker',
+    'threading': 'gthread',
+}.get(SERVER_ASYNC_MODE, 'eventlet')
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 1000))
+threads = int(os.environ.get('GUNICORN_THREADS', 8))  # gthread 전용
+
+# 테스트 케이스 실행 요청이 subprocess를 최대 300초 기다리므로 그보다 길게
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 330))
+graceful_timeout = 30
+keepalive = 5
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+locust 결과 비교
+locust --csv로 저장한 <prefix>_stats.csv를 읽어 엔드포인트별 RPS, p99, 실패 수를 표로 출력한다.
+결과를 두 개 주면 이전(before) 대비 이후(after) 변화율을 함께 출력한다.
+
+사용 예:
+    python loadtest/compare.py loadtest/results/threading
+    python loadtest/compare.py loadtest/results/threading loadtest/results/eventlet
+"""
+import argparse
+import csv
+import os
+
+
+def load_stats(prefix):
+    """{엔드포인트 이름: {'rps', 'p99', 'requests', 'failures'}} (Aggregated 포함)"""
+    path = prefix if prefix.endswith('.csv') else f'{prefix}_stats.csv'
+    if not os.path.exists(path):
+        raise SystemExit(f"결과 파일을 찾을 수 없습니다: {path}")
+    stats = {}
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            # 전체 합계 행은 Type이 비어 있고 Name이 'Aggregated'
+            stats[row['Name']] = {
+                'rps': float(row['Requests/s'] or 0),
+                'p99': float(row['99%']) if row.get('99%') not in (None, '', 'N/A') else 0.0,
+                'requests': int(row['Request Count'] or 0),
+                'failures': int(row['Failure Count'] or 0),
+            }
+    return stats
+
+
+def _change(before, after):
+    if not before:
+        return '-'
+    return f"{(after - before) / before * 100:+.1f}%"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='locust 결과 RPS/p99 비교')
+    parser.add_argument('before', help='locust --csv 접두사 또는 _stats.csv 경로')
+    parser.add_argument('after', nargs='?', help='비교할 결과 (생략하면 before만 출력)')
+    args = parser.parse_args()
+
+    before = load_stats(args.before)
+    after = load_stats(args.after) if args.after else None
+    names = sorted(n for n in set(before) | set(after or {}) if n != 'Aggregated') + ['Aggregated']
+
+    if after is None:
+        print(f"{'엔드포인트':<34} {'RPS':>9} {'p99(ms)':>9} {'요청':>8} {'실패':>6}")
+        for name in names:
+            s = before.get(name)
+            if s:
+                print(f"{name:<34} {s['rps']:>9.1f} {s['p99']:>9.0f} {s['requests']:>8} {s['failures']:>6}")
+        return
+
+    print(f"{'엔드포인트':<34} {'RPS 전':>8} {'RPS 후':>8} {'변화':>8}   {'p99 전':>8} {'p99 후':>8} {'변화':>8}   {'실패 전/후':>10}")
+    empty = {'rps': 0.0, 'p99': 0.0, 'requests': 0, 'failures': 0}
+    for name in names:
+        b, a = before.get(name, empty), after.get(name, empty)
+        print(
+            f"{name:<34} {b['rps']:>8.1f} {a['rps']:>8.1f} {_change(b['rps'], a['rps']):>8}   "
+            f"{b['p99']:>8.0f} {a['p99']:>8.0f} {_change(b['p99'], a['p99']):>8}   "
+            f"{str(b['failures']) + '/' + str(a['failures']):>10}"
+        )
+
+
+if __name__ == '__main__':
+    main()
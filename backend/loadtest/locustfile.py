@@ -0,0 +1,66 @@
+"""
+API 부하 테스트 (locust)
+주요 조회 API(/testcases, /folders/tree, /analytics/*)에 읽기 부하를 주고 RPS와 응답 시간 분포를 측정한다.
+
+    locust -f loadtest/locustfile.py --host http://localhost:8000 \
+        --headless -u 100 -r 10 -t 2m --csv loadtest/results/eventlet
+
+서빙 방식(python app.py / gunicorn eventlet / gevent)별로 같은 조건에서 실행한 뒤
+loadtest/compare.py로 엔드포인트별 RPS와 p99를 비교한다.
+
+환경 변수:
+    LOADTEST_USERNAME, LOADTEST_PASSWORD: 지정하면 로그인해 JWT로 요청 (없으면 게스트 접근)
+    LOADTEST_WAIT_MIN, LOADTEST_WAIT_MAX: 사용자별 요청 간 대기 시간(초), 기본 0.5~2
+    LOADTEST_ANALYTICS_DAYS: 분석 API 기간 파라미터, 기본 30
+"""
+import os
+from locust import HttpUser, between, task
+
+USERNAME = os.environ.get('LOADTEST_USERNAME')
+PASSWORD = os.environ.get('LOADTEST_PASSWORD')
+ANALYTICS_DAYS = int(os.environ.get('LOADTEST_ANALYTICS_DAYS', 30))
+
+ANALYTICS_ENDPOINTS = [
+    '/analytics/trends',
+    '/analytics/flaky-tests',
+    '/analytics/regression-detection',
+    '/analytics/execution-time',
+    '/analytics/coverage',
+    '/analytics/failure-patterns',
+    '/analytics/test-health',
+]
+
+
+class ApiUser(HttpUser):
+    """테스트 관리 화면을 조회하는 사용자"""
+    wait_time = between(
+        float(os.environ.get('LOADTEST_WAIT_MIN', 0.5)),
+        float(os.environ.get('LOADTEST_WAIT_MAX', 2))
+    )
+
+    def on_start(self):
+        if not USERNAME:
+            return
+        response = self.client.post('/auth/login', json={'username': USERNAME, 'password': PASSWORD}, name='/auth/login')
+        body = response.json() if response.ok else {}
+        token = (body.get('data') or body).get('access_token')
+        if token:
+            self.client.headers['Authorization'] = f'Bearer {token}'
+
+    @task(6)
+    def list_testcases(self):
+        # 기본 키셋 페이징 첫 페이지
+        self.client.get('/testcases?limit=50', name='/testcases')
+
+    @task(2)
+    def list_testcases_offset(self):
+        self.client.get('/testcases?page=1&per_page=50', name='/testcases?page')
+
+    @task(4)
+    def folder_tree(self):
+        self.client.get('/folders/tree', name='/folders/tree')
+
+    @task(1)
+    def analytics(self):
+        for path in ANALYTICS_ENDPOINTS:
+            self.client.get(f'{path}?days={ANALYTICS_DAYS}', name=path)
@@ -0,0 +1,116 @@
+"""add daily/hourly TestResult rollup tables for analytics
+
+Revision ID: add_analytics_rollups
+Revises: add_system_config
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_analytics_rollups'
+down_revision = 'add_system_config'
+branch_labels = None
+depends_on = None
+
+ROLLUP_TABLES = (
+    ('test_result_daily_rollups', 'bucket_date', sa.Date(), 'daily'),
+    ('test_result_hourly_rollups', 'bucket_hour', sa.DateTime(), 'hourly'),
+)
+
+
+def _table_exists(name):
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    tables = [t.lower() for t in inspector.get_table_names()]
+    return name in tables
+
+
+def _bucket_expressions(dialect, executed_at):
+    """(일 버킷, 시간 버킷) SQL 식 (지원하지 않는 DB는 None)"""
+    if dialect == 'mysql':
+        return sa.func.date(executed_at), sa.func.date_format(executed_at, '%Y-%m-%d %H:00:00')
+    if dialect == 'postgresql':
+        return sa.cast(executed_at, sa.Date), sa.func.date_trunc('hour', executed_at)
+    if dialect == 'sqlite':
+        # SQLAlchemy SQLite DateTime 저장 형식에 맞춤
+        return sa.func.date(executed_at), sa.func.strftime('%Y-%m-%d %H:00:00.000000', executed_at)
+    return None
+
+
+def _backfill(table_name, bucket_column, bucket_index):
+    """기존 TestResults를 GROUP BY로 집계해 롤업 초기값 채움 (이후에는 저장 시 증분 갱신)"""
+    results = sa.table(
+        'TestResults',
+        sa.column('test_case_id'), sa.column('environment'), sa.column('result'), sa.column('executed_at'),
+        sa.column('execution_time'), sa.column('execution_duration')
+    )
+    buckets = _bucket_expressions(op.get_bind().dialect.name, results.c.executed_at)
+    if buckets is None:
+        # 그 밖의 DB는 scripts/rebuild_analytics_rollups.py로 채움
+        return
+    rollup = sa.table(table_name, *[sa.column(name) for name in (
+        bucket_column, 'test_case_id', 'environment', 'result', 'count', 'duration_count', 'duration_sum',
+        'duration_sq_sum', 'duration_min', 'duration_max', 'first_executed_at', 'last_executed_at'
+    )])
+    duration = sa.func.coalesce(results.c.execution_time, results.c.execution_duration)
+    keys = [
+        buckets[bucket_index],
+        results.c.test_case_id,
+        sa.func.coalesce(results.c.environment, ''),
+        sa.func.coalesce(results.c.result, ''),
+    ]
+    op.execute(rollup.insert().from_select(
+        [column.name for column in rollup.columns],
+        sa.select(
+            *keys,
+            sa.func.count(),
+            sa.func.count(duration),
+            sa.func.coalesce(sa.func.sum(duration), 0),
+            sa.func.coalesce(sa.func.sum(duration * duration), 0),
+            sa.func.min(duration),
+            sa.func.max(duration),
+            sa.func.min(results.c.executed_at),
+            sa.func.max(results.c.executed_at),
+        ).where(
+            results.c.test_case_id.isnot(None),
+            results.c.executed_at.isnot(None)
+        ).group_by(*keys)
+    ))
+
+
+def upgrade():
+    for bucket_index, (table_name, bucket_column, bucket_type, prefix) in enumerate(ROLLUP_TABLES):
+        if _table_exists(table_name):
+            continue
+        op.create_table(
+            table_name,
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column(bucket_column, bucket_type, nullable=False),
+            sa.Column('test_case_id', sa.Integer(), nullable=False),
+            sa.Column('environment', sa.String(50), nullable=False, server_default=''),
+            sa.Column('result', sa.String(20), nullable=False, server_default=''),
+            sa.Column('count', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('duration_count', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('duration_sum', sa.Float(), nullable=False, server_default='0'),
+            sa.Column('duration_sq_sum', sa.Float(), nullable=False, server_default='0'),
+            sa.Column('duration_min', sa.Float(), nullable=True),
+            sa.Column('duration_max', sa.Float(), nullable=True),
+            sa.Column('first_executed_at', sa.DateTime(), nullable=True),
+            sa.Column('last_executed_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint(bucket_column, 'test_case_id', 'environment', 'result',
+                                name=f'uq_{prefix}_rollup_bucket')
+        )
+        op.create_index(f'ix_{prefix}_rollup_test_case', table_name, ['test_case_id', bucket_column])
+        _backfill(table_name, bucket_column, bucket_index)
+
+
+def downgrade():
+    for table_name, _, _, prefix in ROLLUP_TABLES:
+        if _table_exists(table_name):
+            op.drop_index(f'ix_{prefix}_rollup_test_case', table_name=table_name)
+            op.drop_table(table_name)
@@ -0,0 +1,68 @@
+"""add dashboard_status_counts table for incremental dashboard summaries
+
+Revision ID: add_dashboard_status_counts
+Revises: add_search_documents
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_dashboard_status_counts'
+down_revision = 'add_search_documents'
+branch_labels = None
+depends_on = None
+
+TABLE_NAME = 'dashboard_status_counts'
+
+
+def _table_exists(name):
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    tables = [t.lower() for t in inspector.get_table_names()]
+    return name in tables
+
+
+def upgrade():
+    if _table_exists(TABLE_NAME):
+        return
+    op.create_table(
+        TABLE_NAME,
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('environment', sa.String(50), nullable=False, server_default=''),
+        sa.Column('project_id', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('folder_id', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('result_status', sa.String(20), nullable=False, server_default=''),
+        sa.Column('count', sa.Integer(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('environment', 'project_id', 'folder_id', 'result_status',
+                            name='uq_dashboard_status_count')
+    )
+    # 기존 테스트 케이스로 초기값 채움 (이후에는 저장 시 증분 갱신, tasks.reconcile_dashboard_summary로 보정)
+    testcases = sa.table(
+        'TestCases',
+        sa.column('environment'), sa.column('project_id'), sa.column('folder_id'), sa.column('result_status')
+    )
+    counts = sa.table(
+        TABLE_NAME,
+        sa.column('environment'), sa.column('project_id'), sa.column('folder_id'),
+        sa.column('result_status'), sa.column('count')
+    )
+    keys = [
+        sa.func.coalesce(testcases.c.environment, ''),
+        sa.func.coalesce(testcases.c.project_id, 0),
+        sa.func.coalesce(testcases.c.folder_id, 0),
+        sa.func.coalesce(testcases.c.result_status, ''),
+    ]
+    op.execute(counts.insert().from_select(
+        ['environment', 'project_id', 'folder_id', 'result_status', 'count'],
+        sa.select(*keys, sa.func.count()).group_by(*keys)
+    ))
+
+
+def downgrade():
+    if _table_exists(TABLE_NAME):
+        op.drop_table(TABLE_NAME)
@@ -0,0 +1,55 @@
+"""add flaky_test_scores table for persisted flaky test metrics
+
+Revision ID: add_flaky_test_scores
+Revises: add_analytics_rollups
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_flaky_test_scores'
+down_revision = 'add_analytics_rollups'
+branch_labels = None
+depends_on = None
+
+
+def _flaky_test_scores_table_exists():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    tables = [t.lower() for t in inspector.get_table_names()]
+    return 'flaky_test_scores' in tables
+
+
+def upgrade():
+    if not _flaky_test_scores_table_exists():
+        op.create_table(
+            'flaky_test_scores',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('window_days', sa.Integer(), nullable=False),
+            sa.Column('test_case_id', sa.Integer(), nullable=False),
+            sa.Column('total_executions', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('passed', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('failed', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('transitions', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('flip_rate', sa.Float(), nullable=False, server_default='0'),
+            sa.Column('entropy', sa.Float(), nullable=False, server_default='0'),
+            sa.Column('failure_probability', sa.Float(), nullable=False, server_default='0'),
+            sa.Column('flakiness_score', sa.Float(), nullable=False, server_default='0'),
+            sa.Column('recent_results', sa.Text(), nullable=True),
+            sa.Column('first_execution', sa.DateTime(), nullable=True),
+            sa.Column('last_execution', sa.DateTime(), nullable=True),
+            sa.Column('computed_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('window_days', 'test_case_id', name='uq_flaky_score_window_test_case')
+        )
+        op.create_index('ix_flaky_score_window_score', 'flaky_test_scores', ['window_days', 'flakiness_score'])
+
+
+def downgrade():
+    if _flaky_test_scores_table_exists():
+        op.drop_index('ix_flaky_score_window_score', table_name='flaky_test_scores')
+        op.drop_table('flaky_test_scores')
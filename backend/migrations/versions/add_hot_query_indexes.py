@@ -0,0 +1,56 @@
+"""add composite indexes for TestResults/TestCases hot queries
+
+Revision ID: add_hot_query_indexes
+Revises: add_flaky_test_scores
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_hot_query_indexes'
+down_revision = 'add_flaky_test_scores'
+branch_labels = None
+depends_on = None
+
+# (테이블, 인덱스 이름, 컬럼) - models.py의 __table_args__와 동일하게 유지
+HOT_QUERY_INDEXES = (
+    ('TestResults', 'ix_testresults_test_case_id_executed_at', ['test_case_id', 'executed_at']),
+    ('TestResults', 'ix_testresults_executed_at_result', ['executed_at', 'result']),
+    ('TestResults', 'ix_testresults_environment_executed_at', ['environment', 'executed_at']),
+    ('TestCases', 'ix_testcases_folder_id', ['folder_id']),
+    ('TestCases', 'ix_testcases_environment_result_status', ['environment', 'result_status']),
+    ('TestCases', 'ix_testcases_categories', ['main_category', 'sub_category', 'detail_category']),
+    ('TestCases', 'ix_testcases_updated_at_id', ['updated_at', 'id']),
+)
+
+
+def table_exists(table_name):
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    return table_name in inspector.get_table_names()
+
+
+def existing_indexes(table_name):
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    return {index['name']: index['column_names'] for index in inspector.get_indexes(table_name)}
+
+
+def upgrade():
+    for table_name, index_name, columns in HOT_QUERY_INDEXES:
+        if not table_exists(table_name):
+            continue
+        indexes = existing_indexes(table_name)
+        # 같은 이름이 있거나, 앞쪽 컬럼이 같은 인덱스가 이미 있으면(예: MySQL FK 자동 인덱스) 생성하지 않음
+        if index_name in indexes or any(cols[:len(columns)] == columns for cols in indexes.values()):
+            continue
+        op.create_index(index_name, table_name, columns)
+
+
+def downgrade():
+    for table_name, index_name, _ in reversed(HOT_QUERY_INDEXES):
+        if table_exists(table_name) and index_name in existing_indexes(table_name):
+            op.drop_index(index_name, table_name=table_name)
@@ -0,0 +1,130 @@
+"""add search_documents table and full-text index
+
+토큰화는 애플리케이션(services/search_service.tokenize)에서 하므로 여기서는 색인을 채우지 않는다.
+백필(scripts/rebuild_search_index.py) 전까지 목록 API의 search= 필터는 LIKE 검색으로 대체된다.
+
+Revision ID: add_search_documents
+Revises: add_hot_query_indexes
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_search_documents'
+down_revision = 'add_hot_query_indexes'
+branch_labels = None
+depends_on = None
+
+FTS_TABLE = 'search_documents_fts'
+SQLITE_TRIGGERS = ('search_documents_ai', 'search_documents_ad', 'search_documents_au')
+MYSQL_FULLTEXT_INDEXES = {
+    'ft_search_documents_tokens': '(title_tokens, body_tokens)',
+    'ft_search_documents_title': '(title_tokens)',
+}
+
+
+def _search_documents_table_exists():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    tables = [t.lower() for t in inspector.get_table_names()]
+    return 'search_documents' in tables
+
+
+def _upgrade_sqlite(bind):
+    exists = bind.execute(sa.text(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"
+    ), {'name': FTS_TABLE}).first()
+    if exists:
+        return
+    try:
+        op.execute(
+            f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+            "title_tokens, body_tokens, content='search_documents', content_rowid='id', tokenize='unicode61')"
+        )
+    except sa.exc.OperationalError:
+        # FTS5가 없는 SQLite 빌드는 LIKE 검색을 사용
+        return
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS search_documents_ai AFTER INSERT ON search_documents BEGIN "
+        f"INSERT INTO {FTS_TABLE}(rowid, title_tokens, body_tokens) "
+        "VALUES (new.id, new.title_tokens, new.body_tokens); END"
+    )
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS search_documents_ad AFTER DELETE ON search_documents BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title_tokens, body_tokens) "
+        "VALUES ('delete', old.id, old.title_tokens, old.body_tokens); END"
+    )
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS search_documents_au AFTER UPDATE ON search_documents BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title_tokens, body_tokens) "
+        "VALUES ('delete', old.id, old.title_tokens, old.body_tokens); "
+        f"INSERT INTO {FTS_TABLE}(rowid, title_tokens, body_tokens) "
+        "VALUES (new.id, new.title_tokens, new.body_tokens); END"
+    )
+    op.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def _upgrade_mysql(bind):
+    existing = {index['name'] for index in inspect(bind).get_indexes('search_documents')}
+    for name, columns in MYSQL_FULLTEXT_INDEXES.items():
+        if name not in existing:
+            # 한글은 공백 단위 토큰화가 맞지 않으므로 ngram 파서 사용 (ngram_token_size 기본 2)
+            op.execute(f"ALTER TABLE search_documents ADD FULLTEXT INDEX {name} {columns} WITH PARSER ngram")
+
+
+def _upgrade_postgresql(bind):
+    columns = {column['name'] for column in inspect(bind).get_columns('search_documents')}
+    if 'search_vector' not in columns:
+        op.execute(
+            "ALTER TABLE search_documents ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('simple', coalesce(title_tokens, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(body_tokens, '')), 'B')) STORED"
+        )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_search_documents_search_vector "
+        "ON search_documents USING GIN (search_vector)"
+    )
+
+
+def upgrade():
+    if not _search_documents_table_exists():
+        op.create_table(
+            'search_documents',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('doc_type', sa.String(length=20), nullable=False),
+            sa.Column('source_key', sa.String(length=500), nullable=False),
+            sa.Column('source_id', sa.Integer(), nullable=True),
+            sa.Column('title', sa.String(length=500), nullable=True),
+            sa.Column('summary', sa.String(length=500), nullable=True),
+            sa.Column('title_tokens', sa.Text(), nullable=True),
+            sa.Column('body_tokens', sa.Text(), nullable=True),
+            sa.Column('source_version', sa.String(length=64), nullable=True),
+            sa.Column('indexed_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('doc_type', 'source_key', name='uq_search_document_source')
+        )
+        op.create_index('ix_search_document_type_source_id', 'search_documents', ['doc_type', 'source_id'])
+
+    bind = op.get_bind()
+    if bind.dialect.name == 'sqlite':
+        _upgrade_sqlite(bind)
+    elif bind.dialect.name == 'mysql':
+        _upgrade_mysql(bind)
+    elif bind.dialect.name == 'postgresql':
+        _upgrade_postgresql(bind)
+
+
+def downgrade():
+    if not _search_documents_table_exists():
+        return
+    bind = op.get_bind()
+    if bind.dialect.name == 'sqlite':
+        for trigger in SQLITE_TRIGGERS:
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+    op.drop_index('ix_search_document_type_source_id', table_name='search_documents')
+    op.drop_table('search_documents')
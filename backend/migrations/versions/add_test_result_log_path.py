@@ -0,0 +1,33 @@
+"""add log_path to TestResults for streamed execution logs
+
+Revision ID: add_test_result_log_path
+Revises: add_dashboard_status_counts
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_test_result_log_path'
+down_revision = 'add_dashboard_status_counts'
+branch_labels = None
+depends_on = None
+
+
+def _column_exists(table, column):
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    return column in [c['name'] for c in inspector.get_columns(table)]
+
+
+def upgrade():
+    if not _column_exists('TestResults', 'log_path'):
+        op.add_column('TestResults', sa.Column('log_path', sa.String(500), nullable=True))
+
+
+def downgrade():
+    if _column_exists('TestResults', 'log_path'):
+        op.drop_column('TestResults', 'log_path')
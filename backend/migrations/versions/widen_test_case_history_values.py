@@ -0,0 +1,36 @@
+"""widen test_case_history old/new values to MEDIUMTEXT on MySQL
+
+Revision ID: widen_test_case_history_values
+Revises: add_test_result_log_path
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision = 'widen_test_case_history_values'
+down_revision = 'add_test_result_log_path'
+branch_labels = None
+depends_on = None
+
+VALUE_COLUMNS = ('old_value', 'new_value')
+
+
+def upgrade():
+    # TEXT(64KB)는 json 저장 방식의 변경 내역(__diff__)을 담지 못할 수 있음. 다른 DB의 TEXT는 길이 제한이 없다.
+    if op.get_bind().dialect.name != 'mysql':
+        return
+    for column in VALUE_COLUMNS:
+        op.alter_column('test_case_history', column, type_=mysql.MEDIUMTEXT(),
+                        existing_type=sa.Text(), existing_nullable=True)
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'mysql':
+        return
+    for column in VALUE_COLUMNS:
+        op.alter_column('test_case_history', column, type_=sa.Text(),
+                        existing_type=mysql.MEDIUMTEXT(), existing_nullable=True)
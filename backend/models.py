@@ -1,6 +1,7 @@
 from datetime import datetime
 from utils.timezone_utils import get_kst_now
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.dialects.mysql import MEDIUMTEXT
 from werkzeug.security import generate_password_hash, check_password_hash
 import secrets
 
@@ -113,6 +114,13 @@ class TestCase(db.Model):
     automation_code_path = db.Column(db.String(500))  # 자동화 코드 경로
     automation_code_type = db.Column(db.String(50))  # 자동화 코드 타입
     result_status = db.Column(db.String(20), default='pending')  # pending, passed, failed, blocked
+    # 목록/대시보드 조회용 인덱스 (migrations/versions/add_hot_query_indexes.py, scripts/index_advisor.py로 점검)
+    __table_args__ = (
+        db.Index('ix_testcases_folder_id', 'folder_id'),
+        db.Index('ix_testcases_environment_result_status', 'environment', 'result_status'),
+        db.Index('ix_testcases_categories', 'main_category', 'sub_category', 'detail_category'),
+        db.Index('ix_testcases_updated_at_id', 'updated_at', 'id'),
+    )
     
     # 관계 설정
     folder = db.relationship('Folder', backref='test_cases')
@@ -127,14 +135,16 @@ class TestCaseHistory(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     test_case_id = db.Column(db.Integer, db.ForeignKey('TestCases.id'), nullable=False)
     field_name = db.Column(db.String(100), nullable=False)  # 변경된 필드명
-    old_value = db.Column(db.Text)  # 이전 값
-    new_value = db.Column(db.Text)  # 새로운 값
+    # json 저장 방식의 변경 내역(__diff__)은 MySQL TEXT(64KB)를 넘을 수 있으므로 MEDIUMTEXT 사용
+    old_value = db.Column(db.Text().with_variant(MEDIUMTEXT(), 'mysql'))  # 이전 값
+    new_value = db.Column(db.Text().with_variant(MEDIUMTEXT(), 'mysql'))  # 새로운 값
     changed_by = db.Column(db.Integer, db.ForeignKey('Users.id'), nullable=False)
     changed_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     change_type = db.Column(db.String(50), nullable=False)  # 'create', 'update', 'delete'
     
     # 관계 설정
-    test_case = db.relationship('TestCase', backref='history')
+    # 테스트 케이스를 ORM으로 삭제하면 히스토리도 함께 삭제 (test_case_id가 NOT NULL)
+    test_case = db.relationship('TestCase', backref=db.backref('history', cascade='all, delete'))
     user = db.relationship('User', backref='test_case_changes')
     
     def __repr__(self):
@@ -193,11 +203,16 @@ class TestResult(db.Model):
     executed_at = db.Column(db.DateTime, default=get_kst_now)
     notes = db.Column(db.Text)
     error_message = db.Column(db.Text)  # 에러 메시지
+    log_path = db.Column(db.String(500))  # 전체 실행 출력 gzip 로그 (utils/streaming_runner.py)
     automation_test_id = db.Column(db.Integer, db.ForeignKey('AutomationTests.id'), nullable=True)  # 자동화 테스트 연결
     performance_test_id = db.Column(db.Integer, db.ForeignKey('PerformanceTests.id'), nullable=True)  # 성능 테스트 연결
     # test_case_id는 반드시 있어야 함 (실제 DB 스키마에 맞춤)
     __table_args__ = (
         db.CheckConstraint('test_case_id IS NOT NULL', name='check_test_reference'),
+        # 테스트별 이력 / 기간+결과 / 환경+기간 조회용 인덱스
+        db.Index('ix_testresults_test_case_id_executed_at', 'test_case_id', 'executed_at'),
+        db.Index('ix_testresults_executed_at_result', 'executed_at', 'result'),
+        db.Index('ix_testresults_environment_executed_at', 'environment', 'executed_at'),
     )
     
     # 관계 설정
@@ -216,6 +231,109 @@ class DashboardSummary(db.Model):
     pass_rate = db.Column(db.Float, default=0.0)
     last_updated = db.Column(db.DateTime, default=get_kst_now)
 
+# 대시보드 상태별 테스트 케이스 수 (환경/프로젝트/폴더/결과 상태 단위)
+# TestCase 저장 시 같은 트랜잭션에서 증감되며(services/dashboard_summary_service.py) 대시보드 API가 원본 대신 조회한다.
+# 유니크 키 충돌 판정을 위해 없는 environment/result_status는 빈 문자열, project_id/folder_id는 0으로 저장한다.
+class DashboardStatusCount(db.Model):
+    __tablename__ = 'dashboard_status_counts'
+    id = db.Column(db.Integer, primary_key=True)
+    environment = db.Column(db.String(50), nullable=False, default='')
+    project_id = db.Column(db.Integer, nullable=False, default=0)
+    folder_id = db.Column(db.Integer, nullable=False, default=0)
+    result_status = db.Column(db.String(20), nullable=False, default='')
+    count = db.Column(db.Integer, nullable=False, default=0)
+    __table_args__ = (
+        db.UniqueConstraint('environment', 'project_id', 'folder_id', 'result_status', name='uq_dashboard_status_count'),
+    )
+
+# 테스트 결과 집계(롤업) 모델
+# TestResult 저장 시 증분으로 갱신되며 /analytics/* API가 원본 대신 조회한다.
+# environment/result가 없는 결과는 유니크 키 충돌 판정을 위해 빈 문자열로 저장한다.
+class TestResultDailyRollup(db.Model):
+    __tablename__ = 'test_result_daily_rollups'
+    id = db.Column(db.Integer, primary_key=True)
+    bucket_date = db.Column(db.Date, nullable=False)
+    test_case_id = db.Column(db.Integer, nullable=False)
+    environment = db.Column(db.String(50), nullable=False, default='')
+    result = db.Column(db.String(20), nullable=False, default='')
+    count = db.Column(db.Integer, nullable=False, default=0)
+    duration_count = db.Column(db.Integer, nullable=False, default=0)  # 실행 시간이 기록된 결과 수
+    duration_sum = db.Column(db.Float, nullable=False, default=0.0)
+    duration_sq_sum = db.Column(db.Float, nullable=False, default=0.0)  # 표준편차 계산용 제곱합
+    duration_min = db.Column(db.Float)
+    duration_max = db.Column(db.Float)
+    first_executed_at = db.Column(db.DateTime)
+    last_executed_at = db.Column(db.DateTime)
+    __table_args__ = (
+        db.UniqueConstraint('bucket_date', 'test_case_id', 'environment', 'result', name='uq_daily_rollup_bucket'),
+        db.Index('ix_daily_rollup_test_case', 'test_case_id', 'bucket_date'),
+    )
+
+class TestResultHourlyRollup(db.Model):
+    __tablename__ = 'test_result_hourly_rollups'
+    id = db.Column(db.Integer, primary_key=True)
+    bucket_hour = db.Column(db.DateTime, nullable=False)  # 정시로 절삭한 실행 시각
+    test_case_id = db.Column(db.Integer, nullable=False)
+    environment = db.Column(db.String(50), nullable=False, default='')
+    result = db.Column(db.String(20), nullable=False, default='')
+    count = db.Column(db.Integer, nullable=False, default=0)
+    duration_count = db.Column(db.Integer, nullable=False, default=0)
+    duration_sum = db.Column(db.Float, nullable=False, default=0.0)
+    duration_sq_sum = db.Column(db.Float, nullable=False, default=0.0)
+    duration_min = db.Column(db.Float)
+    duration_max = db.Column(db.Float)
+    first_executed_at = db.Column(db.DateTime)
+    last_executed_at = db.Column(db.DateTime)
+    __table_args__ = (
+        db.UniqueConstraint('bucket_hour', 'test_case_id', 'environment', 'result', name='uq_hourly_rollup_bucket'),
+        db.Index('ix_hourly_rollup_test_case', 'test_case_id', 'bucket_hour'),
+    )
+
+# Flaky 테스트 점수 모델
+# 분석 기간(window_days)별로 주기적으로 재계산해 저장하며 /analytics/flaky-tests가 그대로 조회한다.
+class FlakyTestScore(db.Model):
+    __tablename__ = 'flaky_test_scores'
+    id = db.Column(db.Integer, primary_key=True)
+    window_days = db.Column(db.Integer, nullable=False)
+    test_case_id = db.Column(db.Integer, nullable=False)
+    total_executions = db.Column(db.Integer, nullable=False, default=0)  # Pass/Fail 결과 수
+    passed = db.Column(db.Integer, nullable=False, default=0)
+    failed = db.Column(db.Integer, nullable=False, default=0)
+    transitions = db.Column(db.Integer, nullable=False, default=0)  # 연속 실행 간 Pass↔Fail 전환 수
+    flip_rate = db.Column(db.Float, nullable=False, default=0.0)  # transitions / (total_executions - 1)
+    entropy = db.Column(db.Float, nullable=False, default=0.0)  # 결과 분포의 이진 엔트로피 (0~1 bit)
+    failure_probability = db.Column(db.Float, nullable=False, default=0.0)  # 전체 실패율을 사전분포로 한 베이지안 추정
+    flakiness_score = db.Column(db.Float, nullable=False, default=0.0)
+    recent_results = db.Column(db.Text)  # 최근 결과 JSON 배열 (최신순)
+    first_execution = db.Column(db.DateTime)
+    last_execution = db.Column(db.DateTime)
+    computed_at = db.Column(db.DateTime, default=get_kst_now)
+    __table_args__ = (
+        db.UniqueConstraint('window_days', 'test_case_id', name='uq_flaky_score_window_test_case'),
+        db.Index('ix_flaky_score_window_score', 'window_days', 'flakiness_score'),
+    )
+
+# 검색 문서 모델
+# 테스트 케이스/템플릿/성능 테스트/test-scripts 파일을 n-gram 토큰으로 저장하는 역색인 원본.
+# 실제 전문 검색 인덱스(SQLite FTS5, MySQL FULLTEXT ngram, PostgreSQL tsvector)는
+# services/search_service.py와 migrations/versions/add_search_documents.py가 이 테이블 위에 만든다.
+class SearchDocument(db.Model):
+    __tablename__ = 'search_documents'
+    id = db.Column(db.Integer, primary_key=True)
+    doc_type = db.Column(db.String(20), nullable=False)  # testcase, template, performance_test, script
+    source_key = db.Column(db.String(500), nullable=False)  # 원본 ID 또는 스크립트 상대 경로
+    source_id = db.Column(db.Integer)  # DB 원본의 ID (스크립트는 NULL)
+    title = db.Column(db.String(500))
+    summary = db.Column(db.String(500))
+    title_tokens = db.Column(db.Text)
+    body_tokens = db.Column(db.Text)
+    source_version = db.Column(db.String(64))  # 원본 updated_at 또는 파일 mtime:size (변경 감지용)
+    indexed_at = db.Column(db.DateTime, default=get_kst_now)
+    __table_args__ = (
+        db.UniqueConstraint('doc_type', 'source_key', name='uq_search_document_source'),
+        db.Index('ix_search_document_type_source_id', 'doc_type', 'source_id'),
+    )
+
 # 테스트 실행 기록 모델
 class TestExecution(db.Model):
     __tablename__ = 'TestExecutions'
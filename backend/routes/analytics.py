@@ -3,20 +3,33 @@
 트렌드 분석, Flaky 테스트 감지, 회귀 테스트 감지 등
 """
 from flask import Blueprint, request, jsonify
-from models import db, TestCase, TestResult, TestExecution
+from models import db, TestCase, TestResult, TestExecution, TestResultDailyRollup, TestResultHourlyRollup, FlakyTestScore
+from services.flaky_test_service import flaky_test_service, count_pattern_changes, FLAKY_SCORE_WINDOWS, DEFAULT_FLAKY_WINDOW
 from utils.cors import add_cors_headers
-from utils.auth_decorators import guest_allowed, user_required
+from utils.auth_decorators import guest_allowed, user_required, admin_required
 from utils.timezone_utils import get_kst_now
 from utils.logger import get_logger
 from datetime import datetime, timedelta
 from sqlalchemy import func, and_, or_, case
 from sqlalchemy.sql import label
 import json
+import math
 
 logger = get_logger(__name__)
 
 analytics_bp = Blueprint('analytics', __name__)
 
+# 분석 API는 원본 TestResults 대신 롤업 테이블(services/analytics_rollup_service.py)을 집계한다.
+# 일 단위 롤업은 기간 시작일 0시부터 포함한다.
+ERROR_KEYWORDS = ['timeout', 'connection', 'not found', 'permission', 'invalid', 'error']
+
+
+def _rollup_count(model, result=None):
+    """롤업 count 합계 (result를 주면 해당 결과만)"""
+    if result is None:
+        return func.coalesce(func.sum(model.count), 0)
+    return func.coalesce(func.sum(case((model.result == result, model.count), else_=0)), 0)
+
 @analytics_bp.route('/analytics/trends', methods=['GET', 'OPTIONS'])
 @guest_allowed
 def get_test_trends():
@@ -34,27 +47,39 @@ def get_test_trends():
         # 시작 날짜 계산
         start_date = get_kst_now() - timedelta(days=days)
         
-        # 기본 쿼리
+        granularity = request.args.get('granularity', 'day')  # day | hour
+        if granularity not in ('day', 'hour'):
+            response = jsonify({'error': "granularity는 'day' 또는 'hour'여야 합니다."})
+            return add_cors_headers(response), 400
+        
+        # 롤업 테이블에서 (버킷, 결과)별 합계 조회
+        if granularity == 'hour':
+            model, bucket = TestResultHourlyRollup, TestResultHourlyRollup.bucket_hour
+            bucket_start = start_date.replace(minute=0, second=0, microsecond=0)
+        else:
+            model, bucket = TestResultDailyRollup, TestResultDailyRollup.bucket_date
+            bucket_start = start_date.date()
+        
         query = db.session.query(
-            func.date(TestResult.executed_at).label('date'),
-            TestResult.result,
-            func.count(TestResult.id).label('count')
+            bucket.label('date'),
+            model.result,
+            _rollup_count(model).label('count')
         ).filter(
-            TestResult.executed_at >= start_date
+            bucket >= bucket_start
         )
         
         # 필터 적용
         if environment:
-            query = query.filter(TestResult.environment == environment)
+            query = query.filter(model.environment == environment)
         if test_case_id:
-            query = query.filter(TestResult.test_case_id == test_case_id)
+            query = query.filter(model.test_case_id == test_case_id)
         
         # 그룹화 및 정렬
         results = query.group_by(
-            func.date(TestResult.executed_at),
-            TestResult.result
+            bucket,
+            model.result
         ).order_by(
-            func.date(TestResult.executed_at).desc()
+            bucket.desc()
         ).all()
         
         # 날짜별로 데이터 구성
@@ -68,8 +93,8 @@ def get_test_trends():
                     'failed': 0,
                     'total': 0
                 }
-            trends_by_date[date_str][row.result.lower() if row.result else 'unknown'] = row.count
-            trends_by_date[date_str]['total'] += row.count
+            trends_by_date[date_str][row.result.lower() if row.result else 'unknown'] = int(row.count)
+            trends_by_date[date_str]['total'] += int(row.count)
         
         # 리스트로 변환 및 정렬
         trends = sorted(trends_by_date.values(), key=lambda x: x['date'])
@@ -98,6 +123,7 @@ def get_test_trends():
                 'overall_pass_rate': round((total_passed / total_tests * 100) if total_tests > 0 else 0, 2),
                 'overall_failure_rate': round((total_failed / total_tests * 100) if total_tests > 0 else 0, 2)
             },
+            'granularity': granularity,
             'filters': {
                 'environment': environment,
                 'test_case_id': test_case_id
@@ -115,7 +141,7 @@ def get_test_trends():
 @analytics_bp.route('/analytics/flaky-tests', methods=['GET', 'OPTIONS'])
 @guest_allowed
 def get_flaky_tests():
-    """불안정한(Flaky) 테스트 감지"""
+    """불안정한(Flaky) 테스트 감지 (beat가 주기적으로 계산해 둔 점수만 조회)"""
     if request.method == 'OPTIONS':
         from app import handle_options_request
         return handle_options_request()
@@ -123,82 +149,57 @@ def get_flaky_tests():
     try:
         # 파라미터
         min_executions = request.args.get('min_executions', 5, type=int)  # 최소 실행 횟수
-        days = request.args.get('days', 30, type=int)  # 분석 기간
-        flakiness_threshold = request.args.get('flakiness_threshold', 0.1, type=float)  # 불안정성 임계값 (10%)
+        days = request.args.get('days', DEFAULT_FLAKY_WINDOW, type=int)  # 분석 기간 (FLAKY_SCORE_WINDOWS 중 하나)
+        flakiness_threshold = request.args.get('flakiness_threshold', 0.1, type=float)  # 전환율(flip rate) 임계값 (10%)
+        
+        if days not in FLAKY_SCORE_WINDOWS:
+            response = jsonify({
+                'error': f"days는 {', '.join(map(str, FLAKY_SCORE_WINDOWS))} 중 하나여야 합니다",
+                'available_days': list(FLAKY_SCORE_WINDOWS)
+            })
+            return add_cors_headers(response), 400
         
         start_date = get_kst_now() - timedelta(days=days)
         
-        # 각 테스트 케이스별 실행 결과 통계
-        test_stats = db.session.query(
-            TestResult.test_case_id,
-            TestCase.name.label('test_case_name'),
-            func.count(TestResult.id).label('total_executions'),
-            func.sum(case([(TestResult.result == 'Pass', 1)], else_=0)).label('passed'),
-            func.sum(case([(TestResult.result == 'Fail', 1)], else_=0)).label('failed'),
-            func.min(TestResult.executed_at).label('first_execution'),
-            func.max(TestResult.executed_at).label('last_execution')
+        # 조회는 (기간, 점수) 인덱스로 한 번에 수행 (점수가 아직 계산되지 않았으면 빈 목록, computed_at=None)
+        computed_at = flaky_test_service.last_computed(days)
+        scores = db.session.query(
+            FlakyTestScore,
+            TestCase.name.label('test_case_name')
         ).join(
-            TestCase, TestResult.test_case_id == TestCase.id
+            TestCase, FlakyTestScore.test_case_id == TestCase.id
         ).filter(
-            TestResult.executed_at >= start_date
-        ).group_by(
-            TestResult.test_case_id,
-            TestCase.name
-        ).having(
-            func.count(TestResult.id) >= min_executions
+            FlakyTestScore.window_days == days,
+            FlakyTestScore.flakiness_score >= flakiness_threshold,
+            FlakyTestScore.total_executions >= min_executions,
+            FlakyTestScore.passed > 0,
+            FlakyTestScore.failed > 0
+        ).order_by(
+            FlakyTestScore.flakiness_score.desc()
         ).all()
         
         flaky_tests = []
-        for stat in test_stats:
-            total = stat.total_executions
-            passed = stat.passed or 0
-            failed = stat.failed or 0
-            
-            # 불안정성 점수 계산: Pass와 Fail이 모두 있는 경우
-            if passed > 0 and failed > 0:
-                # 불안정성 = min(pass_rate, failure_rate) - 둘 다 있으면 불안정
-                pass_rate = passed / total
-                failure_rate = failed / total
-                flakiness_score = min(pass_rate, failure_rate)
-                
-                # 불안정성 점수가 임계값을 넘으면 Flaky로 판단
-                if flakiness_score >= flakiness_threshold:
-                    # 최근 실행 결과 패턴 분석
-                    recent_results = db.session.query(
-                        TestResult.result,
-                        TestResult.executed_at
-                    ).filter(
-                        TestResult.test_case_id == stat.test_case_id,
-                        TestResult.executed_at >= start_date
-                    ).order_by(
-                        TestResult.executed_at.desc()
-                    ).limit(10).all()
-                    
-                    # 결과 패턴 분석 (Pass/Fail이 번갈아 나타나는지)
-                    pattern_changes = 0
-                    prev_result = None
-                    for res in reversed(recent_results):
-                        if prev_result and res.result != prev_result:
-                            pattern_changes += 1
-                        prev_result = res.result
-                    
-                    flaky_tests.append({
-                        'test_case_id': stat.test_case_id,
-                        'test_case_name': stat.test_case_name,
-                        'total_executions': total,
-                        'passed': passed,
-                        'failed': failed,
-                        'pass_rate': round(pass_rate * 100, 2),
-                        'failure_rate': round(failure_rate * 100, 2),
-                        'flakiness_score': round(flakiness_score * 100, 2),
-                        'pattern_changes': pattern_changes,
-                        'first_execution': stat.first_execution.isoformat() if stat.first_execution else None,
-                        'last_execution': stat.last_execution.isoformat() if stat.last_execution else None,
-                        'recent_results': [r.result for r in recent_results]
-                    })
-        
-        # 불안정성 점수로 정렬
-        flaky_tests.sort(key=lambda x: x['flakiness_score'], reverse=True)
+        for score, test_case_name in scores:
+            total = score.total_executions
+            recent_results = json.loads(score.recent_results) if score.recent_results else []
+            flaky_tests.append({
+                'test_case_id': score.test_case_id,
+                'test_case_name': test_case_name,
+                'total_executions': total,
+                'passed': score.passed,
+                'failed': score.failed,
+                'pass_rate': round(score.passed / total * 100, 2),
+                'failure_rate': round(score.failed / total * 100, 2),
+                'flakiness_score': round(score.flakiness_score * 100, 2),
+                'transitions': score.transitions,
+                'flip_rate': round(score.flip_rate * 100, 2),
+                'entropy': round(score.entropy, 4),
+                'failure_probability': round(score.failure_probability * 100, 2),
+                'pattern_changes': count_pattern_changes(recent_results),
+                'first_execution': score.first_execution.isoformat() if score.first_execution else None,
+                'last_execution': score.last_execution.isoformat() if score.last_execution else None,
+                'recent_results': recent_results
+            })
         
         response_data = {
             'period': {
@@ -211,7 +212,8 @@ def get_flaky_tests():
                 'flakiness_threshold': flakiness_threshold
             },
             'flaky_tests': flaky_tests,
-            'total_flaky_tests': len(flaky_tests)
+            'total_flaky_tests': len(flaky_tests),
+            'computed_at': computed_at.isoformat() if computed_at else None
         }
         
         response = jsonify(response_data)
@@ -222,6 +224,33 @@ def get_flaky_tests():
         response = jsonify({'error': str(e)})
         return add_cors_headers(response), 500
 
+@analytics_bp.route('/analytics/flaky-tests/refresh', methods=['POST', 'OPTIONS'])
+@admin_required
+def refresh_flaky_tests():
+    """Flaky 테스트 점수 즉시 재계산 요청 (Celery 태스크로 비동기 실행, 관리자 전용)"""
+    if request.method == 'OPTIONS':
+        from app import handle_options_request
+        return handle_options_request()
+    
+    try:
+        data = request.get_json(silent=True) or {}
+        days = data.get('days')
+        if days is not None and days not in FLAKY_SCORE_WINDOWS:
+            response = jsonify({
+                'error': f"days는 {', '.join(map(str, FLAKY_SCORE_WINDOWS))} 중 하나여야 합니다",
+                'available_days': list(FLAKY_SCORE_WINDOWS)
+            })
+            return add_cors_headers(response), 400
+        
+        from tasks import refresh_flaky_test_scores
+        task = refresh_flaky_test_scores.delay(days)
+        response = jsonify({'message': 'Flaky 테스트 점수 재계산을 요청했습니다', 'task_id': task.id, 'days': days})
+        return add_cors_headers(response), 202
+    except Exception as e:
+        logger.error(f"Flaky 테스트 점수 재계산 요청 오류: {str(e)}")
+        response = jsonify({'error': str(e)})
+        return add_cors_headers(response), 500
+
 @analytics_bp.route('/analytics/regression-detection', methods=['GET', 'OPTIONS'])
 @guest_allowed
 def detect_regressions():
@@ -344,40 +373,43 @@ def analyze_execution_time():
         
         start_date = get_kst_now() - timedelta(days=days)
         
+        # 롤업의 합계/제곱합으로 평균과 표준편차 계산
+        duration_count = func.sum(TestResultDailyRollup.duration_count)
         query = db.session.query(
-            TestResult.test_case_id,
+            TestResultDailyRollup.test_case_id,
             TestCase.name.label('test_case_name'),
-            func.avg(TestResult.execution_time).label('avg_time'),
-            func.min(TestResult.execution_time).label('min_time'),
-            func.max(TestResult.execution_time).label('max_time'),
-            func.stddev(TestResult.execution_time).label('stddev_time'),
-            func.count(TestResult.id).label('execution_count')
+            duration_count.label('execution_count'),
+            func.sum(TestResultDailyRollup.duration_sum).label('duration_sum'),
+            func.sum(TestResultDailyRollup.duration_sq_sum).label('duration_sq_sum'),
+            func.min(TestResultDailyRollup.duration_min).label('min_time'),
+            func.max(TestResultDailyRollup.duration_max).label('max_time')
         ).join(
-            TestCase, TestResult.test_case_id == TestCase.id
+            TestCase, TestResultDailyRollup.test_case_id == TestCase.id
         ).filter(
-            TestResult.executed_at >= start_date,
-            TestResult.execution_time.isnot(None)
+            TestResultDailyRollup.bucket_date >= start_date.date(),
+            TestResultDailyRollup.duration_count > 0
         )
         
         if test_case_id:
-            query = query.filter(TestResult.test_case_id == test_case_id)
+            query = query.filter(TestResultDailyRollup.test_case_id == test_case_id)
         if environment:
-            query = query.filter(TestResult.environment == environment)
+            query = query.filter(TestResultDailyRollup.environment == environment)
         
         results = query.group_by(
-            TestResult.test_case_id,
+            TestResultDailyRollup.test_case_id,
             TestCase.name
         ).having(
-            func.count(TestResult.id) >= 3  # 최소 3회 실행
+            duration_count >= 3  # 최소 3회 실행
         ).all()
         
         analysis = []
         for result in results:
-            avg_time = float(result.avg_time) if result.avg_time else 0
+            execution_count = int(result.execution_count)
+            avg_time = float(result.duration_sum or 0) / execution_count
             min_time = float(result.min_time) if result.min_time else 0
             max_time = float(result.max_time) if result.max_time else 0
-            stddev_time = float(result.stddev_time) if result.stddev_time else 0
-            execution_count = result.execution_count
+            variance = float(result.duration_sq_sum or 0) / execution_count - avg_time * avg_time
+            stddev_time = math.sqrt(variance) if variance > 0 else 0
             
             # 변동성 계산 (표준편차 / 평균)
             variability = (stddev_time / avg_time * 100) if avg_time > 0 else 0
@@ -441,7 +473,15 @@ def analyze_test_coverage():
         environment = request.args.get('environment')
         folder_id = request.args.get('folder_id', type=int)
         
-        # 기본 쿼리
+        # 테스트 케이스별 전체 실행 수/최근 실행 시각 (일 단위 롤업)
+        executions = db.session.query(
+            TestResultDailyRollup.test_case_id.label('test_case_id'),
+            func.sum(TestResultDailyRollup.count).label('execution_count'),
+            func.max(TestResultDailyRollup.last_executed_at).label('last_execution')
+        ).group_by(
+            TestResultDailyRollup.test_case_id
+        ).subquery()
+        
         query = db.session.query(
             TestCase.id,
             TestCase.name,
@@ -449,10 +489,10 @@ def analyze_test_coverage():
             TestCase.folder_id,
             TestCase.main_category,
             TestCase.result_status,
-            func.count(TestResult.id).label('execution_count'),
-            func.max(TestResult.executed_at).label('last_execution')
+            func.coalesce(executions.c.execution_count, 0).label('execution_count'),
+            executions.c.last_execution
         ).outerjoin(
-            TestResult, TestCase.id == TestResult.test_case_id
+            executions, TestCase.id == executions.c.test_case_id
         )
         
         # 필터 적용
@@ -461,14 +501,7 @@ def analyze_test_coverage():
         if folder_id:
             query = query.filter(TestCase.folder_id == folder_id)
         
-        results = query.group_by(
-            TestCase.id,
-            TestCase.name,
-            TestCase.environment,
-            TestCase.folder_id,
-            TestCase.main_category,
-            TestCase.result_status
-        ).all()
+        results = query.all()
         
         # 커버리지 분석
         total_tests = len(results)
@@ -496,13 +529,15 @@ def analyze_test_coverage():
             stats['coverage_rate'] = round((stats['executed'] / stats['total'] * 100) if stats['total'] > 0 else 0, 2)
         
         # 오래 실행되지 않은 테스트 (30일 이상)
-        thirty_days_ago = get_kst_now() - timedelta(days=30)
+        # 실행 시각은 naive KST로 저장되므로 비교 기준도 naive로 맞춤
+        now = get_kst_now().replace(tzinfo=None)
+        thirty_days_ago = now - timedelta(days=30)
         stale_tests = [
             {
                 'test_case_id': r.id,
                 'test_case_name': r.name,
                 'last_execution': r.last_execution.isoformat() if r.last_execution else None,
-                'days_since_execution': (get_kst_now() - r.last_execution).days if r.last_execution else None
+                'days_since_execution': (now - r.last_execution).days if r.last_execution else None
             }
             for r in results
             if r.last_execution is None or r.last_execution < thirty_days_ago
@@ -546,58 +581,71 @@ def analyze_failure_patterns():
         
         start_date = get_kst_now() - timedelta(days=days)
         
-        # 실패한 테스트 결과
+        # 환경/카테고리별 실패 수 (일 단위 롤업)
         failures = db.session.query(
-            TestResult.test_case_id,
-            TestCase.name,
             TestCase.environment,
             TestCase.main_category,
-            TestResult.error_message,
-            TestResult.executed_at
+            func.sum(TestResultDailyRollup.count).label('count')
         ).join(
-            TestCase, TestResult.test_case_id == TestCase.id
+            TestCase, TestResultDailyRollup.test_case_id == TestCase.id
         ).filter(
-            TestResult.executed_at >= start_date,
-            TestResult.result == 'Fail'
+            TestResultDailyRollup.bucket_date >= start_date.date(),
+            TestResultDailyRollup.result == 'Fail'
         )
-        
         if environment:
             failures = failures.filter(TestCase.environment == environment)
-        
-        failures = failures.all()
+        failures = failures.group_by(TestCase.environment, TestCase.main_category).all()
         
         # 환경별 실패 통계
         env_failures = {}
         # 카테고리별 실패 통계
         category_failures = {}
-        # 시간대별 실패 통계
-        hourly_failures = {}
-        # 에러 메시지 패턴 분석
-        error_patterns = {}
-        
+        total_failures = 0
         for failure in failures:
-            # 환경별
+            count = int(failure.count or 0)
+            total_failures += count
             env = failure.environment or 'Unknown'
-            env_failures[env] = env_failures.get(env, 0) + 1
-            
-            # 카테고리별
+            env_failures[env] = env_failures.get(env, 0) + count
             category = failure.main_category or 'Uncategorized'
-            category_failures[category] = category_failures.get(category, 0) + 1
-            
-            # 시간대별
-            if failure.executed_at:
-                hour = failure.executed_at.hour
-                hourly_failures[hour] = hourly_failures.get(hour, 0) + 1
-            
-            # 에러 메시지 패턴 (간단한 키워드 추출)
-            if failure.error_message:
-                error_msg = failure.error_message.lower()
-                # 일반적인 에러 키워드
-                keywords = ['timeout', 'connection', 'not found', 'permission', 'invalid', 'error']
-                for keyword in keywords:
-                    if keyword in error_msg:
-                        error_patterns[keyword] = error_patterns.get(keyword, 0) + 1
-                        break
+            category_failures[category] = category_failures.get(category, 0) + count
+        
+        # 시간대별 실패 통계 (시간 단위 롤업을 시각별로 합산)
+        hourly_rows = db.session.query(
+            TestResultHourlyRollup.bucket_hour,
+            func.sum(TestResultHourlyRollup.count).label('count')
+        ).join(
+            TestCase, TestResultHourlyRollup.test_case_id == TestCase.id
+        ).filter(
+            TestResultHourlyRollup.bucket_hour >= start_date.replace(minute=0, second=0, microsecond=0),
+            TestResultHourlyRollup.result == 'Fail'
+        )
+        if environment:
+            hourly_rows = hourly_rows.filter(TestCase.environment == environment)
+        hourly_failures = {}
+        for row in hourly_rows.group_by(TestResultHourlyRollup.bucket_hour).all():
+            hour = row.bucket_hour.hour
+            hourly_failures[hour] = hourly_failures.get(hour, 0) + int(row.count or 0)
+        
+        # 에러 메시지 패턴 분석 (간단한 키워드 추출, 메시지가 있는 실패 결과만 조회)
+        error_messages = db.session.query(
+            TestResult.error_message
+        ).join(
+            TestCase, TestResult.test_case_id == TestCase.id
+        ).filter(
+            TestResult.executed_at >= start_date,
+            TestResult.result == 'Fail',
+            TestResult.error_message.isnot(None)
+        )
+        if environment:
+            error_messages = error_messages.filter(TestCase.environment == environment)
+        
+        error_patterns = {}
+        for (error_message,) in error_messages.yield_per(1000):
+            error_msg = error_message.lower()
+            for keyword in ERROR_KEYWORDS:
+                if keyword in error_msg:
+                    error_patterns[keyword] = error_patterns.get(keyword, 0) + 1
+                    break
         
         response_data = {
             'period': {
@@ -605,7 +653,7 @@ def analyze_failure_patterns():
                 'end_date': get_kst_now().isoformat(),
                 'days': days
             },
-            'total_failures': len(failures),
+            'total_failures': total_failures,
             'environment_failures': env_failures,
             'category_failures': category_failures,
             'hourly_failures': hourly_failures,
@@ -638,28 +686,30 @@ def get_test_health():
         
         start_date = get_kst_now() - timedelta(days=days)
         
-        # 전체 통계
-        total_stats = db.session.query(
-            func.count(TestCase.id).label('total_tests'),
-            func.count(TestResult.id).label('total_executions'),
-            func.sum(case([(TestResult.result == 'Pass', 1)], else_=0)).label('passed'),
-            func.sum(case([(TestResult.result == 'Fail', 1)], else_=0)).label('failed')
-        ).outerjoin(
-            TestResult, and_(
-                TestCase.id == TestResult.test_case_id,
-                TestResult.executed_at >= start_date
-            )
+        # 전체 테스트 케이스 수
+        test_case_query = db.session.query(func.count(TestCase.id))
+        if environment:
+            test_case_query = test_case_query.filter(TestCase.environment == environment)
+        total_tests = test_case_query.scalar() or 0
+        
+        # 테스트 케이스별 실행 통계 (일 단위 롤업 1회 조회로 전체 합계와 안정성 모두 계산)
+        per_test_query = db.session.query(
+            TestResultDailyRollup.test_case_id,
+            _rollup_count(TestResultDailyRollup).label('count'),
+            _rollup_count(TestResultDailyRollup, 'Pass').label('passed'),
+            _rollup_count(TestResultDailyRollup, 'Fail').label('failed')
+        ).filter(
+            TestResultDailyRollup.bucket_date >= start_date.date()
         )
-        
         if environment:
-            total_stats = total_stats.filter(TestCase.environment == environment)
-        
-        stats = total_stats.first()
+            per_test_query = per_test_query.join(
+                TestCase, TestResultDailyRollup.test_case_id == TestCase.id
+            ).filter(TestCase.environment == environment)
+        per_test_stats = per_test_query.group_by(TestResultDailyRollup.test_case_id).all()
         
-        total_tests = stats.total_tests or 0
-        total_executions = stats.total_executions or 0
-        passed = stats.passed or 0
-        failed = stats.failed or 0
+        total_executions = sum(int(tc.count) for tc in per_test_stats)
+        passed = sum(int(tc.passed) for tc in per_test_stats)
+        failed = sum(int(tc.failed) for tc in per_test_stats)
         
         # 건강도 점수 계산 (0-100)
         health_score = 0
@@ -678,23 +728,8 @@ def get_test_health():
         stability_score = 100  # 기본값
         if total_executions > 0:
             # Flaky 테스트 비율 계산 (간단 버전)
-            flaky_count = 0
-            test_cases_with_results = db.session.query(
-                TestResult.test_case_id,
-                func.count(TestResult.id).label('count'),
-                func.sum(case([(TestResult.result == 'Pass', 1)], else_=0)).label('passed'),
-                func.sum(case([(TestResult.result == 'Fail', 1)], else_=0)).label('failed')
-            ).filter(
-                TestResult.executed_at >= start_date
-            ).group_by(
-                TestResult.test_case_id
-            ).having(
-                func.count(TestResult.id) >= 5
-            ).all()
-            
-            for tc in test_cases_with_results:
-                if tc.passed > 0 and tc.failed > 0:
-                    flaky_count += 1
+            test_cases_with_results = [tc for tc in per_test_stats if tc.count >= 5]
+            flaky_count = sum(1 for tc in test_cases_with_results if tc.passed > 0 and tc.failed > 0)
             
             if len(test_cases_with_results) > 0:
                 flaky_rate = (flaky_count / len(test_cases_with_results)) * 100
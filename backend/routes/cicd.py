@@ -410,7 +410,8 @@ def test_integration(id):
             task = execute_test_case_batch.delay(
                 test_case_ids,
                 environment='dev',
-                max_workers=5
+                max_workers=5,
+                execution_id=execution.id
             )
             
             response = jsonify({
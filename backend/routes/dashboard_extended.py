@@ -1,9 +1,9 @@
 from flask import Blueprint, request, jsonify
-from models import db, TestCase
 from utils.cors import add_cors_headers
 from datetime import datetime
-from sqlalchemy import func, text
+from sqlalchemy import text
 from utils.timezone_utils import get_kst_now
+from services.dashboard_summary_service import dashboard_summary_service, SKIPPED_STATUSES
 
 # Blueprint 생성
 dashboard_extended_bp = Blueprint('dashboard_extended', __name__)
@@ -16,6 +16,29 @@ def get_dashboard_summaries():
         return handle_options_request()
     
     try:
+        project_id = request.args.get('project_id', type=int)
+        folder_id = request.args.get('folder_id', type=int)
+        if project_id is not None or folder_id is not None:
+            # 프로젝트/폴더 범위 요약은 상태별 카운터에서 합산
+            data = []
+            for environment, status_counts in dashboard_summary_service.get_status_counts(project_id, folder_id).items():
+                if environment is None:
+                    continue
+                total = sum(status_counts.values())
+                passed = status_counts.get('Pass', 0)
+                data.append({
+                    'id': None,
+                    'environment': environment,
+                    'total_tests': total,
+                    'passed_tests': passed,
+                    'failed_tests': status_counts.get('Fail', 0),
+                    'skipped_tests': sum(status_counts.get(status, 0) for status in SKIPPED_STATUSES),
+                    'pass_rate': round(passed / total * 100, 2) if total > 0 else 0,
+                    'last_updated': get_kst_now().isoformat()
+                })
+            response = jsonify(data)
+            return add_cors_headers(response), 200
+
         # DashboardSummary 테이블이 있으면 사용, 없으면 실시간 계산
         try:
             from models import DashboardSummary
@@ -48,26 +71,12 @@ def get_testcases_summary_all():
         return jsonify({'status': 'preflight_ok'}), 200
     
     try:
-        # 실제 DB에 저장된 값으로 환경별/테스트 결과별 카운트 계산
-        stats = (
-            db.session.query(
-                TestCase.environment,
-                TestCase.result_status,
-                func.count().label('count')
-            )
-            .group_by(TestCase.environment, TestCase.result_status)
-            .order_by(TestCase.environment, TestCase.result_status)
-            .all()
+        # 테스트 케이스 저장 시 증분 갱신되는 환경별/결과 상태별 카운터 조회 (project_id/folder_id로 범위 지정 가능)
+        env_stats = dashboard_summary_service.get_status_counts(
+            project_id=request.args.get('project_id', type=int),
+            folder_id=request.args.get('folder_id', type=int)
         )
         
-        # 환경별로 데이터 그룹화
-        env_stats = {}
-        for row in stats:
-            env = row.environment
-            if env not in env_stats:
-                env_stats[env] = {}
-            env_stats[env][row.result_status] = row.count
-        
         # 요약 데이터 생성
         summaries = []
         for environment, status_counts in env_stats.items():
@@ -179,7 +179,9 @@ def get_execution_order():
         
         test_case_ids = data['test_case_ids']
         
-        execution_order = dependency_service.get_execution_order(test_case_ids)
+        # 병렬 실행 웨이브 (같은 웨이브는 동시에 실행 가능)
+        plan = dependency_service.plan_waves(test_case_ids)
+        execution_order = [test_id for wave in plan['waves'] for test_id in wave] + plan['cyclic']
         
         # 테스트 케이스 정보 포함
         test_cases = TestCase.query.filter(TestCase.id.in_(execution_order)).all()
@@ -192,6 +194,8 @@ def get_execution_order():
         
         response = jsonify({
             'execution_order': execution_order,
+            'waves': plan['waves'],
+            'cyclic': plan['cyclic'],
             'test_cases': ordered_test_cases
         })
         return add_cors_headers(response), 200
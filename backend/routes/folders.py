@@ -1,5 +1,5 @@
 from flask import Blueprint, request, jsonify
-from models import db, Folder, TestCase, Project
+from models import db, Folder, TestCase
 from utils.cors import add_cors_headers
 from utils.auth_decorators import guest_allowed, user_required, admin_required
 from utils.response_utils import (
@@ -7,6 +7,7 @@ from utils.response_utils import (
     validation_error_response, not_found_response
 )
 from utils.logger import get_logger
+from services.folder_service import folder_service
 from datetime import datetime
 
 logger = get_logger(__name__)
@@ -180,8 +181,8 @@ def delete_folder(id):
             return add_cors_headers(response), 400
         
         # 해당 폴더에 속한 테스트 케이스가 있는지 확인
-        test_cases = TestCase.query.filter_by(folder_id=id).all()
-        if test_cases:
+        has_test_cases = db.session.query(TestCase.id).filter_by(folder_id=id).first() is not None
+        if has_test_cases:
             response = jsonify({'error': '테스트 케이스가 있어서 삭제할 수 없습니다. 먼저 테스트 케이스를 이동하거나 삭제해주세요.'})
             return add_cors_headers(response), 400
         
@@ -202,75 +203,8 @@ def delete_folder(id):
 def get_folder_tree():
     """프로젝트 → 환경 → 배포일자 → 기능 폴더 트리 구조 반환"""
     try:
-        # 기존 project_id 없는 폴더는 기본 프로젝트(2)로 매칭
-        legacy_folders = Folder.query.filter(Folder.project_id.is_(None)).all()
-        if legacy_folders:
-            for lf in legacy_folders:
-                lf.project_id = 2
-            db.session.commit()
-
-        tree = []
-
-        projects = Project.query.all()
-        for project in projects:
-            project_node = {
-                'id': project.id,
-                'name': project.name,
-                'type': 'project',
-                'children': []
-            }
-
-            environment_folders = Folder.query.filter(
-                (Folder.project_id == project.id) &
-                (Folder.parent_folder_id.is_(None)) &
-                ((Folder.folder_type == 'environment') | (Folder.folder_type.is_(None)))
-            ).all()
-
-            for env_folder in environment_folders:
-                env_node = {
-                    'id': env_folder.id,
-                    'name': env_folder.folder_name,
-                    'type': 'environment',
-                    'environment': env_folder.environment or 'dev',
-                    'project_id': env_folder.project_id,
-                    'children': []
-                }
-
-                deployment_folders = Folder.query.filter(
-                    (Folder.parent_folder_id == env_folder.id) &
-                    ((Folder.folder_type == 'deployment_date') | (Folder.folder_type.is_(None)))
-                ).all()
-
-                for dep_folder in deployment_folders:
-                    dep_node = {
-                        'id': dep_folder.id,
-                        'name': dep_folder.folder_name,
-                        'type': 'deployment_date',
-                        'deployment_date': dep_folder.deployment_date.strftime('%Y-%m-%d') if dep_folder.deployment_date else (dep_folder.folder_name or 'Unknown'),
-                        'project_id': dep_folder.project_id,
-                        'children': []
-                    }
-
-                    feature_folders = Folder.query.filter(
-                        (Folder.parent_folder_id == dep_folder.id) &
-                        ((Folder.folder_type == 'feature') | (Folder.folder_type.is_(None)))
-                    ).all()
-
-                    for feature_folder in feature_folders:
-                        feature_node = {
-                            'id': feature_folder.id,
-                            'name': feature_folder.folder_name,
-                            'type': 'feature',
-                            'project_id': feature_folder.project_id,
-                            'children': []
-                        }
-                        dep_node['children'].append(feature_node)
-
-                    env_node['children'].append(dep_node)
-
-                project_node['children'].append(env_node)
-
-            tree.append(project_node)
+        # 단일 쿼리 + 프로젝트별 캐시로 구성 (project_id 없는 기존 폴더는 기본 프로젝트(2)로 간주)
+        tree = folder_service.get_folder_tree()
 
         response = jsonify(tree)
         return add_cors_headers(response), 200
@@ -3,6 +3,7 @@ from models import db, PerformanceTest, TestResult, TestExecution
 from utils.cors import add_cors_headers
 from utils.auth_decorators import guest_allowed, user_required, admin_required
 from engines.k6_engine import k6_engine
+from services.search_service import search_service
 from utils.timezone_utils import get_kst_now
 from utils.logger import get_logger
 import json
@@ -62,13 +63,17 @@ def get_performance_tests():
         
         # 검색어 필터링
         if search:
-            query = query.filter(
-                db.or_(
-                    PerformanceTest.name.contains(search),
-                    PerformanceTest.description.contains(search),
-                    PerformanceTest.script_path.contains(search)
+            matched_ids = search_service.match_ids_query('performance_test', search)
+            if matched_ids is not None:
+                query = query.filter(PerformanceTest.id.in_(matched_ids))
+            else:
+                query = query.filter(
+                    db.or_(
+                        PerformanceTest.name.contains(search),
+                        PerformanceTest.description.contains(search),
+                        PerformanceTest.script_path.contains(search)
+                    )
                 )
-            )
         
         # 환경 필터링
         if environment_filter != 'all':
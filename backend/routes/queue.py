@@ -117,6 +117,8 @@ def get_task_status(task_id):
                 if isinstance(task.info, dict):
                     response_data['progress'] = task.info.get('current', 0)
                     response_data['total'] = task.info.get('total', 0)
+                    # 배치 실행의 경우 통과/실패 수 등 항목별 진행 정보 포함
+                    response_data['meta'] = task.info
                 else:
                     response_data['info'] = str(task.info)
         
@@ -0,0 +1,57 @@
+"""
+통합 검색 API
+테스트 케이스, 템플릿, 성능 테스트, test-scripts 파일을 관련도순으로 검색
+"""
+from flask import Blueprint, request, jsonify
+from services.search_service import search_service, DOCUMENT_SOURCES
+from utils.cors import add_cors_headers
+from utils.auth_decorators import guest_allowed
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+search_bp = Blueprint('search', __name__)
+
+SEARCH_DOC_TYPES = list(DOCUMENT_SOURCES) + ['script']
+
+
+@search_bp.route('/api/search', methods=['GET', 'OPTIONS'])
+@guest_allowed
+def search():
+    """통합 검색 (q: 검색어, types: 쉼표로 구분한 문서 유형, limit/offset: 페이징)"""
+    if request.method == 'OPTIONS':
+        from app import handle_options_request
+        return handle_options_request()
+
+    try:
+        query = request.args.get('q', '').strip()
+        if not query:
+            response = jsonify({'error': '검색어가 필요합니다.'})
+            return add_cors_headers(response), 400
+
+        doc_types = [t.strip() for t in request.args.get('types', '').split(',') if t.strip()] or None
+        invalid_types = [t for t in doc_types or [] if t not in SEARCH_DOC_TYPES]
+        if invalid_types:
+            response = jsonify({
+                'error': f"지원하지 않는 검색 유형입니다: {', '.join(invalid_types)}",
+                'supported_types': SEARCH_DOC_TYPES
+            })
+            return add_cors_headers(response), 400
+
+        limit = min(max(request.args.get('limit', 20, type=int), 1), 100)
+        offset = max(request.args.get('offset', 0, type=int), 0)
+
+        result = search_service.search(query, doc_types=doc_types, limit=limit, offset=offset)
+        response = jsonify({
+            'query': query,
+            'results': result['results'],
+            'limit': limit,
+            'offset': offset,
+            'has_more': result['has_more']
+        })
+        return add_cors_headers(response), 200
+
+    except Exception as e:
+        logger.error(f"통합 검색 오류: {str(e)}")
+        response = jsonify({'error': f'검색 중 오류가 발생했습니다: {str(e)}'})
+        return add_cors_headers(response), 500
@@ -1,11 +1,13 @@
 import os
 import sys
 import json
+import hashlib
 from flask import Blueprint, request, jsonify, current_app
 from werkzeug.utils import secure_filename
 import mimetypes
-from datetime import datetime
 import stat
+from services.search_service import search_service
+from services.script_tree_service import script_tree_service, PROJECT_ROOT
 
 # 상위 디렉토리를 sys.path에 추가
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -13,97 +15,15 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 # Blueprint 생성
 test_scripts_bp = Blueprint('test_scripts', __name__)
 
-def get_file_info(file_path):
-    """파일 정보를 가져오는 헬퍼 함수"""
-    try:
-        stat_info = os.stat(file_path)
-        file_info = {
-            'name': os.path.basename(file_path),
-            'path': file_path,
-            'type': 'file',
-            'size': stat_info.st_size,
-            'modified': datetime.fromtimestamp(stat_info.st_mtime).isoformat(),
-            'permissions': oct(stat_info.st_mode)[-3:]
-        }
-        
-        # 파일 확장자에 따른 타입 분류
-        if os.path.splitext(file_path)[1].lower() in ['.js', '.py', '.json', '.md', '.spec.js']:
-            file_info['category'] = 'script'
-        elif os.path.splitext(file_path)[1].lower() in ['.png', '.jpg', '.jpeg', '.gif']:
-            file_info['category'] = 'image'
-        elif os.path.splitext(file_path)[1].lower() in ['.DS_Store']:
-            file_info['category'] = 'system'
-        else:
-            file_info['category'] = 'other'
-            
-        return file_info
-    except Exception as e:
-        current_app.logger.error(f"파일 정보 조회 오류: {e}")
-        return None
-
-def get_directory_info(dir_path):
-    """디렉토리 정보를 가져오는 헬퍼 함수"""
-    try:
-        stat_info = os.stat(dir_path)
-        dir_info = {
-            'name': os.path.basename(dir_path),
-            'path': dir_path,
-            'type': 'directory',
-            'modified': datetime.fromtimestamp(stat_info.st_mtime).isoformat(),
-            'permissions': oct(stat_info.st_mode)[-3:],
-            'children_count': 0
-        }
-        
-        # 하위 항목 개수 계산
-        try:
-            children = os.listdir(dir_path)
-            dir_info['children_count'] = len(children)
-        except:
-            dir_info['children_count'] = 0
-            
-        return dir_info
-    except Exception as e:
-        current_app.logger.error(f"디렉토리 정보 조회 오류: {e}")
-        return None
-
-def explore_directory(path):
-    """디렉토리 내용을 탐색하는 함수"""
-    try:
-        if not os.path.exists(path):
-            return None
-            
-        if not os.path.isdir(path):
-            return None
-            
-        items = []
-        children = os.listdir(path)
-        
-        # 숨김 파일 제외하고 정렬
-        visible_children = [child for child in children if not child.startswith('.')]
-        visible_children.sort(key=lambda x: (os.path.isdir(os.path.join(path, x)), x.lower()))
-        
-        for child in visible_children:
-            child_path = os.path.join(path, child)
-            
-            if os.path.isdir(child_path):
-                dir_info = get_directory_info(child_path)
-                if dir_info:
-                    items.append(dir_info)
-            else:
-                file_info = get_file_info(child_path)
-                if file_info:
-                    items.append(file_info)
-                    
-        return {
-            'path': path,
-            'type': 'directory',
-            'children': items,
-            'total_count': len(items)
-        }
-        
-    except Exception as e:
-        current_app.logger.error(f"디렉토리 탐색 오류: {e}")
-        return None
+def _conditional_json(etag, build_payload):
+    """ETag가 If-None-Match와 같으면 본문 없이 304, 아니면 build_payload() 결과를 ETag와 함께 반환"""
+    if etag and etag in request.if_none_match:
+        response = current_app.response_class(status=304)
+    else:
+        response = jsonify(build_payload())
+    if etag:
+        response.set_etag(etag)
+    return response
 
 @test_scripts_bp.route('/explore', methods=['GET'])
 def explore_test_scripts():
@@ -130,33 +50,29 @@ def explore_test_scripts():
             return jsonify({'error': '잘못된 경로입니다.'}), 400
             
         # 디버그 로그
-        current_app.logger.info(f"요청 경로: {base_path}")
-        current_app.logger.info(f"프로젝트 루트: {project_root}")
-        current_app.logger.info(f"테스트 스크립트 루트: {test_scripts_root}")
-        current_app.logger.info(f"최종 경로: {full_path}")
+        current_app.logger.debug(f"요청 경로: {base_path}, 최종 경로: {full_path}")
         
-        # 경로 존재 여부 확인
-        if not os.path.exists(full_path):
+        # 경로 검증 (보안상 test-scripts 폴더 내에서만 탐색 허용)
+        relative_path = script_tree_service.to_relative(full_path)
+        if relative_path is None:
+            current_app.logger.error(f"허용되지 않은 경로: {full_path}")
+            return jsonify({'error': '허용되지 않은 경로입니다.'}), 403
+            
+        # 경로 존재 여부 확인 (폴더를 다시 읽지 않고 트리 인덱스에서 조회)
+        entry = script_tree_service.get(relative_path)
+        if entry is None:
             current_app.logger.error(f"경로가 존재하지 않음: {full_path}")
             return jsonify({'error': f'경로를 찾을 수 없습니다: {base_path}'}), 404
             
-        if not os.path.isdir(full_path):
+        if entry['type'] != 'directory':
             current_app.logger.error(f"경로가 디렉토리가 아님: {full_path}")
             return jsonify({'error': f'디렉토리가 아닙니다: {base_path}'}), 400
             
-        # 경로 검증 (보안상 test-scripts 폴더 내에서만 탐색 허용)
-        if not full_path.startswith(test_scripts_root):
-            current_app.logger.error(f"허용되지 않은 경로: {full_path}")
-            return jsonify({'error': '허용되지 않은 경로입니다.'}), 403
-            
-        # 디렉토리 탐색
-        result = explore_directory(full_path)
-        
-        if result is None:
-            current_app.logger.error(f"디렉토리 탐색 실패: {full_path}")
-            return jsonify({'error': '디렉토리를 탐색할 수 없습니다.'}), 500
-            
-        return jsonify(result)
+        # 하위 항목이 바뀌지 않았으면 304
+        return _conditional_json(
+            f"explore-{entry['fingerprint']}",
+            lambda: script_tree_service.list_directory(relative_path)
+        )
         
     except Exception as e:
         current_app.logger.error(f"테스트 스크립트 탐색 오류: {e}")
@@ -178,17 +94,19 @@ def get_file_content():
         full_path = os.path.join(project_root, file_path)
         
         # 경로 검증 (보안상 test-scripts 폴더 내에서만 접근 허용)
-        if not full_path.startswith(os.path.join(project_root, 'test-scripts')):
+        relative_path = script_tree_service.to_relative(full_path)
+        if relative_path is None:
             return jsonify({'error': '허용되지 않은 경로입니다.'}), 403
             
-        if not os.path.exists(full_path):
+        entry = script_tree_service.get(relative_path)
+        if entry is None:
             return jsonify({'error': '파일을 찾을 수 없습니다.'}), 404
             
-        if not os.path.isfile(full_path):
+        if entry['type'] != 'file':
             return jsonify({'error': '파일이 아닙니다.'}), 400
             
         # 파일 크기 제한 (10MB)
-        file_size = os.path.getsize(full_path)
+        file_size = entry['size']
         if file_size > 10 * 1024 * 1024:
             return jsonify({'error': '파일이 너무 큽니다. (최대 10MB)'}), 413
             
@@ -196,30 +114,29 @@ def get_file_content():
         text_extensions = ['.js', '.py', '.json', '.md', '.txt', '.spec.js', '.env']
         file_ext = os.path.splitext(full_path)[1].lower()
         
-        if file_ext in text_extensions:
-            # 텍스트 파일 읽기
-            try:
-                with open(full_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-            except UnicodeDecodeError:
-                # UTF-8로 읽을 수 없는 경우 다른 인코딩 시도
+        def build_payload():
+            if file_ext in text_extensions:
+                # 트리 인덱스에서 감지해 둔 인코딩으로 한 번에 읽기
                 try:
-                    with open(full_path, 'r', encoding='cp949') as f:
+                    with open(full_path, 'r', encoding=entry['encoding'] or 'utf-8') as f:
                         content = f.read()
-                except:
+                except UnicodeDecodeError:
+                    # 감지 범위 밖에서 디코딩할 수 없는 문자가 나온 경우
                     with open(full_path, 'r', encoding='latin-1') as f:
                         content = f.read()
-        else:
-            # 바이너리 파일인 경우
-            content = f"[바이너리 파일] - 크기: {file_size} bytes"
+            else:
+                # 바이너리 파일인 경우
+                content = f"[바이너리 파일] - 크기: {file_size} bytes"
+                
+            return {
+                'path': file_path,
+                'content': content,
+                'size': file_size,
+                'type': 'text' if file_ext in text_extensions else 'binary',
+                'extension': file_ext
+            }
             
-        return jsonify({
-            'path': file_path,
-            'content': content,
-            'size': file_size,
-            'type': 'text' if file_ext in text_extensions else 'binary',
-            'extension': file_ext
-        })
+        return _conditional_json(f"file-{entry['mtime_ns']}-{file_size}", build_payload)
         
     except Exception as e:
         current_app.logger.error(f"파일 내용 읽기 오류: {e}")
@@ -233,48 +150,50 @@ def search_test_scripts():
         if not query:
             return jsonify({'error': '검색어가 필요합니다.'}), 400
             
-        # 프로젝트 루트 기준으로 test-scripts 폴더 검색
-        project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        test_scripts_path = os.path.join(project_root, 'test-scripts')
-        
-        if not os.path.exists(test_scripts_path):
+        limit = min(request.args.get('limit', 100, type=int), 500)
+
+        if script_tree_service.get('') is None:
             return jsonify({'error': 'test-scripts 폴더를 찾을 수 없습니다.'}), 404
             
-        results = []
-        
-        def search_recursive(path):
-            try:
-                for item in os.listdir(path):
-                    item_path = os.path.join(path, item)
-                    
-                    # 숨김 파일 제외
-                    if item.startswith('.'):
-                        continue
-                        
-                    if os.path.isdir(item_path):
-                        search_recursive(item_path)
-                    else:
-                        # 파일명에 검색어가 포함된 경우
-                        if query.lower() in item.lower():
-                            file_info = get_file_info(item_path)
-                            if file_info:
-                                # 상대 경로로 변환
-                                file_info['relative_path'] = os.path.relpath(item_path, project_root)
-                                results.append(file_info)
-                                
-            except Exception as e:
-                current_app.logger.error(f"검색 중 오류: {e}")
-                
-        search_recursive(test_scripts_path)
-        
-        # 결과 정렬 (파일명 기준)
-        results.sort(key=lambda x: x['name'].lower())
-        
-        return jsonify({
-            'query': query,
-            'results': results,
-            'total_count': len(results)
-        })
+        def build_payload():
+            # 파일 경로와 내용 색인에서 관련도순으로 검색 (변경된 파일은 검색 시 재색인)
+            found = search_service.search(query, doc_types=['script'], limit=limit)
+            results, seen = [], set()
+            for document in found['results']:
+                relative_path = script_tree_service.to_relative(os.path.join(PROJECT_ROOT, document['key']))
+                file_info = script_tree_service.describe(relative_path) if relative_path else None
+                if file_info:
+                    file_info['relative_path'] = document['key']
+                    file_info['score'] = document['score']
+                    file_info['summary'] = document['summary']
+                    results.append(file_info)
+                    seen.add(relative_path)
+            
+            # 내용 색인 대상이 아닌 파일(이미지 등)은 파일명에 검색어가 포함된 경우 이름순으로 추가
+            has_more = found['has_more']
+            name_matches = sorted(
+                (entry['name'].lower(), relative_path)
+                for relative_path, entry in script_tree_service.iter_files()
+                if relative_path not in seen and query.lower() in entry['name'].lower()
+            )
+            for _, relative_path in name_matches:
+                if len(results) >= limit:
+                    has_more = True
+                    break
+                file_info = script_tree_service.describe(relative_path)
+                file_info['relative_path'] = os.path.relpath(file_info['path'], PROJECT_ROOT)
+                results.append(file_info)
+            
+            return {
+                'query': query,
+                'results': results,
+                'total_count': len(results),
+                'has_more': has_more
+            }
+            
+        # 트리가 바뀌지 않았으면 같은 검색어의 결과도 같으므로 304
+        etag = hashlib.sha1(f"{script_tree_service.fingerprint()}:{limit}:{query}".encode('utf-8')).hexdigest()[:20]
+        return _conditional_json(f"search-{etag}", build_payload)
         
     except Exception as e:
         current_app.logger.error(f"테스트 스크립트 검색 오류: {e}")
@@ -284,88 +203,12 @@ def search_test_scripts():
 def get_test_scripts_stats():
     """테스트 스크립트 폴더 통계 정보를 가져오는 API"""
     try:
-        # 프로젝트 루트 기준으로 test-scripts 폴더 통계
-        project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        test_scripts_path = os.path.join(project_root, 'test-scripts')
-        
-        if not os.path.exists(test_scripts_path):
+        # 트리 인덱스에서 집계 (폴더를 다시 순회하지 않음)
+        fingerprint = script_tree_service.fingerprint()
+        if fingerprint is None:
             return jsonify({'error': 'test-scripts 폴더를 찾을 수 없습니다.'}), 404
             
-        stats = {
-            'total_files': 0,
-            'total_directories': 0,
-            'total_size': 0,
-            'file_types': {},
-            'directory_structure': {}
-        }
-        
-        def collect_stats_recursive(path, level=0):
-            try:
-                for item in os.listdir(path):
-                    item_path = os.path.join(path, item)
-                    
-                    # 숨김 파일 제외
-                    if item.startswith('.'):
-                        continue
-                        
-                    if os.path.isdir(item_path):
-                        stats['total_directories'] += 1
-                        
-                        # 디렉토리 구조 기록
-                        if level < 3:  # 최대 3단계까지만 기록
-                            dir_name = os.path.basename(item_path)
-                            if dir_name not in stats['directory_structure']:
-                                stats['directory_structure'][dir_name] = {
-                                    'type': 'directory',
-                                    'children_count': 0,
-                                    'subdirectories': []
-                                }
-                            
-                            # 하위 항목 개수 계산
-                            try:
-                                children = [child for child in os.listdir(item_path) if not child.startswith('.')]
-                                stats['directory_structure'][dir_name]['children_count'] = len(children)
-                                
-                                # 하위 디렉토리만 기록
-                                subdirs = [child for child in children if os.path.isdir(os.path.join(item_path, child))]
-                                stats['directory_structure'][dir_name]['subdirectories'] = subdirs[:5]  # 최대 5개만
-                            except:
-                                pass
-                                
-                        collect_stats_recursive(item_path, level + 1)
-                    else:
-                        stats['total_files'] += 1
-                        
-                        # 파일 크기 추가
-                        try:
-                            file_size = os.path.getsize(item_path)
-                            stats['total_size'] += file_size
-                        except:
-                            pass
-                            
-                        # 파일 타입별 카운트
-                        file_ext = os.path.splitext(item)[1].lower()
-                        if file_ext:
-                            if file_ext not in stats['file_types']:
-                                stats['file_types'][file_ext] = 0
-                            stats['file_types'][file_ext] += 1
-                        else:
-                            if 'no_extension' not in stats['file_types']:
-                                stats['file_types']['no_extension'] = 0
-                            stats['file_types']['no_extension'] += 1
-                                
-            except Exception as e:
-                current_app.logger.error(f"통계 수집 중 오류: {e}")
-                
-        collect_stats_recursive(test_scripts_path)
-        
-        # 파일 타입별 통계 정렬
-        stats['file_types'] = dict(sorted(stats['file_types'].items(), key=lambda x: x[1], reverse=True))
-        
-        # 디렉토리 구조 정렬
-        stats['directory_structure'] = dict(sorted(stats['directory_structure'].items(), key=lambda x: x[0].lower()))
-        
-        return jsonify(stats)
+        return _conditional_json(f"stats-{fingerprint}", script_tree_service.stats)
         
     except Exception as e:
         current_app.logger.error(f"테스트 스크립트 통계 오류: {e}")
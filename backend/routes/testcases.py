@@ -1,15 +1,16 @@
-from flask import Blueprint, request, jsonify, send_file
-from models import db, TestCase, TestResult, Screenshot, Project, Folder, User, TestCaseTemplate, TestPlan, TestPlanTestCase, SystemConfig
+from flask import Blueprint, request, jsonify, send_file, Response, stream_with_context
+from models import db, TestCase, TestResult, Screenshot, Project, Folder, User, TestCaseTemplate, TestPlan, TestPlanTestCase, SystemConfig, TestCaseHistory
 from utils.cors import add_cors_headers
 from utils.auth_decorators import admin_required, user_required, guest_allowed
 from utils.serializers import serialize_testcase, serialize_project, serialize_folder
 from services.testcase_service import TestCaseService
 from services.report_service import ReportService
-from utils.history_tracker import get_test_case_history, track_test_case_creation, track_test_case_change, track_test_case_deletion
+from services.search_service import search_service
+from services.dashboard_summary_service import dashboard_summary_service
+from utils.streaming_runner import run_streaming, resolve_log_path
+from utils.history_tracker import get_test_case_history, serialize_history
 from datetime import datetime, timedelta
 from utils.timezone_utils import get_kst_now, get_kst_isoformat, format_kst_datetime
-import pandas as pd
-from io import BytesIO
 import os
 import subprocess
 import time
@@ -22,6 +23,9 @@ logger = get_logger(__name__)
 # Blueprint 생성
 testcases_bp = Blueprint('testcases', __name__)
 
+# 다운로드 시 서버 측 커서에서 한 번에 가져올 행 수
+EXPORT_BATCH_SIZE = 1000
+
 # OPTIONS 핸들러는 app.py의 공통 함수 사용
 
 # 기존 TCM API 엔드포인트들
@@ -97,20 +101,38 @@ def get_testcases():
     try:
         page = request.args.get('page', None, type=int)
         per_page = request.args.get('per_page', None, type=int)
+        # 키셋 커서 페이징: ?after=<next_cursor>&limit=N (page/per_page 미지정 시 기본 모드)
+        after = request.args.get('after') or None
+        limit = request.args.get('limit', None, type=int)
+        # 컬럼 프로젝션: ?fields=id,name,result_status
+        fields = request.args.get('fields') or None
+        # 전체 건수 계산 방식: exact | estimated | none
+        count_mode = request.args.get('count') or None
+        if count_mode and count_mode not in ('exact', 'estimated', 'none'):
+            response = jsonify({'error': 'count는 exact, estimated, none 중 하나여야 합니다'})
+            return add_cors_headers(response), 400
         
-        data, pagination = TestCaseService.get_testcases(page, per_page, include_relations=True)
+        data, pagination = TestCaseService.get_testcases(
+            page, per_page,
+            include_relations=True,
+            after=after,
+            limit=limit,
+            fields=fields,
+            count_mode=count_mode
+        )
         
-        if pagination:
-            response_data = {
-                'items': data,
-                'pagination': pagination
-            }
-        else:
-            response_data = data
+        response_data = {
+            'items': data,
+            'pagination': pagination
+        }
         
         response = jsonify(response_data)
         return add_cors_headers(response), 200
         
+    except ValueError as e:
+        # 잘못된 커서(InvalidCursorError 포함) 또는 지원하지 않는 필드
+        response = jsonify({'error': str(e)})
+        return add_cors_headers(response), 400
     except Exception as e:
         logger.error(f"테스트 케이스 조회 오류: {str(e)}")
         response = jsonify({'error': str(e)})
@@ -280,16 +302,8 @@ def get_test_case_history_api(id):
     try:
         history = get_test_case_history(id)
         
-        data = [{
-            'id': h.id,
-            'field_name': h.field_name,
-            'old_value': h.old_value,
-            'new_value': h.new_value,
-            'change_type': h.change_type,
-            'changed_by': h.changed_by,
-            'changed_at': h.changed_at.isoformat() if h.changed_at else None,
-            'user_name': h.user.username if h.user else 'Unknown'
-        } for h in history]
+        # json 저장 방식의 행도 필드 단위로 펼쳐서 반환
+        data = serialize_history(history)
         
         response = jsonify(data)
         return add_cors_headers(response), 200
@@ -392,13 +406,6 @@ def create_testcase():
         # 캐시 무효화
         from services.cache_service import cache_service
         cache_service.invalidate_entity('testcase', tc.id)
-        cache_service.delete_pattern('testcases:list:*')
-        
-        # 히스토리 추적
-        try:
-            track_test_case_creation(tc.id, data, request.user.id)
-        except Exception as e:
-            logger.warning(f"히스토리 추적 실패: {str(e)}")
         
         response = jsonify({'message': '테스트 케이스 생성 완료', 'id': tc.id})
         return add_cors_headers(response), 201
@@ -408,68 +415,6 @@ def create_testcase():
         response = jsonify({'error': f'데이터베이스 오류: {str(e)}'})
         return add_cors_headers(response), 500
 
-def update_dashboard_summary_for_environment(environment):
-    """특정 환경의 대시보드 요약 데이터 업데이트"""
-    try:
-        from sqlalchemy import text
-        from datetime import datetime
-        
-        # 해당 환경의 테스트 케이스 통계 조회
-        query = text("""
-            SELECT 
-                result_status,
-                COUNT(*) as count
-            FROM TestCases
-            WHERE environment = :env
-            GROUP BY result_status
-        """)
-        
-        result = db.session.execute(query, {'env': environment})
-        stats = result.fetchall()
-        
-        # 통계 계산
-        status_counts = {row.result_status: row.count for row in stats}
-        total_tests = sum(status_counts.values())
-        passed_tests = status_counts.get('Pass', 0)
-        failed_tests = status_counts.get('Fail', 0)
-        skipped_tests = status_counts.get('N/T', 0) + status_counts.get('N/A', 0)
-        
-        # 통과율 계산
-        pass_rate = (passed_tests / total_tests * 100) if total_tests > 0 else 0
-        
-        # DashboardSummary 모델 import
-        from models import DashboardSummary
-        
-        # 기존 요약 데이터 확인 및 업데이트
-        existing_summary = DashboardSummary.query.filter_by(environment=environment).first()
-        
-        if existing_summary:
-            existing_summary.total_tests = total_tests
-            existing_summary.passed_tests = passed_tests
-            existing_summary.failed_tests = failed_tests
-            existing_summary.skipped_tests = skipped_tests
-            existing_summary.pass_rate = round(pass_rate, 2)
-            existing_summary.last_updated = get_kst_now()
-        else:
-            # 새 요약 데이터 생성
-            new_summary = DashboardSummary(
-                environment=environment,
-                total_tests=total_tests,
-                passed_tests=passed_tests,
-                failed_tests=failed_tests,
-                skipped_tests=skipped_tests,
-                pass_rate=round(pass_rate, 2),
-                last_updated=get_kst_now()
-            )
-            db.session.add(new_summary)
-        
-        print(f"🔄 대시보드 요약 데이터 업데이트 완료: {environment}")
-        return True
-        
-    except Exception as e:
-        print(f"❌ 대시보드 요약 데이터 업데이트 실패: {str(e)}")
-        return False
-
 @testcases_bp.route('/testcases/<int:id>/status', methods=['PUT'])
 @user_required
 def update_testcase_status(id):
@@ -521,12 +466,6 @@ def update_testcase_status(id):
         except Exception as notify_error:
             logger.warning(f"알림 생성 실패: {str(notify_error)}")
         
-        # 대시보드 요약 데이터 자동 업데이트
-        if update_dashboard_summary_for_environment(tc.environment):
-            print(f"✅ 대시보드 요약 데이터 업데이트 성공: {tc.environment}")
-        else:
-            print(f"⚠️ 대시보드 요약 데이터 업데이트 실패: {tc.environment}")
-        
         response = jsonify({
             'message': '테스트 케이스 상태 업데이트 완료',
             'old_status': old_status,
@@ -611,12 +550,6 @@ def update_testcase(id):
         
         db.session.commit()
         
-        # 대시보드 요약 데이터 자동 업데이트
-        if update_dashboard_summary_for_environment(tc.environment):
-            print(f"✅ 대시보드 요약 데이터 업데이트 성공: {tc.environment}")
-        else:
-            print(f"⚠️ 대시보드 요약 데이터 업데이트 실패: {tc.environment}")
-        
         response = jsonify({'message': '테스트 케이스 업데이트 완료'})
         return add_cors_headers(response), 200
         
@@ -652,16 +585,13 @@ def delete_testcase(id):
         for ptc in test_plan_testcases:
             db.session.delete(ptc)
         
-        # 3. 마지막으로 테스트 케이스 삭제
+        # 3. 변경 히스토리 삭제 (test_case_id가 NOT NULL이므로 케이스보다 먼저)
+        TestCaseHistory.query.filter_by(test_case_id=id).delete(synchronize_session=False)
+        
+        # 4. 마지막으로 테스트 케이스 삭제
         db.session.delete(tc)
         db.session.commit()
         
-        # 대시보드 요약 데이터 자동 업데이트
-        if update_dashboard_summary_for_environment(environment):
-            print(f"✅ 대시보드 요약 데이터 업데이트 성공: {environment}")
-        else:
-            print(f"⚠️ 대시보드 요약 데이터 업데이트 실패: {environment}")
-        
         response = jsonify({'message': '테스트 케이스 삭제 완료'})
         return add_cors_headers(response), 200
         
@@ -671,6 +601,43 @@ def delete_testcase(id):
         response = jsonify({'error': f'삭제 중 오류가 발생했습니다: {str(e)}'})
         return add_cors_headers(response), 500
 
+@testcases_bp.route('/testcases/bulk-update', methods=['POST'])
+@user_required
+def bulk_update_testcases():
+    """
+    다중 테스트 케이스 상태/필드 일괄 변경
+
+    요청 형식 (둘 중 하나):
+    - {"testcase_ids": [1, 2, ...], "updates": {"result_status": "Pass"}}  모두 같은 값으로 변경
+    - {"items": [{"id": 1, "result_status": "Pass"}, {"id": 2, "result_status": "Fail"}]}  케이스별 값
+    """
+    try:
+        data = request.get_json() or {}
+        if 'items' in data:
+            items = data.get('items')
+        else:
+            testcase_ids = data.get('testcase_ids')
+            updates = data.get('updates')
+            if not isinstance(testcase_ids, list) or not isinstance(updates, dict) or 'id' in updates:
+                response = jsonify({'error': 'items 또는 testcase_ids와 updates가 필요합니다'})
+                return add_cors_headers(response), 400
+            items = [{'id': testcase_id, **updates} for testcase_id in testcase_ids]
+
+        result = TestCaseService.bulk_update(items, changed_by=request.user.id)
+        response = jsonify({
+            'message': f"{result['updated_count']}개의 테스트 케이스가 변경되었습니다",
+            **result
+        })
+        return add_cors_headers(response), 200
+
+    except ValueError as e:
+        response = jsonify({'error': str(e)})
+        return add_cors_headers(response), 400
+    except Exception as e:
+        logger.error(f"다중 테스트 케이스 변경 실패: {str(e)}")
+        response = jsonify({'error': f'일괄 변경 중 오류가 발생했습니다: {str(e)}'})
+        return add_cors_headers(response), 500
+
 @testcases_bp.route('/testcases/bulk-delete', methods=['POST'])
 @admin_required
 def bulk_delete_testcases():
@@ -694,9 +661,6 @@ def bulk_delete_testcases():
         valid_ids = {tc.id for tc in testcases_to_delete}
         invalid_ids = set(testcase_ids) - valid_ids
         
-        # 환경 정보 수집 (대시보드 업데이트용)
-        environments_to_update = {tc.environment for tc in testcases_to_delete}
-        
         if invalid_ids:
             failed_deletions = [{
                 'id': testcase_id,
@@ -721,7 +685,11 @@ def bulk_delete_testcases():
             # 3. 테스트 계획에서의 연결 삭제
             TestPlanTestCase.query.filter(TestPlanTestCase.test_case_id.in_(testcase_ids_list)).delete(synchronize_session=False)
             
-            # 4. 테스트 케이스 삭제
+            # 4. 변경 히스토리 삭제
+            TestCaseHistory.query.filter(TestCaseHistory.test_case_id.in_(testcase_ids_list)).delete(synchronize_session=False)
+            
+            # 5. 테스트 케이스 삭제 (Query.delete는 세션 이벤트를 거치지 않으므로 대시보드 카운터에 직접 반영)
+            dashboard_summary_service.record_deleted(testcases_to_delete)
             deleted_count = TestCase.query.filter(TestCase.id.in_(testcase_ids_list)).delete(synchronize_session=False)
         else:
             deleted_count = 0
@@ -729,13 +697,6 @@ def bulk_delete_testcases():
         # 모든 삭제 작업을 한 번에 커밋
         db.session.commit()
         
-        # 대시보드 요약 데이터 자동 업데이트 (환경별로)
-        for environment in environments_to_update:
-            if update_dashboard_summary_for_environment(environment):
-                print(f"✅ 대시보드 요약 데이터 업데이트 성공: {environment}")
-            else:
-                print(f"⚠️ 대시보드 요약 데이터 업데이트 실패: {environment}")
-        
         response_data = {
             'message': f'{deleted_count}개의 테스트 케이스가 성공적으로 삭제되었습니다',
             'deleted_count': deleted_count,
@@ -772,7 +733,8 @@ def get_test_results(test_case_id):
                 'screenshot': getattr(result, 'screenshot', None),  # 실제 DB에 없을 수 있음
                 'environment': result.environment,
                 'execution_duration': getattr(result, 'execution_duration', None),  # 실제 DB에 없을 수 있음
-                'error_message': getattr(result, 'error_message', None)  # 실제 DB에 없을 수 있음
+                'error_message': getattr(result, 'error_message', None),  # 실제 DB에 없을 수 있음
+                'has_log': bool(getattr(result, 'log_path', None))  # 전체 출력은 /testresults/<id>/log
             }
             result_list.append(result_data)
         
@@ -782,6 +744,29 @@ def get_test_results(test_case_id):
         response = jsonify({'error': str(e)})
         return add_cors_headers(response), 500
 
+@testcases_bp.route('/testresults/<int:result_id>/log', methods=['GET'])
+@guest_allowed
+def get_test_result_log(result_id):
+    """테스트 결과의 전체 실행 출력 (gzip 로그를 풀면서 스트리밍, ?download=1이면 .gz 파일 그대로)"""
+    result = TestResult.query.get_or_404(result_id)
+    log_path = resolve_log_path(result.log_path)
+    if not log_path:
+        response = jsonify({'error': '저장된 실행 로그가 없습니다'})
+        return add_cors_headers(response), 404
+
+    if request.args.get('download'):
+        return add_cors_headers(send_file(
+            log_path, mimetype='application/gzip', as_attachment=True, download_name=os.path.basename(log_path)
+        ))
+
+    def generate():
+        import gzip
+        with gzip.open(log_path, 'rt', encoding='utf-8', errors='replace') as log_file:
+            for chunk in iter(lambda: log_file.read(64 * 1024), ''):
+                yield chunk
+
+    return add_cors_headers(Response(stream_with_context(generate()), mimetype='text/plain; charset=utf-8'))
+
 @testcases_bp.route('/testcases/<int:id>/screenshots', methods=['GET'])
 def get_testcase_screenshots(id):
     """테스트 케이스의 스크린샷 목록 조회 (최적화: N+1 쿼리 문제 해결)"""
@@ -841,90 +826,118 @@ def create_test_result():
 @testcases_bp.route('/testcases/upload', methods=['POST'])
 @user_required
 def upload_testcases_excel():
-    """엑셀 파일에서 테스트 케이스 업로드"""
+    """
+    엑셀 파일에서 테스트 케이스 업로드
+
+    행을 스트리밍으로 읽어 청크 단위로 검증/일괄 저장하며, 잘못된 행은 건너뛰고 행별 오류로 보고한다.
+    파일이 크거나 ?async=true 인 경우 Celery 작업으로 처리하고 task_id를 반환한다 (202).
+    """
     try:
-        print("=== 파일 업로드 디버깅 ===")
-        print(f"Content-Type: {request.headers.get('Content-Type')}")
-        print(f"Files: {list(request.files.keys())}")
-        print(f"Form data: {list(request.form.keys())}")
-        
+        from services.testcase_import_service import testcase_import_service, ASYNC_IMPORT_THRESHOLD_BYTES
+
         if 'file' not in request.files:
-            print("❌ 'file' 키가 request.files에 없음")
-            print(f"사용 가능한 키들: {list(request.files.keys())}")
+            logger.warning(f"업로드 파일 누락: 사용 가능한 키 {list(request.files.keys())}")
             response = jsonify({'error': '파일이 없습니다'})
             return add_cors_headers(response), 400
         
         file = request.files['file']
-        print(f"파일명: {file.filename}")
-        print(f"파일 크기: {len(file.read()) if file else 'N/A'}")
-        file.seek(0)  # 파일 포인터를 다시 처음으로
         
         if file.filename == '':
-            print("❌ 파일명이 비어있음")
             response = jsonify({'error': '파일이 선택되지 않았습니다'})
             return add_cors_headers(response), 400
         
         if not file.filename.endswith('.xlsx'):
-            print(f"❌ 지원하지 않는 파일 형식: {file.filename}")
             response = jsonify({'error': '엑셀 파일(.xlsx)만 업로드 가능합니다'})
             return add_cors_headers(response), 400
         
-        print("✅ 파일 검증 통과")
-        
-        # 엑셀 파일 읽기
-        df = pd.read_excel(file)
-        print(f"✅ 엑셀 파일 읽기 성공, 행 수: {len(df)}")
-        print(f"📊 컬럼명: {list(df.columns)}")
-        print(f"📋 첫 번째 행 데이터: {df.iloc[0].to_dict()}")
-        
-        created_count = 0
-        for index, row in df.iterrows():
-            print(f"🔍 처리 중인 행 {index + 1}: {row.to_dict()}")
-            
-            test_case = TestCase(
-                project_id=row.get('project_id', 1),
-                main_category=row.get('main_category', ''),
-                sub_category=row.get('sub_category', ''),
-                detail_category=row.get('detail_category', ''),
-                pre_condition=row.get('pre_condition', ''),
-                expected_result=row.get('expected_result', ''),
-                result_status=row.get('result_status', 'N/T'),
-                remark=row.get('remark', ''),
-                environment=row.get('environment', 'dev'),
-                automation_code_path=row.get('automation_code_path', ''),
-                automation_code_type=row.get('automation_code_type', '')
-            )
-            
-            print(f"📝 생성된 테스트 케이스: main_category='{test_case.main_category}', expected_result='{test_case.expected_result}'")
-            
-            db.session.add(test_case)
-            created_count += 1
-        
-        try:
-            db.session.commit()
-            print(f"✅ {created_count}개의 테스트 케이스 생성 완료")
-        except Exception as commit_error:
-            print(f"❌ 데이터베이스 커밋 오류: {str(commit_error)}")
-            db.session.rollback()
-            raise commit_error
+        creator_id = request.user.id
+        file_size = testcase_import_service.get_upload_size(file)
+        run_async = request.args.get('async', '').lower() in ('1', 'true') or file_size >= ASYNC_IMPORT_THRESHOLD_BYTES
+        logger.info(f"테스트 케이스 엑셀 업로드: {file.filename} ({file_size} bytes, async={run_async})")
+
+        if run_async:
+            file_path = testcase_import_service.save_upload(file)
+            try:
+                from tasks import import_testcases_excel
+                task = import_testcases_excel.delay(file_path, creator_id)
+                response = jsonify({
+                    'message': '테스트 케이스 가져오기 작업이 큐에 추가되었습니다',
+                    'task_id': task.id,
+                    'status': 'queued',
+                    'status_url': f'/testcases/upload/{task.id}/status'
+                })
+                return add_cors_headers(response), 202
+            except Exception as queue_error:
+                # 브로커를 사용할 수 없으면 요청 스레드에서 처리
+                logger.warning(f"가져오기 작업 큐 추가 실패, 동기 처리로 대체: {str(queue_error)}")
+                try:
+                    result = testcase_import_service.import_file(file_path, creator_id=creator_id)
+                finally:
+                    os.unlink(file_path)
+        else:
+            result = testcase_import_service.import_file(file.stream, creator_id=creator_id)
         
         response = jsonify({
-            'message': f'{created_count}개의 테스트 케이스가 업로드되었습니다',
-            'created_count': created_count
+            'message': f"{result['created_count']}개의 테스트 케이스가 업로드되었습니다",
+            **result
         })
         return add_cors_headers(response), 201
         
     except Exception as e:
-        print(f"❌ 파일 업로드 오류: {str(e)}")
+        db.session.rollback()
+        logger.error(f"파일 업로드 오류: {str(e)}")
+        response = jsonify({'error': str(e)})
+        return add_cors_headers(response), 500
+
+# 엑셀 업로드 진행 상황 API
+@testcases_bp.route('/testcases/upload/<task_id>/status', methods=['GET'])
+@user_required
+def get_upload_testcases_status(task_id):
+    """비동기 엑셀 업로드 작업의 진행 상황/결과 조회"""
+    try:
+        from celery_app import celery_app
+        task = celery_app.AsyncResult(task_id)
+        
+        response_data = {
+            'task_id': task_id,
+            'status': task.status,
+            'ready': task.ready()
+        }
+        if task.ready():
+            if task.successful():
+                response_data['result'] = task.result
+            else:
+                response_data['error'] = str(task.info) if task.info else 'Unknown error'
+        elif isinstance(task.info, dict):
+            # processed / created_count / failed_count
+            response_data['progress'] = task.info
+        
+        response = jsonify(response_data)
+        return add_cors_headers(response), 200
+        
+    except Exception as e:
+        logger.error(f"업로드 상태 조회 오류: {str(e)}")
         response = jsonify({'error': str(e)})
         return add_cors_headers(response), 500
 
 # 엑셀 다운로드 API
 @testcases_bp.route('/testcases/download', methods=['GET'])
 def download_testcases_excel():
-    """테스트 케이스를 엑셀 파일로 다운로드 (필터 적용 가능)"""
+    """
+    테스트 케이스를 엑셀(기본) 또는 CSV(?format=csv) 파일로 다운로드 (필터 적용 가능)
+
+    서버 측 커서(yield_per)로 읽은 행을 바로 파일 청크로 변환해 스트리밍하므로
+    건수와 관계없이 메모리 사용량이 일정하고 첫 바이트가 즉시 전송된다.
+    """
     try:
         from sqlalchemy import or_
+        from services.folder_service import folder_service
+        from utils.export_stream import iter_csv, iter_xlsx
+        
+        export_format = request.args.get('format', 'xlsx').lower()
+        if export_format not in ('xlsx', 'csv'):
+            response = jsonify({'error': 'format은 xlsx 또는 csv만 지원합니다'})
+            return add_cors_headers(response), 400
         
         # 필터 파라미터 받기
         search = request.args.get('search', '').strip()
@@ -940,16 +953,20 @@ def download_testcases_excel():
         
         # 검색어 필터
         if search:
-            search_lower = search.lower()
-            query = query.filter(
-                or_(
-                    TestCase.main_category.ilike(f'%{search}%'),
-                    TestCase.sub_category.ilike(f'%{search}%'),
-                    TestCase.detail_category.ilike(f'%{search}%'),
-                    TestCase.expected_result.ilike(f'%{search}%'),
-                    TestCase.remark.ilike(f'%{search}%')
+            matched_ids = search_service.match_ids_query('testcase', search)
+            if matched_ids is not None:
+                query = query.filter(TestCase.id.in_(matched_ids))
+            else:
+                # 색인할 수 있는 글자가 없는 검색어(특수문자 등)이거나 색인 백필 전이면 부분 문자열로 검색
+                query = query.filter(
+                    or_(
+                        TestCase.main_category.ilike(f'%{search}%'),
+                        TestCase.sub_category.ilike(f'%{search}%'),
+                        TestCase.detail_category.ilike(f'%{search}%'),
+                        TestCase.expected_result.ilike(f'%{search}%'),
+                        TestCase.remark.ilike(f'%{search}%')
+                    )
                 )
-            )
         
         # 상태 필터
         if status and status != 'all':
@@ -969,35 +986,11 @@ def download_testcases_excel():
             if len(category_parts) >= 3:
                 query = query.filter(TestCase.detail_category == category_parts[2])
         
-        # 폴더 필터
+        # 폴더 필터 (폴더와 모든 하위 폴더, 재귀 CTE 한 번으로 조회)
         if folder_id:
-            folder = Folder.query.get(folder_id)
-            if folder:
-                # 폴더 타입에 따라 필터링
-                if folder.folder_type == 'environment':
-                    # 환경 폴더인 경우, 해당 환경의 모든 하위 폴더 포함
-                    from sqlalchemy.orm import aliased
-                    env_folders = Folder.query.filter(
-                        Folder.parent_folder_id == folder_id
-                    ).all()
-                    folder_ids = [folder_id] + [f.id for f in env_folders]
-                    # 하위 폴더의 하위 폴더도 포함
-                    for env_folder in env_folders:
-                        sub_folders = Folder.query.filter(
-                            Folder.parent_folder_id == env_folder.id
-                        ).all()
-                        folder_ids.extend([f.id for f in sub_folders])
-                    query = query.filter(TestCase.folder_id.in_(folder_ids))
-                elif folder.folder_type == 'deployment_date':
-                    # 배포일자 폴더인 경우, 해당 배포일자의 모든 하위 폴더 포함
-                    dep_folders = Folder.query.filter(
-                        Folder.parent_folder_id == folder_id
-                    ).all()
-                    folder_ids = [folder_id] + [f.id for f in dep_folders]
-                    query = query.filter(TestCase.folder_id.in_(folder_ids))
-                else:
-                    # 기능명 폴더인 경우, 해당 폴더만
-                    query = query.filter(TestCase.folder_id == folder_id)
+            folder_ids = folder_service.get_subtree_ids(folder_id)
+            if folder_ids:
+                query = query.filter(TestCase.folder_id.in_(folder_ids))
         
         # 작성자 필터 (User 테이블과 조인 필요)
         if creator and creator != 'all':
@@ -1023,63 +1016,39 @@ def download_testcases_excel():
                     AssigneeUser.username == assignee
                 )
         
-        # 필터링된 테스트 케이스 조회
-        test_cases = query.all()
-        
-        logger.info(f"다운로드 필터 적용: 검색={search}, 상태={status}, 환경={environment}, 카테고리={category}, 폴더={folder_id}, 결과={len(test_cases)}개")
-        
-        # DataFrame 생성
-        data = []
-        for tc in test_cases:
-            data.append({
-                'id': tc.id,
-                'project_id': tc.project_id,
-                'main_category': tc.main_category,
-                'sub_category': tc.sub_category,
-                'detail_category': tc.detail_category,
-                'pre_condition': tc.pre_condition,
-                'expected_result': tc.expected_result,
-                'result_status': tc.result_status,
-                'remark': tc.remark,
-                'test_steps': getattr(tc, 'test_steps', None),
-                'environment': tc.environment,
-                'automation_code_path': tc.automation_code_path,
-                'automation_code_type': tc.automation_code_type,
-                'created_at': tc.created_at.isoformat() if tc.created_at else None
-            })
-        
-        df = pd.DataFrame(data)
-        
-        # 엑셀 파일 생성
-        output = BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df.to_excel(writer, index=False, sheet_name='TestCases')
+        logger.info(f"다운로드 필터 적용: 검색={search}, 상태={status}, 환경={environment}, 카테고리={category}, 폴더={folder_id}, 형식={export_format}")
         
-        output.seek(0)
+        columns = [
+            TestCase.id, TestCase.project_id, TestCase.main_category, TestCase.sub_category,
+            TestCase.detail_category, TestCase.pre_condition, TestCase.expected_result,
+            TestCase.result_status, TestCase.remark, TestCase.test_steps, TestCase.environment,
+            TestCase.automation_code_path, TestCase.automation_code_type, TestCase.created_at
+        ]
+        header = [column.key for column in columns]
+        rows = query.with_entities(*columns).order_by(TestCase.id).yield_per(EXPORT_BATCH_SIZE)
         
         # 파일명 생성
         try:
-            filename = f'testcases_{format_kst_datetime(get_kst_now(), "%Y%m%d_%H%M%S")}.xlsx'
+            filename = f'testcases_{format_kst_datetime(get_kst_now(), "%Y%m%d_%H%M%S")}.{export_format}'
         except Exception as e:
             logger.warning(f"파일명 생성 오류: {str(e)}, 기본 파일명 사용")
-            filename = f'testcases_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
-        
-        # Flask 2.3.3에서는 download_name 사용
-        file_response = send_file(
-            output,
-            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-            as_attachment=True,
-            download_name=filename
-        )
+            filename = f'testcases_{datetime.now().strftime("%Y%m%d_%H%M%S")}.{export_format}'
+        
+        if export_format == 'csv':
+            body = iter_csv(header, rows)
+            mimetype = 'text/csv; charset=utf-8'
+        else:
+            body = iter_xlsx(header, rows, sheet_name='TestCases')
+            mimetype = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+        
+        file_response = Response(stream_with_context(body), mimetype=mimetype)
+        file_response.headers['Content-Disposition'] = f'attachment; filename={filename}'
         
         # CORS 헤더 추가
         return add_cors_headers(file_response), 200
         
     except Exception as e:
         logger.error(f"다운로드 에러: {str(e)}", exc_info=True)
-        import traceback
-        error_trace = traceback.format_exc()
-        logger.error(f"에러 상세: {error_trace}")
         response = jsonify({'error': f'파일 다운로드 중 오류가 발생했습니다: {str(e)}'})
         return add_cors_headers(response), 500
 
@@ -1134,6 +1103,12 @@ def execute_automation_code(id):
         # 자동화 코드 실행
         script_path = test_case.automation_code_path
         script_type = test_case.automation_code_type or 'playwright'
+
+        # 실행 중 출력은 test_execution_<id> 룸으로 묶어서 실시간 전송, 전체 출력은 gzip 로그 파일로 저장
+        from socketio_handlers import emit_test_execution_output
+
+        def stream_output(lines, dropped):
+            emit_test_execution_output(id, lines, dropped)
         
         # 디버깅을 위한 로그 추가
         print(f"🔍 테스트 케이스 ID: {id}")
@@ -1151,7 +1126,7 @@ def execute_automation_code(id):
         if script_type == 'k6':
             # k6 성능 테스트 실행
             from engines.k6_engine import k6_engine
-            result = k6_engine.execute_test(script_path, {})
+            result = k6_engine.execute_test(script_path, {}, on_output=stream_output, log_prefix=f'testcase_{id}')
             execution_duration = time.time() - start_time
             
             # 실행 결과 저장
@@ -1160,7 +1135,8 @@ def execute_automation_code(id):
                 result=result['status'],
                 environment=test_case.environment,
                 execution_duration=execution_duration,
-                error_message=result.get('error')
+                error_message=result.get('error'),
+                log_path=result.get('log_path')
             )
             db.session.add(test_result)
             db.session.commit()
@@ -1216,13 +1192,13 @@ def execute_automation_code(id):
                 env['K6_BROWSER_ENABLED'] = 'true'
                 env['K6_BROWSER_HEADLESS'] = 'true'
                 
-                result = subprocess.run(
+                result = run_streaming(
                     ['k6', 'run', absolute_script_path],
-                    capture_output=True,
-                    text=True,
                     timeout=300,  # 5분 타임아웃
                     cwd=project_root,  # 프로젝트 루트에서 실행
-                    env=env
+                    env=env,
+                    on_output=stream_output,
+                    log_prefix=f'testcase_{id}'
                 )
             elif script_type == 'playwright':
                 # Playwright 실행
@@ -1249,12 +1225,12 @@ def execute_automation_code(id):
                     response = jsonify({'error': f'Playwright 스크립트 파일을 찾을 수 없습니다: {absolute_script_path}'})
                     return add_cors_headers(response), 400
                 
-                result = subprocess.run(
+                result = run_streaming(
                     ['npx', 'playwright', 'test', absolute_script_path, '--reporter=json'],
-                    capture_output=True,
-                    text=True,
                     timeout=300,  # 5분 타임아웃
-                    cwd=os.path.dirname(absolute_script_path) if os.path.dirname(absolute_script_path) else None
+                    cwd=os.path.dirname(absolute_script_path) if os.path.dirname(absolute_script_path) else None,
+                    on_output=stream_output,
+                    log_prefix=f'testcase_{id}'
                 )
             else:
                 # Selenium 실행
@@ -1281,12 +1257,12 @@ def execute_automation_code(id):
                     response = jsonify({'error': f'Selenium 스크립트 파일을 찾을 수 없습니다: {absolute_script_path}'})
                     return add_cors_headers(response), 400
                 
-                result = subprocess.run(
+                result = run_streaming(
                     ['python', absolute_script_path],
-                    capture_output=True,
-                    text=True,
                     timeout=300,  # 5분 타임아웃
-                    cwd=os.path.dirname(absolute_script_path) if os.path.dirname(absolute_script_path) else None
+                    cwd=os.path.dirname(absolute_script_path) if os.path.dirname(absolute_script_path) else None,
+                    on_output=stream_output,
+                    log_prefix=f'testcase_{id}'
                 )
             
             execution_duration = time.time() - start_time
@@ -1326,16 +1302,19 @@ def execute_automation_code(id):
                 environment=test_case.environment,
                 execution_duration=execution_duration,
                 error_message=result.stderr if result.returncode != 0 else None,
-                screenshot=screenshot_path
+                log_path=result.log_path
             )
             db.session.add(test_result)
             db.session.commit()
             
+            # output/error는 마지막 EXECUTION_OUTPUT_TAIL_BYTES만 (전체 출력은 /testresults/<id>/log)
             response = jsonify({
                 'message': '자동화 코드 실행 완료',
                 'result': 'Pass' if result.returncode == 0 else 'Fail',
                 'output': result.stdout,
                 'error': result.stderr,
+                'output_truncated': result.truncated,
+                'test_result_id': test_result.id,
                 'execution_duration': execution_duration,
                 'screenshot_path': screenshot_path
             })
@@ -1367,14 +1346,18 @@ def get_templates():
         
         # 검색어 필터링
         if search:
-            query = query.filter(
-                db.or_(
-                    TestCaseTemplate.name.contains(search),
-                    TestCaseTemplate.description.contains(search),
-                    TestCaseTemplate.main_category.contains(search),
-                    TestCaseTemplate.sub_category.contains(search)
+            matched_ids = search_service.match_ids_query('template', search)
+            if matched_ids is not None:
+                query = query.filter(TestCaseTemplate.id.in_(matched_ids))
+            else:
+                query = query.filter(
+                    db.or_(
+                        TestCaseTemplate.name.contains(search),
+                        TestCaseTemplate.description.contains(search),
+                        TestCaseTemplate.main_category.contains(search),
+                        TestCaseTemplate.sub_category.contains(search)
+                    )
                 )
-            )
         
         # 카테고리 필터링
         if category:
@@ -1578,14 +1561,9 @@ def link_automation_script(id):
         test_case.automation_code_path = script_path
         test_case.automation_code_type = data.get('script_type', 'playwright')
         
+        # 변경 히스토리는 flush 시 utils/history_tracker가 같은 트랜잭션에 기록
         db.session.commit()
         
-        # 히스토리 추적
-        try:
-            track_test_case_change(id, 'automation_code_path', None, script_path, request.user.id)
-        except Exception as e:
-            logger.warning(f"자동화 연결 히스토리 추적 실패: {str(e)}")
-        
         response = jsonify({
             'message': '자동화 스크립트가 성공적으로 연결되었습니다.',
             'script_path': script_path
@@ -113,11 +113,6 @@ def upload_testcases():
     if request.method == 'OPTIONS':
         return jsonify({'status': 'preflight_ok'}), 200
     
-    # pandas 사용 불가능 시 오류 반환
-    if not PANDAS_AVAILABLE:
-        response = jsonify({'error': 'Excel 파일 처리를 위해 pandas 모듈이 필요합니다. 현재 환경에서는 지원되지 않습니다.'})
-        return add_cors_headers(response), 501
-    
     try:
         if 'file' not in request.files:
             response = jsonify({'error': '파일이 없습니다'})
@@ -129,29 +124,13 @@ def upload_testcases():
             return add_cors_headers(response), 400
         
         if file and file.filename.endswith('.xlsx'):
-            # Excel 파일 처리 로직
-            df = pd.read_excel(file)
-            
-            # 데이터 검증 및 저장
-            success_count = 0
-            for _, row in df.iterrows():
-                try:
-                    testcase = TestCase(
-                        name=row.get('name', ''),
-                        description=row.get('description', ''),
-                        project_id=row.get('project_id'),
-                        folder_id=row.get('folder_id')
-                    )
-                    db.session.add(testcase)
-                    success_count += 1
-                except Exception as e:
-                    logger.error(f"행 처리 오류: {e}")
-                    continue
-            
-            db.session.commit()
+            # 스트리밍 파싱 + 청크 단위 일괄 저장 (잘못된 행은 행별 오류로 보고)
+            from services.testcase_import_service import testcase_import_service
+            result = testcase_import_service.import_file(file.stream)
             
             response = jsonify({
-                'message': f'{success_count}개의 테스트 케이스가 성공적으로 업로드되었습니다'
+                'message': f"{result['created_count']}개의 테스트 케이스가 성공적으로 업로드되었습니다",
+                **result
             })
             return add_cors_headers(response), 200
         else:
@@ -159,6 +138,8 @@ def upload_testcases():
             return add_cors_headers(response), 400
             
     except Exception as e:
+        db.session.rollback()
+        logger.error(f"Excel 업로드 오류: {str(e)}")
         response = jsonify({'error': str(e)})
         return add_cors_headers(response), 500
 
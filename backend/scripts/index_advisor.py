@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+인덱스 어드바이저 실행 스크립트
+utils/index_advisor.py에 등록된 주요 조회의 실행 계획을 확인해 전체 테이블 스캔이 있으면 알린다.
+전체 스캔이 하나라도 있으면 종료 코드 1을 반환하므로 배포 전 CI 단계에서 사용할 수 있다.
+
+사용 예:
+    python scripts/index_advisor.py
+    python scripts/index_advisor.py --verbose
+    python scripts/index_advisor.py --query recent_failures --query testcases_by_folder
+"""
+import argparse
+import os
+import sys
+
+# backend 디렉토리를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app
+from models import db
+from utils.index_advisor import HOT_QUERIES, run_index_advisor
+
+
+def main():
+    parser = argparse.ArgumentParser(description='주요 조회 실행 계획 점검 (전체 테이블 스캔 탐지)')
+    parser.add_argument('--query', action='append', choices=sorted(HOT_QUERIES), help='점검할 조회 이름 (여러 번 지정 가능)')
+    parser.add_argument('--verbose', action='store_true', help='실행 계획 전체 출력')
+    args = parser.parse_args()
+
+    with app.app_context():
+        with db.engine.connect() as connection:
+            print(f"DB: {connection.dialect.name}")
+            try:
+                report = run_index_advisor(connection, names=args.query)
+            except ValueError as e:
+                print(f"❌ {str(e)}")
+                return 2
+
+    flagged = 0
+    for entry in report:
+        if entry['error']:
+            flagged += 1
+            print(f"❌ {entry['name']}: 실행 계획 확인 실패 - {entry['error']}")
+            continue
+        if entry['full_scans']:
+            flagged += 1
+            print(f"⚠️  {entry['name']}: 전체 테이블 스캔 {', '.join(entry['full_scans'])} ({entry['description']})")
+        else:
+            print(f"✅ {entry['name']}")
+        if args.verbose or entry['full_scans']:
+            for line in entry['plan']:
+                print(f"     {line}")
+
+    print(f"\n점검 {len(report)}개, 문제 {flagged}개")
+    return 1 if flagged else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+분석 롤업 테이블 재생성(백필) 스크립트
+TestResults 원본에서 일/시간 단위 롤업을 다시 집계한다.
+
+사용 예:
+    python scripts/rebuild_analytics_rollups.py            # 전체 재생성
+    python scripts/rebuild_analytics_rollups.py --days 7   # 최근 7일만 재생성
+"""
+import argparse
+import os
+import sys
+from datetime import timedelta
+
+# backend 디렉토리를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app
+from services.analytics_rollup_service import analytics_rollup_service, REBUILD_BATCH_SIZE
+from utils.timezone_utils import get_kst_now
+
+
+def main():
+    parser = argparse.ArgumentParser(description='분석 롤업 테이블 재생성')
+    parser.add_argument('--days', type=int, default=None, help='최근 N일만 재생성 (기본값: 전체)')
+    parser.add_argument('--batch-size', type=int, default=REBUILD_BATCH_SIZE, help='한 번에 읽을 TestResult 수')
+    args = parser.parse_args()
+
+    since = get_kst_now() - timedelta(days=args.days) if args.days else None
+    with app.app_context():
+        processed = analytics_rollup_service.rebuild(since=since, batch_size=args.batch_size)
+    print(f"✅ 분석 롤업 재생성 완료: TestResult {processed}건")
+
+
+if __name__ == '__main__':
+    main()
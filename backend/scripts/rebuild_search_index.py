@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+검색 색인 동기화(백필) 스크립트
+테스트 케이스, 템플릿, 성능 테스트, test-scripts 파일을 search_documents에 색인한다.
+기본은 변경분만 반영하고, --full이면 해당 유형의 색인을 비우고 다시 만든다 (토큰화 규칙 변경 시).
+
+사용 예:
+    python scripts/rebuild_search_index.py
+    python scripts/rebuild_search_index.py --type testcase --type script
+    python scripts/rebuild_search_index.py --full
+"""
+import argparse
+import os
+import sys
+
+# backend 디렉토리를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app
+from models import db, SearchDocument
+from services.search_service import search_service, DOCUMENT_SOURCES
+
+DOC_TYPES = list(DOCUMENT_SOURCES) + ['script']
+
+
+def main():
+    parser = argparse.ArgumentParser(description='검색 색인 동기화')
+    parser.add_argument('--type', action='append', choices=DOC_TYPES, help='색인할 문서 유형 (여러 번 지정 가능, 기본값: 전체)')
+    parser.add_argument('--full', action='store_true', help='기존 색인을 지우고 전체 재색인')
+    args = parser.parse_args()
+
+    doc_types = args.type or DOC_TYPES
+    with app.app_context():
+        print(f"검색 인덱스 방식: {search_service.ensure_index()}")
+        if args.full:
+            deleted = SearchDocument.query.filter(
+                SearchDocument.doc_type.in_(doc_types)
+            ).delete(synchronize_session=False)
+            db.session.commit()
+            print(f"기존 색인 {deleted}건 삭제")
+        result = search_service.sync(doc_types)
+
+    for doc_type, counts in result.items():
+        print(f"✅ {doc_type}: 색인 {counts['indexed']}건, 삭제 {counts['removed']}건")
+
+
+if __name__ == '__main__':
+    main()
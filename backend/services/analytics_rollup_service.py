@@ -0,0 +1,277 @@
+"""
+분석 롤업 서비스
+TestResult를 (일/시간, 테스트 케이스, 환경, 결과) 단위로 집계한 롤업 테이블을 관리
+
+- TestResult가 추가/수정/삭제되어 flush될 때 after_flush 이벤트에서 증분 upsert (flush당 테이블별 executemany 1회)
+  수정/삭제는 변경 전 값의 버킷에서 건수/합계를 차감한다. 최소/최대/첫·마지막 실행 시각은 차감할 수 없으므로
+  celery beat의 tasks.rebuild_analytics_rollups가 최근 ANALYTICS_ROLLUP_REBUILD_DAYS일을 주기적으로 다시 집계해 보정
+- rebuild()로 원본 TestResults에서 전체 또는 특정 시점 이후를 다시 집계 (scripts/rebuild_analytics_rollups.py)
+"""
+from datetime import datetime, time
+from sqlalchemy import event, case, and_
+from sqlalchemy.orm import Session
+from models import db, TestResult, TestResultDailyRollup, TestResultHourlyRollup
+from utils.logger import get_logger
+from utils.orm_history import UNKNOWN, track_previous_values, previous_value, has_changes
+from utils.upsert import merge_rows
+
+logger = get_logger(__name__)
+
+# rebuild 시 메모리에 모아 둘 최대 버킷 수 (초과 시 upsert 후 비움)
+REBUILD_FLUSH_BUCKETS = 20000
+REBUILD_BATCH_SIZE = 5000
+
+_ADDITIVE_COLUMNS = ('count', 'duration_count', 'duration_sum', 'duration_sq_sum')
+_MIN_COLUMNS = ('duration_min', 'first_executed_at')
+_MAX_COLUMNS = ('duration_max', 'last_executed_at')
+# 롤업 버킷과 값을 결정하는 TestResult 컬럼
+SOURCE_COLUMNS = ('test_case_id', 'environment', 'result', 'executed_at', 'execution_time', 'execution_duration')
+BUCKET_KEY_COLUMNS = ('test_case_id', 'environment', 'result')
+
+
+def _least(current, incoming):
+    return case(
+        (current.is_(None), incoming),
+        (incoming.is_(None), current),
+        (incoming < current, incoming),
+        else_=current
+    )
+
+
+def _greatest(current, incoming):
+    return case(
+        (current.is_(None), incoming),
+        (incoming.is_(None), current),
+        (incoming > current, incoming),
+        else_=current
+    )
+
+
+def _min(current, value):
+    return value if current is None else min(current, value)
+
+
+def _max(current, value):
+    return value if current is None else max(current, value)
+
+
+def _bucket_keys(executed_at):
+    return executed_at.date(), executed_at.replace(minute=0, second=0, microsecond=0)
+
+
+def _result_duration(execution_time, execution_duration):
+    duration = execution_time if execution_time is not None else execution_duration
+    return float(duration) if duration is not None else None
+
+
+class AnalyticsRollupService:
+    """일/시간 단위 테스트 결과 롤업 관리"""
+
+    ROLLUPS = (
+        (TestResultDailyRollup, 'bucket_date'),
+        (TestResultHourlyRollup, 'bucket_hour'),
+    )
+
+    @staticmethod
+    def _accumulate(buckets, key, executed_at, duration, sign=1):
+        """버킷 dict에 결과 한 건을 누적 (sign=-1이면 건수/합계에서만 차감)"""
+        bucket = buckets.get(key)
+        if bucket is None:
+            bucket = buckets[key] = {
+                'count': 0,
+                'duration_count': 0,
+                'duration_sum': 0.0,
+                'duration_sq_sum': 0.0,
+                'duration_min': None,
+                'duration_max': None,
+                'first_executed_at': None,
+                'last_executed_at': None,
+            }
+        bucket['count'] += sign
+        if duration is not None:
+            bucket['duration_count'] += sign
+            bucket['duration_sum'] += sign * duration
+            bucket['duration_sq_sum'] += sign * duration * duration
+        if sign < 0:
+            return
+        if duration is not None:
+            bucket['duration_min'] = _min(bucket['duration_min'], duration)
+            bucket['duration_max'] = _max(bucket['duration_max'], duration)
+        bucket['first_executed_at'] = _min(bucket['first_executed_at'], executed_at)
+        bucket['last_executed_at'] = _max(bucket['last_executed_at'], executed_at)
+
+    def _collect(self, daily, hourly, test_case_id, environment, result, executed_at, duration, sign=1):
+        if test_case_id is None or executed_at is None:
+            return
+        if executed_at.tzinfo is not None:
+            # executed_at 기본값(get_kst_now)은 KST aware, DB에서 읽은 값은 naive이므로 naive KST로 통일
+            executed_at = executed_at.replace(tzinfo=None)
+        bucket_date, bucket_hour = _bucket_keys(executed_at)
+        environment = environment or ''
+        result = result or ''
+        self._accumulate(daily, (bucket_date, test_case_id, environment, result), executed_at, duration, sign)
+        self._accumulate(hourly, (bucket_hour, test_case_id, environment, result), executed_at, duration, sign)
+
+    @staticmethod
+    def _upsert(connection, model, bucket_column, buckets):
+        """버킷 증분을 롤업 테이블에 병합 (있으면 더하고 min/max 갱신, 없으면 삽입)"""
+        rows = [
+            {bucket_column: key[0], 'test_case_id': key[1], 'environment': key[2], 'result': key[3], **values}
+            for key, values in buckets.items()
+            if any(values[name] for name in _ADDITIVE_COLUMNS)
+        ]
+        if not rows:
+            return
+        table = model.__table__
+
+        def merge(incoming):
+            merged = {name: table.c[name] + incoming[name] for name in _ADDITIVE_COLUMNS}
+            merged.update({name: _least(table.c[name], incoming[name]) for name in _MIN_COLUMNS})
+            merged.update({name: _greatest(table.c[name], incoming[name]) for name in _MAX_COLUMNS})
+            return merged
+
+        merge_rows(connection, table, (bucket_column,) + BUCKET_KEY_COLUMNS, rows, merge)
+        if any(row['count'] < 0 for row in rows):
+            # 차감으로 비게 된 버킷은 집계 결과에 0건으로 나오지 않도록 삭제
+            connection.execute(table.delete().where(and_(
+                table.c.test_case_id.in_({row['test_case_id'] for row in rows if row['count'] < 0}),
+                table.c.count <= 0
+            )))
+
+    def apply_changes(self, connection, added, removed):
+        """
+        TestResult 추가/차감을 롤업에 반영
+
+        Args:
+            added: 새 값 기준으로 더할 결과 값 dict 목록 (SOURCE_COLUMNS 키)
+            removed: 변경 전 값 기준으로 뺄 결과 값 dict 목록
+        """
+        daily, hourly = {}, {}
+        for values, sign in [(values, 1) for values in added] + [(values, -1) for values in removed]:
+            self._collect(
+                daily, hourly,
+                values['test_case_id'], values['environment'], values['result'], values['executed_at'],
+                _result_duration(values['execution_time'], values['execution_duration']),
+                sign
+            )
+        self._upsert(connection, TestResultDailyRollup, 'bucket_date', daily)
+        self._upsert(connection, TestResultHourlyRollup, 'bucket_hour', hourly)
+
+    def record_results(self, connection, results):
+        """새로 저장된 TestResult 목록을 롤업에 반영"""
+        self.apply_changes(
+            connection,
+            [{name: getattr(result, name) for name in SOURCE_COLUMNS} for result in results],
+            []
+        )
+
+    def rebuild(self, since=None, batch_size=REBUILD_BATCH_SIZE):
+        """
+        롤업 재생성 (since가 있으면 그 날짜 0시 이후만, 없으면 전체)
+
+        대상 구간 롤업을 지운 뒤 원본을 id 순 배치로 읽어 집계한다.
+        재생성 중 새로 저장되는 결과가 중복 집계되지 않도록 실행이 적은 시간대에 수행할 것.
+
+        Returns:
+            int: 다시 집계한 TestResult 수
+        """
+        since_start = datetime.combine(since.date(), time.min) if since else None
+
+        daily_delete = TestResultDailyRollup.query
+        hourly_delete = TestResultHourlyRollup.query
+        if since_start:
+            daily_delete = daily_delete.filter(TestResultDailyRollup.bucket_date >= since_start.date())
+            hourly_delete = hourly_delete.filter(TestResultHourlyRollup.bucket_hour >= since_start)
+        daily_delete.delete(synchronize_session=False)
+        hourly_delete.delete(synchronize_session=False)
+
+        connection = db.session.connection()
+        processed = 0
+        last_id = 0
+        daily, hourly = {}, {}
+        while True:
+            # 스트리밍 커서를 연 채로 upsert를 실행할 수 없는 드라이버(MySQL)가 있어 id 키셋 배치로 읽는다
+            query = db.session.query(
+                TestResult.id,
+                TestResult.test_case_id,
+                TestResult.environment,
+                TestResult.result,
+                TestResult.executed_at,
+                TestResult.execution_time,
+                TestResult.execution_duration
+            ).filter(
+                TestResult.id > last_id,
+                TestResult.test_case_id.isnot(None),
+                TestResult.executed_at.isnot(None)
+            )
+            if since_start:
+                query = query.filter(TestResult.executed_at >= since_start)
+            rows = query.order_by(TestResult.id).limit(batch_size).all()
+            if not rows:
+                break
+            for row in rows:
+                self._collect(
+                    daily, hourly,
+                    row.test_case_id, row.environment, row.result, row.executed_at,
+                    _result_duration(row.execution_time, row.execution_duration)
+                )
+            processed += len(rows)
+            last_id = rows[-1].id
+            if len(hourly) >= REBUILD_FLUSH_BUCKETS:
+                self._upsert(connection, TestResultDailyRollup, 'bucket_date', daily)
+                self._upsert(connection, TestResultHourlyRollup, 'bucket_hour', hourly)
+                daily, hourly = {}, {}
+        self._upsert(connection, TestResultDailyRollup, 'bucket_date', daily)
+        self._upsert(connection, TestResultHourlyRollup, 'bucket_hour', hourly)
+        db.session.commit()
+
+        logger.info(f"분석 롤업 재생성 완료: {processed}건 (since={since_start})")
+        return processed
+
+
+# 전역 분석 롤업 서비스 인스턴스
+analytics_rollup_service = AnalyticsRollupService()
+
+
+# 수정/삭제 시 변경 전 버킷에서 차감
+track_previous_values(TestResult, SOURCE_COLUMNS)
+
+
+def _previous_values(obj):
+    values = {name: previous_value(obj, name) for name in SOURCE_COLUMNS}
+    return None if UNKNOWN in values.values() else values
+
+
+@event.listens_for(Session, 'after_flush')
+def _rollup_test_result_changes(session, flush_context):
+    """flush된 TestResult 추가/수정/삭제를 같은 트랜잭션에서 롤업에 반영 (실패해도 결과 저장은 유지)"""
+    added, removed, stale = [], [], False
+    for obj in session.new:
+        if isinstance(obj, TestResult):
+            added.append({name: getattr(obj, name) for name in SOURCE_COLUMNS})
+    for obj in session.dirty:
+        if not isinstance(obj, TestResult) or not has_changes(obj, SOURCE_COLUMNS):
+            continue
+        old = _previous_values(obj)
+        if old is None:
+            stale = True
+            continue
+        removed.append(old)
+        added.append({name: getattr(obj, name) for name in SOURCE_COLUMNS})
+    for obj in session.deleted:
+        if isinstance(obj, TestResult):
+            old = _previous_values(obj)
+            if old is None:
+                stale = True
+                continue
+            removed.append(old)
+    if stale:
+        logger.warning("변경 전 값을 알 수 없는 TestResult가 있어 롤업 차감을 건너뜀 (rebuild로 보정)")
+    if not added and not removed:
+        return
+    connection = session.connection()
+    try:
+        with connection.begin_nested():
+            analytics_rollup_service.apply_changes(connection, added, removed)
+    except Exception as e:
+        logger.error(f"분석 롤업 갱신 실패 (rebuild로 보정 필요): {str(e)}")
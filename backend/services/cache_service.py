@@ -1,23 +1,233 @@
 """
 캐싱 서비스
 Redis 기반 캐싱, 캐시 무효화, TTL 관리
+
+무효화는 태그 단위로 처리한다. 캐시 저장 시 태그별 Redis 집합(cache_tag:<태그>)에 키를 등록해 두고,
+무효화 시에는 해당 집합의 멤버만 배치로 삭제하므로 비용이 전체 키 공간이 아닌 영향받는 키 수에 비례한다.
+
+@cached 데코레이터는 2단 캐시를 사용한다.
+- L1: 프로세스 내 LRU (항목 수/바이트/TTL 제한, 직렬화된 바이트로 보관해 호출자 간 객체 공유 방지)
+- L2: Redis (pickle protocol 5 바이너리 직렬화, 큰 값은 zlib 압축)
+태그 무효화는 Redis pub/sub으로 다른 워커의 L1에도 전파된다. L2 값에는 태그를 함께 저장해 두므로
+다른 워커가 Redis에서 읽어 L1에 채운 항목도 같은 태그로 등록되어 무효화된다.
 """
 import redis
+import hashlib
+import inspect
 import json
 import os
+import pickle
+import threading
+import time
+import uuid
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import date, datetime, time as dt_time
+from decimal import Decimal
 from functools import wraps
+from sqlalchemy import event
+from sqlalchemy.orm import Session
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+TAG_KEY_PREFIX = 'cache_tag'
+# DEL 한 번에 삭제할 키 수 / SCAN 한 번에 조회할 키 수
+DELETE_BATCH_SIZE = 500
+SCAN_COUNT = 1000
+
+
+def entity_tag(entity_type, entity_id):
+    """특정 엔티티 한 건에 의존하는 캐시 항목의 태그"""
+    return f"entity:{entity_type}:{entity_id}"
+
+
+def list_tag(entity_type):
+    """엔티티 목록/집계에 의존하는 캐시 항목의 태그 (해당 타입의 어떤 엔티티가 바뀌어도 무효화)"""
+    return f"list:{entity_type}"
+
+
+# 엔티티 변경 시 항상 무효화하는 공통 태그
+DASHBOARD_TAG = 'dashboard'
+SUMMARY_TAG = 'summary'
+
+# L1(프로세스 내) 캐시 제한: 항목 수, 총 바이트, 최대 TTL(초)
+# 무효화 메시지를 놓치더라도 L1_MAX_TTL 이상 오래된 값은 반환하지 않는다.
+L1_MAX_ENTRIES = int(os.environ.get('CACHE_L1_MAX_ENTRIES', 1024))
+L1_MAX_BYTES = int(os.environ.get('CACHE_L1_MAX_BYTES', 32 * 1024 * 1024))
+L1_MAX_TTL = int(os.environ.get('CACHE_L1_MAX_TTL', 30))
+INVALIDATION_CHANNEL = 'cache_invalidation'
+
+# 바이너리 직렬화 형식 헤더 / 압축 기준 크기
+_RAW_HEADER = b'P'
+_ZLIB_HEADER = b'Z'
+# L2 저장 형식 헤더: 태그 길이(4바이트) + 태그(JSON) + 직렬화된 값
+_TAGGED_HEADER = b'T'
+COMPRESS_MIN_BYTES = 1024
+
+# 단일 실행(single-flight) 분산 잠금 TTL과 대기 중 재조회 간격 (초)
+SINGLE_FLIGHT_LOCK_TTL = 30
+SINGLE_FLIGHT_POLL_INTERVAL = 0.05
+
+# 캐시에 None이 저장된 경우와 미스를 구분하기 위한 값
+MISS = object()
+
+
+def serialize_value(value):
+    """pickle protocol 5로 직렬화하고 COMPRESS_MIN_BYTES 이상이면 zlib 압축"""
+    data = pickle.dumps(value, protocol=5)
+    if len(data) >= COMPRESS_MIN_BYTES:
+        compressed = zlib.compress(data, 1)
+        if len(compressed) < len(data):
+            return _ZLIB_HEADER + compressed
+    return _RAW_HEADER + data
+
+
+def deserialize_value(data):
+    header, body = data[:1], data[1:]
+    if header == _ZLIB_HEADER:
+        body = zlib.decompress(body)
+    elif header != _RAW_HEADER:
+        raise ValueError('알 수 없는 캐시 직렬화 형식')
+    return pickle.loads(body)
+
+
+def _pack_tagged(data, tags):
+    """직렬화된 값 앞에 태그 목록을 붙여 L2 저장 형식으로 변환"""
+    tag_bytes = json.dumps(sorted(set(tags or ())), ensure_ascii=False).encode('utf-8')
+    return _TAGGED_HEADER + len(tag_bytes).to_bytes(4, 'big') + tag_bytes + data
+
+
+def _unpack_tagged(raw):
+    """L2 저장 형식 → (직렬화된 값, 태그 목록) (태그 없이 저장된 이전 형식도 허용)"""
+    if raw[:1] != _TAGGED_HEADER:
+        return raw, []
+    size = int.from_bytes(raw[1:5], 'big')
+    return raw[5 + size:], json.loads(raw[5:5 + size].decode('utf-8'))
+
+
+# 캐시 키 인자로 그대로 쓸 수 있는 형식
+_KEY_SCALAR_TYPES = (str, int, float, bool, type(None))
+
+
+def _normalize_key_arg(value):
+    """
+    캐시 키용 인자 정규화
+
+    그 밖의 객체(모델 인스턴스 등)는 str/repr에 메모리 주소가 들어가 프로세스·인스턴스마다 키가 달라지므로 거부한다.
+    """
+    if isinstance(value, _KEY_SCALAR_TYPES):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_normalize_key_arg(item) for item in value]
+    if isinstance(value, dict) and all(isinstance(key, _KEY_SCALAR_TYPES) for key in value):
+        return {str(key): _normalize_key_arg(item) for key, item in value.items()}
+    if isinstance(value, (datetime, date, dt_time)):
+        return value.isoformat()
+    if isinstance(value, (Decimal, uuid.UUID)):
+        return str(value)
+    raise TypeError(f"캐시 키로 쓸 수 없는 인자입니다: {type(value).__name__} (@cached에 key_func를 지정하세요)")
+
+
+def make_cache_key(key_prefix, func, args, kwargs):
+    """
+    함수와 인자로 안정적인 캐시 키 생성
+
+    인자를 정렬된 JSON으로 정규화한 뒤 해시하므로 kwargs 순서나 프로세스에 관계없이 같은 키가 나온다.
+
+    Raises:
+        TypeError: 값으로 키를 만들 수 없는 인자가 있을 때
+    """
+    payload = json.dumps(
+        [_normalize_key_arg(args), _normalize_key_arg(kwargs)], sort_keys=True, ensure_ascii=False
+    )
+    digest = hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+    return f"cached:{key_prefix or func.__module__}:{func.__qualname__}:{digest}"
+
+
+class LocalLRUCache:
+    """프로세스 내 LRU 캐시 (항목 수/총 바이트/TTL 제한, 태그 단위 무효화 지원)"""
+
+    def __init__(self, max_entries=L1_MAX_ENTRIES, max_bytes=L1_MAX_BYTES, max_ttl=L1_MAX_TTL):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_ttl = max_ttl
+        self._entries = OrderedDict()  # key -> (expires_at, data, tags)
+        self._tags = {}  # tag -> set(key)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, data, ttl, tags=None):
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            self._remove(key)
+            expires_at = time.monotonic() + min(ttl, self.max_ttl)
+            tags = frozenset(tags or ())
+            self._entries[key] = (expires_at, data, tags)
+            self._bytes += len(data)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                self._remove(next(iter(self._entries)))
+
+    def delete(self, key):
+        with self._lock:
+            self._remove(key)
+
+    def invalidate_tags(self, tags):
+        with self._lock:
+            for tag in tags:
+                for key in self._tags.pop(tag, ()):
+                    self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+            self._bytes = 0
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= len(entry[1])
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
 class CacheService:
     """캐싱 서비스"""
     
     def __init__(self):
         redis_url = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
+        self.local_cache = LocalLRUCache()
+        self.binary_client = None
+        self._flight_locks = {}
+        self._flight_guard = threading.Lock()
+        self._listener_pid = None
+        self._listener_guard = threading.Lock()
         try:
             self.redis_client = redis.from_url(redis_url, decode_responses=True)
             self.redis_client.ping()  # 연결 테스트
+            # @cached 값은 바이너리로 저장하므로 디코딩하지 않는 클라이언트를 별도로 사용
+            self.binary_client = redis.from_url(redis_url)
             self.enabled = True
             logger.info("Redis 캐시 서비스 초기화 완료")
         except Exception as e:
@@ -39,14 +249,37 @@ class CacheService:
             logger.error(f"캐시 조회 오류: {str(e)}")
             return None
     
-    def set(self, key, value, ttl=3600):
-        """캐시에 값 저장"""
+    @staticmethod
+    def _tag_key(tag):
+        return f"{TAG_KEY_PREFIX}:{tag}"
+
+    def _setex_with_tags(self, client, key, value, ttl, tags):
+        """값 저장과 태그 집합 등록을 파이프라인 한 번으로 처리"""
+        if not tags:
+            client.setex(key, ttl, value)
+            return
+        pipe = client.pipeline(transaction=False)
+        pipe.setex(key, ttl, value)
+        for tag in set(tags):
+            tag_key = self._tag_key(tag)
+            pipe.sadd(tag_key, key)
+            # 태그 집합은 등록된 항목보다 오래 살아 있어야 하므로 매번 TTL을 연장
+            pipe.expire(tag_key, ttl)
+        pipe.execute()
+
+    def set(self, key, value, ttl=3600, tags=None):
+        """
+        캐시에 값 저장
+
+        Args:
+            tags: 이 항목이 의존하는 태그 목록 (invalidate_tags로 한 번에 무효화)
+        """
         if not self.enabled:
             return False
         
         try:
             value_str = json.dumps(value, ensure_ascii=False)
-            self.redis_client.setex(key, ttl, value_str)
+            self._setex_with_tags(self.redis_client, key, value_str, ttl, tags)
             return True
         except Exception as e:
             logger.error(f"캐시 저장 오류: {str(e)}")
@@ -55,28 +288,72 @@ class CacheService:
     def delete(self, key):
         """캐시에서 값 삭제"""
         if not self.enabled:
+            self.local_cache.delete(key)
             return False
         
         try:
             self.redis_client.delete(key)
+            self.local_cache.delete(key)
             return True
         except Exception as e:
             logger.error(f"캐시 삭제 오류: {str(e)}")
             return False
     
+    def _delete_in_batches(self, keys):
+        """키 이터레이터를 DELETE_BATCH_SIZE개씩 묶어 DEL 한 번으로 삭제하고 삭제한 키 수 반환"""
+        deleted = 0
+        batch = []
+        for key in keys:
+            batch.append(key)
+            if len(batch) >= DELETE_BATCH_SIZE:
+                self.redis_client.delete(*batch)
+                deleted += len(batch)
+                batch = []
+        if batch:
+            self.redis_client.delete(*batch)
+            deleted += len(batch)
+        return deleted
+
     def delete_pattern(self, pattern):
-        """패턴에 맞는 모든 캐시 키 삭제"""
+        """
+        패턴에 맞는 모든 캐시 키 삭제 (태그가 없는 임시 패턴용)
+
+        KEYS 대신 SCAN으로 점진 조회해 Redis를 블로킹하지 않는다.
+        반복 호출되는 무효화에는 태그(invalidate_tags)를 사용할 것.
+        """
         if not self.enabled:
             return False
         
         try:
-            keys = self.redis_client.keys(pattern)
-            if keys:
-                self.redis_client.delete(*keys)
+            self._delete_in_batches(self.redis_client.scan_iter(match=pattern, count=SCAN_COUNT))
             return True
         except Exception as e:
             logger.error(f"패턴 캐시 삭제 오류: {str(e)}")
             return False
+
+    def invalidate_tags(self, *tags):
+        """
+        태그에 등록된 캐시 항목과 태그 집합 삭제 (영향받는 키 수에 비례하는 비용)
+
+        이 프로세스의 L1은 즉시 비우고, 다른 워커의 L1에는 pub/sub으로 무효화를 전파한다.
+        """
+        if not tags:
+            return False
+        self.local_cache.invalidate_tags(tags)
+        if not self.enabled:
+            return False
+
+        try:
+            tag_keys = [self._tag_key(tag) for tag in set(tags)]
+            for tag_key in tag_keys:
+                # 집합이 큰 경우에도 한 번에 읽지 않도록 SSCAN으로 나눠 삭제
+                self._delete_in_batches(self.redis_client.sscan_iter(tag_key, count=DELETE_BATCH_SIZE))
+            self.redis_client.delete(*tag_keys)
+            self.redis_client.publish(INVALIDATION_CHANNEL, json.dumps(sorted(set(tags)), ensure_ascii=False))
+            return True
+        except Exception as e:
+            logger.error(f"태그 캐시 무효화 오류: {str(e)}")
+            return False
     
     def clear(self):
         """모든 캐시 삭제"""
@@ -85,58 +362,217 @@ class CacheService:
         
         try:
             self.redis_client.flushdb()
+            self.local_cache.clear()
             return True
         except Exception as e:
             logger.error(f"캐시 전체 삭제 오류: {str(e)}")
             return False
     
+    def _ensure_invalidation_listener(self):
+        """
+        L1 무효화 구독 스레드를 프로세스당 한 번 시작
+
+        fork 이후(Celery prefork, gunicorn)에는 부모의 스레드가 없으므로 pid 기준으로 다시 시작한다.
+        """
+        if not self.enabled or self._listener_pid == os.getpid():
+            return
+        with self._listener_guard:
+            if self._listener_pid == os.getpid():
+                return
+            try:
+                pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(**{INVALIDATION_CHANNEL: self._handle_invalidation_message})
+                pubsub.run_in_thread(sleep_time=1, daemon=True)
+                self._listener_pid = os.getpid()
+            except Exception as e:
+                logger.warning(f"캐시 무효화 구독 실패: {str(e)}")
+
+    def _handle_invalidation_message(self, message):
+        try:
+            self.local_cache.invalidate_tags(json.loads(message['data']))
+        except Exception as e:
+            logger.error(f"캐시 무효화 메시지 처리 오류: {str(e)}")
+
+    def get_object(self, key, local=True):
+        """
+        L1 → Redis 순으로 바이너리 캐시 조회 (@cached 전용)
+
+        Args:
+            local: False면 L1을 거치지 않고 Redis만 사용 (무효화가 즉시 반영되어야 하는 값)
+
+        Returns:
+            캐시된 값, 없으면 MISS
+        """
+        self._ensure_invalidation_listener()
+        data = self.local_cache.get(key) if local else None
+        if data is None and self.enabled:
+            try:
+                raw = self.binary_client.get(key)
+                data, tags = _unpack_tagged(raw) if raw is not None else (None, None)
+            except Exception as e:
+                logger.error(f"캐시 조회 오류: {str(e)}")
+                data = None
+            if data is not None and local:
+                # Redis에 남은 TTL을 모르므로 L1은 L1_MAX_TTL 동안만 보관하고, 다른 워커의 태그 무효화를 받도록 태그도 등록
+                self.local_cache.set(key, data, L1_MAX_TTL, tags)
+        if data is None:
+            return MISS
+        try:
+            return deserialize_value(data)
+        except Exception as e:
+            logger.error(f"캐시 역직렬화 오류: {str(e)}")
+            self.local_cache.delete(key)
+            return MISS
+
+    def set_object(self, key, value, ttl=3600, tags=None, local=True):
+        """값을 직렬화해 L1과 Redis에 함께 저장 (@cached 전용, local=False면 Redis에만 저장)"""
+        try:
+            data = serialize_value(value)
+        except Exception as e:
+            logger.error(f"캐시 직렬화 오류: {str(e)}")
+            return False
+        if local:
+            self.local_cache.set(key, data, ttl, tags)
+        if not self.enabled:
+            return False
+        try:
+            self._setex_with_tags(self.binary_client, key, _pack_tagged(data, tags), ttl, tags)
+            return True
+        except Exception as e:
+            logger.error(f"캐시 저장 오류: {str(e)}")
+            return False
+
+    @contextmanager
+    def single_flight(self, key):
+        """
+        같은 키에 대한 동시 미스가 한 번만 계산되도록 잠금
+
+        프로세스 내에서는 키별 스레드 잠금으로, 워커 간에는 Redis SET NX 잠금으로 직렬화한다.
+        잠금을 얻지 못한 워커는 값이 채워질 때까지(최대 잠금 TTL) 기다린 뒤 직접 계산한다.
+        """
+        with self._flight_guard:
+            lock, waiters = self._flight_locks.get(key, (None, 0))
+            if lock is None:
+                lock = threading.Lock()
+            self._flight_locks[key] = (lock, waiters + 1)
+        try:
+            with lock:
+                token = None
+                if self.enabled:
+                    lock_key = f"lock:{key}"
+                    try:
+                        token = uuid.uuid4().hex
+                        deadline = time.monotonic() + SINGLE_FLIGHT_LOCK_TTL
+                        while not self.redis_client.set(lock_key, token, nx=True, ex=SINGLE_FLIGHT_LOCK_TTL):
+                            if time.monotonic() >= deadline or self.get_object(key) is not MISS:
+                                token = None
+                                break
+                            time.sleep(SINGLE_FLIGHT_POLL_INTERVAL)
+                    except Exception as e:
+                        logger.warning(f"캐시 잠금 획득 실패: {str(e)}")
+                        token = None
+                try:
+                    yield
+                finally:
+                    if token is not None:
+                        try:
+                            # 다른 워커가 만료 후 다시 잡은 잠금은 지우지 않음
+                            if self.redis_client.get(lock_key) == token:
+                                self.redis_client.delete(lock_key)
+                        except Exception:
+                            pass
+        finally:
+            with self._flight_guard:
+                lock, waiters = self._flight_locks[key]
+                if waiters <= 1:
+                    del self._flight_locks[key]
+                else:
+                    self._flight_locks[key] = (lock, waiters - 1)
+
     def invalidate_entity(self, entity_type, entity_id):
-        """특정 엔티티 관련 캐시 무효화"""
-        patterns = [
-            f"{entity_type}:{entity_id}:*",
-            f"{entity_type}_list:*",
-            f"dashboard:*",
-            f"summary:*"
-        ]
-        
-        for pattern in patterns:
-            self.delete_pattern(pattern)
+        """특정 엔티티 관련 캐시 무효화 (엔티티/목록/대시보드/요약 태그)"""
+        self.invalidate_tags(
+            entity_tag(entity_type, entity_id),
+            list_tag(entity_type),
+            DASHBOARD_TAG,
+            SUMMARY_TAG
+        )
         
         logger.info(f"엔티티 캐시 무효화: {entity_type}:{entity_id}")
 
 # 전역 캐시 서비스 인스턴스
 cache_service = CacheService()
 
-def cached(ttl=3600, key_prefix='', key_func=None):
+# 커밋 후 무효화할 태그를 모아 두는 session.info 키
+_PENDING_TAGS_KEY = 'cache_tags_after_commit'
+
+
+def invalidate_after_commit(session, *tags):
+    """
+    세션 트랜잭션이 커밋된 뒤 태그 무효화 (롤백되면 버림)
+
+    커밋 전에 무효화하면 다른 워커가 변경 전 상태를 다시 캐시할 수 있으므로, flush 이벤트 리스너에서는
+    바로 무효화하지 않고 이 함수로 예약한다.
     """
-    함수 결과 캐싱 데코레이터
+    if tags:
+        session.info.setdefault(_PENDING_TAGS_KEY, set()).update(tags)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_committed_tags(session):
+    tags = session.info.pop(_PENDING_TAGS_KEY, None)
+    if tags:
+        try:
+            cache_service.invalidate_tags(*tags)
+        except Exception as e:
+            logger.error(f"커밋 후 캐시 무효화 실패: {str(e)}")
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_pending_tags(session):
+    session.info.pop(_PENDING_TAGS_KEY, None)
+
+def cached(ttl=3600, key_prefix='', key_func=None, tags=None):
+    """
+    함수 결과 캐싱 데코레이터 (L1 프로세스 내 LRU + L2 Redis)
     
     Args:
         ttl: 캐시 TTL (초)
-        key_prefix: 캐시 키 접두사
-        key_func: 캐시 키 생성 함수
+        key_prefix: 캐시 키 접두사 (기본값: 함수의 모듈명)
+        key_func: 캐시 키 생성 함수 (미지정 시 인자를 해시한 안정적인 키 사용 - 인자는 JSON 값, 날짜, Decimal, UUID만 가능)
+        tags: 캐시 항목의 태그 목록 또는 (*args, **kwargs)를 받아 태그 목록을 반환하는 함수
     """
     def decorator(func):
+        # 메서드의 self/cls는 키에서 제외 (서비스 인스턴스가 달라도 같은 인자면 같은 키)
+        params = list(inspect.signature(func).parameters)
+        skip_first = bool(params) and params[0] in ('self', 'cls')
+
         @wraps(func)
         def wrapper(*args, **kwargs):
             # 캐시 키 생성
             if key_func:
                 cache_key = key_func(*args, **kwargs)
             else:
-                cache_key = f"{key_prefix}:{func.__name__}:{str(args)}:{str(kwargs)}"
+                cache_key = make_cache_key(key_prefix, func, args[1:] if skip_first else args, kwargs)
             
             # 캐시에서 조회
-            cached_value = cache_service.get(cache_key)
-            if cached_value is not None:
+            cached_value = cache_service.get_object(cache_key)
+            if cached_value is not MISS:
                 return cached_value
             
-            # 함수 실행
-            result = func(*args, **kwargs)
-            
-            # 캐시에 저장
-            cache_service.set(cache_key, result, ttl)
+            with cache_service.single_flight(cache_key):
+                # 잠금을 기다리는 동안 다른 요청이 채웠을 수 있으므로 다시 확인
+                cached_value = cache_service.get_object(cache_key)
+                if cached_value is not MISS:
+                    return cached_value
+
+                # 함수 실행
+                result = func(*args, **kwargs)
+                
+                # 캐시에 저장
+                entry_tags = tags(*args, **kwargs) if callable(tags) else tags
+                cache_service.set_object(cache_key, result, ttl, tags=entry_tags)
             
             return result
         return wrapper
     return decorator
-
@@ -100,7 +100,8 @@ class CICDService:
                 task = execute_test_case_batch.delay(
                     test_case_ids,
                     environment='dev',  # 기본값
-                    max_workers=5
+                    max_workers=5,
+                    execution_id=execution.id
                 )
                 
                 execution.status = 'running'
@@ -155,7 +156,8 @@ class CICDService:
                 task = execute_test_case_batch.delay(
                     test_case_ids,
                     environment='dev',
-                    max_workers=5
+                    max_workers=5,
+                    execution_id=execution.id
                 )
                 
                 execution.status = 'running'
@@ -212,7 +214,8 @@ class CICDService:
                     task = execute_test_case_batch.delay(
                         test_case_ids,
                         environment='dev',
-                        max_workers=5
+                        max_workers=5,
+                        execution_id=execution.id
                     )
                     
                     execution.status = 'running'
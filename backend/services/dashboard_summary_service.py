@@ -0,0 +1,292 @@
+"""
+대시보드 요약 서비스
+테스트 케이스 수를 (환경, 프로젝트, 폴더, 결과 상태) 단위로 세어 둔 DashboardStatusCount와
+환경별 DashboardSummary를 관리
+
+- TestCase가 추가/수정/삭제되어 flush될 때 after_flush 이벤트에서 이전 키 -1, 새 키 +1 증분을 같은 트랜잭션에 반영
+  (flush당 upsert executemany 1회 + 바뀐 환경의 DashboardSummary UPDATE)
+- 세션을 거치지 않는 일괄 저장/삭제(bulk_insert_mappings, Query.delete)는 record_inserted()/record_deleted()로 직접 반영
+- reconcile()로 원본 TestCases에서 다시 집계해 어긋난 값을 보정 (tasks.reconcile_dashboard_summary, celery beat)
+"""
+from collections import defaultdict
+from sqlalchemy import event, func, case, cast, Numeric
+from sqlalchemy.orm import Session
+from models import db, TestCase, DashboardSummary, DashboardStatusCount
+from utils.orm_history import UNKNOWN, track_previous_values, previous_value, has_changes
+from utils.timezone_utils import get_kst_now
+from utils.upsert import merge_rows
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+KEY_COLUMNS = ('environment', 'project_id', 'folder_id', 'result_status')
+# DashboardSummary.skipped_tests에 합산하는 상태
+SKIPPED_STATUSES = ('N/T', 'N/A')
+
+def _status_key(environment, project_id, folder_id, result_status):
+    """카운터 키 (없는 값은 유니크 키 판정을 위해 ''/0으로 저장)"""
+    return (environment or '', project_id or 0, folder_id or 0, result_status or '')
+
+
+class DashboardSummaryService:
+    """대시보드 상태별 카운터 관리"""
+
+    @staticmethod
+    def _collect_flush(session):
+        """flush된 TestCase 변경을 카운터 증감 dict로 변환"""
+        deltas = defaultdict(int)
+        stale = False
+        for obj in session.new:
+            if isinstance(obj, TestCase):
+                deltas[_status_key(*(getattr(obj, name) for name in KEY_COLUMNS))] += 1
+        for obj in session.deleted:
+            if isinstance(obj, TestCase):
+                old = [previous_value(obj, name) for name in KEY_COLUMNS]
+                if UNKNOWN in old:
+                    stale = True
+                    continue
+                deltas[_status_key(*old)] -= 1
+        for obj in session.dirty:
+            if not isinstance(obj, TestCase):
+                continue
+            if not has_changes(obj, KEY_COLUMNS):
+                continue
+            old = [previous_value(obj, name) for name in KEY_COLUMNS]
+            if UNKNOWN in old:
+                stale = True
+                continue
+            deltas[_status_key(*old)] -= 1
+            deltas[_status_key(*(getattr(obj, name) for name in KEY_COLUMNS))] += 1
+        if stale:
+            logger.warning("변경 전 값을 알 수 없는 테스트 케이스가 있어 대시보드 카운터를 건너뜀 (reconcile로 보정)")
+        return {key: delta for key, delta in deltas.items() if delta}
+
+    @staticmethod
+    def _upsert_counts(connection, deltas):
+        """카운터 증감 병합 (있으면 더하고 없으면 삽입)"""
+        table = DashboardStatusCount.__table__
+        merge_rows(
+            connection, table, KEY_COLUMNS,
+            [dict(zip(KEY_COLUMNS, key), count=delta) for key, delta in deltas.items()],
+            lambda incoming: {'count': table.c.count + incoming['count']}
+        )
+
+    @staticmethod
+    def _summary_deltas(deltas):
+        """카운터 증감 → 환경별 DashboardSummary 증감"""
+        summaries = {}
+        for (environment, _, _, result_status), delta in deltas.items():
+            if not environment:
+                # DashboardSummary.environment는 NOT NULL이므로 환경 없는 케이스는 카운터에만 반영
+                continue
+            summary = summaries.setdefault(environment, {'total': 0, 'passed': 0, 'failed': 0, 'skipped': 0})
+            summary['total'] += delta
+            if result_status == 'Pass':
+                summary['passed'] += delta
+            elif result_status == 'Fail':
+                summary['failed'] += delta
+            elif result_status in SKIPPED_STATUSES:
+                summary['skipped'] += delta
+        return {env: summary for env, summary in summaries.items() if any(summary.values())}
+
+    def _apply_summaries(self, connection, deltas):
+        """바뀐 환경의 DashboardSummary에 증감 반영 (행이 없으면 생성) 후 통과율 재계산"""
+        summaries = self._summary_deltas(deltas)
+        if not summaries:
+            return
+        table = DashboardSummary.__table__
+        now = get_kst_now().replace(tzinfo=None)
+        for environment, summary in summaries.items():
+            result = connection.execute(
+                table.update()
+                .where(table.c.environment == environment)
+                .values(
+                    total_tests=func.coalesce(table.c.total_tests, 0) + summary['total'],
+                    passed_tests=func.coalesce(table.c.passed_tests, 0) + summary['passed'],
+                    failed_tests=func.coalesce(table.c.failed_tests, 0) + summary['failed'],
+                    skipped_tests=func.coalesce(table.c.skipped_tests, 0) + summary['skipped'],
+                    last_updated=now
+                )
+            )
+            if result.rowcount == 0:
+                # 처음 등장한 환경은 카운터 합계로 생성 (첫 변경이 삭제/상태 변경이어도 음수가 되지 않도록)
+                connection.execute(table.insert().values(
+                    environment=environment, last_updated=now, **self._environment_totals(connection, environment)
+                ))
+        # MySQL은 같은 UPDATE의 SET을 왼쪽부터 적용하므로 통과율은 별도 문장으로 계산
+        connection.execute(
+            table.update()
+            .where(table.c.environment.in_(list(summaries)))
+            .values(pass_rate=self._pass_rate_expression(table))
+        )
+
+    @staticmethod
+    def _pass_rate_expression(table):
+        # PostgreSQL의 round(x, n)은 numeric만 받으므로 형 변환
+        return case(
+            (table.c.total_tests > 0, func.round(cast(table.c.passed_tests * 100.0 / table.c.total_tests, Numeric(10, 4)), 2)),
+            else_=0.0
+        )
+
+    @staticmethod
+    def _environment_totals(connection, environment):
+        """카운터에서 환경 합계 조회"""
+        table = DashboardStatusCount.__table__
+        rows = connection.execute(
+            db.select(table.c.result_status, func.sum(table.c.count))
+            .where(table.c.environment == environment)
+            .group_by(table.c.result_status)
+        ).all()
+        status_counts = {status: int(count or 0) for status, count in rows}
+        return {
+            'total_tests': sum(status_counts.values()),
+            'passed_tests': status_counts.get('Pass', 0),
+            'failed_tests': status_counts.get('Fail', 0),
+            'skipped_tests': sum(status_counts.get(status, 0) for status in SKIPPED_STATUSES),
+        }
+
+    def apply_deltas(self, connection, deltas):
+        """카운터 증감을 카운터와 DashboardSummary에 반영 (실패하면 savepoint만 되돌리고 원래 작업은 유지)"""
+        if not deltas:
+            return
+        try:
+            with connection.begin_nested():
+                self._upsert_counts(connection, deltas)
+                self._apply_summaries(connection, deltas)
+        except Exception as e:
+            logger.error(f"대시보드 카운터 갱신 실패 (reconcile로 보정 필요): {str(e)}")
+
+    def record_inserted(self, mappings):
+        """bulk_insert_mappings로 저장한 테스트 케이스 반영 (커밋 전에 호출해 같은 트랜잭션으로 처리)"""
+        deltas = defaultdict(int)
+        for mapping in mappings:
+            deltas[_status_key(*(mapping.get(name) for name in KEY_COLUMNS))] += 1
+        self.apply_deltas(db.session.connection(), dict(deltas))
+
+    def record_deleted(self, test_cases):
+        """Query.delete()로 삭제할 테스트 케이스 반영 (커밋 전에 호출해 같은 트랜잭션으로 처리)"""
+        deltas = defaultdict(int)
+        for tc in test_cases:
+            deltas[_status_key(tc.environment, tc.project_id, tc.folder_id, tc.result_status)] -= 1
+        self.apply_deltas(db.session.connection(), dict(deltas))
+
+    def record_updated(self, changes):
+        """
+        UPDATE 문으로 직접 바꾼 테스트 케이스 반영 (커밋 전에 호출해 같은 트랜잭션으로 처리)
+
+        Args:
+            changes: [(변경 전 값 dict, 변경 후 값 dict)] - KEY_COLUMNS 키를 포함
+        """
+        deltas = defaultdict(int)
+        for before, after in changes:
+            deltas[_status_key(*(before.get(name) for name in KEY_COLUMNS))] -= 1
+            deltas[_status_key(*(after.get(name) for name in KEY_COLUMNS))] += 1
+        self.apply_deltas(db.session.connection(), {key: delta for key, delta in deltas.items() if delta})
+
+    def get_status_counts(self, project_id=None, folder_id=None):
+        """
+        환경별 결과 상태 수 조회 (project_id/folder_id로 범위 지정 가능)
+
+        Returns:
+            dict: {environment(없으면 None): {result_status: count}}
+        """
+        query = db.session.query(
+            DashboardStatusCount.environment,
+            DashboardStatusCount.result_status,
+            func.sum(DashboardStatusCount.count).label('count')
+        )
+        if project_id is not None:
+            query = query.filter(DashboardStatusCount.project_id == project_id)
+        if folder_id is not None:
+            query = query.filter(DashboardStatusCount.folder_id == folder_id)
+        rows = query.group_by(DashboardStatusCount.environment, DashboardStatusCount.result_status).all()
+
+        env_stats = {}
+        for row in rows:
+            if not row.count:
+                continue
+            status_counts = env_stats.setdefault(row.environment or None, {})
+            status_counts[row.result_status or None] = int(row.count)
+        return env_stats
+
+    def reconcile(self):
+        """
+        원본 TestCases에서 카운터와 DashboardSummary를 다시 집계
+
+        한 트랜잭션에서 카운터를 지우고 다시 채우므로 실행 중 저장된 변경도 커밋 순서대로 반영된다.
+        Returns:
+            dict: {'keys': 카운터 키 수, 'drift': 값이 어긋나 있던 키 수}
+        """
+        counts_table = DashboardStatusCount.__table__
+        keys = [
+            func.coalesce(TestCase.environment, ''),
+            func.coalesce(TestCase.project_id, 0),
+            func.coalesce(TestCase.folder_id, 0),
+            func.coalesce(TestCase.result_status, ''),
+        ]
+        actual = {
+            tuple(row[:4]): row[4]
+            for row in db.session.query(*keys, func.count(TestCase.id)).group_by(*keys).all()
+        }
+        stored = {
+            (row.environment, row.project_id, row.folder_id, row.result_status): row.count
+            for row in DashboardStatusCount.query.all()
+        }
+        drift = sum(1 for key in set(actual) | set(stored) if actual.get(key, 0) != stored.get(key, 0))
+
+        connection = db.session.connection()
+        connection.execute(counts_table.delete())
+        if actual:
+            connection.execute(
+                counts_table.insert(),
+                [dict(zip(KEY_COLUMNS, key), count=count) for key, count in actual.items()]
+            )
+
+        # 환경별 요약 재생성 (중복 행은 하나만 남김)
+        summary_table = DashboardSummary.__table__
+        now = get_kst_now().replace(tzinfo=None)
+        environments = {key[0] for key in actual if key[0]}
+        kept = {}
+        for summary in DashboardSummary.query.order_by(DashboardSummary.id).all():
+            if summary.environment in kept:
+                db.session.delete(summary)
+            else:
+                kept[summary.environment] = summary
+        for environment in environments | set(kept):
+            totals = self._environment_totals(connection, environment)
+            summary = kept.get(environment)
+            if summary is None:
+                summary = DashboardSummary(environment=environment)
+                db.session.add(summary)
+            summary.total_tests = totals['total_tests']
+            summary.passed_tests = totals['passed_tests']
+            summary.failed_tests = totals['failed_tests']
+            summary.skipped_tests = totals['skipped_tests']
+            summary.pass_rate = round(totals['passed_tests'] / totals['total_tests'] * 100, 2) if totals['total_tests'] else 0.0
+            summary.last_updated = now
+        db.session.commit()
+
+        if drift:
+            logger.warning(f"대시보드 카운터 보정: {drift}개 키의 값이 어긋나 있었음")
+        else:
+            logger.info(f"대시보드 카운터 보정 완료: 어긋난 값 없음 ({len(actual)}개 키)")
+        return {'keys': len(actual), 'drift': drift}
+
+
+# 전역 대시보드 요약 서비스 인스턴스
+dashboard_summary_service = DashboardSummaryService()
+
+
+# 카운터 키 컬럼은 변경 전 값으로 이전 키를 차감
+track_previous_values(TestCase, KEY_COLUMNS)
+
+
+@event.listens_for(Session, 'after_flush')
+def _count_test_case_changes(session, flush_context):
+    """flush된 TestCase 추가/수정/삭제를 같은 트랜잭션에서 카운터에 반영 (실패해도 테스트 케이스 저장은 유지)"""
+    if not any(isinstance(obj, TestCase) for obj in (*session.new, *session.dirty, *session.deleted)):
+        return
+    deltas = dashboard_summary_service._collect_flush(session)
+    if not deltas:
+        return
+    dashboard_summary_service.apply_deltas(session.connection(), deltas)
@@ -1,15 +1,28 @@
 """
 테스트 의존성 관리 서비스
 의존성 그래프, 실행 순서 계산, 순환 의존성 검사
+
+활성 의존성 전체의 인접 리스트(forward/reverse)를 캐시(L1 프로세스 내 + Redis)에 보관하고
+TestDependency가 변경·커밋되면 DEPENDENCY_GRAPH_TAG 무효화로 모든 워커의 캐시를 비운다.
+순환 검사와 실행 계획(웨이브)은 DB 조회 없이 이 인접 리스트에서 계산한다.
 """
 from models import db, TestDependency, TestCase, TestResult
+from services.cache_service import cache_service, invalidate_after_commit, MISS
 from utils.timezone_utils import get_kst_now
 from utils.logger import get_logger
 from collections import defaultdict, deque
+from sqlalchemy import event
+from sqlalchemy.orm import Session
 import json
 
 logger = get_logger(__name__)
 
+DEPENDENCY_GRAPH_CACHE_KEY = 'dependency_graph:adjacency'
+DEPENDENCY_GRAPH_TAG = 'dependency_graph'
+DEPENDENCY_GRAPH_TTL = 3600
+# 의존성 간선에 우선순위가 없는 테스트 케이스의 우선순위 (값이 작을수록 먼저 실행)
+DEFAULT_NODE_PRIORITY = 1000
+
 class DependencyService:
     """테스트 의존성 관리 서비스"""
     
@@ -56,7 +69,8 @@ class DependencyService:
             raise
     
     def _would_create_cycle(self, test_case_id, depends_on_test_case_id):
-        """순환 의존성 발생 여부 확인"""
+        """순환 의존성 발생 여부 확인 (캐시된 인접 리스트에서 탐색)"""
+        forward = self._adjacency()['forward']
         # depends_on_test_case_id에서 test_case_id로 도달 가능한지 확인
         visited = set()
         queue = deque([depends_on_test_case_id])
@@ -70,17 +84,63 @@ class DependencyService:
                 continue
             visited.add(current_id)
             
-            # 현재 테스트 케이스가 의존하는 테스트 케이스들 조회
-            dependencies = TestDependency.query.filter_by(
-                test_case_id=current_id,
-                enabled=True
-            ).all()
-            
-            for dep in dependencies:
-                queue.append(dep.depends_on_test_case_id)
+            # 현재 테스트 케이스가 의존하는 테스트 케이스들
+            for dep in forward.get(current_id, []):
+                queue.append(dep['depends_on'])
         
         return False
     
+    @staticmethod
+    def _load_adjacency():
+        """활성 의존성 전체로 인접 리스트 구성"""
+        forward = defaultdict(list)
+        reverse = defaultdict(list)
+        
+        for dep in TestDependency.query.filter_by(enabled=True).order_by(TestDependency.id).all():
+            condition = json.loads(dep.condition) if dep.condition else None
+            forward[dep.test_case_id].append({
+                'id': dep.id,
+                'depends_on': dep.depends_on_test_case_id,
+                'type': dep.dependency_type,
+                'condition': condition,
+                'priority': dep.priority
+            })
+            reverse[dep.depends_on_test_case_id].append({
+                'id': dep.id,
+                'test_case': dep.test_case_id,
+                'type': dep.dependency_type,
+                'condition': condition,
+                'priority': dep.priority
+            })
+        
+        return {'forward': dict(forward), 'reverse': dict(reverse)}
+    
+    def _adjacency(self):
+        """
+        캐시된 인접 리스트 (없으면 DB에서 한 번 읽어 캐시)
+        
+        Returns:
+            dict: {'forward': {test_case_id: [의존 대상 간선]}, 'reverse': {depends_on: [의존하는 간선]}}
+        """
+        adjacency = cache_service.get_object(DEPENDENCY_GRAPH_CACHE_KEY)
+        if adjacency is not MISS:
+            return adjacency
+        
+        with cache_service.single_flight(DEPENDENCY_GRAPH_CACHE_KEY):
+            adjacency = cache_service.get_object(DEPENDENCY_GRAPH_CACHE_KEY)
+            if adjacency is MISS:
+                adjacency = self._load_adjacency()
+                cache_service.set_object(
+                    DEPENDENCY_GRAPH_CACHE_KEY, adjacency,
+                    ttl=DEPENDENCY_GRAPH_TTL, tags=[DEPENDENCY_GRAPH_TAG]
+                )
+        return adjacency
+    
+    @staticmethod
+    def invalidate_graph():
+        """인접 리스트 캐시 무효화 (다른 워커에도 전파)"""
+        cache_service.invalidate_tags(DEPENDENCY_GRAPH_TAG)
+    
     def get_dependency_graph(self, test_case_ids=None):
         """
         의존성 그래프 조회
@@ -92,37 +152,27 @@ class DependencyService:
             dict: 의존성 그래프
         """
         try:
-            query = TestDependency.query.filter_by(enabled=True)
+            adjacency = self._adjacency()
             
-            if test_case_ids:
-                query = query.filter(
-                    db.or_(
-                        TestDependency.test_case_id.in_(test_case_ids),
-                        TestDependency.depends_on_test_case_id.in_(test_case_ids)
-                    )
-                )
-            
-            dependencies = query.all()
+            if not test_case_ids:
+                return {
+                    'forward': adjacency['forward'],  # test_case_id -> depends_on 목록
+                    'reverse': adjacency['reverse']  # depends_on -> test_case 목록
+                }
             
-            # 그래프 구성
+            # 지정한 테스트 케이스가 한쪽 끝인 간선만 남김
+            selected = set(test_case_ids)
             graph = defaultdict(list)
             reverse_graph = defaultdict(list)
             
-            for dep in dependencies:
-                graph[dep.test_case_id].append({
-                    'id': dep.id,
-                    'depends_on': dep.depends_on_test_case_id,
-                    'type': dep.dependency_type,
-                    'condition': json.loads(dep.condition) if dep.condition else None,
-                    'priority': dep.priority
-                })
-                reverse_graph[dep.depends_on_test_case_id].append({
-                    'id': dep.id,
-                    'test_case': dep.test_case_id,
-                    'type': dep.dependency_type,
-                    'condition': json.loads(dep.condition) if dep.condition else None,
-                    'priority': dep.priority
-                })
+            for test_id, deps in adjacency['forward'].items():
+                for dep in deps:
+                    if test_id in selected or dep['depends_on'] in selected:
+                        graph[test_id].append(dep)
+            for depends_on_id, deps in adjacency['reverse'].items():
+                for dep in deps:
+                    if depends_on_id in selected or dep['test_case'] in selected:
+                        reverse_graph[depends_on_id].append(dep)
             
             return {
                 'forward': dict(graph),  # test_case_id -> depends_on 목록
@@ -133,6 +183,102 @@ class DependencyService:
             logger.error(f"의존성 그래프 조회 오류: {str(e)}")
             return {'forward': {}, 'reverse': {}}
     
+    def _selected_prerequisites(self, forward, selected):
+        """
+        선택된 테스트 케이스 사이의 선행 관계
+        선택되지 않은 테스트 케이스를 거치는 간접 의존(A -> X -> B)도 A가 B 뒤에 오도록 포함
+        
+        Returns:
+            dict: test_case_id -> 선행해야 하는 선택된 테스트 케이스 ID 집합
+        """
+        prerequisites = {}
+        for test_id in selected:
+            found = set()
+            visited = {test_id}
+            stack = [dep['depends_on'] for dep in forward.get(test_id, [])]
+            while stack:
+                current = stack.pop()
+                if current in visited:
+                    continue
+                visited.add(current)
+                if current in selected:
+                    found.add(current)
+                else:
+                    stack.extend(dep['depends_on'] for dep in forward.get(current, []))
+            prerequisites[test_id] = found
+        return prerequisites
+    
+    def plan_waves(self, test_case_ids):
+        """
+        병렬 실행 계획 (DAG 레벨 단위 웨이브)
+        
+        같은 웨이브의 테스트 케이스는 서로 의존하지 않으므로 동시에 실행할 수 있고,
+        각 웨이브는 이전 웨이브가 모두 끝난 뒤 실행한다.
+        웨이브 안에서는 우선순위(간선 priority 최솟값, 작을수록 먼저) → 뒤에서 기다리는 테스트 수(많을수록 먼저) 순으로 정렬한다.
+        
+        Args:
+            test_case_ids: 실행할 테스트 케이스 ID 목록
+        
+        Returns:
+            dict: {'waves': [[test_case_id, ...], ...], 'cyclic': [순환 때문에 순서를 정할 수 없는 ID]}
+        """
+        test_case_ids = list(dict.fromkeys(test_case_ids))
+        selected = set(test_case_ids)
+        adjacency = self._adjacency()
+        forward = adjacency['forward']
+        
+        prerequisites = self._selected_prerequisites(forward, selected)
+        dependents = defaultdict(set)
+        for test_id, prereqs in prerequisites.items():
+            for prereq_id in prereqs:
+                dependents[prereq_id].add(test_id)
+        
+        # 노드 우선순위: 자신 또는 자신을 기다리는 테스트와 연결된 간선 priority의 최솟값
+        priority = {}
+        for test_id in test_case_ids:
+            edge_priorities = [dep['priority'] for dep in forward.get(test_id, []) if dep['priority'] is not None]
+            edge_priorities += [dep['priority'] for dep in adjacency['reverse'].get(test_id, []) if dep['priority'] is not None]
+            priority[test_id] = min(edge_priorities) if edge_priorities else DEFAULT_NODE_PRIORITY
+        
+        # 뒤에서 기다리는(전이적으로 의존하는) 테스트 수
+        downstream = {}
+        for test_id in test_case_ids:
+            seen, stack = set(), list(dependents[test_id])
+            while stack:
+                current = stack.pop()
+                if current not in seen:
+                    seen.add(current)
+                    stack.extend(dependents[current])
+            downstream[test_id] = len(seen)
+        
+        position = {test_id: index for index, test_id in enumerate(test_case_ids)}
+        sort_key = lambda test_id: (priority[test_id], -downstream[test_id], position[test_id])
+        
+        # 위상 정렬 (Kahn) - 진입 차수 = 아직 끝나지 않은 선행 테스트 수
+        in_degree = {test_id: len(prerequisites[test_id]) for test_id in test_case_ids}
+        wave = sorted((test_id for test_id in test_case_ids if in_degree[test_id] == 0), key=sort_key)
+        waves = []
+        
+        while wave:
+            waves.append(wave)
+            next_wave = []
+            for current in wave:
+                # 현재 노드를 기다리던 테스트의 진입 차수 감소
+                for dependent_id in dependents[current]:
+                    in_degree[dependent_id] -= 1
+                    if in_degree[dependent_id] == 0:
+                        next_wave.append(dependent_id)
+            wave = sorted(next_wave, key=sort_key)
+        
+        # 순환 의존성 확인
+        planned = sum(len(w) for w in waves)
+        cyclic = []
+        if planned != len(test_case_ids):
+            cyclic = sorted((test_id for test_id in test_case_ids if in_degree[test_id] > 0), key=sort_key)
+            logger.warning(f"순환 의존성으로 순서를 정할 수 없는 테스트 케이스: {cyclic}")
+        
+        return {'waves': waves, 'cyclic': cyclic}
+    
     def get_execution_order(self, test_case_ids):
         """
         테스트 케이스 실행 순서 계산 (위상 정렬)
@@ -141,51 +287,11 @@ class DependencyService:
             test_case_ids: 실행할 테스트 케이스 ID 목록
         
         Returns:
-            list: 실행 순서 (의존성 순서대로)
+            list: 실행 순서 (의존성 순서대로, 순환에 걸린 테스트 케이스는 마지막)
         """
         try:
-            graph = self.get_dependency_graph(test_case_ids)
-            forward_graph = graph['forward']
-            
-            # 위상 정렬 (Topological Sort)
-            in_degree = defaultdict(int)
-            
-            # 진입 차수 계산
-            for test_id in test_case_ids:
-                in_degree[test_id] = 0
-            
-            for test_id, deps in forward_graph.items():
-                if test_id in test_case_ids:
-                    for dep in deps:
-                        if dep['depends_on'] in test_case_ids:
-                            in_degree[test_id] += 1
-            
-            # 큐에 진입 차수가 0인 노드 추가
-            queue = deque([test_id for test_id in test_case_ids if in_degree[test_id] == 0])
-            result = []
-            
-            while queue:
-                # 우선순위에 따라 정렬 (priority가 낮을수록 먼저 실행)
-                current = queue.popleft()
-                result.append(current)
-                
-                # 현재 노드에 의존하는 노드들의 진입 차수 감소
-                if current in forward_graph:
-                    for dep in forward_graph[current]:
-                        depends_on_id = dep['depends_on']
-                        if depends_on_id in test_case_ids:
-                            in_degree[depends_on_id] -= 1
-                            if in_degree[depends_on_id] == 0:
-                                queue.append(depends_on_id)
-            
-            # 순환 의존성 확인
-            if len(result) != len(test_case_ids):
-                remaining = set(test_case_ids) - set(result)
-                logger.warning(f"순환 의존성 또는 의존성 조건 미충족: {remaining}")
-                # 남은 테스트 케이스들을 결과에 추가
-                result.extend(remaining)
-            
-            return result
+            plan = self.plan_waves(test_case_ids)
+            return [test_id for wave in plan['waves'] for test_id in wave] + plan['cyclic']
             
         except Exception as e:
             logger.error(f"실행 순서 계산 오류: {str(e)}")
@@ -335,3 +441,10 @@ class DependencyService:
 # 전역 의존성 서비스 인스턴스
 dependency_service = DependencyService()
 
+
+@event.listens_for(Session, 'after_flush')
+def _track_dependency_changes(session, flush_context):
+    """TestDependency 변경이 flush되면 커밋 후 그래프 캐시를 무효화하도록 예약"""
+    if any(isinstance(obj, TestDependency) for obj in (*session.new, *session.dirty, *session.deleted)):
+        invalidate_after_commit(session, DEPENDENCY_GRAPH_TAG)
+
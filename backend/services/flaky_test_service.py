@@ -0,0 +1,248 @@
+"""
+Flaky 테스트 점수 서비스
+분석 기간별로 테스트 케이스의 Pass/Fail 전환율(flip rate), 결과 엔트로피, 베이지안 실패 확률을 계산해 저장
+
+- 점수는 FLAKY_SCORE_WINDOWS에 정한 기간만 celery beat(tasks.refresh_flaky_test_scores)가 주기적으로 계산하고,
+  API는 저장된 점수만 조회한다 (요청 중 재계산 없음)
+
+- 윈도우 함수(LAG/ROW_NUMBER)로 전환 수와 최근 결과를 테스트별 추가 쿼리 없이 한 번에 계산
+- 윈도우 함수를 지원하지 않는 DB(SQLite < 3.25, MySQL < 8.0)는 정렬된 결과를 한 번 순회해 같은 값을 계산
+"""
+import json
+import math
+import os
+from datetime import timedelta
+from sqlalchemy import func, case, and_, select
+from models import db, TestResult, FlakyTestScore
+from utils.timezone_utils import get_kst_now
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 점수를 저장하는 분석 기간(일) 목록 - API는 이 기간만 조회할 수 있다
+FLAKY_SCORE_WINDOWS = tuple(sorted({
+    int(days) for days in os.environ.get('FLAKY_SCORE_WINDOWS', '7,14,30,90').split(',') if days.strip()
+}))
+DEFAULT_FLAKY_WINDOW = 30 if 30 in FLAKY_SCORE_WINDOWS else FLAKY_SCORE_WINDOWS[-1]
+# 테스트별로 보관할 최근 결과 수
+RECENT_RESULTS_LIMIT = 10
+# 베이지안 실패 확률의 사전분포 강도 (전체 실패율을 이 횟수만큼 관측한 것으로 간주)
+PRIOR_STRENGTH = 10.0
+FLAKY_RESULTS = ('Pass', 'Fail')
+
+
+def _supports_window_functions(connection):
+    dialect = connection.dialect
+    version = dialect.server_version_info or ()
+    if dialect.name == 'sqlite':
+        return version >= (3, 25, 0)
+    if dialect.name == 'mysql':
+        if getattr(dialect, 'is_mariadb', False):
+            return version >= (10, 2)
+        return version >= (8, 0)
+    return True
+
+
+def _binary_entropy(p):
+    if p <= 0 or p >= 1:
+        return 0.0
+    return -(p * math.log2(p) + (1 - p) * math.log2(1 - p))
+
+
+def count_pattern_changes(results):
+    """결과 목록에서 인접한 결과가 바뀐 횟수"""
+    return sum(1 for prev, cur in zip(results, results[1:]) if prev != cur)
+
+
+class FlakyTestService:
+    """테스트 케이스별 불안정성 지표 계산 및 저장"""
+
+    @staticmethod
+    def _window_stats(start_date):
+        """윈도우 함수로 테스트별 통계와 최근 결과 조회 (쿼리 2회)"""
+        partition = TestResult.test_case_id
+        ordered = select(
+            TestResult.test_case_id,
+            TestResult.result,
+            TestResult.executed_at,
+            func.lag(TestResult.result).over(
+                partition_by=partition,
+                order_by=(TestResult.executed_at, TestResult.id)
+            ).label('prev_result'),
+            func.row_number().over(
+                partition_by=partition,
+                order_by=(TestResult.executed_at.desc(), TestResult.id.desc())
+            ).label('recency')
+        ).where(
+            TestResult.test_case_id.isnot(None),
+            TestResult.executed_at >= start_date,
+            TestResult.result.in_(FLAKY_RESULTS)
+        ).subquery()
+
+        stats_rows = db.session.execute(
+            select(
+                ordered.c.test_case_id,
+                func.sum(case((ordered.c.result == 'Pass', 1), else_=0)).label('passed'),
+                func.sum(case((ordered.c.result == 'Fail', 1), else_=0)).label('failed'),
+                func.sum(case(
+                    (and_(ordered.c.prev_result.isnot(None), ordered.c.prev_result != ordered.c.result), 1),
+                    else_=0
+                )).label('transitions'),
+                func.min(ordered.c.executed_at).label('first_execution'),
+                func.max(ordered.c.executed_at).label('last_execution')
+            ).group_by(ordered.c.test_case_id)
+        ).all()
+
+        recent = {}
+        recent_rows = db.session.execute(
+            select(ordered.c.test_case_id, ordered.c.result).where(
+                ordered.c.recency <= RECENT_RESULTS_LIMIT
+            ).order_by(ordered.c.test_case_id, ordered.c.recency)
+        )
+        for test_case_id, result in recent_rows:
+            recent.setdefault(test_case_id, []).append(result)
+
+        stats = {}
+        for row in stats_rows:
+            stats[row.test_case_id] = {
+                'passed': int(row.passed or 0),
+                'failed': int(row.failed or 0),
+                'transitions': int(row.transitions or 0),
+                'first_execution': row.first_execution,
+                'last_execution': row.last_execution,
+                'recent_results': recent.get(row.test_case_id, [])
+            }
+        return stats
+
+    @staticmethod
+    def _sequential_stats(start_date):
+        """윈도우 함수 미지원 DB용: 테스트/시각 순으로 정렬된 결과를 한 번 순회해 같은 통계 계산"""
+        rows = db.session.query(
+            TestResult.test_case_id,
+            TestResult.result,
+            TestResult.executed_at
+        ).filter(
+            TestResult.test_case_id.isnot(None),
+            TestResult.executed_at >= start_date,
+            TestResult.result.in_(FLAKY_RESULTS)
+        ).order_by(
+            TestResult.test_case_id,
+            TestResult.executed_at,
+            TestResult.id
+        ).yield_per(5000)
+
+        stats = {}
+        current = None
+        prev_result = None
+        for test_case_id, result, executed_at in rows:
+            if current is None or current['test_case_id'] != test_case_id:
+                current = stats[test_case_id] = {
+                    'test_case_id': test_case_id,
+                    'passed': 0,
+                    'failed': 0,
+                    'transitions': 0,
+                    'first_execution': executed_at,
+                    'last_execution': executed_at,
+                    'recent_results': []
+                }
+                prev_result = None
+            if result == 'Pass':
+                current['passed'] += 1
+            else:
+                current['failed'] += 1
+            if prev_result is not None and prev_result != result:
+                current['transitions'] += 1
+            prev_result = result
+            current['last_execution'] = executed_at
+            current['recent_results'].append(result)
+            del current['recent_results'][:-RECENT_RESULTS_LIMIT]
+
+        for stat in stats.values():
+            del stat['test_case_id']
+            stat['recent_results'].reverse()
+        return stats
+
+    @staticmethod
+    def score(stat, prior_failure_rate):
+        """테스트 하나의 통계에서 불안정성 지표 계산"""
+        total = stat['passed'] + stat['failed']
+        failure_rate = stat['failed'] / total if total else 0.0
+        flip_rate = stat['transitions'] / (total - 1) if total > 1 else 0.0
+        return {
+            'total_executions': total,
+            'flip_rate': flip_rate,
+            'entropy': _binary_entropy(failure_rate),
+            'failure_probability': (stat['failed'] + PRIOR_STRENGTH * prior_failure_rate) / (total + PRIOR_STRENGTH),
+            # 결과가 얼마나 자주 뒤집히는지를 불안정성으로 본다 (한동안 계속 실패한 뒤 고쳐진 테스트는 낮게 나옴)
+            'flakiness_score': flip_rate
+        }
+
+    def compute(self, days):
+        """기간 내 Pass/Fail 결과로 테스트별 점수 계산 (저장하지 않음)"""
+        start_date = get_kst_now() - timedelta(days=days)
+        if _supports_window_functions(db.session.connection()):
+            stats = self._window_stats(start_date)
+        else:
+            stats = self._sequential_stats(start_date)
+
+        total_passed = sum(s['passed'] for s in stats.values())
+        total_failed = sum(s['failed'] for s in stats.values())
+        prior_failure_rate = total_failed / (total_passed + total_failed) if stats else 0.0
+
+        scores = []
+        for test_case_id, stat in stats.items():
+            scores.append({
+                'test_case_id': test_case_id,
+                'passed': stat['passed'],
+                'failed': stat['failed'],
+                'transitions': stat['transitions'],
+                'first_execution': stat['first_execution'],
+                'last_execution': stat['last_execution'],
+                'recent_results': stat['recent_results'],
+                **self.score(stat, prior_failure_rate)
+            })
+        return scores
+
+    def refresh(self, days):
+        """
+        기간별 저장된 점수를 다시 계산해 교체
+
+        Raises:
+            ValueError: FLAKY_SCORE_WINDOWS에 없는 기간일 때
+        """
+        if days not in FLAKY_SCORE_WINDOWS:
+            raise ValueError(f"지원하지 않는 분석 기간입니다: {days}일 (가능: {', '.join(map(str, FLAKY_SCORE_WINDOWS))})")
+        scores = self.compute(days)
+        computed_at = get_kst_now()
+        FlakyTestScore.query.filter_by(window_days=days).delete(synchronize_session=False)
+        db.session.bulk_insert_mappings(FlakyTestScore, [
+            {
+                **score,
+                'window_days': days,
+                'recent_results': json.dumps(score['recent_results']),
+                'computed_at': computed_at
+            }
+            for score in scores
+        ])
+        db.session.commit()
+        logger.info(f"Flaky 테스트 점수 갱신: {days}일, {len(scores)}개 테스트")
+        return len(scores)
+
+    def refresh_all(self):
+        """FLAKY_SCORE_WINDOWS의 모든 기간 점수 갱신 → {기간: 테스트 수} (목록에서 빠진 기간의 점수는 삭제)"""
+        FlakyTestScore.query.filter(
+            FlakyTestScore.window_days.notin_(FLAKY_SCORE_WINDOWS)
+        ).delete(synchronize_session=False)
+        db.session.commit()
+        return {days: self.refresh(days) for days in FLAKY_SCORE_WINDOWS}
+
+    @staticmethod
+    def last_computed(days):
+        """기간별 저장된 점수의 계산 시각 (아직 없으면 None)"""
+        return db.session.query(func.max(FlakyTestScore.computed_at)).filter(
+            FlakyTestScore.window_days == days
+        ).scalar()
+
+
+# 전역 Flaky 테스트 서비스 인스턴스
+flaky_test_service = FlakyTestService()
@@ -0,0 +1,235 @@
+"""
+폴더 트리 서비스
+Folders 테이블 단일 조회로 프로젝트 → 환경 → 배포일자 → 기능 트리를 구성하고,
+프로젝트 단위로 캐싱 (폴더가 추가/수정/삭제되어 커밋되면 영향받는 프로젝트 캐시만 무효화)
+"""
+import copy
+from collections import defaultdict
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from models import db, Folder, Project, TestCase
+from services.cache_service import cache_service, invalidate_after_commit
+from utils.orm_history import UNKNOWN, track_previous_values, previous_value, has_changes
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# project_id가 없는 기존 폴더가 속하는 기본 프로젝트
+LEGACY_PROJECT_ID = 2
+
+FOLDER_TREE_CACHE_TTL = 3600
+# 모든 프로젝트 트리 캐시에 붙는 태그 (영향받는 프로젝트를 알 수 없을 때 전체 무효화)
+FOLDER_TREE_TAG = 'folder_tree'
+# 트리 구성에 쓰이는 폴더 컬럼
+TREE_COLUMNS = ('folder_name', 'folder_type', 'environment', 'deployment_date', 'parent_folder_id', 'project_id')
+
+
+def folder_tree_tag(project_id):
+    """프로젝트 트리 캐시 태그 (project_id가 없으면 기본 프로젝트)"""
+    return f"{FOLDER_TREE_TAG}:{project_id if project_id is not None else LEGACY_PROJECT_ID}"
+
+
+class FolderService:
+    """폴더 트리 조회 및 캐시 관리"""
+
+    @staticmethod
+    def _cache_key(project_id):
+        return f"folder_tree:project:{project_id}"
+
+    def get_folder_tree(self):
+        """
+        프로젝트 → 환경 → 배포일자 → 기능 폴더 트리 반환
+
+        - 폴더 구조는 프로젝트별로 캐싱하고, 캐시 미스가 나면 Folders 테이블을 한 번의 쿼리로 로드
+        - 폴더별 테스트 케이스 수는 매 요청 GROUP BY 한 번으로 계산해 트리에 반영
+        """
+        projects = db.session.query(Project.id, Project.name).order_by(Project.id).all()
+
+        structures = {}
+        missing_ids = []
+        for project in projects:
+            cached = cache_service.get(self._cache_key(project.id))
+            if cached is None:
+                missing_ids.append(project.id)
+            else:
+                structures[project.id] = cached
+
+        if missing_ids:
+            built = self._build_structures(missing_ids)
+            for project_id in missing_ids:
+                structure = built.get(project_id, [])
+                structures[project_id] = structure
+                cache_service.set(self._cache_key(project_id), structure, FOLDER_TREE_CACHE_TTL,
+                                  tags=[folder_tree_tag(project_id), FOLDER_TREE_TAG])
+
+        counts = self.get_test_case_counts()
+
+        tree = []
+        for project in projects:
+            children = copy.deepcopy(structures.get(project.id, []))
+            project_total = sum(self._apply_counts(node, counts) for node in children)
+            tree.append({
+                'id': project.id,
+                'name': project.name,
+                'type': 'project',
+                'total_test_case_count': project_total,
+                'children': children
+            })
+        return tree
+
+    def _build_structures(self, project_ids):
+        """
+        Folders 테이블 전체를 단일 쿼리로 읽어 지정한 프로젝트들의 환경 노드 목록을 구성
+
+        하위 폴더는 project_id가 아닌 parent_folder_id로만 연결하므로 (기존 동작과 동일)
+        프로젝트 필터 없이 전체를 읽은 뒤 메모리에서 조립한다.
+        """
+        project_ids = set(project_ids)
+        folders = Folder.query.order_by(Folder.id).all()
+
+        children_by_parent = defaultdict(list)
+        roots_by_project = defaultdict(list)
+        for folder in folders:
+            if folder.parent_folder_id is None:
+                project_id = folder.project_id if folder.project_id is not None else LEGACY_PROJECT_ID
+                roots_by_project[project_id].append(folder)
+            else:
+                children_by_parent[folder.parent_folder_id].append(folder)
+
+        def of_type(items, folder_type):
+            return [f for f in items if f.folder_type in (folder_type, None)]
+
+        structures = {}
+        for project_id, roots in roots_by_project.items():
+            if project_id not in project_ids:
+                continue
+            env_nodes = []
+            for env_folder in of_type(roots, 'environment'):
+                env_node = {
+                    'id': env_folder.id,
+                    'name': env_folder.folder_name,
+                    'type': 'environment',
+                    'environment': env_folder.environment or 'dev',
+                    'project_id': env_folder.project_id if env_folder.project_id is not None else LEGACY_PROJECT_ID,
+                    'children': []
+                }
+                for dep_folder in of_type(children_by_parent[env_folder.id], 'deployment_date'):
+                    dep_node = {
+                        'id': dep_folder.id,
+                        'name': dep_folder.folder_name,
+                        'type': 'deployment_date',
+                        'deployment_date': dep_folder.deployment_date.strftime('%Y-%m-%d') if dep_folder.deployment_date else (dep_folder.folder_name or 'Unknown'),
+                        'project_id': dep_folder.project_id if dep_folder.project_id is not None else LEGACY_PROJECT_ID,
+                        'children': []
+                    }
+                    for feature_folder in of_type(children_by_parent[dep_folder.id], 'feature'):
+                        dep_node['children'].append({
+                            'id': feature_folder.id,
+                            'name': feature_folder.folder_name,
+                            'type': 'feature',
+                            'project_id': feature_folder.project_id if feature_folder.project_id is not None else LEGACY_PROJECT_ID,
+                            'children': []
+                        })
+                    env_node['children'].append(dep_node)
+                env_nodes.append(env_node)
+            structures[project_id] = env_nodes
+        return structures
+
+    @staticmethod
+    def get_test_case_counts():
+        """폴더별 테스트 케이스 수 (GROUP BY 한 번)"""
+        rows = db.session.query(
+            TestCase.folder_id,
+            db.func.count(TestCase.id)
+        ).filter(TestCase.folder_id.isnot(None)).group_by(TestCase.folder_id).all()
+        return {folder_id: count for folder_id, count in rows}
+
+    def _apply_counts(self, node, counts):
+        """노드에 직접/하위 포함 테스트 케이스 수를 기록하고 하위 포함 합계를 반환"""
+        direct = counts.get(node['id'], 0)
+        total = direct + sum(self._apply_counts(child, counts) for child in node['children'])
+        node['test_case_count'] = direct
+        node['total_test_case_count'] = total
+        return total
+
+    @staticmethod
+    def get_subtree_ids(folder_id):
+        """폴더와 모든 하위 폴더 ID 목록 (재귀 CTE 한 번으로 조회)"""
+        subtree = db.session.query(Folder.id).filter(Folder.id == folder_id).cte(name='folder_subtree', recursive=True)
+        subtree = subtree.union_all(
+            db.session.query(Folder.id).filter(Folder.parent_folder_id == subtree.c.id)
+        )
+        return [row[0] for row in db.session.query(subtree.c.id).all()]
+
+    @staticmethod
+    def root_project_ids(session, folder_ids):
+        """
+        폴더들이 트리에서 표시되는 프로젝트 (최상위 조상 폴더의 project_id)
+
+        하위 폴더는 parent_folder_id로만 연결되므로 자신의 project_id가 아닌 조상 쪽 프로젝트에 나타난다.
+        """
+        folder_ids = {folder_id for folder_id in folder_ids if folder_id is not None}
+        if not folder_ids:
+            return set()
+        ancestors = session.query(Folder.id, Folder.parent_folder_id, Folder.project_id).filter(
+            Folder.id.in_(folder_ids)
+        ).cte(name='folder_ancestors', recursive=True)
+        ancestors = ancestors.union_all(
+            session.query(Folder.id, Folder.parent_folder_id, Folder.project_id).filter(
+                Folder.id == ancestors.c.parent_folder_id
+            )
+        )
+        return {row[0] for row in session.query(ancestors.c.project_id).filter(ancestors.c.parent_folder_id.is_(None)).all()}
+
+    def invalidate_project(self, *project_ids):
+        """지정한 프로젝트의 트리 캐시 무효화 (폴더 변경은 커밋 시 자동 무효화)"""
+        cache_service.invalidate_tags(*{folder_tree_tag(project_id) for project_id in project_ids})
+        logger.debug(f"폴더 트리 캐시 무효화: project {sorted(set(project_ids), key=str)}")
+
+
+# 전역 폴더 서비스 인스턴스
+folder_service = FolderService()
+
+
+# 폴더 이동 시 이전 프로젝트도 무효화하도록 변경 전 값을 읽어 둠
+track_previous_values(Folder, ('parent_folder_id', 'project_id'))
+
+
+@event.listens_for(Session, 'after_flush')
+def _track_folder_changes(session, flush_context):
+    """
+    폴더 추가/수정/삭제가 flush되면 영향받는 프로젝트 트리 캐시를 커밋 후 무효화하도록 예약
+
+    변경 전/후 project_id와, 폴더 자신 및 이전 부모 폴더가 트리에서 속하는 프로젝트를 모두 무효화한다.
+    """
+    project_ids, folder_ids = set(), set()
+    unknown = False
+    for obj in session.new:
+        if isinstance(obj, Folder):
+            project_ids.add(obj.project_id)
+            folder_ids.add(obj.id)
+    for obj in session.dirty:
+        if not isinstance(obj, Folder) or not has_changes(obj, TREE_COLUMNS):
+            continue
+        old_parent_id, old_project_id = previous_value(obj, 'parent_folder_id'), previous_value(obj, 'project_id')
+        unknown = unknown or UNKNOWN in (old_parent_id, old_project_id)
+        project_ids.update((old_project_id, obj.project_id))
+        folder_ids.update((obj.id, old_parent_id))
+    for obj in session.deleted:
+        if isinstance(obj, Folder):
+            old_parent_id, old_project_id = previous_value(obj, 'parent_folder_id'), previous_value(obj, 'project_id')
+            unknown = unknown or UNKNOWN in (old_parent_id, old_project_id)
+            project_ids.add(old_project_id)
+            folder_ids.add(old_parent_id)
+    if not project_ids and not folder_ids:
+        return
+    if unknown:
+        invalidate_after_commit(session, FOLDER_TREE_TAG)
+        return
+    try:
+        project_ids |= FolderService.root_project_ids(session, folder_ids)
+    except Exception as e:
+        logger.warning(f"폴더 트리 프로젝트 조회 실패, 전체 무효화: {str(e)}")
+        invalidate_after_commit(session, FOLDER_TREE_TAG)
+        return
+    invalidate_after_commit(session, *{folder_tree_tag(project_id) for project_id in project_ids})
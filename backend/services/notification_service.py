@@ -5,9 +5,10 @@
 from models import db, Notification, NotificationSettings, User, TestCase, TestResult
 from utils.timezone_utils import get_kst_now
 from utils.logger import get_logger
+from services.slack_delivery_service import slack_delivery_service
+from datetime import datetime
 import json
 import os
-import requests
 
 logger = get_logger(__name__)
 
@@ -134,7 +135,92 @@ class NotificationService:
             
         except Exception as e:
             logger.error(f"테스트 완료 알림 생성 오류: {str(e)}")
-    
+
+    @staticmethod
+    def _test_result_notification(event):
+        """결과 이벤트 → 알림 필드 (notify_test_failed / notify_test_completed와 같은 문구)"""
+        name = event.get('test_case_name')
+        if event.get('result') == 'Fail':
+            return {
+                'notification_type': 'test_failed',
+                'title': f"테스트 실패: {name}",
+                'message': f"테스트 케이스 '{name}'가 실패했습니다.",
+                'priority': 'high'
+            }
+        status_text = '성공' if event.get('result') == 'Pass' else '실패'
+        return {
+            'notification_type': 'test_completed',
+            'title': f"테스트 완료: {name}",
+            'message': f"테스트 케이스 '{name}'가 {status_text}했습니다.",
+            'priority': 'medium' if event.get('result') == 'Pass' else 'high'
+        }
+
+    def notify_test_results(self, events):
+        """
+        테스트 결과 이벤트 묶음으로 인앱 알림 일괄 생성 (커밋 1회, 슬랙은 별도 소비자가 전송)
+
+        같은 결과에 대한 알림이 이미 있으면 건너뛰므로 이벤트가 재전달되어도 중복 생성되지 않는다.
+        """
+        events = [e for e in events if e.get('target_user_id') and e.get('test_result_id')]
+        if not events:
+            return []
+
+        existing = {
+            (row.related_test_result_id, row.user_id)
+            for row in db.session.query(Notification.related_test_result_id, Notification.user_id).filter(
+                Notification.related_test_result_id.in_([e['test_result_id'] for e in events]),
+                Notification.notification_type.in_(['test_failed', 'test_completed'])
+            )
+        }
+        notifications = []
+        for event in events:
+            if (event['test_result_id'], event['target_user_id']) in existing:
+                continue
+            notifications.append(Notification(
+                user_id=event['target_user_id'],
+                related_test_case_id=event.get('test_case_id'),
+                related_test_result_id=event['test_result_id'],
+                channels='in_app',
+                **self._test_result_notification(event)
+            ))
+        if not notifications:
+            return []
+
+        try:
+            db.session.add_all(notifications)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        for notification in notifications:
+            self._send_realtime_notification(notification)
+        logger.info(f"테스트 결과 알림 {len(notifications)}건 생성")
+        return notifications
+
+    def send_test_result_slack(self, events):
+        """테스트 결과 이벤트 묶음을 슬랙 전송 대기열에 추가 (알림을 저장하지 않고 같은 형식으로 메시지만 구성)"""
+        events = [e for e in events if e.get('target_user_id')]
+        targets = self._slack_targets(e['target_user_id'] for e in events)
+        for event in events:
+            target = targets.get(event['target_user_id'])
+            if not target:
+                continue
+            webhook_url, username = target
+            notification = Notification(
+                user_id=event['target_user_id'],
+                related_test_case_id=event.get('test_case_id'),
+                related_test_result_id=event.get('test_result_id'),
+                **self._test_result_notification(event)
+            )
+            entry = self._slack_entry(notification, username, event.get('test_case_name'), event.get('environment'))
+            if event.get('executed_at'):
+                try:
+                    entry['ts'] = int(datetime.fromisoformat(event['executed_at']).timestamp())
+                except ValueError:
+                    pass
+            slack_delivery_service.enqueue(webhook_url, entry)
+
     def notify_test_started(self, test_case_id, user_id=None):
         """테스트 시작 알림"""
         try:
@@ -267,148 +353,137 @@ class NotificationService:
         except Exception as e:
             logger.error(f"테스트 케이스 상태 변경 알림 생성 오류: {str(e)}")
             return []
+
+    def notify_bulk_changes(self, changes, changed_by_user_id=None):
+        """
+        테스트 케이스 일괄 변경 알림 (작성자/담당자별 요약 알림 한 건, 커밋 1회)
+
+        Args:
+            changes: [(변경 전 값 dict, 변경 후 값 dict)] - id, name, creator_id, assignee_id, result_status 포함
+        """
+        recipients = {}
+        for before, after in changes:
+            for user_id in {after.get('creator_id'), after.get('assignee_id')}:
+                if user_id:
+                    recipients.setdefault(user_id, []).append((before, after))
+        if not recipients:
+            return []
+
+        changed_by_name = '시스템'
+        if changed_by_user_id:
+            changed_by_user = User.query.get(changed_by_user_id)
+            changed_by_name = changed_by_user.username if changed_by_user else changed_by_name
+
+        notifications = []
+        for user_id, user_changes in recipients.items():
+            status_counts = {}
+            for before, after in user_changes:
+                if before.get('result_status') != after.get('result_status'):
+                    status_counts[after.get('result_status')] = status_counts.get(after.get('result_status'), 0) + 1
+            lines = [f"{changed_by_name}님이 테스트 케이스 {len(user_changes)}건을 일괄 변경했습니다."]
+            if status_counts:
+                lines.append('결과 상태: ' + ', '.join(
+                    f"{status}: {count}건" for status, count in sorted(status_counts.items(), key=lambda item: -item[1])
+                ))
+            notifications.append(Notification(
+                user_id=user_id,
+                notification_type='test_status_changed',
+                title=f"테스트 케이스 {len(user_changes)}건 일괄 변경",
+                message='\n'.join(lines),
+                related_test_case_id=user_changes[0][1]['id'] if len(user_changes) == 1 else None,
+                priority='high' if 'Fail' in status_counts else 'medium',
+                channels='all'
+            ))
+
+        try:
+            db.session.add_all(notifications)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        targets = self._slack_targets(recipients)
+        for notification in notifications:
+            self._send_realtime_notification(notification)
+            target = targets.get(notification.user_id)
+            if target:
+                webhook_url, username = target
+                slack_delivery_service.enqueue(webhook_url, self._slack_entry(notification, username))
+        logger.info(f"테스트 케이스 일괄 변경 알림 {len(notifications)}건 생성")
+        return notifications
     
     def _send_realtime_notification(self, notification):
         """WebSocket을 통해 실시간 알림 전송"""
         try:
-            from app import socketio
+            from utils import socketio_emitter
             
-            # 해당 사용자에게만 알림 전송
-            socketio.emit('notification', notification.to_dict(), room=f'user_{notification.user_id}')
+            # 해당 사용자에게만 알림 전송 (Celery 워커에서는 메시지 큐를 거쳐 웹 서버가 전달)
+            socketio_emitter.emit('notification', notification.to_dict(), room=f'user_{notification.user_id}')
             logger.debug(f"실시간 알림 전송: User {notification.user_id}")
             
         except Exception as e:
             logger.error(f"실시간 알림 전송 오류: {str(e)}")
     
+    @staticmethod
+    def _slack_targets(user_ids):
+        """
+        사용자별 슬랙 웹훅 URL과 사용자명 (설정/사용자 조회를 사용자 수와 관계없이 쿼리 2번으로)
+
+        사용자별 URL이 없으면 전역 SLACK_WEBHOOK_URL을 사용하고, 설정에서 슬랙을 끈 사용자는 제외한다.
+        Returns:
+            dict: {user_id: (webhook_url, username)}
+        """
+        user_ids = {user_id for user_id in user_ids if user_id}
+        if not user_ids:
+            return {}
+        settings = {
+            row.user_id: row for row in NotificationSettings.query.filter(NotificationSettings.user_id.in_(user_ids))
+        }
+        usernames = dict(db.session.query(User.id, User.username).filter(User.id.in_(user_ids)))
+        global_webhook_url = os.getenv('SLACK_WEBHOOK_URL')
+
+        targets = {}
+        for user_id in user_ids:
+            user_settings = settings.get(user_id)
+            if user_settings and not user_settings.slack_enabled:
+                logger.debug(f"사용자 {user_id}의 슬랙 알림이 비활성화되어 있음")
+                continue
+            webhook_url = (user_settings.slack_webhook_url if user_settings else None) or global_webhook_url
+            if not webhook_url:
+                logger.debug(f"슬랙 웹훅 URL이 설정되지 않음: User {user_id}")
+                continue
+            targets[user_id] = (webhook_url, usernames.get(user_id, 'Unknown User'))
+        return targets
+
+    @staticmethod
+    def _slack_entry(notification, username, test_case_name=None, environment=None):
+        """슬랙 전송 대기열 항목 (알림 한 건)"""
+        return {
+            'notification_type': notification.notification_type,
+            'priority': notification.priority,
+            'title': notification.title,
+            'message': notification.message,
+            'usernames': [username],
+            'test_case_name': test_case_name,
+            'environment': environment,
+            'ts': int(notification.created_at.timestamp()) if notification.created_at else None
+        }
+
     def _send_slack_notification(self, notification, user_id):
-        """슬랙 웹훅을 통해 알림 전송"""
+        """슬랙 웹훅 전송 대기열에 추가 (전송/요약/재시도는 slack_delivery_service가 처리)"""
         try:
-            # 사용자별 슬랙 설정 확인
-            user_settings = NotificationSettings.query.filter_by(user_id=user_id).first()
-            
-            # 슬랙 웹훅 URL 확인 (사용자별 설정 우선, 없으면 전역 환경 변수)
-            slack_webhook_url = None
-            slack_enabled = False
-            
-            if user_settings:
-                # 사용자별 설정이 있는 경우
-                slack_enabled = user_settings.slack_enabled
-                if user_settings.slack_webhook_url:
-                    slack_webhook_url = user_settings.slack_webhook_url
-                    logger.info(f"🔔 사용자별 슬랙 웹훅 URL 사용: User {user_id}, enabled={slack_enabled}")
-                else:
-                    # 사용자별 URL이 없으면 전역 환경 변수 사용
-                    slack_webhook_url = os.getenv('SLACK_WEBHOOK_URL')
-                    logger.info(f"🔔 전역 슬랙 웹훅 URL 사용: User {user_id}, enabled={slack_enabled}")
-            else:
-                # 사용자별 설정이 없는 경우 전역 환경 변수 사용
-                slack_webhook_url = os.getenv('SLACK_WEBHOOK_URL')
-                logger.info(f"🔔 사용자 설정 없음, 전역 슬랙 웹훅 URL 사용: User {user_id}")
-            
-            # 슬랙 웹훅 URL이 없으면 건너뛰기
-            if not slack_webhook_url:
-                logger.warning(f"⚠️ 슬랙 웹훅 URL이 설정되지 않음: User {user_id}, 환경변수 확인 필요")
-                return
-            
-            # 사용자별 설정이 있고 slack_enabled가 False면 건너뛰기
-            if user_settings and not slack_enabled:
-                logger.info(f"🔔 사용자 {user_id}의 슬랙 알림이 비활성화되어 있음 (slack_enabled=False)")
+            target = self._slack_targets([user_id]).get(user_id)
+            if not target:
                 return
-            
-            logger.info(f"🔔 슬랙 알림 전송 시도: User {user_id}, URL={slack_webhook_url[:30]}...")
-            
-            # 사용자 정보 가져오기
-            user = User.query.get(user_id)
-            username = user.username if user else 'Unknown User'
-            
-            # 알림 타입에 따른 이모지 및 색상 설정
-            emoji_map = {
-                'assignment': '👤',
-                'mention': '💬',
-                'test_failed': '❌',
-                'test_completed': '✅',
-                'test_started': '🚀',
-                'schedule_run': '⏰',
-                'test_status_changed': '🔄'
-            }
-            
-            color_map = {
-                'high': '#dc3545',      # 빨간색
-                'medium': '#ffc107',     # 노란색
-                'low': '#17a2b8'         # 파란색
-            }
-            
-            emoji = emoji_map.get(notification.notification_type, '🔔')
-            color = color_map.get(notification.priority, '#6c757d')
-            
-            # 슬랙 메시지 포맷팅
-            slack_message = {
-                "text": f"{emoji} {notification.title}",
-                "blocks": [
-                    {
-                        "type": "header",
-                        "text": {
-                            "type": "plain_text",
-                            "text": f"{emoji} {notification.title}",
-                            "emoji": True
-                        }
-                    },
-                    {
-                        "type": "section",
-                        "fields": [
-                            {
-                                "type": "mrkdwn",
-                                "text": f"*사용자:*\n{username}"
-                            },
-                            {
-                                "type": "mrkdwn",
-                                "text": f"*타입:*\n{notification.notification_type}"
-                            }
-                        ]
-                    },
-                    {
-                        "type": "section",
-                        "text": {
-                            "type": "mrkdwn",
-                            "text": f"*메시지:*\n{notification.message}"
-                        }
-                    }
-                ],
-                "attachments": [
-                    {
-                        "color": color,
-                        "footer": "Integrated Test Platform",
-                        "ts": int(notification.created_at.timestamp()) if notification.created_at else None
-                    }
-                ]
-            }
-            
+            webhook_url, username = target
+
             # 관련 테스트 케이스 정보 추가
+            test_case_name = None
             if notification.related_test_case_id:
                 test_case = TestCase.query.get(notification.related_test_case_id)
-                if test_case:
-                    slack_message["blocks"].append({
-                        "type": "section",
-                        "text": {
-                            "type": "mrkdwn",
-                            "text": f"*관련 테스트 케이스:*\n{test_case.name}"
-                        }
-                    })
-            
-            # 슬랙 웹훅으로 전송
-            response = requests.post(
-                slack_webhook_url,
-                json=slack_message,
-                timeout=5
-            )
-            
-            if response.status_code == 200:
-                logger.info(f"슬랙 알림 전송 성공: User {user_id}, Notification {notification.id}")
-            else:
-                logger.warning(f"슬랙 알림 전송 실패: Status {response.status_code}, Response: {response.text}")
-                
-        except requests.exceptions.RequestException as e:
-            logger.error(f"슬랙 웹훅 요청 오류: {str(e)}")
+                test_case_name = test_case.name if test_case else None
+
+            slack_delivery_service.enqueue(webhook_url, self._slack_entry(notification, username, test_case_name))
         except Exception as e:
             logger.error(f"슬랙 알림 전송 오류: {str(e)}", exc_info=True)
     
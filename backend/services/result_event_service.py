@@ -0,0 +1,295 @@
+"""
+테스트 결과 이벤트 버스
+TestResult 저장 이후의 후속 처리(알림, 슬랙, 실시간 전송, 대시보드 요약, CI/CD 반영)를 실행 태스크에서 분리
+
+- 결과 한 건당 Redis 스트림(result_events)에 이벤트를 한 번 발행하고, 소비자별 컨슈머 그룹이 독립적으로 읽는다.
+  한 소비자가 느리거나 실패해도 다른 소비자와 테스트 실행 워커의 처리량에는 영향이 없다.
+- 발행 시 consume_result_events 태스크를 짧은 지연 후 한 번만 예약해 그 사이에 쌓인 이벤트를 묶음으로 처리하고,
+  celery beat가 주기적으로 남은 이벤트와 재시도 대상을 정리한다.
+- 처리에 실패한 이벤트는 ACK하지 않아 RESULT_EVENT_RETRY_IDLE_MS 이후 다시 가져오며,
+  RESULT_EVENT_MAX_DELIVERIES번 실패하면 데드레터 스트림(result_events:dead)으로 옮긴다.
+- Redis를 사용할 수 없으면 발행 시점에 모든 소비자를 바로 실행한다.
+"""
+import json
+import os
+import socket
+import redis
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+RESULT_EVENT_STREAM = 'result_events'
+RESULT_EVENT_DEAD_STREAM = 'result_events:dead'
+# 이 키가 있는 동안에는 소비 태스크를 다시 예약하지 않음 (발행이 몰려도 묶음 처리)
+DRAIN_SCHEDULED_KEY = 'result_events:drain_scheduled'
+DRAIN_DELAY_SECONDS = float(os.environ.get('RESULT_EVENT_DRAIN_DELAY', 0.5))
+# 스트림 최대 길이 (근사치 트리밍)
+STREAM_MAXLEN = int(os.environ.get('RESULT_EVENT_STREAM_MAXLEN', 100000))
+DEAD_STREAM_MAXLEN = 10000
+# 소비자가 한 번에 처리하는 이벤트 수 / 한 번의 소비 태스크에서 그룹당 최대 반복 횟수
+CONSUME_BATCH_SIZE = int(os.environ.get('RESULT_EVENT_BATCH_SIZE', 100))
+MAX_BATCHES_PER_DRAIN = 20
+# ACK되지 않은 이벤트를 다시 처리하기까지의 유휴 시간 / 최대 전달 횟수
+RETRY_IDLE_MS = int(os.environ.get('RESULT_EVENT_RETRY_IDLE_MS', 30000))
+MAX_DELIVERIES = int(os.environ.get('RESULT_EVENT_MAX_DELIVERIES', 5))
+
+# 이벤트 유형
+TEST_RESULT_EVENT = 'test_result'
+BATCH_COMPLETED_EVENT = 'batch_completed'
+
+
+class PartialEventFailure(Exception):
+    """묶음 중 일부만 실패했을 때 처리 함수가 던지는 예외 (실패한 이벤트만 재시도)"""
+
+    def __init__(self, failed_event_ids, message):
+        super().__init__(message)
+        self.failed_event_ids = set(failed_event_ids)
+
+
+def _consume_notifications(events):
+    from services.notification_service import notification_service
+    notification_service.notify_test_results([e for e in events if e['type'] == TEST_RESULT_EVENT])
+
+
+def _consume_slack(events):
+    from services.notification_service import notification_service
+    notification_service.send_test_result_slack([e for e in events if e['type'] == TEST_RESULT_EVENT])
+
+
+def _consume_socket(events):
+    from socketio_handlers import emit_test_results
+    results = [e for e in events if e['type'] == TEST_RESULT_EVENT]
+    if results:
+        emit_test_results(results)
+
+
+def _consume_summary(events):
+    """결과가 들어온 묶음당 한 번 대시보드 관련 캐시 무효화 (카운터는 테스트 케이스 저장 시 이미 갱신됨)"""
+    if not any(e['type'] == TEST_RESULT_EVENT for e in events):
+        return
+    from services.cache_service import cache_service, list_tag, DASHBOARD_TAG, SUMMARY_TAG
+    cache_service.invalidate_tags(list_tag('testresult'), DASHBOARD_TAG, SUMMARY_TAG)
+
+
+def _consume_cicd(events):
+    """CI/CD 실행 기록 반영 (PR 코멘트를 다시 달지 않도록 실패한 건만 재시도)"""
+    from services.cicd_service import cicd_service
+    failed = []
+    for event in events:
+        if event['type'] != BATCH_COMPLETED_EVENT or not event.get('execution_id'):
+            continue
+        if not cicd_service.update_execution_with_results(int(event['execution_id']), event.get('results', [])):
+            failed.append(event)
+    if failed:
+        raise PartialEventFailure(
+            [event['event_id'] for event in failed],
+            f"CI/CD 실행 기록 업데이트 실패: {[event['execution_id'] for event in failed]}"
+        )
+
+
+# 컨슈머 그룹 → 처리 함수 (이벤트 목록을 받음, 예외를 던지면 재시도, PartialEventFailure면 해당 건만 재시도)
+CONSUMERS = {
+    'notifications': _consume_notifications,
+    'slack': _consume_slack,
+    'socket': _consume_socket,
+    'summary': _consume_summary,
+    'cicd': _consume_cicd,
+}
+
+
+class ResultEventService:
+    """테스트 결과 이벤트 발행/소비"""
+
+    def __init__(self):
+        self._client = None
+        self._client_pid = None
+        self._groups_ready = False
+        self.consumer_name = f"{socket.gethostname()}-{os.getpid()}"
+
+    def _redis(self):
+        """Redis 클라이언트 (Celery 워커 fork 이후 프로세스별로 생성, 연결 불가 시 None)"""
+        if self._client_pid != os.getpid():
+            self._client_pid = os.getpid()
+            self._groups_ready = False
+            self.consumer_name = f"{socket.gethostname()}-{os.getpid()}"
+            try:
+                client = redis.from_url(os.environ.get('REDIS_URL', 'redis://localhost:6379/0'), decode_responses=True)
+                client.ping()
+                self._client = client
+            except Exception as e:
+                logger.warning(f"결과 이벤트 버스 Redis 연결 실패, 소비자를 즉시 실행: {str(e)}")
+                self._client = None
+        return self._client
+
+    def _ensure_groups(self, client):
+        if self._groups_ready:
+            return
+        for group in CONSUMERS:
+            try:
+                client.xgroup_create(RESULT_EVENT_STREAM, group, id='0', mkstream=True)
+            except redis.exceptions.ResponseError as e:
+                if 'BUSYGROUP' not in str(e):
+                    raise
+        self._groups_ready = True
+
+    # ---- 발행 ----
+
+    def publish(self, event_type, payload):
+        """
+        이벤트 발행 (결과 한 건당 한 번)
+
+        Args:
+            event_type: TEST_RESULT_EVENT 또는 BATCH_COMPLETED_EVENT
+            payload: JSON 직렬화 가능한 dict
+        """
+        event = dict(payload, type=event_type, event_id=None)
+        client = self._redis()
+        if client is not None:
+            try:
+                self._ensure_groups(client)
+                client.xadd(
+                    RESULT_EVENT_STREAM,
+                    {'type': event_type, 'payload': json.dumps(payload, ensure_ascii=False, default=str)},
+                    maxlen=STREAM_MAXLEN,
+                    approximate=True
+                )
+                self._schedule_drain(client)
+                return
+            except Exception as e:
+                logger.error(f"결과 이벤트 발행 실패, 소비자를 즉시 실행: {str(e)}")
+        self._run_inline(event)
+
+    def _schedule_drain(self, client):
+        """DRAIN_DELAY_SECONDS 안에 발행된 이벤트를 한 번의 소비 태스크로 묶음"""
+        if not client.set(DRAIN_SCHEDULED_KEY, 1, nx=True, px=int(DRAIN_DELAY_SECONDS * 1000)):
+            return
+        try:
+            from tasks import consume_result_events
+            consume_result_events.apply_async(countdown=DRAIN_DELAY_SECONDS)
+        except Exception as e:
+            # 예약에 실패해도 beat 주기 작업이 처리
+            logger.warning(f"결과 이벤트 소비 태스크 예약 실패: {str(e)}")
+
+    def _run_inline(self, event):
+        for group, handler in CONSUMERS.items():
+            try:
+                handler([event])
+            except Exception as e:
+                logger.error(f"결과 이벤트 처리 오류 ({group}): {str(e)}")
+
+    # ---- 소비 ----
+
+    @staticmethod
+    def _decode(message_id, fields):
+        event = json.loads(fields.get('payload') or '{}')
+        event['type'] = fields.get('type')
+        event['event_id'] = message_id
+        return event
+
+    def drain(self):
+        """
+        모든 컨슈머 그룹의 재시도 대상과 새 이벤트를 처리 (앱 컨텍스트 안에서 호출)
+
+        Returns:
+            dict: {그룹: {'processed', 'failed', 'dead'}}
+        """
+        client = self._redis()
+        if client is None:
+            return {}
+        self._ensure_groups(client)
+        return {group: self._drain_group(client, group, handler) for group, handler in CONSUMERS.items()}
+
+    def _drain_group(self, client, group, handler):
+        counts = {'processed': 0, 'failed': 0, 'dead': 0}
+
+        # 1. 다른 소비자(중단된 워커 포함)가 ACK하지 않고 오래 둔 이벤트를 가져와 재시도
+        claimed = client.xautoclaim(
+            RESULT_EVENT_STREAM, group, self.consumer_name,
+            min_idle_time=RETRY_IDLE_MS, start_id='0-0', count=CONSUME_BATCH_SIZE
+        )[1]
+        claimed = [(message_id, fields) for message_id, fields in claimed if fields]
+        if claimed:
+            deliveries = {
+                entry['message_id']: entry['times_delivered']
+                for entry in client.xpending_range(
+                    RESULT_EVENT_STREAM, group, min=claimed[0][0], max=claimed[-1][0],
+                    count=len(claimed) * 2, consumername=self.consumer_name
+                )
+            }
+            retry = []
+            for message_id, fields in claimed:
+                if deliveries.get(message_id, 0) > MAX_DELIVERIES:
+                    self._dead_letter(client, group, message_id, fields)
+                    counts['dead'] += 1
+                else:
+                    retry.append((message_id, fields))
+            self._process(client, group, handler, retry, counts)
+
+        # 2. 새 이벤트
+        for _ in range(MAX_BATCHES_PER_DRAIN):
+            response = client.xreadgroup(
+                group, self.consumer_name, {RESULT_EVENT_STREAM: '>'}, count=CONSUME_BATCH_SIZE
+            )
+            messages = response[0][1] if response else []
+            if not messages:
+                break
+            self._process(client, group, handler, messages, counts)
+            if len(messages) < CONSUME_BATCH_SIZE:
+                break
+        return counts
+
+    def _process(self, client, group, handler, messages, counts):
+        """묶음 처리, 실패하면 건별로 다시 처리해 성공한 이벤트만 ACK (ACK하지 않은 이벤트는 RETRY_IDLE_MS 이후 재시도)"""
+        if not messages:
+            return
+        events = [self._decode(message_id, fields) for message_id, fields in messages]
+        try:
+            handler(events)
+            client.xack(RESULT_EVENT_STREAM, group, *[event['event_id'] for event in events])
+            counts['processed'] += len(events)
+            return
+        except PartialEventFailure as e:
+            logger.error(f"결과 이벤트 일부 처리 실패 ({group}): {str(e)}")
+            self._rollback()
+            succeeded = [event['event_id'] for event in events if event['event_id'] not in e.failed_event_ids]
+            if succeeded:
+                client.xack(RESULT_EVENT_STREAM, group, *succeeded)
+            counts['processed'] += len(succeeded)
+            counts['failed'] += len(events) - len(succeeded)
+            return
+        except Exception as e:
+            logger.warning(f"결과 이벤트 묶음 처리 실패 ({group}), 건별 재처리: {str(e)}")
+            self._rollback()
+
+        for event in events:
+            try:
+                handler([event])
+                client.xack(RESULT_EVENT_STREAM, group, event['event_id'])
+                counts['processed'] += 1
+            except Exception as e:
+                # ACK하지 않으면 RETRY_IDLE_MS 이후 재시도
+                logger.error(f"결과 이벤트 처리 실패 ({group}, {event['event_id']}): {str(e)}")
+                self._rollback()
+                counts['failed'] += 1
+
+    @staticmethod
+    def _rollback():
+        from models import db
+        db.session.rollback()
+
+    def _dead_letter(self, client, group, message_id, fields):
+        """최대 전달 횟수를 넘긴 이벤트를 데드레터 스트림으로 옮기고 ACK"""
+        pipe = client.pipeline()
+        pipe.xadd(
+            RESULT_EVENT_DEAD_STREAM,
+            dict(fields, group=group, event_id=message_id),
+            maxlen=DEAD_STREAM_MAXLEN,
+            approximate=True
+        )
+        pipe.xack(RESULT_EVENT_STREAM, group, message_id)
+        pipe.execute()
+        logger.error(f"결과 이벤트 데드레터 이동 ({group}, {message_id})")
+
+
+# 전역 결과 이벤트 서비스 인스턴스
+result_event_service = ResultEventService()
@@ -0,0 +1,329 @@
+"""
+테스트 스크립트 트리 인덱스 서비스
+test-scripts 폴더의 경로/크기/수정 시각/유형/인코딩을 메모리에 보관해 탐색기 API가 요청마다 폴더를 다시 순회하지 않도록 함
+
+- watchdog이 설치되어 있으면 파일 시스템 이벤트로, 없거나 SCRIPT_TREE_WATCH=0이면 SCRIPT_TREE_POLL_INTERVAL 간격의 mtime 폴링으로 갱신
+- 재스캔 시 크기/수정 시각이 같은 파일은 이전 항목(감지한 인코딩 포함)을 그대로 사용
+- 디렉토리별 지문(fingerprint)은 응답에 드러나는 값(하위 항목의 이름/유형/크기/수정 시각/권한, 하위 디렉토리의 수정 시각과
+  숨김 파일을 포함한 항목 수)으로 계산해 ETag로 사용 (워커 간에도 동일)
+"""
+import codecs
+import hashlib
+import os
+import threading
+import time
+from datetime import datetime
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    WATCHDOG_AVAILABLE = False
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+TEST_SCRIPTS_ROOT = os.path.join(PROJECT_ROOT, 'test-scripts')
+# watchdog 사용 여부 (그린 스레드 서버에서는 wsgi.py가 0으로 설정해 폴링 사용)
+SCRIPT_TREE_WATCH = os.environ.get('SCRIPT_TREE_WATCH', '1').lower() not in ('0', 'false', 'no')
+# watchdog이 없을 때 변경 여부를 다시 확인하는 최소 간격(초)
+SCRIPT_TREE_POLL_INTERVAL = float(os.environ.get('SCRIPT_TREE_POLL_INTERVAL', 5))
+# 인코딩을 감지해 둘 텍스트 파일 확장자
+TEXT_EXTENSIONS = {'.js', '.mjs', '.cjs', '.ts', '.py', '.json', '.md', '.txt', '.env', '.yaml', '.yml', '.feature', '.sh', '.csv'}
+# 인코딩 감지 시 읽는 최대 바이트 수
+ENCODING_SNIFF_BYTES = 64 * 1024
+CANDIDATE_ENCODINGS = ('utf-8', 'cp949')
+
+
+def file_category(name):
+    """파일 확장자에 따른 분류 (script, image, system, other)"""
+    ext = os.path.splitext(name)[1].lower()
+    if ext in ['.js', '.py', '.json', '.md', '.spec.js']:
+        return 'script'
+    if ext in ['.png', '.jpg', '.jpeg', '.gif']:
+        return 'image'
+    if ext in ['.DS_Store']:
+        return 'system'
+    return 'other'
+
+
+def detect_encoding(path):
+    """텍스트 파일 앞부분으로 인코딩 감지 (utf-8 → cp949 → latin-1)"""
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(ENCODING_SNIFF_BYTES)
+    except OSError:
+        return None
+    for encoding in CANDIDATE_ENCODINGS:
+        try:
+            # 잘린 멀티바이트 문자가 끝에 있어도 오류가 나지 않도록 증분 디코더 사용
+            codecs.getincrementaldecoder(encoding)().decode(head, final=False)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    return 'latin-1'
+
+
+def _fingerprint(parts):
+    return hashlib.sha1('\n'.join(parts).encode('utf-8')).hexdigest()[:20]
+
+
+class _ChangeHandler(FileSystemEventHandler if WATCHDOG_AVAILABLE else object):
+    """
+    생성/삭제/수정/이동 이벤트가 오면 다음 조회 때 재스캔하도록 표시
+
+    inotify 감시는 파일을 읽기만 해도 opened/closed 이벤트를 보내므로 on_any_event는 쓰지 않는다
+    (트리 서비스 자신의 내용 읽기가 재스캔을 일으키지 않도록).
+    """
+
+    def __init__(self, service):
+        super().__init__()
+        self.service = service
+
+    def on_created(self, event):
+        self.service.mark_dirty()
+
+    def on_deleted(self, event):
+        self.service.mark_dirty()
+
+    def on_modified(self, event):
+        self.service.mark_dirty()
+
+    def on_moved(self, event):
+        self.service.mark_dirty()
+
+
+class ScriptTreeService:
+    """test-scripts 트리 메모리 인덱스"""
+
+    def __init__(self, root=TEST_SCRIPTS_ROOT):
+        self.root = root
+        # 상대 경로('' = 루트) → 항목
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._dirty = True
+        self._last_scan = 0.0
+        self._observer = None
+        self._stats_cache = (None, None)
+
+    # ---- 인덱스 갱신 ----
+
+    def start(self):
+        """초기 스캔과 파일 감시 시작 (앱 시작 시 한 번)"""
+        if WATCHDOG_AVAILABLE and SCRIPT_TREE_WATCH and self._observer is None and os.path.isdir(self.root):
+            try:
+                observer = Observer()
+                observer.schedule(_ChangeHandler(self), self.root, recursive=True)
+                observer.daemon = True
+                observer.start()
+                self._observer = observer
+                logger.info(f"test-scripts 파일 감시 시작: {self.root}")
+            except Exception as e:
+                logger.warning(f"test-scripts 파일 감시 시작 실패, mtime 폴링 사용: {str(e)}")
+        threading.Thread(target=self.refresh, name='script-tree-scan', daemon=True).start()
+
+    def mark_dirty(self):
+        self._dirty = True
+
+    def _needs_scan(self):
+        if not self._entries:
+            return True
+        if self._observer is not None:
+            return self._dirty
+        return time.monotonic() - self._last_scan >= SCRIPT_TREE_POLL_INTERVAL
+
+    def refresh(self, force=False):
+        """변경이 있을 수 있으면 다시 스캔 (파일 감시 중이면 이벤트가 있을 때만)"""
+        if not force and not self._needs_scan():
+            return
+        with self._lock:
+            if not force and not self._needs_scan():
+                return
+            # 스캔 도중 들어온 이벤트를 놓치지 않도록 먼저 표시를 지움
+            self._dirty = False
+            started = time.monotonic()
+            entries = {}
+            if os.path.isdir(self.root):
+                self._scan_directory(self.root, '', os.stat(self.root), entries, ())
+            self._entries = entries
+            self._last_scan = time.monotonic()
+            logger.debug(f"test-scripts 스캔: {len(entries)}개 항목, {self._last_scan - started:.3f}초")
+
+    def _scan_directory(self, path, relative, stat_info, entries, ancestors):
+        """scandir로 한 번 순회하며 항목 구성, 디렉토리 지문 반환"""
+        previous = self._entries
+        # 심볼릭 링크로 상위 디렉토리를 다시 가리키는 순환 방지
+        ancestors = ancestors + ((stat_info.st_dev, stat_info.st_ino),)
+        children, parts, entry_count = [], [], 0
+        try:
+            with os.scandir(path) as iterator:
+                dir_entries = list(iterator)
+        except OSError as e:
+            logger.warning(f"디렉토리 스캔 실패: {path} ({str(e)})")
+            dir_entries = []
+
+        for dir_entry in dir_entries:
+            entry_count += 1
+            # 숨김 파일 제외
+            if dir_entry.name.startswith('.'):
+                continue
+            child_relative = os.path.join(relative, dir_entry.name) if relative else dir_entry.name
+            try:
+                child_stat = dir_entry.stat()
+                is_dir = dir_entry.is_dir()
+            except OSError:
+                continue
+            if is_dir:
+                if (child_stat.st_dev, child_stat.st_ino) in ancestors:
+                    continue
+                # 하위 지문에는 숨김 파일을 포함한 항목 수(children_count)가, 여기에는 디렉토리 자신의 수정 시각/권한이 반영됨
+                child_fingerprint = 'd:{}:{}:{}'.format(
+                    child_stat.st_mtime_ns, child_stat.st_mode,
+                    self._scan_directory(dir_entry.path, child_relative, child_stat, entries, ancestors)
+                )
+            else:
+                old = previous.get(child_relative)
+                if old and old['type'] == 'file' and old['mtime_ns'] == child_stat.st_mtime_ns and old['size'] == child_stat.st_size:
+                    entries[child_relative] = old
+                else:
+                    entries[child_relative] = {
+                        'name': dir_entry.name,
+                        'type': 'file',
+                        'size': child_stat.st_size,
+                        'mtime_ns': child_stat.st_mtime_ns,
+                        'mode': child_stat.st_mode,
+                        'category': file_category(dir_entry.name),
+                        'encoding': detect_encoding(dir_entry.path)
+                        if os.path.splitext(dir_entry.name)[1].lower() in TEXT_EXTENSIONS else None
+                    }
+                child_fingerprint = f"f:{child_stat.st_mtime_ns}:{child_stat.st_size}:{child_stat.st_mode}"
+            children.append(child_relative)
+            parts.append(f"{dir_entry.name}/{child_fingerprint}")
+
+        # 파일 먼저, 이름순 (기존 탐색 API 정렬과 동일)
+        children.sort(key=lambda child: (entries[child]['type'] == 'directory', entries[child]['name'].lower()))
+        parts.sort()
+        fingerprint = _fingerprint([f"entries:{entry_count}"] + parts)
+        entries[relative] = {
+            'name': os.path.basename(path),
+            'type': 'directory',
+            'mtime_ns': stat_info.st_mtime_ns,
+            'mode': stat_info.st_mode,
+            'children': children,
+            # 숨김 파일을 포함한 전체 하위 항목 수
+            'entry_count': entry_count,
+            'fingerprint': fingerprint
+        }
+        return fingerprint
+
+    # ---- 조회 ----
+
+    def _snapshot(self):
+        self.refresh()
+        return self._entries
+
+    def _absolute(self, relative):
+        return os.path.join(self.root, relative) if relative else self.root
+
+    def to_relative(self, full_path):
+        """절대 경로 → 인덱스 키 (test-scripts 밖이면 None)"""
+        normalized = os.path.normpath(full_path)
+        if normalized == self.root:
+            return ''
+        if not normalized.startswith(self.root + os.sep):
+            return None
+        return os.path.relpath(normalized, self.root)
+
+    def get(self, relative):
+        return self._snapshot().get(relative)
+
+    def fingerprint(self):
+        """트리 전체 지문 (루트 디렉토리 지문)"""
+        root = self._snapshot().get('')
+        return root['fingerprint'] if root else None
+
+    def describe(self, relative, entry=None):
+        """기존 get_file_info / get_directory_info와 같은 형식의 항목 정보"""
+        entry = entry or self.get(relative)
+        if entry is None:
+            return None
+        info = {
+            'name': entry['name'],
+            'path': self._absolute(relative),
+            'type': entry['type'],
+        }
+        if entry['type'] == 'file':
+            info['size'] = entry['size']
+        info['modified'] = datetime.fromtimestamp(entry['mtime_ns'] / 1e9).isoformat()
+        info['permissions'] = oct(entry['mode'])[-3:]
+        if entry['type'] == 'file':
+            info['category'] = entry['category']
+        else:
+            info['children_count'] = entry['entry_count']
+        return info
+
+    def list_directory(self, relative):
+        """디렉토리 내용 (탐색 API 응답 형식), 없으면 None"""
+        entries = self._snapshot()
+        entry = entries.get(relative)
+        if entry is None or entry['type'] != 'directory':
+            return None
+        items = [self.describe(child, entries[child]) for child in entry['children']]
+        return {
+            'path': self._absolute(relative),
+            'type': 'directory',
+            'children': items,
+            'total_count': len(items)
+        }
+
+    def iter_files(self):
+        """(상대 경로, 항목) 목록"""
+        return [(relative, entry) for relative, entry in self._snapshot().items() if entry['type'] == 'file']
+
+    def stats(self):
+        """폴더 통계 (지문이 같으면 이전 계산 결과 재사용)"""
+        entries = self._snapshot()
+        root = entries.get('')
+        fingerprint = root['fingerprint'] if root else None
+        cached_fingerprint, cached_stats = self._stats_cache
+        if cached_stats is not None and cached_fingerprint == fingerprint:
+            return cached_stats
+
+        stats = {
+            'total_files': 0,
+            'total_directories': 0,
+            'total_size': 0,
+            'file_types': {},
+            'directory_structure': {}
+        }
+        for relative, entry in sorted(entries.items()):
+            if not relative:
+                continue
+            if entry['type'] == 'directory':
+                stats['total_directories'] += 1
+                # 최대 3단계까지만 기록
+                if relative.count(os.sep) < 3 and entry['name'] not in stats['directory_structure']:
+                    stats['directory_structure'][entry['name']] = {
+                        'type': 'directory',
+                        'children_count': len(entry['children']),
+                        'subdirectories': [
+                            entries[child]['name'] for child in entry['children']
+                            if entries[child]['type'] == 'directory'
+                        ][:5]  # 최대 5개만
+                    }
+            else:
+                stats['total_files'] += 1
+                stats['total_size'] += entry['size']
+                file_ext = os.path.splitext(entry['name'])[1].lower() or 'no_extension'
+                stats['file_types'][file_ext] = stats['file_types'].get(file_ext, 0) + 1
+
+        stats['file_types'] = dict(sorted(stats['file_types'].items(), key=lambda x: x[1], reverse=True))
+        stats['directory_structure'] = dict(sorted(stats['directory_structure'].items(), key=lambda x: x[0].lower()))
+        self._stats_cache = (fingerprint, stats)
+        return stats
+
+
+# 전역 테스트 스크립트 트리 서비스 인스턴스
+script_tree_service = ScriptTreeService()
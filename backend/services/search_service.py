@@ -0,0 +1,488 @@
+"""
+검색 서비스
+테스트 케이스, 템플릿, 성능 테스트, test-scripts 파일을 하나의 역색인(search_documents)으로 검색
+
+- 토큰화: 한글/한자/가나는 2글자 n-gram, 영문/숫자는 camelCase를 나눈 단어 단위 (조사가 붙어도 검색되도록)
+- 인덱스: SQLite는 FTS5(외부 콘텐츠 + 트리거), MySQL은 ngram 파서 FULLTEXT, PostgreSQL은 tsvector(GIN)
+  사용할 수 없으면 토큰 컬럼 LIKE 검색으로 대체
+- 갱신: DB 원본은 after_flush 이벤트에서 증분 반영, 대량 저장(bulk insert)은 sync()로 동기화
+  스크립트 파일은 test-scripts 트리 인덱스(script_tree_service)의 지문이 바뀌면 검색 시 변경분만 재색인
+"""
+import json
+import os
+import re
+import threading
+import unicodedata
+from datetime import datetime, timedelta
+from sqlalchemy import event, inspect as sa_inspect, text, select, func, and_, or_, bindparam, column, literal_column, table
+from sqlalchemy.dialects.mysql import match as mysql_match
+from sqlalchemy.orm import Session
+from models import db, SearchDocument, TestCase, TestCaseTemplate, PerformanceTest
+from services.script_tree_service import script_tree_service, PROJECT_ROOT
+from utils.timezone_utils import get_kst_now
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+SCRIPT_EXTENSIONS = {'.js', '.mjs', '.cjs', '.ts', '.py', '.json', '.md', '.yaml', '.yml', '.txt', '.feature', '.sh'}
+SKIPPED_DIRECTORIES = {'node_modules', '__pycache__', 'test-results', 'playwright-report'}
+SCRIPT_MAX_BYTES = 512 * 1024
+SYNC_BATCH_SIZE = 500
+SUMMARY_LENGTH = 200
+TITLE_WEIGHT = 3.0
+
+FTS_TABLE = 'search_documents_fts'
+MYSQL_FULLTEXT_INDEX = 'ft_search_documents_tokens'
+MYSQL_TITLE_FULLTEXT_INDEX = 'ft_search_documents_title'
+PG_VECTOR_COLUMN = 'search_vector'
+
+# SQLite FTS5 외부 콘텐츠 테이블과 동기화 트리거
+SQLITE_FTS_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    f"title_tokens, body_tokens, content='search_documents', content_rowid='id', tokenize='unicode61')",
+    f"CREATE TRIGGER IF NOT EXISTS search_documents_ai AFTER INSERT ON search_documents BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, title_tokens, body_tokens) VALUES (new.id, new.title_tokens, new.body_tokens); END",
+    f"CREATE TRIGGER IF NOT EXISTS search_documents_ad AFTER DELETE ON search_documents BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title_tokens, body_tokens) "
+    f"VALUES ('delete', old.id, old.title_tokens, old.body_tokens); END",
+    f"CREATE TRIGGER IF NOT EXISTS search_documents_au AFTER UPDATE ON search_documents BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title_tokens, body_tokens) "
+    f"VALUES ('delete', old.id, old.title_tokens, old.body_tokens); "
+    f"INSERT INTO {FTS_TABLE}(rowid, title_tokens, body_tokens) VALUES (new.id, new.title_tokens, new.body_tokens); END",
+)
+
+_WORD_RE = re.compile(r'[A-Za-z0-9]+|[ᄀ-ᇿ㄰-㆏가-힣]+|[぀-ヿ㐀-䶿一-鿿]+')
+_CAMEL_RE = re.compile(r'[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+')
+
+# 문서 유형별 원본 모델과 색인 필드 (title, 본문 필드들)
+DOCUMENT_SOURCES = {
+    'testcase': (TestCase, 'name', (
+        'main_category', 'sub_category', 'detail_category', 'description',
+        'pre_condition', 'test_steps', 'expected_result', 'remark'
+    )),
+    'template': (TestCaseTemplate, 'name', (
+        'main_category', 'sub_category', 'detail_category', 'description',
+        'pre_condition', 'test_steps', 'expected_result', 'tags'
+    )),
+    'performance_test': (PerformanceTest, 'name', ('description', 'script_path')),
+}
+_MODEL_DOC_TYPES = {model: doc_type for doc_type, (model, _, _) in DOCUMENT_SOURCES.items()}
+
+
+def tokenize(value):
+    """검색용 토큰 목록 (한글 등은 2-gram, 영문/숫자는 소문자 단어)"""
+    if not value:
+        return []
+    tokens = []
+    for run in _WORD_RE.findall(unicodedata.normalize('NFKC', str(value))):
+        if run.isascii():
+            parts = _CAMEL_RE.findall(run)
+            tokens.extend(part.lower() for part in parts)
+            if len(parts) > 1:
+                tokens.append(run.lower())
+        elif len(run) == 1:
+            tokens.append(run)
+        else:
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return tokens
+
+
+def _query_tokens(query):
+    return list(dict.fromkeys(tokenize(query)))
+
+
+def _tags_text(tags):
+    try:
+        parsed = json.loads(tags)
+        if isinstance(parsed, list):
+            return ' '.join(str(tag) for tag in parsed)
+    except (TypeError, ValueError):
+        pass
+    return tags
+
+
+def _build_document(doc_type, source_key, source_id, title, body_values, source_version):
+    body = '\n'.join(str(v) for v in body_values if v)
+    return {
+        'doc_type': doc_type,
+        'source_key': str(source_key),
+        'source_id': source_id,
+        'title': (title or '')[:500],
+        'summary': ' '.join(body.split())[:SUMMARY_LENGTH],
+        'title_tokens': ' '.join(tokenize(title)),
+        'body_tokens': ' '.join(tokenize(body)),
+        'source_version': source_version,
+        'indexed_at': get_kst_now()
+    }
+
+
+def _source_version(updated_at):
+    return updated_at.replace(tzinfo=None).isoformat(timespec='seconds') if updated_at else None
+
+
+def _same_version(indexed_version, current_version):
+    """원본 버전 비교 (DB에 따라 초 미만이 잘리거나 반올림되므로 1초 오차 허용)"""
+    if indexed_version is None or current_version is None:
+        return indexed_version == current_version
+    try:
+        gap = datetime.fromisoformat(indexed_version) - datetime.fromisoformat(current_version)
+    except ValueError:
+        return False
+    return abs(gap) <= timedelta(seconds=1)
+
+
+def _model_document(doc_type, obj):
+    _, title_field, body_fields = DOCUMENT_SOURCES[doc_type]
+    body_values = []
+    for field in body_fields:
+        value = getattr(obj, field, None)
+        body_values.append(_tags_text(value) if field == 'tags' else value)
+    return _build_document(
+        doc_type, obj.id, obj.id, getattr(obj, title_field), body_values,
+        _source_version(getattr(obj, 'updated_at', None))
+    )
+
+
+class SearchService:
+    """역색인 관리와 순위 검색"""
+
+    def __init__(self):
+        self._backend = None
+        self._backend_lock = threading.Lock()
+        self._synced_script_fingerprint = None
+        # 원본 행이 모두 색인된 것을 확인한 문서 유형 (이후에는 after_flush가 증분 반영)
+        self._synced_doc_types = set()
+
+    # ---- 인덱스 준비 ----
+
+    def ensure_index(self):
+        """DB별 전문 검색 인덱스를 준비하고 사용할 방식 반환 (프로세스당 한 번)"""
+        if self._backend is not None:
+            return self._backend
+        with self._backend_lock:
+            if self._backend is None:
+                try:
+                    self._backend = self._prepare_backend()
+                except Exception as e:
+                    db.session.rollback()
+                    logger.warning(f"전문 검색 인덱스 준비 실패, LIKE 검색 사용: {str(e)}")
+                    self._backend = 'like'
+                logger.info(f"검색 인덱스 방식: {self._backend}")
+        return self._backend
+
+    def _prepare_backend(self):
+        dialect = db.engine.dialect.name
+        if dialect == 'sqlite':
+            exists = db.session.execute(text(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"
+            ), {'name': FTS_TABLE}).first()
+            if not exists:
+                for statement in SQLITE_FTS_DDL:
+                    db.session.execute(text(statement))
+                # 이미 저장된 문서를 FTS 인덱스에 채움
+                db.session.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+                db.session.commit()
+            return 'fts5'
+        if dialect == 'mysql':
+            indexes = {index['name'] for index in sa_inspect(db.engine).get_indexes(SearchDocument.__tablename__)}
+            return 'mysql_fulltext' if {MYSQL_FULLTEXT_INDEX, MYSQL_TITLE_FULLTEXT_INDEX} <= indexes else 'like'
+        if dialect == 'postgresql':
+            columns = {column['name'] for column in sa_inspect(db.engine).get_columns(SearchDocument.__tablename__)}
+            return 'tsvector' if PG_VECTOR_COLUMN in columns else 'like'
+        return 'like'
+
+    # ---- 문서 쓰기 ----
+
+    @staticmethod
+    def write_documents(connection, documents):
+        """문서 교체 (같은 유형/키의 기존 문서를 지우고 다시 삽입, 인덱스는 DB가 갱신)"""
+        if not documents:
+            return
+        doc_table = SearchDocument.__table__
+        keys_by_type = {}
+        for document in documents:
+            keys_by_type.setdefault(document['doc_type'], []).append(document['source_key'])
+        for doc_type, keys in keys_by_type.items():
+            connection.execute(doc_table.delete().where(and_(
+                doc_table.c.doc_type == doc_type,
+                doc_table.c.source_key.in_(keys)
+            )))
+        connection.execute(doc_table.insert(), documents)
+
+    @staticmethod
+    def delete_documents(connection, doc_type, source_keys):
+        if not source_keys:
+            return
+        doc_table = SearchDocument.__table__
+        connection.execute(doc_table.delete().where(and_(
+            doc_table.c.doc_type == doc_type,
+            doc_table.c.source_key.in_([str(key) for key in source_keys])
+        )))
+
+    # ---- 동기화 ----
+
+    def _indexed_versions(self, doc_type):
+        return dict(db.session.query(
+            SearchDocument.source_key, SearchDocument.source_version
+        ).filter(SearchDocument.doc_type == doc_type).all())
+
+    def sync_model(self, doc_type):
+        """DB 원본과 색인을 비교해 추가/변경/삭제분만 반영 (대량 저장 후 또는 초기 색인용)"""
+        model = DOCUMENT_SOURCES[doc_type][0]
+        indexed = self._indexed_versions(doc_type)
+        current = {
+            str(row_id): _source_version(updated_at)
+            for row_id, updated_at in db.session.query(model.id, model.updated_at).all()
+        }
+        changed_ids = [int(key) for key, version in current.items()
+                       if key not in indexed or not _same_version(indexed[key], version)]
+        removed = [key for key in indexed if key not in current]
+
+        connection = db.session.connection()
+        for start in range(0, len(changed_ids), SYNC_BATCH_SIZE):
+            rows = model.query.filter(model.id.in_(changed_ids[start:start + SYNC_BATCH_SIZE])).all()
+            self.write_documents(connection, [_model_document(doc_type, row) for row in rows])
+        self.delete_documents(connection, doc_type, removed)
+        db.session.commit()
+        self._synced_doc_types.add(doc_type)
+        return {'indexed': len(changed_ids), 'removed': len(removed)}
+
+    def is_synced(self, doc_type):
+        """원본 행이 모두 색인되었는지 (배포 직후 백필 전이면 False)"""
+        if doc_type in self._synced_doc_types:
+            return True
+        model = DOCUMENT_SOURCES[doc_type][0]
+        indexed = db.session.query(func.count(SearchDocument.id)).filter(SearchDocument.doc_type == doc_type).scalar()
+        if indexed < db.session.query(func.count(model.id)).scalar():
+            return False
+        self._synced_doc_types.add(doc_type)
+        return True
+
+    @staticmethod
+    def _iter_script_files():
+        """색인 대상 스크립트 (상대 경로, 트리 항목) - 폴더 순회 대신 트리 인덱스 사용"""
+        for relative, entry in script_tree_service.iter_files():
+            if SKIPPED_DIRECTORIES.intersection(relative.split(os.sep)[:-1]):
+                continue
+            if os.path.splitext(entry['name'])[1].lower() not in SCRIPT_EXTENSIONS:
+                continue
+            if entry['size'] <= SCRIPT_MAX_BYTES:
+                yield relative, entry
+
+    def sync_scripts(self):
+        """test-scripts 파일을 mtime/크기로 비교해 바뀐 파일만 다시 읽어 색인"""
+        self._synced_script_fingerprint = script_tree_service.fingerprint()
+        indexed = self._indexed_versions('script')
+        seen, documents, changed = set(), [], 0
+        connection = db.session.connection()
+        for relative, entry in self._iter_script_files():
+            path = os.path.join(script_tree_service.root, relative)
+            relative_path = os.path.relpath(path, PROJECT_ROOT)
+            version = f"{entry['mtime_ns']}:{entry['size']}"
+            seen.add(relative_path)
+            if indexed.get(relative_path) == version:
+                continue
+            try:
+                with open(path, 'r', encoding=entry['encoding'] or 'utf-8', errors='ignore') as f:
+                    content = f.read()
+            except OSError:
+                continue
+            documents.append(_build_document(
+                'script', relative_path, None, relative_path,
+                [entry['name'], content], version
+            ))
+            changed += 1
+            if len(documents) >= SYNC_BATCH_SIZE:
+                self.write_documents(connection, documents)
+                documents = []
+        self.write_documents(connection, documents)
+        removed = [key for key in indexed if key not in seen]
+        self.delete_documents(connection, 'script', removed)
+        db.session.commit()
+        return {'indexed': changed, 'removed': len(removed)}
+
+    def sync(self, doc_types=None):
+        """지정한(기본: 전체) 문서 유형 동기화"""
+        self.ensure_index()
+        result = {}
+        for doc_type in doc_types or list(DOCUMENT_SOURCES) + ['script']:
+            if doc_type == 'script':
+                result[doc_type] = self.sync_scripts()
+            else:
+                result[doc_type] = self.sync_model(doc_type)
+        return result
+
+    def _maybe_sync_scripts(self):
+        # 트리 지문이 바뀌었을 때만 (파일 추가/삭제/수정) 스크립트 색인을 비교
+        if script_tree_service.fingerprint() == self._synced_script_fingerprint:
+            return
+        try:
+            self.sync_scripts()
+        except Exception as e:
+            db.session.rollback()
+            logger.warning(f"스크립트 색인 동기화 실패: {str(e)}")
+
+    # ---- 검색 ----
+
+    def _match_clause(self, backend, tokens):
+        """
+        백엔드별 검색 조건 구성
+
+        Returns:
+            tuple: (FROM 절, WHERE 조건, 점수 표현식 - 클수록 관련도 높음, LIKE 대체 시 None)
+        """
+        doc_table = SearchDocument.__table__
+        # 마지막 토큰은 입력 중인 단어일 수 있으므로 접두어로 검색
+        prefix_last = tokens[-1].isascii() or len(tokens[-1]) == 1
+        if backend == 'fts5':
+            terms = [f'"{token}"' for token in tokens]
+            if prefix_last:
+                terms[-1] += '*'
+            fts = table(FTS_TABLE, column('rowid'))
+            fts_ref = literal_column(FTS_TABLE)
+            return (
+                doc_table.join(fts, fts.c.rowid == doc_table.c.id),
+                fts_ref.op('MATCH')(' '.join(terms)),
+                # bm25는 관련도가 높을수록 작은(음수) 값
+                -func.bm25(fts_ref, literal_column(str(TITLE_WEIGHT)), literal_column('1.0'))
+            )
+        if backend == 'tsvector':
+            terms = list(tokens)
+            if prefix_last:
+                terms[-1] += ':*'
+            vector = literal_column(PG_VECTOR_COLUMN)
+            ts_query = func.to_tsquery('simple', ' & '.join(terms))
+            return doc_table, vector.op('@@')(ts_query), func.ts_rank_cd(vector, ts_query)
+        if backend == 'mysql_fulltext':
+            # ngram 파서는 ngram_token_size(기본 2)보다 짧은 단어를 색인하지 않음
+            terms = [token for token in tokens if len(token) >= 2]
+            if terms:
+                against = ' '.join(f'+"{token}"' for token in terms)
+                return (
+                    doc_table,
+                    mysql_match(doc_table.c.title_tokens, doc_table.c.body_tokens, against=against).in_boolean_mode(),
+                    mysql_match(doc_table.c.title_tokens, against=against).in_boolean_mode() * TITLE_WEIGHT
+                    + mysql_match(doc_table.c.title_tokens, doc_table.c.body_tokens, against=against).in_boolean_mode()
+                )
+
+        # LIKE 대체: 모든 토큰이 제목 또는 본문 토큰에 포함된 문서
+        condition = and_(*[
+            or_(doc_table.c.title_tokens.like(f'%{token}%'), doc_table.c.body_tokens.like(f'%{token}%'))
+            for token in tokens
+        ])
+        return doc_table, condition, None
+
+    def match_ids_query(self, doc_type, query):
+        """
+        검색어에 일치하는 원본 ID SELECT (기존 목록 API의 IN 필터용)
+
+        Returns:
+            Select 또는 None (검색 가능한 토큰이 없거나 아직 색인되지 않은 유형 - 호출한 쪽에서 LIKE 검색으로 대체)
+        """
+        tokens = _query_tokens(query)
+        if not tokens:
+            return None
+        if not self.is_synced(doc_type):
+            logger.warning(f"{doc_type} 검색 색인이 동기화되지 않아 LIKE 검색 사용 (scripts/rebuild_search_index.py 실행 필요)")
+            return None
+        from_clause, condition, _ = self._match_clause(self.ensure_index(), tokens)
+        doc_table = SearchDocument.__table__
+        return select(doc_table.c.source_id).select_from(from_clause).where(
+            doc_table.c.doc_type == doc_type,
+            condition
+        )
+
+    def search(self, query, doc_types=None, limit=20, offset=0):
+        """
+        순위 검색
+
+        Returns:
+            dict: {'results': [{'type', 'id', 'key', 'title', 'summary', 'score'}], 'has_more'}
+        """
+        tokens = _query_tokens(query)
+        if not tokens:
+            return {'results': [], 'has_more': False}
+        backend = self.ensure_index()
+        if not doc_types or 'script' in doc_types:
+            self._maybe_sync_scripts()
+
+        from_clause, condition, score = self._match_clause(backend, tokens)
+        doc_table = SearchDocument.__table__
+        stmt = select(
+            doc_table.c.doc_type, doc_table.c.source_key, doc_table.c.source_id,
+            doc_table.c.title, doc_table.c.summary,
+            (score if score is not None else literal_column('0')).label('score')
+        ).select_from(from_clause).where(condition)
+        if doc_types:
+            stmt = stmt.where(doc_table.c.doc_type.in_(doc_types))
+        if score is not None:
+            stmt = stmt.order_by(score.desc())
+        stmt = stmt.order_by(doc_table.c.id).limit(limit + 1).offset(offset)
+
+        rows = db.session.execute(stmt).all()
+        results = [{
+            'type': row.doc_type,
+            'id': row.source_id,
+            'key': row.source_key,
+            'title': row.title,
+            'summary': row.summary,
+            'score': round(float(row.score), 4) if score is not None else None
+        } for row in rows[:limit]]
+        return {'results': results, 'has_more': len(rows) > limit}
+
+
+# 전역 검색 서비스 인스턴스
+search_service = SearchService()
+
+
+def _indexed_fields_changed(obj, doc_type):
+    _, title_field, body_fields = DOCUMENT_SOURCES[doc_type]
+    state = sa_inspect(obj)
+    return any(state.attrs[field].history.has_changes() for field in (title_field,) + body_fields)
+
+
+@event.listens_for(Session, 'after_flush')
+def _index_changed_documents(session, flush_context):
+    """flush된 테스트 케이스/템플릿/성능 테스트 변경을 같은 트랜잭션에서 색인에 반영"""
+    documents, removed, version_bumps = [], {}, []
+    for obj in session.new:
+        doc_type = _MODEL_DOC_TYPES.get(type(obj))
+        if doc_type:
+            documents.append(_model_document(doc_type, obj))
+    for obj in session.dirty:
+        doc_type = _MODEL_DOC_TYPES.get(type(obj))
+        if not doc_type:
+            continue
+        if _indexed_fields_changed(obj, doc_type):
+            documents.append(_model_document(doc_type, obj))
+        elif sa_inspect(obj).attrs.updated_at.history.has_changes():
+            # 색인 내용은 그대로이고 updated_at만 바뀐 경우 sync()가 다시 색인하지 않도록 버전만 갱신
+            version_bumps.append({
+                'b_doc_type': doc_type,
+                'b_source_key': str(obj.id),
+                'source_version': _source_version(obj.updated_at)
+            })
+    for obj in session.deleted:
+        doc_type = _MODEL_DOC_TYPES.get(type(obj))
+        if doc_type:
+            removed.setdefault(doc_type, []).append(obj.id)
+    if not documents and not removed and not version_bumps:
+        return
+
+    doc_table = SearchDocument.__table__
+    connection = session.connection()
+    try:
+        with connection.begin_nested():
+            search_service.write_documents(connection, documents)
+            if version_bumps:
+                connection.execute(
+                    doc_table.update().where(and_(
+                        doc_table.c.doc_type == bindparam('b_doc_type'),
+                        doc_table.c.source_key == bindparam('b_source_key')
+                    )).values(source_version=bindparam('source_version')),
+                    version_bumps
+                )
+            for doc_type, ids in removed.items():
+                search_service.delete_documents(connection, doc_type, ids)
+    except Exception as e:
+        logger.error(f"검색 색인 갱신 실패 (sync로 보정 필요): {str(e)}")
@@ -0,0 +1,360 @@
+"""
+슬랙 웹훅 전송 서비스
+알림 생성 경로(요청 처리, 결과 이벤트 소비자)에서 슬랙으로 직접 POST하지 않고 웹훅별 대기열에 넣은 뒤 Celery 작업이 전송
+
+- 웹훅별로 SLACK_DIGEST_WINDOW초 동안 쌓인 알림을 하나의 메시지로 합침 (1건이면 기존 단건 형식, 여러 건이면 요약 형식)
+- 프로세스당 하나의 requests.Session(연결 풀)을 재사용
+- 웹훅별 최소 전송 간격(SLACK_RATE_LIMIT_INTERVAL)을 Redis로 워커 간에 공유하고 429 응답의 Retry-After를 따름
+- 전송 실패는 지수 백오프로 재시도하고, SLACK_MAX_ATTEMPTS번 실패하거나 재시도해도 소용없는 응답(4xx)이면
+  데드레터 스트림(slack_deliveries:dead)에 기록
+- Redis를 사용할 수 없으면 호출한 곳에서 바로 한 번 전송
+"""
+import hashlib
+import json
+import os
+import threading
+import redis
+import requests
+from requests.adapters import HTTPAdapter
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 웹훅별 알림을 모으는 시간(초)
+SLACK_DIGEST_WINDOW = float(os.environ.get('SLACK_DIGEST_WINDOW', 10))
+# 같은 웹훅으로 연속 전송할 때의 최소 간격(초) - 슬랙 Incoming Webhook 권장 한도(초당 1건)
+SLACK_RATE_LIMIT_INTERVAL = float(os.environ.get('SLACK_RATE_LIMIT_INTERVAL', 1))
+SLACK_MAX_ATTEMPTS = int(os.environ.get('SLACK_MAX_ATTEMPTS', 5))
+SLACK_RETRY_BASE_DELAY = 5
+SLACK_REQUEST_TIMEOUT = 5
+SLACK_POOL_SIZE = int(os.environ.get('SLACK_POOL_SIZE', 10))
+# 요약 메시지에서 그룹별로 나열할 최대 알림 수 / 섹션 텍스트 최대 길이 (슬랙 제한 3000자)
+DIGEST_MAX_LINES = 15
+SECTION_MAX_CHARS = 2900
+DEAD_STREAM = 'slack_deliveries:dead'
+DEAD_STREAM_MAXLEN = 10000
+
+EMOJI_MAP = {
+    'assignment': '👤',
+    'mention': '💬',
+    'test_failed': '❌',
+    'test_completed': '✅',
+    'test_started': '🚀',
+    'schedule_run': '⏰',
+    'test_status_changed': '🔄'
+}
+
+COLOR_MAP = {
+    'high': '#dc3545',      # 빨간색
+    'medium': '#ffc107',     # 노란색
+    'low': '#17a2b8'         # 파란색
+}
+PRIORITY_ORDER = ['low', 'medium', 'high', 'critical']
+
+# 요약 메시지의 그룹 제목 (알림 타입별)
+DIGEST_TITLES = {
+    'test_failed': '테스트 {count}건 실패',
+    'test_completed': '테스트 {count}건 완료',
+    'test_started': '테스트 {count}건 시작',
+    'schedule_run': '스케줄 실행 {count}건 완료',
+    'test_status_changed': '테스트 케이스 상태 변경 {count}건',
+}
+
+
+def _webhook_hash(webhook_url):
+    return hashlib.sha1(webhook_url.encode('utf-8')).hexdigest()[:16]
+
+
+def _key(name, webhook_hash=None):
+    return f"slack:{name}:{webhook_hash}" if webhook_hash else f"slack:{name}"
+
+
+def build_single_message(entry):
+    """알림 한 건의 슬랙 메시지 (기존 단건 전송 형식)"""
+    emoji = EMOJI_MAP.get(entry.get('notification_type'), '🔔')
+    color = COLOR_MAP.get(entry.get('priority'), '#6c757d')
+    message = {
+        "text": f"{emoji} {entry.get('title')}",
+        "blocks": [
+            {
+                "type": "header",
+                "text": {
+                    "type": "plain_text",
+                    "text": f"{emoji} {entry.get('title')}",
+                    "emoji": True
+                }
+            },
+            {
+                "type": "section",
+                "fields": [
+                    {
+                        "type": "mrkdwn",
+                        "text": f"*사용자:*\n{', '.join(entry.get('usernames') or ['Unknown User'])}"
+                    },
+                    {
+                        "type": "mrkdwn",
+                        "text": f"*타입:*\n{entry.get('notification_type')}"
+                    }
+                ]
+            },
+            {
+                "type": "section",
+                "text": {
+                    "type": "mrkdwn",
+                    "text": f"*메시지:*\n{entry.get('message')}"
+                }
+            }
+        ],
+        "attachments": [
+            {
+                "color": color,
+                "footer": "Integrated Test Platform",
+                "ts": entry.get('ts')
+            }
+        ]
+    }
+    if entry.get('test_case_name'):
+        message["blocks"].append({
+            "type": "section",
+            "text": {
+                "type": "mrkdwn",
+                "text": f"*관련 테스트 케이스:*\n{entry['test_case_name']}"
+            }
+        })
+    return message
+
+
+def build_digest_message(entries):
+    """여러 알림을 (타입, 환경)별로 묶은 요약 메시지 (예: "❌ [dev] 테스트 37건 실패")"""
+    groups = {}
+    for entry in entries:
+        groups.setdefault((entry.get('notification_type'), entry.get('environment')), []).append(entry)
+
+    blocks = [{
+        "type": "header",
+        "text": {"type": "plain_text", "text": f"🔔 알림 {len(entries)}건 요약", "emoji": True}
+    }]
+    summaries = []
+    # 건수가 많은 그룹부터 (슬랙 블록 수 제한 50개)
+    for (notification_type, environment), items in sorted(groups.items(), key=lambda g: -len(g[1]))[:45]:
+        emoji = EMOJI_MAP.get(notification_type, '🔔')
+        title = DIGEST_TITLES.get(notification_type, '알림 {count}건').format(count=len(items))
+        if environment:
+            title = f"[{environment}] {title}"
+        summaries.append(f"{emoji} {title}")
+        lines = [f"*{emoji} {title}*"]
+        for item in items[:DIGEST_MAX_LINES]:
+            lines.append(f"• {item.get('test_case_name') or item.get('title')}")
+        if len(items) > DIGEST_MAX_LINES:
+            lines.append(f"외 {len(items) - DIGEST_MAX_LINES}건")
+        text = '\n'.join(lines)
+        if len(text) > SECTION_MAX_CHARS:
+            text = text[:SECTION_MAX_CHARS] + '…'
+        blocks.append({"type": "section", "text": {"type": "mrkdwn", "text": text}})
+
+    priority = max((entry.get('priority') or 'medium' for entry in entries),
+                   key=lambda p: PRIORITY_ORDER.index(p) if p in PRIORITY_ORDER else 1)
+    return {
+        "text": ', '.join(summaries),
+        "blocks": blocks,
+        "attachments": [
+            {
+                "color": COLOR_MAP.get(priority, '#6c757d'),
+                "footer": "Integrated Test Platform",
+                "ts": max((entry.get('ts') or 0 for entry in entries), default=None) or None
+            }
+        ]
+    }
+
+
+def build_message(entries):
+    """같은 알림(여러 사용자에게 간 동일 알림)은 합친 뒤 1건이면 단건, 여러 건이면 요약 메시지"""
+    merged = {}
+    for entry in entries:
+        key = (entry.get('notification_type'), entry.get('title'), entry.get('message'))
+        if key in merged:
+            usernames = merged[key].setdefault('usernames', [])
+            usernames.extend(u for u in entry.get('usernames') or [] if u not in usernames)
+        else:
+            merged[key] = dict(entry)
+    entries = list(merged.values())
+    return build_single_message(entries[0]) if len(entries) == 1 else build_digest_message(entries)
+
+
+class SlackDeliveryService:
+    """슬랙 웹훅 대기열/요약/재시도 전송"""
+
+    def __init__(self):
+        self._client = None
+        self._client_pid = None
+        self._session = None
+        self._session_pid = None
+        self._session_lock = threading.Lock()
+
+    def _redis(self):
+        """Redis 클라이언트 (프로세스별로 생성, 연결 불가 시 None)"""
+        if self._client_pid != os.getpid():
+            self._client_pid = os.getpid()
+            try:
+                client = redis.from_url(os.environ.get('REDIS_URL', 'redis://localhost:6379/0'), decode_responses=True)
+                client.ping()
+                self._client = client
+            except Exception as e:
+                logger.warning(f"슬랙 전송 대기열 Redis 연결 실패, 즉시 전송: {str(e)}")
+                self._client = None
+        return self._client
+
+    def _http(self):
+        """프로세스당 하나의 연결 풀 세션 (fork 이후 새로 생성)"""
+        if self._session is None or self._session_pid != os.getpid():
+            with self._session_lock:
+                if self._session is None or self._session_pid != os.getpid():
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=SLACK_POOL_SIZE, pool_maxsize=SLACK_POOL_SIZE)
+                    session.mount('https://', adapter)
+                    session.mount('http://', adapter)
+                    self._session = session
+                    self._session_pid = os.getpid()
+        return self._session
+
+    # ---- 대기열 ----
+
+    def enqueue(self, webhook_url, entry):
+        """
+        알림 한 건을 웹훅 대기열에 추가 (SLACK_DIGEST_WINDOW 뒤에 모아서 전송)
+
+        Args:
+            webhook_url: 슬랙 웹훅 URL
+            entry: {'notification_type', 'priority', 'title', 'message', 'usernames',
+                    'test_case_name', 'environment', 'ts'}
+        """
+        client = self._redis()
+        if client is None:
+            self._post_once(webhook_url, build_message([entry]))
+            return
+        webhook_hash = _webhook_hash(webhook_url)
+        try:
+            pipe = client.pipeline()
+            pipe.hset(_key('webhooks'), webhook_hash, webhook_url)
+            pipe.rpush(_key('queue', webhook_hash), json.dumps(entry, ensure_ascii=False, default=str))
+            pipe.execute()
+        except Exception as e:
+            logger.error(f"슬랙 알림 대기열 추가 실패, 즉시 전송: {str(e)}")
+            self._post_once(webhook_url, build_message([entry]))
+            return
+
+        # 창(window)마다 한 번만 전송 작업 예약
+        if client.set(_key('flush_scheduled', webhook_hash), 1, nx=True, px=int(SLACK_DIGEST_WINDOW * 1000)):
+            try:
+                from tasks import flush_slack_digest
+                flush_slack_digest.apply_async(args=[webhook_hash], countdown=SLACK_DIGEST_WINDOW)
+            except Exception as e:
+                client.delete(_key('flush_scheduled', webhook_hash))
+                logger.error(f"슬랙 전송 작업 예약 실패: {str(e)}")
+
+    def flush(self, webhook_hash):
+        """대기열의 알림을 하나의 메시지로 합쳐 전송 (flush_slack_digest 태스크)"""
+        client = self._redis()
+        if client is None:
+            return 0
+        pipe = client.pipeline()
+        pipe.lrange(_key('queue', webhook_hash), 0, -1)
+        pipe.delete(_key('queue', webhook_hash))
+        pipe.hget(_key('webhooks'), webhook_hash)
+        raw_entries, _, webhook_url = pipe.execute()
+        if not raw_entries or not webhook_url:
+            return 0
+        entries = [json.loads(raw) for raw in raw_entries]
+        self.deliver(webhook_hash, build_message(entries), attempt=1, count=len(entries))
+        return len(entries)
+
+    # ---- 전송 ----
+
+    def deliver(self, webhook_hash, message, attempt=1, count=1):
+        """
+        웹훅별 전송 간격을 지켜 메시지 전송, 실패 시 재시도 예약 또는 데드레터 기록
+
+        Returns:
+            bool: 전송 성공 여부 (재시도 예약 시 False)
+        """
+        client = self._redis()
+        if client is None:
+            return False
+        webhook_url = client.hget(_key('webhooks'), webhook_hash)
+        if not webhook_url:
+            return False
+
+        # 다른 워커가 방금 같은 웹훅으로 전송했으면 남은 간격만큼 미룸 (시도 횟수는 그대로)
+        if not client.set(_key('rate', webhook_hash), 1, nx=True, px=int(SLACK_RATE_LIMIT_INTERVAL * 1000)):
+            wait_ms = max(client.pttl(_key('rate', webhook_hash)), 50)
+            self._schedule_retry(webhook_hash, message, attempt, count, wait_ms / 1000)
+            return False
+
+        try:
+            response = self._http().post(webhook_url, json=message, timeout=SLACK_REQUEST_TIMEOUT)
+        except requests.exceptions.RequestException as e:
+            return self._retry_or_dead_letter(webhook_hash, message, attempt, count, f"요청 오류: {str(e)}")
+
+        if response.status_code == 200:
+            logger.info(f"슬랙 알림 전송 성공: {count}건 (webhook {webhook_hash})")
+            return True
+        if response.status_code == 429:
+            try:
+                retry_after = float(response.headers.get('Retry-After', SLACK_RETRY_BASE_DELAY))
+            except ValueError:
+                retry_after = SLACK_RETRY_BASE_DELAY
+            # 슬랙이 제한한 동안 같은 웹훅의 다른 전송도 멈춤
+            client.set(_key('rate', webhook_hash), 1, px=int(retry_after * 1000))
+            return self._retry_or_dead_letter(webhook_hash, message, attempt, count, 'rate limited', delay=retry_after)
+        if response.status_code >= 500:
+            return self._retry_or_dead_letter(webhook_hash, message, attempt, count,
+                                              f"Status {response.status_code}: {response.text[:200]}")
+        # 잘못된 웹훅(404 no_service, 403 등)은 재시도해도 실패
+        self._dead_letter(webhook_hash, message, attempt, count, f"Status {response.status_code}: {response.text[:200]}")
+        return False
+
+    def _retry_or_dead_letter(self, webhook_hash, message, attempt, count, error, delay=None):
+        if attempt >= SLACK_MAX_ATTEMPTS:
+            self._dead_letter(webhook_hash, message, attempt, count, error)
+            return False
+        logger.warning(f"슬랙 알림 전송 실패, 재시도 예정 ({attempt}/{SLACK_MAX_ATTEMPTS}): {error}")
+        self._schedule_retry(webhook_hash, message, attempt + 1, count,
+                             delay if delay is not None else SLACK_RETRY_BASE_DELAY * (2 ** (attempt - 1)))
+        return False
+
+    def _schedule_retry(self, webhook_hash, message, attempt, count, delay):
+        try:
+            from tasks import send_slack_message
+            send_slack_message.apply_async(args=[webhook_hash, message, attempt, count], countdown=delay)
+        except Exception as e:
+            self._dead_letter(webhook_hash, message, attempt, count, f"재시도 예약 실패: {str(e)}")
+
+    def _dead_letter(self, webhook_hash, message, attempt, count, error):
+        """전송을 포기한 메시지 기록 (웹훅 URL은 비밀값이므로 해시만 남김)"""
+        logger.error(f"슬랙 알림 전송 포기 ({count}건, {attempt}회 시도, webhook {webhook_hash}): {error}")
+        client = self._redis()
+        if client is None:
+            return
+        try:
+            client.xadd(DEAD_STREAM, {
+                'webhook': webhook_hash,
+                'attempts': attempt,
+                'count': count,
+                'error': error,
+                'message': json.dumps(message, ensure_ascii=False, default=str)
+            }, maxlen=DEAD_STREAM_MAXLEN, approximate=True)
+        except Exception as e:
+            logger.error(f"슬랙 데드레터 기록 실패: {str(e)}")
+
+    def _post_once(self, webhook_url, message):
+        """대기열 없이 한 번 전송 (Redis를 사용할 수 없을 때)"""
+        try:
+            response = self._http().post(webhook_url, json=message, timeout=SLACK_REQUEST_TIMEOUT)
+            if response.status_code != 200:
+                logger.warning(f"슬랙 알림 전송 실패: Status {response.status_code}, Response: {response.text}")
+        except requests.exceptions.RequestException as e:
+            logger.error(f"슬랙 웹훅 요청 오류: {str(e)}")
+
+
+# 전역 슬랙 전송 서비스 인스턴스
+slack_delivery_service = SlackDeliveryService()
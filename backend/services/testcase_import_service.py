@@ -0,0 +1,260 @@
+"""
+테스트 케이스 엑셀 가져오기 서비스
+openpyxl read_only 모드로 행을 스트리밍하면서 청크 단위로 검증하고 bulk_insert_mappings로 일괄 저장
+잘못된 행은 건너뛰고 행 번호별 오류 목록으로 보고 (파일 전체를 중단하지 않음)
+"""
+import os
+import tempfile
+from openpyxl import load_workbook
+from models import db, TestCase, Project, Folder
+from services.dashboard_summary_service import dashboard_summary_service
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+IMPORT_CHUNK_SIZE = 1000
+# 응답에 포함할 최대 행 오류 수 (전체 실패 건수는 별도로 집계)
+MAX_ERROR_REPORTS = 1000
+# 이 크기 이상의 파일은 Celery 작업으로 처리
+ASYNC_IMPORT_THRESHOLD_BYTES = int(os.environ.get('TESTCASE_IMPORT_ASYNC_THRESHOLD', 2 * 1024 * 1024))
+# 비동기 처리용 업로드 파일 저장 경로 (웹 서버와 Celery 워커가 공유해야 함)
+IMPORT_UPLOAD_DIR = os.environ.get('TESTCASE_IMPORT_DIR', os.path.join(tempfile.gettempdir(), 'tms-testcase-imports'))
+
+DEFAULT_PROJECT_ID = 1
+
+# 엑셀 컬럼 → (모델 컬럼, 최대 길이) 매핑 (길이 None은 Text)
+STRING_COLUMNS = {
+    'name': 100,
+    'description': None,
+    'main_category': 100,
+    'sub_category': 100,
+    'detail_category': 100,
+    'pre_condition': None,
+    'expected_result': None,
+    'result_status': 20,
+    'remark': None,
+    'test_steps': None,
+    'environment': 50,
+    'automation_code_path': 500,
+    'automation_code_type': 50,
+    'test_type': 50,
+    'priority': 20,
+}
+INTEGER_COLUMNS = ('project_id', 'folder_id')
+COLUMN_DEFAULTS = {
+    'result_status': 'N/T',
+    'environment': 'dev',
+}
+
+
+class TestCaseImportService:
+    """엑셀 파일을 읽어 테스트 케이스를 일괄 생성"""
+
+    @staticmethod
+    def iter_rows(file_obj):
+        """
+        첫 행을 헤더로 보고 (엑셀 행 번호, {헤더: 값}) 를 순서대로 반환
+
+        read_only 모드는 시트를 메모리에 올리지 않고 XML을 순차적으로 읽는다.
+        """
+        workbook = load_workbook(file_obj, read_only=True, data_only=True)
+        try:
+            sheet = workbook.worksheets[0]
+            rows = sheet.iter_rows(values_only=True)
+            header = next(rows, None)
+            if not header:
+                return
+            columns = [str(h).strip() if h is not None else None for h in header]
+            for row_number, values in enumerate(rows, start=2):
+                if values is None or all(v is None or (isinstance(v, str) and not v.strip()) for v in values):
+                    continue
+                yield row_number, {
+                    column: value for column, value in zip(columns, values) if column
+                }
+        finally:
+            workbook.close()
+
+    @staticmethod
+    def _validate_row(row, creator_id):
+        """행 하나를 모델 컬럼 매핑으로 변환. (mapping, 오류 목록) 반환"""
+        errors = []
+        mapping = {}
+
+        for column, max_length in STRING_COLUMNS.items():
+            value = row.get(column)
+            if value is None or (isinstance(value, str) and not value.strip()):
+                value = COLUMN_DEFAULTS.get(column)
+            elif not isinstance(value, str):
+                value = str(value)
+            if value is not None and max_length and len(value) > max_length:
+                errors.append(f"{column}: 최대 {max_length}자까지 입력할 수 있습니다")
+            mapping[column] = value
+
+        for column in INTEGER_COLUMNS:
+            value = row.get(column)
+            if value is None or (isinstance(value, str) and not value.strip()):
+                mapping[column] = None
+                continue
+            try:
+                mapping[column] = int(float(value))
+            except (TypeError, ValueError):
+                errors.append(f"{column}: 숫자여야 합니다 ({value})")
+
+        if mapping.get('project_id') is None:
+            mapping['project_id'] = DEFAULT_PROJECT_ID
+        if not mapping.get('name'):
+            # name은 NOT NULL이므로 카테고리로 대체
+            mapping['name'] = (mapping.get('detail_category') or mapping.get('sub_category')
+                               or mapping.get('main_category') or '')[:100]
+        if not mapping['name']:
+            errors.append('name 또는 카테고리(main/sub/detail_category)가 필요합니다')
+
+        mapping['creator_id'] = creator_id
+        return mapping, errors
+
+    @staticmethod
+    def _check_references(chunk):
+        """청크 전체의 project_id/folder_id 존재 여부를 쿼리 2번으로 확인"""
+        project_ids = {m['project_id'] for _, m in chunk if m.get('project_id') is not None}
+        folder_ids = {m['folder_id'] for _, m in chunk if m.get('folder_id') is not None}
+        existing_projects = {
+            row[0] for row in db.session.query(Project.id).filter(Project.id.in_(project_ids)).all()
+        } if project_ids else set()
+        existing_folders = {
+            row[0] for row in db.session.query(Folder.id).filter(Folder.id.in_(folder_ids)).all()
+        } if folder_ids else set()
+
+        valid, errors = [], []
+        for row_number, mapping in chunk:
+            row_errors = []
+            if mapping.get('project_id') is not None and mapping['project_id'] not in existing_projects:
+                row_errors.append(f"project_id: 존재하지 않는 프로젝트입니다 ({mapping['project_id']})")
+            if mapping.get('folder_id') is not None and mapping['folder_id'] not in existing_folders:
+                row_errors.append(f"folder_id: 존재하지 않는 폴더입니다 ({mapping['folder_id']})")
+            if row_errors:
+                errors.append((row_number, row_errors))
+            else:
+                valid.append((row_number, mapping))
+        return valid, errors
+
+    @staticmethod
+    def _insert_chunk(chunk):
+        """
+        청크를 bulk_insert_mappings로 저장하고 커밋. 실패 시 행 단위로 다시 저장해 문제 행만 보고
+        Returns:
+            tuple: (생성 수, [(행 번호, [오류])])
+        """
+        if not chunk:
+            return 0, []
+        try:
+            mappings = [mapping for _, mapping in chunk]
+            db.session.bulk_insert_mappings(TestCase, mappings)
+            # bulk_insert_mappings는 after_flush 리스너를 거치지 않으므로 대시보드 카운터에 직접 반영
+            dashboard_summary_service.record_inserted(mappings)
+            db.session.commit()
+            return len(chunk), []
+        except Exception as e:
+            db.session.rollback()
+            logger.warning(f"청크 일괄 저장 실패, 행 단위로 재시도: {str(e)}")
+
+        created, errors = 0, []
+        for row_number, mapping in chunk:
+            try:
+                db.session.bulk_insert_mappings(TestCase, [mapping])
+                dashboard_summary_service.record_inserted([mapping])
+                db.session.commit()
+                created += 1
+            except Exception as e:
+                db.session.rollback()
+                errors.append((row_number, [f"저장 실패: {str(e).splitlines()[0]}"]))
+        return created, errors
+
+    def import_file(self, file_obj, creator_id=None, progress_callback=None, chunk_size=IMPORT_CHUNK_SIZE):
+        """
+        엑셀 파일 가져오기
+
+        Args:
+            file_obj: 파일 경로 또는 파일 객체 (.xlsx)
+            creator_id: 생성자 사용자 ID
+            progress_callback: 청크 처리마다 호출되는 함수 (요약 dict 인자)
+            chunk_size: 한 번에 검증/저장할 행 수
+
+        Returns:
+            dict: {'processed', 'created_count', 'failed_count', 'errors': [{'row', 'errors'}], 'errors_truncated'}
+        """
+        summary = {
+            'processed': 0,
+            'created_count': 0,
+            'failed_count': 0,
+            'errors': [],
+            'errors_truncated': False
+        }
+
+        def record_errors(row_errors):
+            summary['failed_count'] += len(row_errors)
+            for row_number, messages in row_errors:
+                if len(summary['errors']) < MAX_ERROR_REPORTS:
+                    summary['errors'].append({'row': row_number, 'errors': messages})
+                else:
+                    summary['errors_truncated'] = True
+
+        def flush(chunk):
+            valid, reference_errors = self._check_references(chunk)
+            created, insert_errors = self._insert_chunk(valid)
+            summary['created_count'] += created
+            record_errors(reference_errors + insert_errors)
+            if progress_callback:
+                progress_callback(summary)
+
+        chunk = []
+        for row_number, row in self.iter_rows(file_obj):
+            summary['processed'] += 1
+            mapping, errors = self._validate_row(row, creator_id)
+            if errors:
+                record_errors([(row_number, errors)])
+                continue
+            chunk.append((row_number, mapping))
+            if len(chunk) >= chunk_size:
+                flush(chunk)
+                chunk = []
+        flush(chunk)
+
+        if summary['created_count']:
+            from services.cache_service import cache_service, list_tag, DASHBOARD_TAG, SUMMARY_TAG
+            cache_service.invalidate_tags(list_tag('testcase'), DASHBOARD_TAG, SUMMARY_TAG)
+            # bulk_insert_mappings는 after_flush 색인 리스너를 거치지 않으므로 새 행을 검색 색인에 반영
+            from services.search_service import search_service
+            try:
+                search_service.sync(['testcase'])
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"가져온 테스트 케이스 검색 색인 실패: {str(e)}")
+
+        logger.info(
+            f"테스트 케이스 가져오기 완료: 처리 {summary['processed']}행, "
+            f"생성 {summary['created_count']}건, 실패 {summary['failed_count']}건"
+        )
+        return summary
+
+    @staticmethod
+    def save_upload(file_storage):
+        """비동기 처리를 위해 업로드 파일을 공유 디렉토리에 저장하고 경로 반환"""
+        os.makedirs(IMPORT_UPLOAD_DIR, exist_ok=True)
+        fd, path = tempfile.mkstemp(suffix='.xlsx', dir=IMPORT_UPLOAD_DIR)
+        with os.fdopen(fd, 'wb') as f:
+            file_storage.save(f)
+        return path
+
+    @staticmethod
+    def get_upload_size(file_storage):
+        """업로드 파일 크기 (스트림 끝으로 이동해 측정 후 원위치)"""
+        stream = file_storage.stream
+        position = stream.tell()
+        stream.seek(0, os.SEEK_END)
+        size = stream.tell()
+        stream.seek(position)
+        return size
+
+
+# 전역 테스트 케이스 가져오기 서비스 인스턴스
+testcase_import_service = TestCaseImportService()
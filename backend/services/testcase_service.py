@@ -1,10 +1,13 @@
 """
 테스트 케이스 서비스 레이어
 """
-from models import db, TestCase, TestResult, Folder
+from datetime import datetime
+from models import db, TestCase, TestResult, Folder, User
 from utils.serializers import serialize_testcase
+from utils.pagination import encode_cursor, decode_cursor, estimate_row_count
 from utils.logger import get_logger
-from sqlalchemy import func
+from sqlalchemy import func, and_, or_
+from sqlalchemy.orm import joinedload, aliased
 
 logger = get_logger(__name__)
 
@@ -12,38 +15,188 @@ logger = get_logger(__name__)
 class TestCaseService:
     """테스트 케이스 관련 비즈니스 로직"""
     
+    # fields= 프로젝션에서 허용하는 컬럼 (serialize_testcase 키와 동일)
+    PROJECTABLE_FIELDS = (
+        'id', 'name', 'description', 'test_type', 'script_path', 'folder_id', 'project_id',
+        'main_category', 'sub_category', 'detail_category', 'pre_condition', 'expected_result',
+        'remark', 'test_steps', 'automation_code_path', 'automation_code_type', 'environment',
+        'result_status', 'creator_id', 'assignee_id', 'created_at', 'updated_at'
+    )
+    RELATION_FIELDS = ('creator_name', 'assignee_name')
+    DEFAULT_LIMIT = 100
+    MAX_LIMIT = 1000
+    # 일괄 변경(bulk_update)에서 허용하는 필드와 요청당 최대 건수, IN 목록 크기
+    BULK_UPDATE_FIELDS = ('result_status', 'status', 'priority', 'assignee_id')
+    BULK_UPDATE_MAX = 5000
+    BULK_UPDATE_CHUNK = 500
+    # 일괄 변경에서 허용하는 값 (프론트엔드 결과 상태 선택지와 모델 기본값, TestCase.status 주석 기준)
+    BULK_UPDATE_CHOICES = {
+        'result_status': ('N/T', 'Pass', 'Fail', 'N/A', 'Block', 'pending'),
+        'status': ('draft', 'active', 'inactive'),
+    }
+
     @staticmethod
-    def get_testcases(page=None, per_page=None, include_relations=False):
-        """테스트 케이스 목록 조회"""
-        if page is None or per_page is None:
-            testcases = TestCase.query.all()
-            return [serialize_testcase(tc, include_relations) for tc in testcases], None
-        
-        # 페이징 처리
+    def parse_fields(fields):
+        """fields 파라미터(콤마 구분 문자열 또는 리스트)를 검증된 필드 목록으로 변환"""
+        if not fields:
+            return None
+        if isinstance(fields, str):
+            fields = [f.strip() for f in fields.split(',') if f.strip()]
+        allowed = TestCaseService.PROJECTABLE_FIELDS + TestCaseService.RELATION_FIELDS
+        invalid = [f for f in fields if f not in allowed]
+        if invalid:
+            raise ValueError(f"지원하지 않는 필드입니다: {', '.join(invalid)}")
+        return list(dict.fromkeys(fields))
+
+    @staticmethod
+    def get_testcases(page=None, per_page=None, include_relations=False,
+                      after=None, limit=None, fields=None, count_mode=None):
+        """
+        테스트 케이스 목록 조회
+
+        - page/per_page가 모두 있으면 기존 OFFSET 페이징 (count_mode 기본 'exact')
+        - 그 외에는 (updated_at, id) 키셋 커서 페이징 (count_mode 기본 'none')
+        - fields가 주어지면 해당 컬럼만 SELECT 하는 프로젝션 쿼리 사용
+        - count_mode: 'exact' | 'estimated' | 'none'
+        """
+        fields = TestCaseService.parse_fields(fields)
+
+        if page is not None and per_page is not None:
+            return TestCaseService._get_testcases_by_page(
+                page, per_page, include_relations, fields, count_mode or 'exact'
+            )
+        return TestCaseService._get_testcases_by_cursor(
+            after, limit, include_relations, fields, count_mode or 'none'
+        )
+
+    @staticmethod
+    def _build_query(include_relations, fields):
+        """프로젝션/관계 로딩이 적용된 기본 쿼리와 행 직렬화 함수 반환"""
+        if fields is None:
+            query = TestCase.query
+            if include_relations:
+                # 작성자/담당자를 행마다 지연 로딩하지 않고 단일 JOIN으로 함께 로드
+                query = query.options(
+                    joinedload(TestCase.creator),
+                    joinedload(TestCase.assignee)
+                )
+            return query, lambda tc: serialize_testcase(tc, include_relations)
+
+        # 커서 생성을 위해 정렬 키는 항상 SELECT
+        column_names = [f for f in fields if f in TestCaseService.PROJECTABLE_FIELDS]
+        select_names = list(dict.fromkeys(column_names + ['id', 'updated_at']))
+        columns = [getattr(TestCase, name).label(name) for name in select_names]
+
+        creator_user = assignee_user = None
+        if 'creator_name' in fields:
+            creator_user = aliased(User)
+            columns.append(creator_user.username.label('creator_name'))
+        if 'assignee_name' in fields:
+            assignee_user = aliased(User)
+            columns.append(assignee_user.username.label('assignee_name'))
+
+        query = db.session.query(*columns).select_from(TestCase)
+        if creator_user is not None:
+            query = query.outerjoin(creator_user, TestCase.creator_id == creator_user.id)
+        if assignee_user is not None:
+            query = query.outerjoin(assignee_user, TestCase.assignee_id == assignee_user.id)
+
+        def serialize_row(row):
+            data = {}
+            for name in fields:
+                value = getattr(row, name)
+                data[name] = value.isoformat() if isinstance(value, datetime) else value
+            return data
+
+        return query, serialize_row
+
+    @staticmethod
+    def _count(query, count_mode):
+        """count_mode에 따른 전체 건수 계산"""
+        if count_mode == 'exact':
+            return query.order_by(None).count()
+        if count_mode == 'estimated':
+            return estimate_row_count(db.session, TestCase.__tablename__, query.order_by(None))
+        return None
+
+    @staticmethod
+    def _get_testcases_by_page(page, per_page, include_relations, fields, count_mode):
+        """OFFSET 기반 페이징 (기존 page/per_page 호환)"""
         if page < 1:
             page = 1
         if per_page < 1 or per_page > 100:
             per_page = 10
-        
-        total_count = TestCase.query.count()
+
+        query, serialize_row = TestCaseService._build_query(include_relations, fields)
+        total_count = TestCaseService._count(TestCase.query, count_mode)
+
         offset = (page - 1) * per_page
-        testcases = TestCase.query.offset(offset).limit(per_page).all()
-        
-        total_pages = (total_count + per_page - 1) // per_page
+        rows = query.order_by(TestCase.id).offset(offset).limit(per_page).all()
+
+        if total_count is not None:
+            total_pages = (total_count + per_page - 1) // per_page
+            has_next = page < total_pages
+        else:
+            total_pages = None
+            has_next = len(rows) == per_page
+
         pagination = {
             'page': page,
             'per_page': per_page,
             'total': total_count,
             'pages': total_pages,
-            'has_next': page < total_pages,
+            'count_mode': count_mode,
+            'has_next': has_next,
             'has_prev': page > 1,
-            'next_num': page + 1 if page < total_pages else None,
+            'next_num': page + 1 if has_next else None,
             'prev_num': page - 1 if page > 1 else None
         }
-        
-        data = [serialize_testcase(tc, include_relations) for tc in testcases]
+
+        data = [serialize_row(row) for row in rows]
         return data, pagination
-    
+
+    @staticmethod
+    def _get_testcases_by_cursor(after, limit, include_relations, fields, count_mode):
+        """(updated_at DESC, id DESC) 키셋 페이징 - OFFSET 없이 인덱스 범위 스캔"""
+        if limit is None or limit < 1:
+            limit = TestCaseService.DEFAULT_LIMIT
+        limit = min(limit, TestCaseService.MAX_LIMIT)
+
+        query, serialize_row = TestCaseService._build_query(include_relations, fields)
+        total_count = TestCaseService._count(TestCase.query, count_mode)
+
+        if after:
+            cursor_updated_at, cursor_id = decode_cursor(after)
+            if cursor_updated_at is None:
+                query = query.filter(TestCase.updated_at.is_(None), TestCase.id < cursor_id)
+            else:
+                query = query.filter(or_(
+                    TestCase.updated_at < cursor_updated_at,
+                    and_(TestCase.updated_at == cursor_updated_at, TestCase.id < cursor_id)
+                ))
+
+        # 다음 페이지 존재 여부 확인을 위해 1건 더 조회
+        rows = query.order_by(TestCase.updated_at.desc(), TestCase.id.desc()).limit(limit + 1).all()
+        has_next = len(rows) > limit
+        rows = rows[:limit]
+
+        next_cursor = None
+        if has_next and rows:
+            last = rows[-1]
+            next_cursor = encode_cursor(last.updated_at, last.id)
+
+        pagination = {
+            'limit': limit,
+            'after': after,
+            'next_cursor': next_cursor,
+            'has_next': has_next,
+            'total': total_count,
+            'count_mode': count_mode
+        }
+
+        data = [serialize_row(row) for row in rows]
+        return data, pagination
+
     @staticmethod
     def get_testcase_by_id(testcase_id):
         """테스트 케이스 단일 조회"""
@@ -110,6 +263,147 @@ class TestCaseService:
         db.session.commit()
         return serialize_testcase(testcase, include_relations=True)
     
+    @staticmethod
+    def _parse_bulk_items(items):
+        """일괄 변경 요청 검증 → {id: {필드: 값}} (같은 ID가 여러 번 오면 나중 값 우선)"""
+        if not isinstance(items, list) or not items:
+            raise ValueError('변경할 테스트 케이스 목록이 필요합니다')
+        if len(items) > TestCaseService.BULK_UPDATE_MAX:
+            raise ValueError(f'한 번에 최대 {TestCaseService.BULK_UPDATE_MAX}개까지 변경할 수 있습니다')
+        updates = {}
+        for item in items:
+            if not isinstance(item, dict) or not isinstance(item.get('id'), int) or isinstance(item['id'], bool):
+                raise ValueError('각 항목에는 정수 id가 필요합니다')
+            fields = {key: value for key, value in item.items() if key != 'id'}
+            invalid = [key for key in fields if key not in TestCaseService.BULK_UPDATE_FIELDS]
+            if invalid:
+                raise ValueError(f"일괄 변경할 수 없는 필드입니다: {', '.join(invalid)}")
+            if not fields:
+                raise ValueError(f"변경할 필드가 없습니다: id {item['id']}")
+            for field, value in fields.items():
+                TestCaseService._validate_bulk_value(field, value)
+            updates.setdefault(item['id'], {}).update(fields)
+
+        assignee_ids = {fields['assignee_id'] for fields in updates.values() if fields.get('assignee_id') is not None}
+        if assignee_ids:
+            found = {row.id for row in db.session.query(User.id).filter(User.id.in_(assignee_ids)).all()}
+            missing = sorted(assignee_ids - found)
+            if missing:
+                raise ValueError(f"존재하지 않는 담당자입니다: {', '.join(map(str, missing))}")
+        return updates
+
+    @staticmethod
+    def _validate_bulk_value(field, value):
+        """일괄 변경 값 형식 검증 (담당자 존재 여부는 _parse_bulk_items에서 한 번에 조회)"""
+        if field == 'assignee_id':
+            # bool은 int의 하위 타입이므로 제외
+            if value is not None and (not isinstance(value, int) or isinstance(value, bool)):
+                raise ValueError('assignee_id는 정수 또는 null이어야 합니다')
+            return
+        choices = TestCaseService.BULK_UPDATE_CHOICES.get(field)
+        if choices is not None:
+            if value not in choices:
+                raise ValueError(f"{field}는 다음 중 하나여야 합니다: {', '.join(choices)}")
+            return
+        if value is None:
+            return
+        if not isinstance(value, str):
+            raise ValueError(f'{field}는 문자열이어야 합니다')
+        max_length = TestCase.__table__.c[field].type.length
+        if max_length and len(value) > max_length:
+            raise ValueError(f'{field}는 {max_length}자 이하여야 합니다')
+
+    @staticmethod
+    def bulk_update(items, changed_by=None):
+        """
+        여러 테스트 케이스의 상태/필드 일괄 변경
+
+        - 현재 값은 BULK_UPDATE_CHUNK개씩 한 번에 조회하고, 실제로 바뀌는 (필드, 값)마다 UPDATE ... WHERE id IN 실행
+        - 히스토리는 INSERT 한 번(executemany), 대시보드 카운터는 환경별 증분 한 번으로 같은 트랜잭션에서 반영 후 커밋 1회
+        - 커밋 후 수신자(작성자/담당자)별로 요약 알림 한 건
+
+        Args:
+            items: [{'id': 테스트 케이스 ID, 필드: 값, ...}] (필드는 BULK_UPDATE_FIELDS)
+            changed_by: 변경한 사용자 ID
+
+        Returns:
+            dict: {'updated_count', 'unchanged_count', 'not_found_ids', 'changes': {필드: {값: 건수}}}
+        """
+        from sqlalchemy import update
+        from services.dashboard_summary_service import dashboard_summary_service, KEY_COLUMNS
+        from utils.history_tracker import track_test_case_changes_bulk
+
+        updates = TestCaseService._parse_bulk_items(items)
+        ids = list(updates)
+        chunk = TestCaseService.BULK_UPDATE_CHUNK
+        columns = tuple(dict.fromkeys(('id', 'name', 'creator_id') + KEY_COLUMNS + TestCaseService.BULK_UPDATE_FIELDS))
+
+        current = {}
+        for start in range(0, len(ids), chunk):
+            rows = db.session.query(*(getattr(TestCase, name) for name in columns)).filter(
+                TestCase.id.in_(ids[start:start + chunk])
+            ).all()
+            current.update((row.id, row._asdict()) for row in rows)
+
+        groups = {}
+        history = []
+        changed_rows = []
+        for testcase_id, fields in updates.items():
+            before = current.get(testcase_id)
+            if before is None:
+                continue
+            after = dict(before)
+            for field, value in fields.items():
+                if before[field] != value:
+                    after[field] = value
+                    groups.setdefault((field, value), []).append(testcase_id)
+                    history.append((testcase_id, field, before[field], value))
+            if after != before:
+                changed_rows.append((before, after))
+
+        try:
+            for (field, value), group_ids in groups.items():
+                for start in range(0, len(group_ids), chunk):
+                    db.session.execute(
+                        update(TestCase)
+                        .where(TestCase.id.in_(group_ids[start:start + chunk]))
+                        .values({field: value})
+                        .execution_options(synchronize_session=False)
+                    )
+            if changed_by:
+                track_test_case_changes_bulk(history, changed_by)
+            # UPDATE 문은 after_flush 리스너를 거치지 않으므로 대시보드 카운터에 직접 반영
+            dashboard_summary_service.record_updated(changed_rows)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        if changed_rows:
+            # 세션에 남아 있는 객체가 이전 값을 보여주지 않도록 만료
+            db.session.expire_all()
+            from services.cache_service import cache_service, entity_tag, list_tag, DASHBOARD_TAG, SUMMARY_TAG
+            cache_service.invalidate_tags(
+                list_tag('testcase'), DASHBOARD_TAG, SUMMARY_TAG,
+                *(entity_tag('testcase', before['id']) for before, _ in changed_rows)
+            )
+            try:
+                from services.notification_service import notification_service
+                notification_service.notify_bulk_changes(changed_rows, changed_by)
+            except Exception as e:
+                logger.warning(f"일괄 변경 알림 생성 실패: {str(e)}")
+
+        summary = {}
+        for (field, value), group_ids in groups.items():
+            summary.setdefault(field, {})[str(value)] = len(group_ids)
+        logger.info(f"테스트 케이스 일괄 변경: {len(changed_rows)}건 (UPDATE 그룹 {len(groups)}개)")
+        return {
+            'updated_count': len(changed_rows),
+            'unchanged_count': len(current) - len(changed_rows),
+            'not_found_ids': [testcase_id for testcase_id in ids if testcase_id not in current],
+            'changes': summary
+        }
+
     @staticmethod
     def delete_testcase(testcase_id):
         """테스트 케이스 삭제"""
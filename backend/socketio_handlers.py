@@ -10,6 +10,7 @@ from models import Notification, TestResult, TestCase
 from services.notification_service import notification_service
 from datetime import datetime
 from utils.timezone_utils import get_kst_now
+from utils import socketio_emitter
 
 logger = get_logger(__name__)
 
@@ -115,8 +116,6 @@ def register_socketio_handlers(socketio):
 def emit_test_execution_update(test_case_id, status, progress=None, result=None):
     """테스트 실행 상태 업데이트 브로드캐스트"""
     try:
-        from app import socketio
-        
         data = {
             'test_case_id': test_case_id,
             'status': status,
@@ -129,17 +128,62 @@ def emit_test_execution_update(test_case_id, status, progress=None, result=None)
         if result is not None:
             data['result'] = result
         
-        socketio.emit('test_execution_update', data, room=f'test_execution_{test_case_id}')
+        socketio_emitter.emit('test_execution_update', data, room=f'test_execution_{test_case_id}')
         logger.debug(f"테스트 실행 업데이트 전송: Test Case {test_case_id}, Status: {status}")
         
     except Exception as e:
         logger.error(f"테스트 실행 업데이트 전송 오류: {str(e)}")
 
+def emit_test_execution_output(test_case_id, lines, dropped=0):
+    """
+    실행 중 출력 묶음 전송 (test_execution_update와 같은 test_execution_<id> 룸)
+
+    utils/streaming_runner가 EXECUTION_STREAM_INTERVAL마다 모은 줄을 한 프레임으로 보내며,
+    dropped는 프레임 크기 제한으로 실시간 전송에서만 건너뛴 줄 수 (전체 출력은 결과의 로그 파일)
+    """
+    try:
+        socketio_emitter.emit('test_execution_output', {
+            'test_case_id': test_case_id,
+            'lines': lines,
+            'dropped': dropped,
+            'timestamp': datetime.utcnow().isoformat()
+        }, room=f'test_execution_{test_case_id}')
+    except Exception as e:
+        logger.error(f"테스트 실행 출력 전송 오류: {str(e)}")
+
+def _test_result_payload(event):
+    """결과 이벤트/레코드 → test_result 이벤트 데이터"""
+    return {
+        'test_result_id': event['test_result_id'],
+        'test_case_id': event['test_case_id'],
+        'test_case_name': event.get('test_case_name'),
+        'result': event.get('result'),
+        'execution_duration': event.get('execution_duration'),
+        'executed_at': event.get('executed_at')
+    }
+
+def emit_test_results(events):
+    """
+    결과 이벤트 묶음 브로드캐스트 (이벤트에 필요한 값이 모두 있으므로 DB를 다시 조회하지 않음)
+
+    룸별로 SOCKETIO_BATCH_INTERVAL 동안 모아 보내므로 여러 건이면 test_result_batch 이벤트({'items': [...]})로 전달된다.
+    """
+    try:
+        for event in events:
+            data = _test_result_payload(event)
+            # 테스트 실행 룸에 브로드캐스트
+            socketio_emitter.emit_batched('test_result', data, room=f'test_execution_{data["test_case_id"]}')
+            # 전역 룸에도 브로드캐스트
+            socketio_emitter.emit_batched('test_result', data, room='all_users')
+        
+        logger.debug(f"테스트 결과 브로드캐스트: {len(events)}건")
+        
+    except Exception as e:
+        logger.error(f"테스트 결과 브로드캐스트 오류: {str(e)}")
+
 def emit_test_result(test_result_id):
     """테스트 결과 브로드캐스트"""
     try:
-        from app import socketio
-        
         test_result = TestResult.query.get(test_result_id)
         if not test_result:
             return
@@ -148,23 +192,14 @@ def emit_test_result(test_result_id):
         if not test_case:
             return
         
-        data = {
+        emit_test_results([{
             'test_result_id': test_result_id,
             'test_case_id': test_result.test_case_id,
             'test_case_name': test_case.name,
             'result': test_result.result,
             'execution_duration': test_result.execution_duration,
             'executed_at': test_result.executed_at.isoformat() if test_result.executed_at else None
-        }
-        
-        # 테스트 실행 룸에 브로드캐스트
-        socketio.emit('test_result', data, room=f'test_execution_{test_result.test_case_id}')
-        
-        # 전역 룸에도 브로드캐스트
-        socketio.emit('test_result', data, room='all_users')
-        
-        logger.debug(f"테스트 결과 브로드캐스트: Test Result {test_result_id}")
+        }])
         
     except Exception as e:
         logger.error(f"테스트 결과 브로드캐스트 오류: {str(e)}")
-
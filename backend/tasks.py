@@ -11,7 +11,8 @@ import subprocess
 import os
 import time
 import json
-from datetime import datetime
+import uuid
+from datetime import datetime, timedelta
 
 logger = get_logger(__name__)
 
@@ -20,6 +21,23 @@ def create_app():
     from app import app
     return app
 
+def _publish_test_result(test_case, test_result):
+    """저장된 결과를 결과 이벤트 버스에 발행 (소비자가 DB를 다시 조회하지 않도록 필요한 값을 함께 담음)"""
+    try:
+        from services.result_event_service import result_event_service, TEST_RESULT_EVENT
+        result_event_service.publish(TEST_RESULT_EVENT, {
+            'test_result_id': test_result.id,
+            'test_case_id': test_case.id,
+            'test_case_name': test_case.name,
+            'target_user_id': test_case.assignee_id or test_case.creator_id,
+            'result': test_result.result,
+            'environment': test_result.environment,
+            'execution_duration': test_result.execution_duration,
+            'executed_at': test_result.executed_at.isoformat() if test_result.executed_at else None
+        })
+    except Exception as e:
+        logger.error(f"결과 이벤트 발행 오류: {str(e)}")
+
 @celery_app.task(bind=True, name='tasks.execute_test_case')
 def execute_test_case(self, test_case_id, environment='dev', execution_parameters=None):
     """
@@ -49,9 +67,11 @@ def execute_test_case(self, test_case_id, environment='dev', execution_parameter
                     steps_data = None
                 if isinstance(steps_data, list) and len(steps_data) > 0:
                     base_url = (execution_parameters or {}).get('baseUrl') or (execution_parameters or {}).get('base_url')
+                    step_timeout = int((execution_parameters or {}).get('timeout') or 300)
+                    # 상주 단계 실행 데몬의 컨텍스트 풀에서 실행 (실행마다 격리된 컨텍스트, 동시 실행 수 제한)
                     from utils.playwright_steps_runner import run_playwright_steps
                     _start = time.time()
-                    run_result = run_playwright_steps(steps_data, base_url=base_url)
+                    run_result = run_playwright_steps(steps_data, base_url=base_url, timeout=step_timeout)
                     execution_duration = time.time() - _start
                     test_result = TestResult(
                         test_case_id=test_case_id,
@@ -62,6 +82,7 @@ def execute_test_case(self, test_case_id, environment='dev', execution_parameter
                     )
                     db.session.add(test_result)
                     db.session.commit()
+                    _publish_test_result(test_case, test_result)
                     return {
                         'status': run_result['status'],
                         'output': run_result.get('output', ''),
@@ -97,6 +118,7 @@ def execute_test_case(self, test_case_id, environment='dev', execution_parameter
             result_status = 'Fail'
             error_message = None
             output = ''
+            log_path = None
             
             try:
                 # 스크립트 경로를 절대 경로로 변환
@@ -112,41 +134,45 @@ def execute_test_case(self, test_case_id, environment='dev', execution_parameter
                 
                 # 스크립트 타입에 따라 실행
                 if script_type == 'k6':
+                    # playwright/selenium과 같이 출력은 test_execution_<id> 룸으로 전송, 전체 출력은 gzip 로그 파일로 저장
                     from engines.k6_engine import k6_engine
-                    result = k6_engine.execute_test(absolute_script_path, execution_parameters or {})
+                    from socketio_handlers import emit_test_execution_output
+                    result = k6_engine.execute_test(
+                        absolute_script_path, execution_parameters or {},
+                        on_output=lambda lines, dropped: emit_test_execution_output(test_case_id, lines, dropped),
+                        log_prefix=f'testcase_{test_case_id}'
+                    )
                     result_status = result.get('status', 'Fail')
                     output = result.get('output', '')
                     error_message = result.get('error')
+                    log_path = result.get('log_path')
                     
-                elif script_type == 'playwright':
-                    result = subprocess.run(
-                        ['npx', 'playwright', 'test', absolute_script_path, '--reporter=json'],
-                        capture_output=True,
-                        text=True,
+                elif script_type in ('playwright', 'selenium'):
+                    # 출력은 test_execution_<id> 룸으로 묶어서 실시간 전송, 전체 출력은 gzip 로그 파일로 저장
+                    from socketio_handlers import emit_test_execution_output
+                    from utils.streaming_runner import run_streaming
+                    if script_type == 'playwright':
+                        command = ['npx', 'playwright', 'test', absolute_script_path, '--reporter=json']
+                    else:
+                        command = ['python', absolute_script_path]
+                    result = run_streaming(
+                        command,
                         timeout=300,
-                        cwd=os.path.dirname(absolute_script_path) if os.path.dirname(absolute_script_path) else None
-                    )
-                    result_status = 'Pass' if result.returncode == 0 else 'Fail'
-                    output = result.stdout
-                    error_message = result.stderr if result.returncode != 0 else None
-                    
-                elif script_type == 'selenium':
-                    result = subprocess.run(
-                        ['python', absolute_script_path],
-                        capture_output=True,
-                        text=True,
-                        timeout=300,
-                        cwd=os.path.dirname(absolute_script_path) if os.path.dirname(absolute_script_path) else None
+                        cwd=os.path.dirname(absolute_script_path) if os.path.dirname(absolute_script_path) else None,
+                        on_output=lambda lines, dropped: emit_test_execution_output(test_case_id, lines, dropped),
+                        log_prefix=f'testcase_{test_case_id}'
                     )
                     result_status = 'Pass' if result.returncode == 0 else 'Fail'
                     output = result.stdout
+                    log_path = result.log_path
                     error_message = result.stderr if result.returncode != 0 else None
                 else:
                     raise ValueError(f"지원하지 않는 스크립트 타입: {script_type}")
                 
-            except subprocess.TimeoutExpired:
+            except subprocess.TimeoutExpired as e:
                 result_status = 'Fail'
                 error_message = '테스트 실행 시간이 초과되었습니다'
+                log_path = getattr(e, 'log_path', None)
             except Exception as e:
                 result_status = 'Fail'
                 error_message = str(e)
@@ -163,28 +189,15 @@ def execute_test_case(self, test_case_id, environment='dev', execution_parameter
                 executed_at=get_kst_now(),
                 executed_by='system',
                 error_message=error_message,
-                notes=output[:1000] if output else None  # 최대 1000자
+                notes=output[-1000:] if output else None,  # 마지막 1000자 (전체 출력은 log_path)
+                log_path=log_path
             )
             
             db.session.add(test_result)
             db.session.commit()
             
-            # 알림 생성
-            try:
-                from services.notification_service import notification_service
-                if result_status == 'Fail':
-                    notification_service.notify_test_failed(test_case_id, test_result.id)
-                else:
-                    notification_service.notify_test_completed(test_case_id, test_result.id, result_status)
-            except Exception as notify_error:
-                logger.error(f"알림 생성 오류: {str(notify_error)}")
-            
-            # WebSocket을 통해 실시간 업데이트
-            try:
-                from socketio_handlers import emit_test_result
-                emit_test_result(test_result.id)
-            except Exception as socket_error:
-                logger.error(f"WebSocket 업데이트 오류: {str(socket_error)}")
+            # 알림/슬랙/실시간 전송/요약 갱신은 결과 이벤트 소비자가 처리
+            _publish_test_result(test_case, test_result)
             
             logger.info(f"테스트 케이스 실행 완료: {test_case.name} - {result_status}")
             
@@ -201,60 +214,303 @@ def execute_test_case(self, test_case_id, environment='dev', execution_parameter
             logger.error(f"태스크 실행 오류: {str(e)}")
             raise
 
+# 배치 실행 상태 보관 (Redis) - 워커 슬롯을 점유하지 않고 콜백으로 진행 상황을 집계
+BATCH_STATE_TTL = 24 * 3600
+# 이 시간(초) 동안 완료된 항목이 없으면 남은 항목을 실패로 처리하고 배치를 마무리 (reap_test_case_batch)
+BATCH_STALL_TIMEOUT = int(os.getenv('BATCH_STALL_TIMEOUT', 3600))
+
+def _batch_redis():
+    """배치 상태 저장용 Redis 클라이언트 (Celery 브로커와 동일한 REDIS_URL)"""
+    import redis
+    return redis.from_url(os.getenv('REDIS_URL', 'redis://localhost:6379/0'), decode_responses=True)
+
+def _batch_key(batch_id, name):
+    return f"batch:{batch_id}:{name}"
+
+def _schedule_batch_reaper(redis_client, batch_id, completed):
+    """
+    BATCH_STALL_TIMEOUT 후 정체 감시 예약
+
+    countdown이 브로커의 visibility_timeout 이상이면 같은 메시지가 다시 전달될 수 있으므로,
+    예약마다 1회용 토큰을 저장해 두고 토큰을 먼저 지운 감시 태스크만 실행한다.
+    """
+    token = uuid.uuid4().hex
+    redis_client.set(_batch_key(batch_id, f'reaper:{token}'), 1, ex=BATCH_STATE_TTL)
+    reap_test_case_batch.apply_async((batch_id, completed, token), countdown=BATCH_STALL_TIMEOUT)
+
+def _dispatch_next_batch_item(redis_client, batch_id, environment):
+    """대기 중인 다음 테스트 케이스를 꺼내 실행 큐에 추가 (없으면 False)"""
+    next_id = redis_client.lpop(_batch_key(batch_id, 'pending'))
+    if next_id is None:
+        return False
+    execute_batch_item.delay(batch_id, int(next_id), environment)
+    return True
+
+def _start_next_batch_wave(redis_client, batch_id, environment, max_workers):
+    """다음 웨이브를 대기 목록으로 옮기고 동시 실행 한도(0이면 웨이브 전체)만큼 투입 (남은 웨이브가 없으면 False)"""
+    wave_data = redis_client.lpop(_batch_key(batch_id, 'waves'))
+    if wave_data is None:
+        return False
+    wave = json.loads(wave_data)
+    pipe = redis_client.pipeline()
+    pipe.rpush(_batch_key(batch_id, 'pending'), *wave)
+    pipe.hset(_batch_key(batch_id, 'meta'), 'wave_remaining', len(wave))
+    pipe.hincrby(_batch_key(batch_id, 'meta'), 'wave', 1)
+    pipe.expire(_batch_key(batch_id, 'pending'), BATCH_STATE_TTL)
+    pipe.execute()
+    for _ in range(min(max_workers, len(wave)) if max_workers else len(wave)):
+        _dispatch_next_batch_item(redis_client, batch_id, environment)
+    return True
+
+def _publish_batch_completed(execution_id, results):
+    """배치 완료 이벤트 발행 (CI/CD 실행 기록 반영과 PR 코멘트는 cicd 소비자가 처리)"""
+    app = create_app()
+    with app.app_context():
+        try:
+            from services.result_event_service import result_event_service, BATCH_COMPLETED_EVENT
+            result_event_service.publish(BATCH_COMPLETED_EVENT, {'execution_id': execution_id, 'results': results})
+        except Exception as e:
+            logger.error(f"배치 완료 이벤트 발행 오류: {str(e)}")
+
+def _plan_batch_waves(test_case_ids):
+    """의존성 그래프로 배치를 웨이브로 나눔 (계산 실패 시 전체를 한 웨이브로)"""
+    app = create_app()
+    with app.app_context():
+        try:
+            from services.dependency_service import dependency_service
+            plan = dependency_service.plan_waves(test_case_ids)
+            waves = plan['waves'] + ([plan['cyclic']] if plan['cyclic'] else [])
+            return [wave for wave in waves if wave]
+        except Exception as e:
+            logger.error(f"배치 실행 계획 계산 오류, 의존성 없이 실행: {str(e)}")
+            return [list(test_case_ids)]
+
 @celery_app.task(bind=True, name='tasks.execute_test_case_batch')
-def execute_test_case_batch(self, test_case_ids, environment='dev', max_workers=5):
+def execute_test_case_batch(self, test_case_ids, environment='dev', max_workers=5, execution_id=None):
     """
     여러 테스트 케이스를 병렬로 실행하는 태스크
     
+    결과를 기다리며 블로킹하지 않는다. 테스트 의존성 그래프로 배치를 웨이브(DAG 레벨)로 나누고,
+    같은 웨이브의 항목은 동시에 실행하며 웨이브가 모두 끝나면 다음 웨이브를 시작한다.
+    웨이브 안에서는 최대 max_workers개의 항목만 먼저 큐에 넣고, 각 항목이 끝날 때마다
+    다음 항목을 투입하는 슬라이딩 윈도우 방식으로 동시 실행 수를 제한한다.
+    진행률은 이 태스크 ID의 PROGRESS 상태(current/total/wave/waves)로 게시되며,
+    모든 항목이 끝나면 finalize_test_case_batch 콜백이 결과를 집계해 이 태스크의 최종 결과로 저장한다.
+    
     Args:
         test_case_ids: 테스트 케이스 ID 리스트
         environment: 실행 환경
-        max_workers: 최대 동시 실행 수
+        max_workers: 최대 동시 실행 수 (0 또는 None이면 웨이브 전체를 한 번에 실행)
+        execution_id: CI/CD 실행 기록 ID (있으면 완료 시 결과 반영)
+    
+    Returns:
+        dict: 실행 결과 요약 (빈 배치인 경우에만 즉시 반환)
+    """
+    from celery.exceptions import Ignore
+    
+    batch_id = self.request.id
+    # 중복 ID 제거 (순서 유지)
+    test_case_ids = list(dict.fromkeys(test_case_ids or []))
+    total = len(test_case_ids)
+    
+    if total == 0:
+        summary = {'status': 'success', 'total': 0, 'passed': 0, 'failed': 0, 'results': []}
+        if execution_id:
+            _publish_batch_completed(execution_id, [])
+        return summary
+    
+    try:
+        max_workers = max(0, int(max_workers or 0))
+    except (TypeError, ValueError):
+        max_workers = 5
+    
+    try:
+        waves = _plan_batch_waves(test_case_ids)
+        
+        redis_client = _batch_redis()
+        pipe = redis_client.pipeline()
+        pipe.hset(_batch_key(batch_id, 'meta'), mapping={
+            'total': total,
+            'environment': environment,
+            'execution_id': execution_id or '',
+            'started_at': get_kst_now().isoformat(),
+            'max_workers': max_workers,
+            'waves': len(waves),
+            'wave': 0
+        })
+        pipe.rpush(_batch_key(batch_id, 'waves'), *[json.dumps(wave) for wave in waves])
+        pipe.sadd(_batch_key(batch_id, 'ids'), *test_case_ids)
+        for name in ('meta', 'waves', 'ids'):
+            pipe.expire(_batch_key(batch_id, name), BATCH_STATE_TTL)
+        pipe.execute()
+        
+        self.update_state(state='PROGRESS', meta={
+            'current': 0,
+            'total': total,
+            'passed': 0,
+            'failed': 0,
+            'max_workers': max_workers,
+            'wave': 1,
+            'waves': len(waves)
+        })
+        
+        # 첫 웨이브의 초기 윈도우만 투입 (나머지는 항목 완료 콜백에서 투입)
+        _start_next_batch_wave(redis_client, batch_id, environment, max_workers)
+        # 항목 콜백이 오지 않는 경우(워커 종료, 메시지 유실)에도 배치가 끝나도록 정체 감시 예약
+        _schedule_batch_reaper(redis_client, batch_id, 0)
+        
+        logger.info(f"배치 실행 시작: {batch_id} ({total}개, 웨이브 {len(waves)}개, 동시 실행 {max_workers or '웨이브 전체'})")
+    except Exception as e:
+        logger.error(f"배치 실행 오류: {str(e)}")
+        raise
+    
+    # 최종 상태는 finalize_test_case_batch가 기록하므로 여기서는 결과를 저장하지 않음
+    raise Ignore()
+
+@celery_app.task(bind=True, name='tasks.execute_batch_item')
+def execute_batch_item(self, batch_id, test_case_id, environment='dev'):
+    """
+    배치의 단일 항목 실행 후 진행률 게시 및 다음 항목 투입
+    
+    Args:
+        batch_id: execute_test_case_batch 태스크 ID
+        test_case_id: 테스트 케이스 ID
+        environment: 실행 환경
+    """
+    try:
+        result = execute_test_case(test_case_id, environment)
+    except Exception as e:
+        logger.error(f"배치 항목 실행 오류: {test_case_id} - {str(e)}")
+        result = {
+            'status': 'error',
+            'test_case_id': test_case_id,
+            'result': 'Error',
+            'error': str(e)
+        }
+    
+    redis_client = _batch_redis()
+    
+    # 정체 감시로 이미 마무리된 배치의 늦은 결과는 집계하지 않음
+    if redis_client.exists(_batch_key(batch_id, 'finalized')):
+        return result
+    # 재전달(acks_late)로 같은 항목이 두 번 실행되더라도 한 번만 집계
+    if redis_client.sadd(_batch_key(batch_id, 'done'), test_case_id) == 0:
+        return result
+    
+    pipe = redis_client.pipeline()
+    pipe.rpush(_batch_key(batch_id, 'results'), json.dumps(result, ensure_ascii=False, default=str))
+    pipe.hincrby(_batch_key(batch_id, 'meta'), 'passed' if result.get('result') == 'Pass' else 'failed', 1)
+    pipe.hincrby(_batch_key(batch_id, 'meta'), 'wave_remaining', -1)
+    pipe.hgetall(_batch_key(batch_id, 'meta'))
+    for name in ('done', 'results'):
+        pipe.expire(_batch_key(batch_id, name), BATCH_STATE_TTL)
+    completed, _, wave_remaining, meta = pipe.execute()[:4]
+    
+    total = int(meta.get('total', 0))
+    if completed < total:
+        self.update_state(task_id=batch_id, state='PROGRESS', meta={
+            'current': completed,
+            'total': total,
+            'passed': int(meta.get('passed', 0)),
+            'failed': int(meta.get('failed', 0)),
+            'wave': int(meta.get('wave', 1)),
+            'waves': int(meta.get('waves', 1)),
+            'last_test_case_id': test_case_id
+        })
+        batch_environment = meta.get('environment', environment)
+        if wave_remaining > 0:
+            _dispatch_next_batch_item(redis_client, batch_id, batch_environment)
+        else:
+            # 현재 웨이브의 마지막 항목이 끝났을 때만 (한 항목만 0을 보게 됨) 다음 웨이브 시작
+            _start_next_batch_wave(redis_client, batch_id, batch_environment, int(meta.get('max_workers', 0)))
+    else:
+        finalize_test_case_batch.delay(batch_id)
+    
+    return result
+
+@celery_app.task(bind=True, name='tasks.finalize_test_case_batch')
+def finalize_test_case_batch(self, batch_id):
+    """
+    배치 완료 콜백: 결과 집계, CI/CD 실행 기록 반영, 배치 태스크 최종 결과 저장
+    
+    Args:
+        batch_id: execute_test_case_batch 태스크 ID
     
     Returns:
         dict: 실행 결과 요약
     """
-    app = create_app()
-    with app.app_context():
-        try:
-            from celery import group
-            
-            # 태스크 그룹 생성 (병렬 실행)
-            job = group(
-                execute_test_case.s(test_id, environment) 
-                for test_id in test_case_ids
-            )
-            
-            # 결과 수집
-            result = job.apply_async()
-            results = result.get()  # 모든 태스크 완료 대기
-            
-            # 결과 요약
-            total = len(test_case_ids)
-            passed = sum(1 for r in results if r.get('result') == 'Pass')
-            failed = total - passed
-            
-            # CI/CD 실행 기록 업데이트 (있는 경우)
-            try:
-                # 실행 컨텍스트에서 execution_id 가져오기 (있는 경우)
-                execution_id = self.request.get('execution_id') if hasattr(self, 'request') else None
-                if execution_id:
-                    from services.cicd_service import cicd_service
-                    cicd_service.update_execution_with_results(execution_id, results)
-            except Exception as cicd_error:
-                logger.error(f"CI/CD 실행 기록 업데이트 오류: {str(cicd_error)}")
-            
-            return {
-                'status': 'success',
-                'total': total,
-                'passed': passed,
-                'failed': failed,
-                'results': results
-            }
-            
-        except Exception as e:
-            logger.error(f"배치 실행 오류: {str(e)}")
-            raise
+    redis_client = _batch_redis()
+    # 마지막 항목 콜백과 정체 감시가 함께 호출해도 한 번만 집계 (표시는 상태 키를 지운 뒤에도 TTL 동안 유지)
+    if not redis_client.set(_batch_key(batch_id, 'finalized'), 1, nx=True, ex=BATCH_STATE_TTL):
+        return None
+    meta = redis_client.hgetall(_batch_key(batch_id, 'meta'))
+    results = [json.loads(r) for r in redis_client.lrange(_batch_key(batch_id, 'results'), 0, -1)]
+    
+    total = int(meta.get('total', len(results)))
+    passed = sum(1 for r in results if r.get('result') == 'Pass')
+    failed = total - passed
+    
+    execution_id = meta.get('execution_id')
+    if execution_id:
+        _publish_batch_completed(int(execution_id), results)
+    
+    summary = {
+        'status': 'success',
+        'total': total,
+        'passed': passed,
+        'failed': failed,
+        'results': results
+    }
+    self.update_state(task_id=batch_id, state='SUCCESS', meta=summary)
+    
+    redis_client.delete(*[_batch_key(batch_id, name) for name in ('meta', 'waves', 'pending', 'done', 'results', 'ids')])
+    logger.info(f"배치 실행 완료: {batch_id} (통과 {passed}/{total})")
+    return summary
+
+@celery_app.task(bind=True, name='tasks.reap_test_case_batch')
+def reap_test_case_batch(self, batch_id, last_completed=0, token=None):
+    """
+    배치 정체 감시 (BATCH_STALL_TIMEOUT 후 실행)
+    
+    그동안 완료된 항목이 늘었으면 다시 예약하고, 늘지 않았으면 끝나지 않은 항목을 실패로 기록한 뒤
+    finalize_test_case_batch로 마무리한다. 늦게 끝난 항목의 결과는 집계되지 않는다.
+    
+    Args:
+        batch_id: execute_test_case_batch 태스크 ID
+        last_completed: 이전 확인 시점의 완료 항목 수
+        token: 예약 토큰 (이미 사용된 토큰이면 중복 전달된 메시지이므로 무시)
+    """
+    redis_client = _batch_redis()
+    if token is not None and not redis_client.delete(_batch_key(batch_id, f'reaper:{token}')):
+        return None
+    if redis_client.exists(_batch_key(batch_id, 'finalized')) or not redis_client.exists(_batch_key(batch_id, 'meta')):
+        return None
+    
+    completed = redis_client.scard(_batch_key(batch_id, 'done'))
+    if completed > last_completed:
+        _schedule_batch_reaper(redis_client, batch_id, completed)
+        return {'status': 'running', 'completed': completed}
+    
+    unfinished = sorted(int(test_case_id) for test_case_id in redis_client.sdiff(
+        _batch_key(batch_id, 'ids'), _batch_key(batch_id, 'done')
+    ))
+    if unfinished:
+        error = f'{BATCH_STALL_TIMEOUT}초 동안 진행이 없어 중단됨'
+        pipe = redis_client.pipeline()
+        # done에 먼저 넣어 이후 도착하는 항목 결과가 중복 집계되지 않게 하고 남은 항목 투입 중단
+        pipe.sadd(_batch_key(batch_id, 'done'), *unfinished)
+        pipe.rpush(_batch_key(batch_id, 'results'), *[json.dumps({
+            'status': 'error',
+            'test_case_id': test_case_id,
+            'result': 'Error',
+            'error': error
+        }, ensure_ascii=False) for test_case_id in unfinished])
+        pipe.hincrby(_batch_key(batch_id, 'meta'), 'failed', len(unfinished))
+        pipe.delete(_batch_key(batch_id, 'pending'), _batch_key(batch_id, 'waves'))
+        pipe.execute()
+    logger.warning(f"배치 정체로 마무리: {batch_id} (미완료 {len(unfinished)}개를 실패로 처리)")
+    finalize_test_case_batch.delay(batch_id)
+    return {'status': 'reaped', 'unfinished': unfinished}
 
 @celery_app.task(bind=True, name='tasks.execute_automation_test')
 def execute_automation_test(self, automation_test_id, environment='dev'):
@@ -335,7 +591,8 @@ def execute_performance_test(self, performance_test_id, environment_vars=None):
                 except:
                     pass
             
-            result = k6_engine.execute_test(pt.script_path, env_vars)
+            # 전체 출력은 gzip 로그로 저장하고 경로는 result_summary의 log_path에 남김
+            result = k6_engine.execute_test(pt.script_path, env_vars, log_prefix=f'performance_{pt.id}')
             
             execution = TestExecution(
                 performance_test_id=pt.id,
@@ -358,3 +615,128 @@ def execute_performance_test(self, performance_test_id, environment_vars=None):
             logger.error(f"성능 테스트 실행 오류: {str(e)}")
             raise
 
+
+
+@celery_app.task(bind=True, name='tasks.import_testcases_excel')
+def import_testcases_excel(self, file_path, creator_id=None):
+    """
+    대용량 엑셀 테스트 케이스 가져오기 태스크
+
+    청크마다 PROGRESS 상태로 처리/생성/실패 건수를 기록하므로
+    /testcases/upload/<task_id>/status 에서 진행 상황을 조회할 수 있다.
+
+    Args:
+        file_path: 업로드 파일 저장 경로 (처리 후 삭제)
+        creator_id: 생성자 사용자 ID
+
+    Returns:
+        dict: 가져오기 결과 요약 (행별 오류 포함)
+    """
+    app = create_app()
+    with app.app_context():
+        try:
+            from services.testcase_import_service import testcase_import_service
+
+            def report_progress(summary):
+                self.update_state(state='PROGRESS', meta={
+                    'processed': summary['processed'],
+                    'created_count': summary['created_count'],
+                    'failed_count': summary['failed_count']
+                })
+
+            return testcase_import_service.import_file(
+                file_path,
+                creator_id=creator_id,
+                progress_callback=report_progress
+            )
+        except Exception as e:
+            logger.error(f"테스트 케이스 가져오기 오류: {str(e)}")
+            raise
+        finally:
+            try:
+                os.unlink(file_path)
+            except OSError:
+                pass
+
+@celery_app.task(bind=True, name='tasks.refresh_flaky_test_scores')
+def refresh_flaky_test_scores(self, days=None):
+    """
+    Flaky 테스트 점수 재계산 태스크 (celery beat로 주기 실행, 관리자 재계산 요청)
+
+    /analytics/flaky-tests는 저장된 점수만 조회하므로 이 태스크가 점수를 최신으로 유지한다.
+    days를 지정하지 않으면 FLAKY_SCORE_WINDOWS의 모든 기간을 갱신한다.
+    """
+    app = create_app()
+    with app.app_context():
+        try:
+            from services.flaky_test_service import flaky_test_service
+            if days is None:
+                return {'test_cases': flaky_test_service.refresh_all()}
+            return {'days': days, 'test_cases': flaky_test_service.refresh(days)}
+        except Exception as e:
+            logger.error(f"Flaky 테스트 점수 갱신 오류: {str(e)}")
+            raise
+
+@celery_app.task(bind=True, name='tasks.reconcile_dashboard_summary')
+def reconcile_dashboard_summary(self):
+    """
+    대시보드 카운터 보정 태스크 (celery beat로 주기 실행)
+
+    DashboardStatusCount/DashboardSummary는 저장 시 증분으로 갱신되므로,
+    증분 반영이 실패했거나 세션을 거치지 않은 변경이 있어도 원본 TestCases 기준으로 다시 맞춘다.
+    """
+    app = create_app()
+    with app.app_context():
+        try:
+            from services.dashboard_summary_service import dashboard_summary_service
+            return dashboard_summary_service.reconcile()
+        except Exception as e:
+            logger.error(f"대시보드 카운터 보정 오류: {str(e)}")
+            raise
+
+@celery_app.task(bind=True, name='tasks.rebuild_analytics_rollups')
+def rebuild_analytics_rollups(self, days=None):
+    """
+    최근 분석 롤업 재집계 태스크 (celery beat로 주기 실행)
+
+    저장 시 증분 갱신은 수정/삭제된 결과를 건수/합계에서만 차감하므로,
+    최근 days(기본 ANALYTICS_ROLLUP_REBUILD_DAYS)일의 최소/최대 값과 실패한 증분을 원본 기준으로 다시 맞춘다.
+    """
+    app = create_app()
+    with app.app_context():
+        try:
+            from services.analytics_rollup_service import analytics_rollup_service
+            days = days or int(os.getenv('ANALYTICS_ROLLUP_REBUILD_DAYS', 2))
+            processed = analytics_rollup_service.rebuild(since=get_kst_now() - timedelta(days=days))
+            return {'days': days, 'processed': processed}
+        except Exception as e:
+            logger.error(f"분석 롤업 재집계 오류: {str(e)}")
+            raise
+
+@celery_app.task(bind=True, name='tasks.consume_result_events')
+def consume_result_events(self):
+    """
+    결과 이벤트 소비 태스크 (발행 시 짧은 지연 후 예약, celery beat로도 주기 실행)
+
+    컨슈머 그룹별로 재시도 대상과 새 이벤트를 묶음 처리한다.
+    """
+    app = create_app()
+    with app.app_context():
+        try:
+            from services.result_event_service import result_event_service
+            return result_event_service.drain()
+        except Exception as e:
+            logger.error(f"결과 이벤트 소비 오류: {str(e)}")
+            raise
+
+@celery_app.task(bind=True, name='tasks.flush_slack_digest')
+def flush_slack_digest(self, webhook_hash):
+    """웹훅 대기열에 모인 슬랙 알림을 하나의 메시지(1건이면 단건, 여러 건이면 요약)로 전송"""
+    from services.slack_delivery_service import slack_delivery_service
+    return {'webhook': webhook_hash, 'count': slack_delivery_service.flush(webhook_hash)}
+
+@celery_app.task(bind=True, name='tasks.send_slack_message')
+def send_slack_message(self, webhook_hash, message, attempt=1, count=1):
+    """슬랙 메시지 재전송 (전송 간격 대기 또는 실패 후 백오프 재시도)"""
+    from services.slack_delivery_service import slack_delivery_service
+    return {'webhook': webhook_hash, 'sent': slack_delivery_service.deliver(webhook_hash, message, attempt, count)}
@@ -1,11 +1,57 @@
+"""
+인증/권한 데코레이터
+
+요청마다 User를 조회하지 않도록 권한 판단에 필요한 값(Principal)을 Redis에 짧게 캐시한다.
+User가 추가/수정/삭제되어 커밋되면 entity:user:<id> 태그를 무효화한다. 프로세스 내 L1 캐시는 사용하지 않으므로
+(pub/sub 메시지 지연·유실과 무관하게) 역할 변경, 비활성화, 삭제가 커밋 직후 모든 프로세스에 반영된다.
+Redis를 사용할 수 없으면 캐시 없이 매 요청 DB를 조회한다.
+"""
+import os
+from collections import namedtuple
 from functools import wraps
 from flask import jsonify, request
 from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request, get_jwt
+from sqlalchemy import event
+from sqlalchemy.orm import Session
 from models import User
+from services.cache_service import cache_service, entity_tag, invalidate_after_commit, MISS
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 권한 판단용 사용자 정보 캐시 TTL(초) - 무효화에 실패해도 이 시간이 지나면 다시 조회
+PRINCIPAL_CACHE_TTL = int(os.environ.get('PRINCIPAL_CACHE_TTL', 60))
+
+# 데코레이터가 request.user에 저장하는 사용자 정보 (routes에서는 id/username/role만 사용)
+Principal = namedtuple('Principal', ['id', 'username', 'email', 'role', 'is_active'])
+
+
+def _principal_cache_key(user_id):
+    return f"principal:{user_id}"
+
+
+def get_principal(user_id):
+    """사용자 ID → Principal (없으면 None, 캐시 미스일 때만 DB 조회)"""
+    user_id = int(user_id)
+    key = _principal_cache_key(user_id)
+    principal = cache_service.get_object(key, local=False)
+    if principal is not MISS:
+        return principal
+    user = User.query.get(user_id)
+    principal = Principal(user.id, user.username, user.email, user.role, user.is_active) if user else None
+    # 없는 사용자도 캐시해 잘못된 토큰의 반복 조회를 막음 (생성 시 태그로 무효화)
+    cache_service.set_object(key, principal, ttl=PRINCIPAL_CACHE_TTL, tags=[entity_tag('user', user_id)], local=False)
+    return principal
+
+
+@event.listens_for(Session, 'after_flush')
+def _track_user_changes(session, flush_context):
+    """User 추가/수정/삭제가 flush되면 커밋 후 해당 사용자의 캐시를 무효화하도록 예약"""
+    user_ids = {obj.id for obj in (*session.new, *session.dirty, *session.deleted) if isinstance(obj, User)}
+    if user_ids:
+        invalidate_after_commit(session, *[entity_tag('user', user_id) for user_id in user_ids])
+
+
 def admin_required(fn):
     """관리자 권한 확인 데코레이터"""
     @wraps(fn)
@@ -15,31 +61,27 @@ def admin_required(fn):
             return fn(*args, **kwargs)
 
         try:
-            logger.debug(f"admin_required 데코레이터 실행 - 요청 URL: {request.url}")
-            logger.debug(f"Authorization 헤더: {request.headers.get('Authorization', '없음')}")
+            logger.debug("admin_required 데코레이터 실행 - 요청 경로: %s", request.path)
             
             verify_jwt_in_request()
             current_user_id = get_jwt_identity()
-            logger.debug(f"JWT 검증 성공 - 사용자 ID: {current_user_id}")
             
             # 게스트 사용자 체크
             if current_user_id == 'guest':
-                logger.warning(f"게스트 사용자는 접근 불가")
+                logger.warning("게스트 사용자는 접근 불가")
                 return jsonify({'error': '관리자 권한이 필요합니다.'}), 403
             
-            user = User.query.get(int(current_user_id))
-            logger.debug(f"데이터베이스에서 사용자 조회: {user}")
-            logger.debug(f"사용자 역할: {user.role if user else '사용자 없음'}")
+            user = get_principal(current_user_id)
             
             if not user or user.role != 'admin':
-                logger.warning(f"관리자 권한 부족: {user.role if user else '사용자 없음'}")
+                logger.warning("관리자 권한 부족: %s", user.role if user else '사용자 없음')
                 return jsonify({'error': '관리자 권한이 필요합니다.'}), 403
             
-            logger.info(f"관리자 권한 확인 완료: {user.username} ({user.role})")
+            logger.debug("관리자 권한 확인 완료: %s (%s)", user.username, user.role)
+            request.user = user
             return fn(*args, **kwargs)
         except Exception as e:
-            logger.error(f"admin_required 데코레이터 오류: {str(e)}")
-            logger.error(f"오류 타입: {type(e).__name__}")
+            logger.error("admin_required 데코레이터 오류: %s (%s)", e, type(e).__name__)
             return jsonify({'error': '로그인이 필요합니다.'}), 401
     return wrapper
 
@@ -52,32 +94,28 @@ def user_required(fn):
             return fn(*args, **kwargs)
         
         try:
-            logger.debug(f"user_required 데코레이터 실행 - 요청 URL: {request.url}")
-            logger.debug(f"Authorization 헤더: {request.headers.get('Authorization', '없음')}")
+            logger.debug("user_required 데코레이터 실행 - 요청 경로: %s", request.path)
             
             verify_jwt_in_request()
             current_user_id = get_jwt_identity()
-            logger.debug(f"JWT 검증 성공 - 사용자 ID: {current_user_id}")
             
             # 게스트 사용자 체크
             if current_user_id == 'guest':
-                logger.warning(f"게스트 사용자는 접근 불가")
+                logger.warning("게스트 사용자는 접근 불가")
                 return jsonify({'error': '사용자 권한이 필요합니다.'}), 403
             
-            user = User.query.get(int(current_user_id))
-            logger.debug(f"데이터베이스에서 사용자 조회: {user}")
+            user = get_principal(current_user_id)
             
             if not user or user.role not in ['admin', 'user']:
-                logger.warning(f"사용자 권한 부족: {user.role if user else '사용자 없음'}")
+                logger.warning("사용자 권한 부족: %s", user.role if user else '사용자 없음')
                 return jsonify({'error': '사용자 권한이 필요합니다.'}), 403
             
-            logger.info(f"사용자 권한 확인 완료: {user.username} ({user.role})")
+            logger.debug("사용자 권한 확인 완료: %s (%s)", user.username, user.role)
             # request.user에 사용자 정보 저장 (routes에서 사용)
             request.user = user
             return fn(*args, **kwargs)
         except Exception as e:
-            logger.error(f"user_required 데코레이터 오류: {str(e)}")
-            logger.error(f"오류 타입: {type(e).__name__}")
+            logger.error("user_required 데코레이터 오류: %s (%s)", e, type(e).__name__)
             return jsonify({'error': '로그인이 필요합니다.'}), 401
     return wrapper
 
@@ -97,7 +135,7 @@ def guest_allowed(fn):
             if current_user_id == 'guest':
                 return fn(*args, **kwargs)
             
-            user = User.query.get(int(current_user_id))
+            user = get_principal(current_user_id)
             
             if not user or not user.is_active:
                 return jsonify({'error': '유효하지 않은 사용자입니다.'}), 401
@@ -123,7 +161,7 @@ def role_required(allowed_roles):
                         return jsonify({'error': '접근 권한이 없습니다.'}), 403
                     return fn(*args, **kwargs)
                 
-                user = User.query.get(int(current_user_id))
+                user = get_principal(current_user_id)
                 
                 if not user or user.role not in allowed_roles:
                     return jsonify({'error': '접근 권한이 없습니다.'}), 403
@@ -149,7 +187,7 @@ def login_required(fn):
             if current_user_id == 'guest':
                 return fn(*args, **kwargs)
             
-            user = User.query.get(int(current_user_id))
+            user = get_principal(current_user_id)
             
             if not user or not user.is_active:
                 return jsonify({'error': '로그인이 필요합니다.'}), 401
@@ -171,7 +209,7 @@ def owner_required(fn):
             if current_user_id == 'guest':
                 return jsonify({'error': '소유자 권한이 필요합니다.'}), 403
             
-            user = User.query.get(int(current_user_id))
+            user = get_principal(current_user_id)
             
             if not user or not user.is_active:
                 return jsonify({'error': '유효하지 않은 사용자입니다.'}), 401
@@ -201,7 +239,6 @@ def get_user_from_token(token):
     """JWT 토큰에서 사용자 정보 추출 (SocketIO 등에서 사용)"""
     try:
         from flask_jwt_extended import decode_token
-        from models import User
         
         decoded_token = decode_token(token)
         user_id = decoded_token.get('sub')
@@ -209,11 +246,11 @@ def get_user_from_token(token):
         if user_id == 'guest':
             return None
         
-        user = User.query.get(int(user_id))
+        user = get_principal(user_id)
         if user and user.is_active:
             return user
         
         return None
     except Exception as e:
-        logger.error(f"토큰에서 사용자 정보 추출 오류: {str(e)}")
+        logger.error("토큰에서 사용자 정보 추출 오류: %s", e)
         return None
@@ -0,0 +1,153 @@
+"""
+스트리밍 내보내기 유틸리티
+행 이터레이터를 CSV 또는 XLSX 바이트 청크로 변환해 제너레이터 응답으로 바로 전송
+
+openpyxl write-only 모드도 save() 시점에야 zip을 만들기 때문에 첫 바이트까지 전체 조회를 기다려야 한다.
+여기서는 최소 구성의 SpreadsheetML 패키지를 zip 스트림으로 직접 기록해 행을 읽는 즉시 전송한다.
+"""
+import codecs
+import csv
+import io
+import re
+import zipfile
+from datetime import datetime, date
+from xml.sax.saxutils import escape
+
+# 청크를 내보내기 전에 모을 행 수
+ROWS_PER_CHUNK = 500
+
+# XML 1.0에서 허용되지 않는 제어 문자 (openpyxl은 이 경우 예외를 던짐)
+_ILLEGAL_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '</Types>'
+)
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{sheet_name}" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '</Relationships>'
+)
+_SHEET_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+_SHEET_TAIL = '</sheetData></worksheet>'
+
+
+def _format_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def iter_csv(header, rows, rows_per_chunk=ROWS_PER_CHUNK):
+    """
+    CSV 바이트 청크 제너레이터 (엑셀에서 한글이 깨지지 않도록 UTF-8 BOM 포함)
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write('\ufeff')
+    writer.writerow(header)
+    pending = 1
+    for row in rows:
+        writer.writerow(['' if v is None else _format_value(v) for v in row])
+        pending += 1
+        if pending >= rows_per_chunk:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+class _ChunkSink(io.RawIOBase):
+    """zipfile이 기록한 바이트를 모아 두었다가 제너레이터가 꺼내 가는 출력 스트림 (탐색 불가)"""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _xlsx_cell(value):
+    value = _format_value(value)
+    if value is None:
+        return '<c/>'
+    if isinstance(value, bool):
+        return f'<c t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)):
+        return f'<c><v>{value}</v></c>'
+    text = escape(_ILLEGAL_XML_CHARS.sub('', str(value)))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _xlsx_row(values):
+    return '<row>' + ''.join(_xlsx_cell(v) for v in values) + '</row>'
+
+
+def iter_xlsx(header, rows, sheet_name='Sheet1', rows_per_chunk=ROWS_PER_CHUNK):
+    """
+    XLSX 바이트 청크 제너레이터
+
+    워크시트는 인라인 문자열로 기록하므로 공유 문자열 테이블을 메모리에 쌓지 않는다.
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('[Content_Types].xml', _CONTENT_TYPES)
+        archive.writestr('_rels/.rels', _ROOT_RELS)
+        archive.writestr('xl/workbook.xml', _WORKBOOK.format(sheet_name=escape(sheet_name, {'"': '&quot;'})))
+        archive.writestr('xl/_rels/workbook.xml.rels', _WORKBOOK_RELS)
+
+        with archive.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as sheet:
+            writer = codecs.getwriter('utf-8')(sheet)
+            writer.write(_SHEET_HEAD)
+            writer.write(_xlsx_row(header))
+            pending = 0
+            for row in rows:
+                writer.write(_xlsx_row(row))
+                pending += 1
+                if pending >= rows_per_chunk:
+                    pending = 0
+                    data = sink.drain()
+                    if data:
+                        yield data
+            writer.write(_SHEET_TAIL)
+    yield sink.drain()
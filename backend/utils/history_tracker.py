@@ -1,51 +1,170 @@
-from models import db, TestCaseHistory
+"""
+테스트 케이스 변경 히스토리
+
+- 요청 단위 수집: TestCase가 flush되면 after_flush에서 생성 값과 변경된 속성을 한 번 비교하고,
+  모든 히스토리 행을 INSERT 한 번(executemany)으로 호출한 쪽 트랜잭션에 기록
+  (변경자는 요청의 request.user, 요청 밖에서는 set_history_user()로 지정. 변경자가 없으면 기록하지 않음)
+- 저장 방식(TEST_CASE_HISTORY_STORAGE):
+  'field'(기본) - 필드마다 한 행 / 'json' - flush당 테스트 케이스마다 한 행에 {"필드": [이전, 이후]} 압축 JSON
+  조회 시 serialize_history()가 두 형식을 같은 필드 단위 목록으로 펼친다.
+"""
+import json
+import os
 from datetime import datetime
+from flask import has_request_context, request
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, joinedload
+from models import db, TestCase, TestCaseHistory
 from utils.logger import get_logger
+from utils.orm_history import UNKNOWN, track_previous_values, previous_value, has_changes
 
 logger = get_logger(__name__)
 
+HISTORY_STORAGE_MODE = os.environ.get('TEST_CASE_HISTORY_STORAGE', 'field').lower()
+# json 저장 방식에서 사용하는 field_name
+DIFF_FIELD_NAME = '__diff__'
+# 히스토리에 남기지 않는 컬럼
+UNTRACKED_FIELDS = ('id', 'created_at', 'updated_at')
+TRACKED_FIELDS = tuple(column.key for column in TestCase.__table__.columns if column.key not in UNTRACKED_FIELDS)
+
+
+def _to_text(value):
+    return str(value) if value is not None else None
+
+
+def _history_rows(changes, changed_by, change_type, changed_at=None):
+    """
+    (test_case_id, [(필드, 이전 값, 이후 값)]) 목록 → TestCaseHistory INSERT 행 (저장 방식 반영, 값이 같은 필드 제외)
+    """
+    changed_at = changed_at or datetime.utcnow()
+    rows = []
+    for test_case_id, fields in changes:
+        fields = [(field, old, new) for field, old, new in fields if old != new]
+        if not fields:
+            continue
+        base = {'test_case_id': test_case_id, 'changed_by': changed_by, 'change_type': change_type, 'changed_at': changed_at}
+        if HISTORY_STORAGE_MODE == 'json':
+            diff = {field: [_to_text(old), _to_text(new)] for field, old, new in fields}
+            rows.append(dict(base, field_name=DIFF_FIELD_NAME, old_value=None,
+                             new_value=json.dumps(diff, ensure_ascii=False, separators=(',', ':'))))
+        else:
+            rows.extend(
+                dict(base, field_name=field, old_value=_to_text(old), new_value=_to_text(new))
+                for field, old, new in fields
+            )
+    return rows
+
+
+def _insert_rows(connection, rows):
+    if rows:
+        connection.execute(TestCaseHistory.__table__.insert(), rows)
+    return len(rows)
+
+
+def set_history_user(user_id, session=None):
+    """요청 밖(스크립트, Celery 태스크)에서 이후 flush의 변경자 지정 (None이면 해제)"""
+    session = session or db.session
+    if user_id is None:
+        session.info.pop('history_changed_by', None)
+    else:
+        session.info['history_changed_by'] = user_id
+
+
+def _history_user(session):
+    if session.info.get('history_changed_by'):
+        return session.info['history_changed_by']
+    if has_request_context():
+        user = getattr(request, 'user', None)
+        return getattr(user, 'id', None)
+    return None
+
+
+# 커밋 후 만료된 속성에 바로 값을 대입해도 이전 값과 비교할 수 있도록 함
+track_previous_values(TestCase, TRACKED_FIELDS)
+
+
+def _created_fields(obj):
+    """INSERT 후 값 (컬럼 기본값 포함, 읽지 않은 서버 기본값은 제외)"""
+    values = inspect(obj).dict
+    return [(name, None, values.get(name)) for name in TRACKED_FIELDS if values.get(name) not in (None, '')]
+
+
+def _updated_fields(obj):
+    fields = []
+    for name in TRACKED_FIELDS:
+        if has_changes(obj, (name,)):
+            old = previous_value(obj, name)
+            fields.append((name, None if old is UNKNOWN else old, getattr(obj, name)))
+    return fields
+
+
+@event.listens_for(Session, 'after_flush')
+def _write_test_case_history(session, flush_context):
+    """
+    flush된 TestCase의 생성/변경 필드를 호출한 쪽 트랜잭션에 INSERT 한 번으로 기록
+
+    after_flush에서 비교하므로 생성 기록에는 INSERT 때 적용된 컬럼 기본값(result_status='pending' 등)도 포함된다.
+    기록에 실패해도 테스트 케이스 저장은 유지하고 오류를 남긴다.
+    """
+    changed_by = _history_user(session)
+    if not changed_by:
+        return
+    created, updated = [], []
+    for obj in session.new:
+        if isinstance(obj, TestCase):
+            created.append((obj.id, _created_fields(obj)))
+    for obj in session.dirty:
+        if isinstance(obj, TestCase) and session.is_modified(obj):
+            fields = _updated_fields(obj)
+            if fields:
+                updated.append((obj.id, fields))
+    if not created and not updated:
+        return
+    changed_at = datetime.utcnow()
+    rows = _history_rows(created, changed_by, 'create', changed_at) + \
+        _history_rows(updated, changed_by, 'update', changed_at)
+    if not rows:
+        return
+    connection = session.connection()
+    try:
+        with connection.begin_nested():
+            _insert_rows(connection, rows)
+    except Exception:
+        test_case_ids = sorted({row['test_case_id'] for row in rows})
+        logger.exception(f"히스토리 기록 실패 (테스트 케이스 {test_case_ids}, {len(rows)}행)")
+
+
 def track_test_case_change(test_case_id, field_name, old_value, new_value, changed_by, change_type='update'):
-    """테스트 케이스 변경 히스토리 추적"""
+    """테스트 케이스 변경 히스토리 추적 (ORM flush로 수집되지 않는 변경용)"""
     try:
-        # 값이 실제로 변경되었는지 확인
-        if old_value != new_value:
-            history = TestCaseHistory(
-                test_case_id=test_case_id,
-                field_name=field_name,
-                old_value=str(old_value) if old_value is not None else None,
-                new_value=str(new_value) if new_value is not None else None,
-                changed_by=changed_by,
-                change_type=change_type,
-                changed_at=datetime.utcnow()
-            )
-            
-            db.session.add(history)
+        if _insert_rows(db.session.connection(), _history_rows(
+            [(test_case_id, [(field_name, old_value, new_value)])], changed_by, change_type
+        )):
             db.session.commit()
-            
-            logger.info(f"테스트 케이스 {test_case_id} {field_name} 필드 변경 추적: {old_value} -> {new_value}")
-            
+            logger.debug(f"테스트 케이스 {test_case_id} {field_name} 필드 변경 추적: {old_value} -> {new_value}")
     except Exception as e:
         logger.error(f"히스토리 추적 실패: {str(e)}")
         db.session.rollback()
 
+def track_test_case_changes_bulk(changes, changed_by, change_type='update'):
+    """
+    여러 테스트 케이스 변경 히스토리를 INSERT 한 번(executemany)으로 기록 (커밋은 호출한 쪽에서)
+
+    Args:
+        changes: [(test_case_id, field_name, old_value, new_value)]
+    """
+    grouped = {}
+    for test_case_id, field_name, old_value, new_value in changes:
+        grouped.setdefault(test_case_id, []).append((field_name, old_value, new_value))
+    return _insert_rows(db.session.connection(), _history_rows(grouped.items(), changed_by, change_type))
+
 def track_test_case_creation(test_case_id, test_case_data, created_by):
-    """테스트 케이스 생성 히스토리 추적"""
+    """테스트 케이스 생성 히스토리 추적 (ORM flush로 수집되지 않는 생성용, INSERT 한 번)"""
     try:
-        for field_name, value in test_case_data.items():
-            if value is not None and value != '':
-                history = TestCaseHistory(
-                    test_case_id=test_case_id,
-                    field_name=field_name,
-                    old_value=None,
-                    new_value=str(value),
-                    changed_by=created_by,
-                    change_type='create',
-                    changed_at=datetime.utcnow()
-                )
-                db.session.add(history)
-        
+        fields = [(field_name, None, value) for field_name, value in test_case_data.items() if value is not None and value != '']
+        _insert_rows(db.session.connection(), _history_rows([(test_case_id, fields)], created_by, 'create'))
         db.session.commit()
-        logger.info(f"테스트 케이스 {test_case_id} 생성 히스토리 추적 완료")
+        logger.debug(f"테스트 케이스 {test_case_id} 생성 히스토리 추적 완료")
         
     except Exception as e:
         logger.error(f"생성 히스토리 추적 실패: {str(e)}")
@@ -54,17 +173,9 @@ def track_test_case_creation(test_case_id, test_case_data, created_by):
 def track_test_case_deletion(test_case_id, deleted_by):
     """테스트 케이스 삭제 히스토리 추적"""
     try:
-        history = TestCaseHistory(
-            test_case_id=test_case_id,
-            field_name='deleted',
-            old_value='active',
-            new_value='deleted',
-            changed_by=deleted_by,
-            change_type='delete',
-            changed_at=datetime.utcnow()
-        )
-        
-        db.session.add(history)
+        _insert_rows(db.session.connection(), _history_rows(
+            [(test_case_id, [('deleted', 'active', 'deleted')])], deleted_by, 'delete'
+        ))
         db.session.commit()
         
         logger.info(f"테스트 케이스 {test_case_id} 삭제 히스토리 추적 완료")
@@ -73,10 +184,36 @@ def track_test_case_deletion(test_case_id, deleted_by):
         logger.error(f"삭제 히스토리 추적 실패: {str(e)}")
         db.session.rollback()
 
+def serialize_history(history):
+    """
+    히스토리 행 → 필드 단위 dict 목록 (json 저장 행은 필드별로 펼침)
+    """
+    data = []
+    for h in history:
+        base = {
+            'id': h.id,
+            'change_type': h.change_type,
+            'changed_by': h.changed_by,
+            'changed_at': h.changed_at.isoformat() if h.changed_at else None,
+            'user_name': h.user.username if h.user else 'Unknown'
+        }
+        if h.field_name == DIFF_FIELD_NAME:
+            try:
+                diff = json.loads(h.new_value or '{}')
+            except ValueError:
+                diff = {}
+            for field_name, (old_value, new_value) in diff.items():
+                data.append(dict(base, field_name=field_name, old_value=old_value, new_value=new_value))
+        else:
+            data.append(dict(base, field_name=h.field_name, old_value=h.old_value, new_value=h.new_value))
+    return data
+
 def get_test_case_history(test_case_id):
     """테스트 케이스 변경 히스토리 조회"""
     try:
-        history = TestCaseHistory.query.filter_by(test_case_id=test_case_id)\
+        # serialize_history가 user_name을 행마다 조회하지 않도록 함께 로드
+        history = TestCaseHistory.query.options(joinedload(TestCaseHistory.user))\
+            .filter_by(test_case_id=test_case_id)\
             .order_by(TestCaseHistory.changed_at.desc()).all()
         return history
     except Exception as e:
@@ -0,0 +1,186 @@
+"""
+인덱스 어드바이저
+자주 실행되는 조회(HOT_QUERIES)의 실행 계획을 EXPLAIN으로 확인해 전체 테이블 스캔을 찾아낸다.
+
+- MySQL: EXPLAIN의 type = ALL
+- PostgreSQL: EXPLAIN (FORMAT JSON)의 Seq Scan
+  (작은 테이블에서는 인덱스가 있어도 Seq Scan을 고르므로 enable_seqscan = off 상태로 계획을 본다.
+   그래도 Seq Scan이면 쓸 수 있는 인덱스가 없다는 뜻)
+- SQLite: EXPLAIN QUERY PLAN의 인덱스 없는 SCAN
+
+scripts/index_advisor.py에서 실행한다.
+"""
+import json
+import re
+from datetime import timedelta
+from sqlalchemy import select
+from models import TestCase, TestResult
+from utils.timezone_utils import get_kst_now
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 이름 → (설명, 조회문 생성 함수)
+HOT_QUERIES = {}
+
+_SQLITE_SCAN = re.compile(r'^SCAN (?:TABLE )?(\S+)')
+
+
+def hot_query(name, description):
+    """EXPLAIN 점검 대상 조회 등록 데코레이터"""
+    def decorator(builder):
+        HOT_QUERIES[name] = (description, builder)
+        return builder
+    return decorator
+
+
+@hot_query('testcases_cursor_page', '테스트 케이스 목록 커서 페이징 (updated_at, id 역순)')
+def _testcases_cursor_page():
+    return select(TestCase).order_by(TestCase.updated_at.desc(), TestCase.id.desc()).limit(100)
+
+
+@hot_query('testcases_by_folder', '폴더(하위 폴더 포함)별 테스트 케이스')
+def _testcases_by_folder():
+    return select(TestCase).where(TestCase.folder_id.in_([1, 2, 3]))
+
+
+@hot_query('testcases_by_environment_status', '환경 + 결과 상태별 테스트 케이스')
+def _testcases_by_environment_status():
+    return select(TestCase.id).where(TestCase.environment == 'dev', TestCase.result_status == 'Fail')
+
+
+@hot_query('testcases_by_category', '메인/서브 카테고리별 테스트 케이스')
+def _testcases_by_category():
+    return select(TestCase).where(TestCase.main_category == 'category', TestCase.sub_category == 'sub')
+
+
+@hot_query('test_case_recent_results', '테스트 케이스별 최근 실행 결과')
+def _test_case_recent_results():
+    return select(TestResult).where(
+        TestResult.test_case_id == 1
+    ).order_by(TestResult.executed_at.desc()).limit(10)
+
+
+@hot_query('recent_failures', '기간 내 실패 결과 (회귀/실패 패턴 분석)')
+def _recent_failures():
+    return select(TestResult.test_case_id, TestResult.executed_at).where(
+        TestResult.executed_at >= get_kst_now() - timedelta(days=7),
+        TestResult.result == 'Fail'
+    )
+
+
+@hot_query('results_by_environment', '환경 + 기간별 실행 결과')
+def _results_by_environment():
+    return select(TestResult.id, TestResult.result).where(
+        TestResult.environment == 'dev',
+        TestResult.executed_at >= get_kst_now() - timedelta(days=30)
+    )
+
+
+def _execute_explain(connection, prefix, statement):
+    compiled = statement.compile(dialect=connection.dialect, compile_kwargs={'render_postcompile': True})
+    params = compiled.params
+    if compiled.positional:
+        params = tuple(params[name] for name in compiled.positiontup)
+    return connection.exec_driver_sql(f"{prefix} {compiled}", params)
+
+
+def _explain_sqlite(connection, statement):
+    rows = _execute_explain(connection, 'EXPLAIN QUERY PLAN', statement).fetchall()
+    plan = [row[-1] for row in rows]
+    full_scans = []
+    for detail in plan:
+        match = _SQLITE_SCAN.match(detail)
+        if match and 'USING' not in detail:
+            full_scans.append(match.group(1))
+    return full_scans, plan
+
+
+def _explain_mysql(connection, statement):
+    rows = _execute_explain(connection, 'EXPLAIN', statement).mappings().all()
+    plan = [
+        f"table={row.get('table')} type={row.get('type')} key={row.get('key')} rows={row.get('rows')}"
+        for row in rows
+    ]
+    full_scans = [row.get('table') for row in rows if row.get('type') == 'ALL']
+    return full_scans, plan
+
+
+def _explain_postgresql(connection, statement):
+    with connection.begin_nested() if connection.in_transaction() else connection.begin():
+        connection.exec_driver_sql('SET LOCAL enable_seqscan = off')
+        result = _execute_explain(connection, 'EXPLAIN (FORMAT JSON)', statement).scalar()
+        connection.exec_driver_sql('SET LOCAL enable_seqscan = on')
+    if isinstance(result, str):
+        result = json.loads(result)
+
+    full_scans, plan = [], []
+
+    def walk(node, depth):
+        relation = node.get('Relation Name')
+        index = node.get('Index Name')
+        plan.append('  ' * depth + node.get('Node Type', '?')
+                    + (f" on {relation}" if relation else '')
+                    + (f" using {index}" if index else ''))
+        if node.get('Node Type') == 'Seq Scan' and relation:
+            full_scans.append(relation)
+        for child in node.get('Plans', []):
+            walk(child, depth + 1)
+
+    walk(result[0]['Plan'], 0)
+    return full_scans, plan
+
+
+_EXPLAINERS = {
+    'sqlite': _explain_sqlite,
+    'mysql': _explain_mysql,
+    'postgresql': _explain_postgresql,
+}
+
+
+def explain(connection, statement):
+    """
+    조회문의 실행 계획에서 전체 스캔 테이블 목록 추출
+
+    Returns:
+        tuple: ([전체 스캔 테이블], [실행 계획 줄])
+
+    Raises:
+        ValueError: 실행 계획 해석을 지원하지 않는 DB
+    """
+    return _explainer(connection)(connection, statement)
+
+
+def _explainer(connection):
+    explainer = _EXPLAINERS.get(connection.dialect.name)
+    if explainer is None:
+        raise ValueError(
+            f"인덱스 어드바이저를 지원하지 않는 DB입니다: {connection.dialect.name} "
+            f"(지원: {', '.join(sorted(_EXPLAINERS))})"
+        )
+    return explainer
+
+
+def run_index_advisor(connection, names=None):
+    """
+    등록된 조회(또는 names에 해당하는 조회)의 실행 계획 점검
+
+    Returns:
+        list: [{'name', 'description', 'full_scans', 'plan', 'error'}]
+
+    Raises:
+        ValueError: 실행 계획 해석을 지원하지 않는 DB (조회별 오류로 기록하지 않고 먼저 확인)
+    """
+    _explainer(connection)
+    report = []
+    for name, (description, builder) in HOT_QUERIES.items():
+        if names and name not in names:
+            continue
+        entry = {'name': name, 'description': description, 'full_scans': [], 'plan': [], 'error': None}
+        try:
+            entry['full_scans'], entry['plan'] = explain(connection, builder())
+        except Exception as e:
+            logger.warning(f"실행 계획 확인 실패 ({name}): {str(e)}")
+            entry['error'] = str(e)
+        report.append(entry)
+    return report
@@ -0,0 +1,38 @@
+"""
+ORM 변경 전 값 헬퍼
+flush 이벤트 리스너에서 컬럼의 변경 전 값을 읽기 위한 공용 함수 (대시보드 카운터, 분석 롤업, 변경 히스토리)
+"""
+from sqlalchemy import event, inspect
+
+# 변경 전 값을 읽어 두지 않아 알 수 없음
+UNKNOWN = object()
+
+
+def _load_previous_value(target, value, oldvalue, initiator):
+    """active_history용 리스너 (값 변경 없음)"""
+    return value
+
+
+def track_previous_values(model, names):
+    """커밋 후 만료된 속성에 바로 값을 대입해도 변경 전 값을 읽어 두도록 active_history 설정"""
+    for name in names:
+        event.listen(getattr(model, name), 'set', _load_previous_value, active_history=True, retval=True)
+
+
+def previous_value(obj, name):
+    """flush 중인 객체의 변경 전 컬럼 값 (읽어 두지 않았으면 UNKNOWN)"""
+    state = inspect(obj)
+    history = state.attrs[name].history
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    if history.added or name not in state.dict:
+        return UNKNOWN
+    return None
+
+
+def has_changes(obj, names):
+    """names 중 값이 바뀐 컬럼이 있는지"""
+    state = inspect(obj)
+    return any(state.attrs[name].history.has_changes() for name in names)
@@ -0,0 +1,62 @@
+"""
+키셋(커서) 페이지네이션 유틸리티
+정렬 키 값을 불투명한 커서 토큰으로 인코딩/디코딩하고, 대용량 테이블의 추정 행 수를 조회
+"""
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import text
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class InvalidCursorError(ValueError):
+    """커서 토큰 형식이 올바르지 않을 때 발생"""
+    pass
+
+
+def encode_cursor(updated_at, row_id):
+    """(updated_at, id) 정렬 키를 URL-safe 커서 토큰으로 인코딩"""
+    payload = [updated_at.isoformat() if updated_at else None, row_id]
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token):
+    """커서 토큰을 (updated_at, id) 튜플로 디코딩"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        updated_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return (datetime.fromisoformat(updated_at) if updated_at else None), int(row_id)
+    except Exception as e:
+        raise InvalidCursorError(f'유효하지 않은 커서입니다: {token}') from e
+
+
+def estimate_row_count(session, table_name, fallback_query=None):
+    """
+    통계 정보 기반 추정 행 수 조회 (COUNT(*) 전체 스캔 회피)
+
+    MySQL은 information_schema.TABLES, PostgreSQL은 pg_class.reltuples를 사용하고,
+    추정값을 얻을 수 없는 경우(SQLite 등) fallback_query.count()로 정확한 값을 반환
+    """
+    dialect = session.get_bind().dialect.name
+    try:
+        if dialect == 'mysql':
+            row = session.execute(text(
+                "SELECT TABLE_ROWS FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :name"
+            ), {'name': table_name}).first()
+            if row and row[0] is not None:
+                return int(row[0])
+        elif dialect == 'postgresql':
+            row = session.execute(text(
+                "SELECT reltuples::bigint FROM pg_class WHERE relname = :name"
+            ), {'name': table_name}).first()
+            if row and row[0] is not None and row[0] >= 0:
+                return int(row[0])
+    except Exception as e:
+        logger.warning(f"추정 행 수 조회 실패, 정확한 COUNT 사용: {str(e)}")
+        session.rollback()
+
+    return fallback_query.count() if fallback_query is not None else None
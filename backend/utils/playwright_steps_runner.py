@@ -1,59 +1,224 @@
 # -*- coding: utf-8 -*-
-"""Playwright test_steps JSON 실행 (코드 없이 실행 버튼용). routes와 tasks에서 공통 사용."""
+"""
+Playwright test_steps JSON 실행 (코드 없이 실행 버튼용). routes와 tasks에서 공통 사용.
+
+기본적으로 브라우저를 상주시키는 단계 실행 데몬(step-runner/daemon.mjs)에 요청을 보내고,
+데몬이 없으면 한 번 자동 기동을 시도한 뒤 그래도 연결할 수 없으면 1회성 실행(run-steps.mjs)으로 대체한다.
+
+환경변수:
+    PLAYWRIGHT_STEP_RUNNER_MODE: 'daemon'(기본) 또는 'subprocess'(항상 1회성 실행)
+    PLAYWRIGHT_STEP_RUNNER_ADDR: 데몬 주소 'host:port' 또는 'unix:/경로' (기본 127.0.0.1:9323)
+    PLAYWRIGHT_STEP_RUNNER_AUTOSTART: 'false'면 데몬 자동 기동 안 함
+    PLAYWRIGHT_STEP_RUNNER_POOL_SIZE: 자동 기동하는 데몬의 최대 동시 실행 수 (기본 4)
+"""
 import os
 import json
+import socket
 import subprocess
-import tempfile
+import threading
+import time
+import uuid
+from utils.logger import get_logger
 
+logger = get_logger(__name__)
 
-def run_playwright_steps(steps_data, base_url=None, timeout=300):
-    """
-    test_steps JSON으로 Playwright 단계 실행.
+DEFAULT_DAEMON_ADDR = '127.0.0.1:9323'
+DAEMON_START_TIMEOUT = 15
+# 데몬 대기열에서 기다리는 시간까지 고려한 응답 대기 여유 시간(초)
+DAEMON_RESPONSE_GRACE = 60
 
-    Args:
-        steps_data: list of step dicts (e.g. [{"action": "navigate", "url": "..."}, ...])
-        base_url: 기본 URL (미지정 시 환경변수 또는 http://localhost:3000)
-        timeout: 실행 제한 시간(초)
+_daemon_lock = threading.Lock()
+_daemon_process = None
 
-    Returns:
-        dict: {'status': 'Pass'|'Fail', 'output': str, 'error': str|None}
-    """
+
+class DaemonUnavailable(ConnectionError):
+    """요청을 보내기 전에 실패함 (연결 거부/시간 초과, 소켓 없음, 전송 실패 - 데몬은 요청을 실행하지 않음)"""
+
+
+def _runner_dir():
     backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     project_root = os.path.dirname(backend_dir)
-    runner_dir = os.path.join(project_root, 'test-scripts', 'playwright', 'step-runner')
+    return os.path.join(project_root, 'test-scripts', 'playwright', 'step-runner')
+
+
+def _daemon_addr():
+    """데몬 주소를 (family, address) 형태로 반환"""
+    addr = os.environ.get('PLAYWRIGHT_STEP_RUNNER_ADDR', DEFAULT_DAEMON_ADDR)
+    if addr.startswith('unix:'):
+        return socket.AF_UNIX, addr[len('unix:'):]
+    host, _, port = addr.rpartition(':')
+    return socket.AF_INET, (host or '127.0.0.1', int(port))
+
+
+def _connect(timeout):
+    family, address = _daemon_addr()
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(address)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def _request(message, timeout, connect_timeout=2):
+    """
+    데몬에 NDJSON 요청 한 건을 보내고 같은 id의 응답을 반환 (실행마다 별도 연결)
+
+    Raises:
+        DaemonUnavailable: 연결 또는 전송 실패 (줄 단위 요청이 끝까지 전달되지 않았으므로 실행되지 않음)
+    """
+    message = dict(message, id=message.get('id') or uuid.uuid4().hex)
+    try:
+        sock = _connect(connect_timeout)
+    except OSError as e:
+        raise DaemonUnavailable(str(e)) from e
+    try:
+        sock.settimeout(timeout)
+        try:
+            sock.sendall((json.dumps(message, ensure_ascii=False) + '\n').encode('utf-8'))
+        except OSError as e:
+            raise DaemonUnavailable(str(e)) from e
+        with sock.makefile('r', encoding='utf-8') as reader:
+            for line in reader:
+                response = json.loads(line)
+                if response.get('id') == message['id']:
+                    return response
+        raise ConnectionError('단계 실행 데몬이 응답 없이 연결을 종료했습니다.')
+    finally:
+        sock.close()
+
+
+def ping_daemon(timeout=2):
+    """데몬 상태(풀 크기, 대기 수 등) 조회. 연결할 수 없으면 None"""
+    try:
+        return _request({'type': 'ping'}, timeout=timeout, connect_timeout=timeout)
+    except (OSError, ValueError):
+        return None
+
+
+def _start_daemon():
+    """
+    단계 실행 데몬을 백그라운드로 기동하고 응답할 때까지 대기
+
+    여러 워커 프로세스가 동시에 기동을 시도해도 포트를 먼저 잡은 한 개만 살아남고
+    나머지는 바로 종료되므로, 이후 ping이 성공하면 어느 쪽이든 사용한다.
+    """
+    global _daemon_process
+    with _daemon_lock:
+        if ping_daemon():
+            return True
+        runner_script = os.path.join(_runner_dir(), 'daemon.mjs')
+        if not os.path.exists(runner_script):
+            return False
+        if _daemon_process is None or _daemon_process.poll() is not None:
+            family, address = _daemon_addr()
+            env = os.environ.copy()
+            env['HEADLESS'] = 'true'
+            env['STEP_RUNNER_POOL_SIZE'] = os.environ.get('PLAYWRIGHT_STEP_RUNNER_POOL_SIZE', '4')
+            if family == socket.AF_UNIX:
+                env['STEP_RUNNER_SOCKET'] = address
+            else:
+                env['STEP_RUNNER_HOST'], env['STEP_RUNNER_PORT'] = address[0], str(address[1])
+            try:
+                _daemon_process = subprocess.Popen(
+                    ['node', 'daemon.mjs'],
+                    cwd=_runner_dir(),
+                    env=env,
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    start_new_session=True
+                )
+            except OSError as e:
+                logger.warning(f"단계 실행 데몬 기동 실패: {str(e)}")
+                return False
+            logger.info(f"단계 실행 데몬 기동 (pid {_daemon_process.pid})")
+
+        deadline = time.time() + DAEMON_START_TIMEOUT
+        while time.time() < deadline:
+            if ping_daemon(timeout=1):
+                return True
+            time.sleep(0.2)
+        return False
+
+
+def _run_via_daemon(steps_data, base_url, timeout):
+    """데몬으로 실행. 데몬에 연결할 수 없으면 None 반환"""
+    message = {'steps': steps_data, 'base_url': base_url, 'timeout': timeout}
+    for attempt in range(2):
+        try:
+            response = _request(message, timeout=timeout + DAEMON_RESPONSE_GRACE)
+            return {
+                'status': response.get('status', 'Fail'),
+                'output': response.get('output') or '',
+                'error': response.get('error')
+            }
+        except DaemonUnavailable as e:
+            # 요청이 전달되지 않은 경우에만 기동 후 재시도하거나 1회성 실행으로 대체 (전달된 뒤의 실패는 재실행하지 않음)
+            logger.debug(f"단계 실행 데몬 연결 실패: {str(e)}")
+            if attempt > 0 or os.environ.get('PLAYWRIGHT_STEP_RUNNER_AUTOSTART', 'true').lower() == 'false':
+                return None
+            if not _start_daemon():
+                return None
+        except socket.timeout:
+            return {'status': 'Fail', 'output': '', 'error': '단계 실행 시간이 초과되었습니다.'}
+        except (OSError, ValueError) as e:
+            return {'status': 'Fail', 'output': '', 'error': f'단계 실행 데몬 통신 오류: {str(e)}'}
+    return None
+
+
+def _run_via_subprocess(steps_data, base_url, timeout):
+    """run-steps.mjs 1회성 실행 (브라우저를 매번 새로 띄움, 단계 JSON은 stdin으로 전달)"""
+    runner_dir = _runner_dir()
     runner_script = os.path.join(runner_dir, 'run-steps.mjs')
     if not os.path.exists(runner_script):
         return {'status': 'Fail', 'output': '', 'error': f'단계 실행기가 없습니다: {runner_script}'}
 
-    base_url = base_url or os.environ.get('PLAYWRIGHT_BASE_URL', 'http://localhost:3000')
     env = os.environ.copy()
     env['BASE_URL'] = base_url
     env['HEADLESS'] = 'true'
 
     try:
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump(steps_data, f, ensure_ascii=False)
-            steps_path = f.name
-        try:
-            result = subprocess.run(
-                ['node', 'run-steps.mjs', steps_path],
-                capture_output=True,
-                text=True,
-                timeout=timeout,
-                cwd=runner_dir,
-                env=env
-            )
-            return {
-                'status': 'Pass' if result.returncode == 0 else 'Fail',
-                'output': result.stdout or '',
-                'error': result.stderr if result.returncode != 0 else None
-            }
-        finally:
-            try:
-                os.unlink(steps_path)
-            except Exception:
-                pass
+        result = subprocess.run(
+            ['node', 'run-steps.mjs'],
+            input=json.dumps(steps_data, ensure_ascii=False),
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+            cwd=runner_dir,
+            env=env
+        )
+        return {
+            'status': 'Pass' if result.returncode == 0 else 'Fail',
+            'output': result.stdout or '',
+            'error': result.stderr if result.returncode != 0 else None
+        }
     except subprocess.TimeoutExpired:
         return {'status': 'Fail', 'output': '', 'error': '단계 실행 시간이 초과되었습니다.'}
     except Exception as e:
         return {'status': 'Fail', 'output': '', 'error': str(e)}
+
+
+def run_playwright_steps(steps_data, base_url=None, timeout=300):
+    """
+    test_steps JSON으로 Playwright 단계 실행.
+
+    Args:
+        steps_data: list of step dicts (e.g. [{"action": "navigate", "url": "..."}, ...])
+        base_url: 기본 URL (미지정 시 환경변수 또는 http://localhost:3000)
+        timeout: 실행 제한 시간(초)
+
+    Returns:
+        dict: {'status': 'Pass'|'Fail', 'output': str, 'error': str|None}
+    """
+    base_url = base_url or os.environ.get('PLAYWRIGHT_BASE_URL', 'http://localhost:3000')
+
+    if os.environ.get('PLAYWRIGHT_STEP_RUNNER_MODE', 'daemon').lower() != 'subprocess':
+        result = _run_via_daemon(steps_data, base_url, timeout)
+        if result is not None:
+            return result
+        logger.warning("단계 실행 데몬에 연결할 수 없어 1회성 실행으로 대체합니다.")
+
+    return _run_via_subprocess(steps_data, base_url, timeout)
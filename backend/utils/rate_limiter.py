@@ -1,81 +1,178 @@
 """
 Rate Limiting 유틸리티
-Flask-Limiter를 사용한 API 요청 제한
+Redis 슬라이딩 윈도우 기반 API 요청 제한 (모든 워커/노드가 같은 한도를 공유)
+Redis를 사용할 수 없으면 크기가 제한된 프로세스 내 LRU 저장소로 대체
 """
 from functools import wraps
 from flask import request, jsonify
 from utils.logger import get_logger
+import threading
 import time
-from collections import defaultdict
+import uuid
+from collections import OrderedDict, deque
 
 logger = get_logger(__name__)
 
-# 간단한 메모리 기반 Rate Limiter (프로덕션에서는 Redis 사용 권장)
-_rate_limit_store = defaultdict(list)
+RATE_LIMIT_KEY_PREFIX = 'ratelimit'
+# 로컬 대체 저장소가 보관하는 최대 키 수 (초과 시 가장 오래 사용되지 않은 키부터 제거)
+LOCAL_STORE_MAX_KEYS = 10000
 
-def rate_limit(max_requests=100, window_seconds=60):
+# 슬라이딩 윈도우 (정렬 집합에 요청 시각 기록)
+# KEYS[1]: 제한 키, ARGV[1]: 최대 요청 수, ARGV[2]: 윈도우(ms), ARGV[3]: 요청 고유 ID
+# 반환: {허용 여부(1/0), 윈도우 내 요청 수, 재시도까지 남은 시간(ms)}
+# 시각은 Redis 서버 시간을 사용하므로 노드 간 시계 차이에 영향을 받지 않는다.
+SLIDING_WINDOW_SCRIPT = """
+if redis.replicate_commands then redis.replicate_commands() end
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+redis.call('ZREMRANGEBYSCORE', KEYS[1], 0, now - window)
+local count = redis.call('ZCARD', KEYS[1])
+if count < limit then
+    redis.call('ZADD', KEYS[1], now, ARGV[3])
+    redis.call('PEXPIRE', KEYS[1], window)
+    return {1, count + 1, 0}
+end
+local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+local retry_after = window
+if oldest[2] then
+    retry_after = tonumber(oldest[2]) + window - now
+end
+return {0, count, retry_after}
+"""
+
+
+class LocalSlidingWindowStore:
+    """Redis 장애 시 사용하는 프로세스 내 슬라이딩 윈도우 저장소 (키 수와 키당 기록 수 모두 제한)"""
+
+    def __init__(self, max_keys=LOCAL_STORE_MAX_KEYS):
+        self.max_keys = max_keys
+        self._windows = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key, max_requests, window_seconds):
+        now = time.time()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or window.maxlen != max_requests:
+                window = deque(maxlen=max_requests)
+                self._windows[key] = window
+            self._windows.move_to_end(key)
+            while len(self._windows) > self.max_keys:
+                self._windows.popitem(last=False)
+
+            while window and now - window[0] >= window_seconds:
+                window.popleft()
+            if len(window) >= max_requests:
+                return False, len(window), window[0] + window_seconds - now
+            window.append(now)
+            return True, len(window), 0.0
+
+
+class RateLimiter:
+    """Redis 슬라이딩 윈도우 Rate Limiter (cache_service의 Redis 연결 재사용)"""
+
+    def __init__(self):
+        self._script = None
+        self._script_client = None
+        self.local_store = LocalSlidingWindowStore()
+
+    def _get_script(self):
+        from services.cache_service import cache_service
+        if not cache_service.enabled or cache_service.redis_client is None:
+            return None
+        if self._script is None or self._script_client is not cache_service.redis_client:
+            self._script = cache_service.redis_client.register_script(SLIDING_WINDOW_SCRIPT)
+            self._script_client = cache_service.redis_client
+        return self._script
+
+    def hit(self, key, max_requests, window_seconds):
+        """
+        요청 1건을 기록하고 허용 여부 반환 (Redis 왕복 1회)
+
+        Returns:
+            tuple: (허용 여부, 윈도우 내 요청 수, 재시도까지 남은 시간(초))
+        """
+        script = self._get_script()
+        if script is not None:
+            try:
+                allowed, count, retry_after_ms = script(
+                    keys=[f"{RATE_LIMIT_KEY_PREFIX}:{key}"],
+                    args=[max_requests, int(window_seconds * 1000), uuid.uuid4().hex]
+                )
+                return bool(int(allowed)), int(count), int(retry_after_ms) / 1000.0
+            except Exception as e:
+                logger.warning(f"Redis Rate Limit 확인 실패, 로컬 저장소 사용: {str(e)}")
+        return self.local_store.hit(key, max_requests, window_seconds)
+
+
+# 전역 Rate Limiter 인스턴스
+rate_limiter = RateLimiter()
+
+
+def _client_ip():
+    client_ip = request.environ.get('HTTP_X_FORWARDED_FOR', request.remote_addr)
+    if client_ip:
+        return client_ip.split(',')[0].strip()
+    return 'unknown'
+
+
+def _client_identity():
+    """인증된 사용자는 사용자 ID, 그 외(비로그인/게스트)는 IP 기준으로 식별"""
+    user = getattr(request, 'user', None)
+    if user is not None and getattr(user, 'id', None) is not None:
+        return f"user:{user.id}"
+    try:
+        from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
+        verify_jwt_in_request(optional=True)
+        identity = get_jwt_identity()
+        if identity and identity != 'guest':
+            return f"user:{identity}"
+    except Exception:
+        pass
+    return f"ip:{_client_ip()}"
+
+
+def rate_limit(max_requests=100, window_seconds=60, scope=None, per_user=True):
     """
-    간단한 Rate Limiting 데코레이터
-    
+    슬라이딩 윈도우 Rate Limiting 데코레이터
+
     Args:
         max_requests: 시간 윈도우 내 최대 요청 수
         window_seconds: 시간 윈도우 (초)
-    
+        scope: 한도를 공유할 범위 이름 (기본값: 라우트 엔드포인트별)
+        per_user: True면 로그인 사용자는 사용자 ID 기준, False면 항상 IP 기준
+
     사용 예:
-        @rate_limit(max_requests=10, window_seconds=60)
         @app.route('/api/endpoint')
+        @rate_limit(max_requests=10, window_seconds=60)
         def my_endpoint():
             ...
     """
     def decorator(f):
         @wraps(f)
         def wrapper(*args, **kwargs):
-            # 클라이언트 IP 주소 가져오기
-            client_ip = request.environ.get('HTTP_X_FORWARDED_FOR', request.remote_addr)
-            if client_ip:
-                client_ip = client_ip.split(',')[0].strip()
-            else:
-                client_ip = 'unknown'
-            
-            current_time = time.time()
-            
-            # 오래된 요청 기록 제거
-            _rate_limit_store[client_ip] = [
-                req_time for req_time in _rate_limit_store[client_ip]
-                if current_time - req_time < window_seconds
-            ]
-            
-            # 요청 수 확인
-            if len(_rate_limit_store[client_ip]) >= max_requests:
-                logger.warning(f"Rate limit exceeded for IP: {client_ip}")
-                return jsonify({
+            if request.method == 'OPTIONS':
+                return f(*args, **kwargs)
+
+            identity = _client_identity() if per_user else f"ip:{_client_ip()}"
+            key = f"{scope or request.endpoint or f.__name__}:{identity}"
+
+            allowed, count, retry_after = rate_limiter.hit(key, max_requests, window_seconds)
+            if not allowed:
+                retry_after = max(1, int(retry_after + 0.999))
+                logger.warning(f"Rate limit exceeded: {key}")
+                response = jsonify({
                     'error': 'Too many requests',
-                    'message': f'요청 한도를 초과했습니다. {window_seconds}초 후 다시 시도해주세요.',
-                    'retry_after': window_seconds
-                }), 429
-            
-            # 요청 기록 추가
-            _rate_limit_store[client_ip].append(current_time)
-            
+                    'message': f'요청 한도를 초과했습니다. {retry_after}초 후 다시 시도해주세요.',
+                    'retry_after': retry_after
+                })
+                response.headers['Retry-After'] = str(retry_after)
+                response.headers['X-RateLimit-Limit'] = str(max_requests)
+                response.headers['X-RateLimit-Remaining'] = '0'
+                return response, 429
+
             return f(*args, **kwargs)
         return wrapper
     return decorator
-
-# 프로덕션 환경에서는 Flask-Limiter 사용 권장
-# 설치: pip install flask-limiter
-# 사용 예:
-# from flask_limiter import Limiter
-# from flask_limiter.util import get_remote_address
-# 
-# limiter = Limiter(
-#     app=app,
-#     key_func=get_remote_address,
-#     default_limits=["200 per day", "50 per hour"],
-#     storage_uri="redis://localhost:6379"
-# )
-# 
-# @app.route('/api/endpoint')
-# @limiter.limit("10 per minute")
-# def my_endpoint():
-#     ...
-
@@ -0,0 +1,119 @@
+"""
+Socket.IO 이벤트 전송 헬퍼
+웹 서버 여러 프로세스/노드와 Celery 워커에서 보낸 이벤트가 모든 클라이언트에 전달되도록 Redis 메시지 큐를 사용
+
+- 웹 서버: SocketIO(app, message_queue=...)가 큐를 구독해 다른 프로세스가 보낸 이벤트도 자기 클라이언트에 전달
+- Celery 워커: 연결된 클라이언트가 없으므로 app의 SocketIO 대신 큐에 쓰기만 하는 SocketIO(message_queue=...)로 전송
+  (celery_app의 worker_init 신호에서 use_write_only_emitter() 호출)
+- test_result처럼 많이 발생하는 이벤트는 emit_batched()로 룸별 SOCKETIO_BATCH_INTERVAL(기본 0.25초) 동안 모아
+  한 프레임('<이벤트>_batch', {'items': [...]})으로 전송 (모인 것이 1건이면 원래 이벤트 그대로, 0이면 묶지 않음)
+"""
+import atexit
+import os
+import threading
+import time
+import redis
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+SOCKETIO_MESSAGE_QUEUE = os.environ.get('SOCKETIO_MESSAGE_QUEUE') or os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
+SOCKETIO_CHANNEL = os.environ.get('SOCKETIO_CHANNEL', 'flask-socketio')
+SOCKETIO_BATCH_INTERVAL = float(os.environ.get('SOCKETIO_BATCH_INTERVAL', 0.25))
+
+_write_only = False
+_external = None
+_external_pid = None
+_external_lock = threading.Lock()
+
+
+def message_queue_url():
+    """사용할 메시지 큐 URL (Redis에 연결할 수 없으면 None - 단일 프로세스에서만 전달)"""
+    if not SOCKETIO_MESSAGE_QUEUE:
+        return None
+    try:
+        redis.from_url(SOCKETIO_MESSAGE_QUEUE, socket_connect_timeout=2).ping()
+        return SOCKETIO_MESSAGE_QUEUE
+    except Exception as e:
+        logger.warning(f"Socket.IO 메시지 큐 연결 실패, 단일 프로세스 모드로 동작: {str(e)}")
+        return None
+
+
+def use_write_only_emitter():
+    """이 프로세스의 이벤트를 메시지 큐로만 보냄 (Celery 워커처럼 클라이언트가 없는 프로세스)"""
+    global _write_only
+    _write_only = True
+
+
+def get_socketio():
+    """이벤트를 보낼 SocketIO 인스턴스 (쓰기 전용 모드에서 큐를 사용할 수 없으면 None)"""
+    global _external, _external_pid
+    if not _write_only:
+        from app import socketio
+        return socketio
+    if _external_pid != os.getpid():
+        with _external_lock:
+            if _external_pid != os.getpid():
+                from flask_socketio import SocketIO
+                url = message_queue_url()
+                # app 없이 message_queue만 주면 쓰기 전용 클라이언트 매니저로 동작
+                _external = SocketIO(message_queue=url, channel=SOCKETIO_CHANNEL) if url else None
+                _external_pid = os.getpid()
+    return _external
+
+
+def emit(event, data, room):
+    """룸에 이벤트 전송"""
+    socketio = get_socketio()
+    if socketio is None:
+        logger.debug(f"Socket.IO 메시지 큐가 없어 이벤트를 보내지 않음: {event} ({room})")
+        return
+    socketio.emit(event, data, room=room)
+
+
+class RoomEventBatcher:
+    """(이벤트, 룸)별로 모았다가 주기적으로 한 프레임씩 전송"""
+
+    def __init__(self, interval=SOCKETIO_BATCH_INTERVAL):
+        self.interval = interval
+        self._buffers = {}
+        self._lock = threading.Lock()
+        self._thread_pid = None
+
+    def add(self, event, room, data):
+        with self._lock:
+            self._buffers.setdefault((event, room), []).append(data)
+            if self._thread_pid != os.getpid():
+                # fork 이후에는 스레드가 따라오지 않으므로 프로세스마다 시작
+                self._thread_pid = os.getpid()
+                threading.Thread(target=self._run, name='socketio-batcher', daemon=True).start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            buffers, self._buffers = self._buffers, {}
+        for (event, room), items in buffers.items():
+            try:
+                if len(items) == 1:
+                    emit(event, items[0], room)
+                else:
+                    emit(f'{event}_batch', {'items': items}, room)
+            except Exception as e:
+                logger.error(f"Socket.IO 묶음 전송 오류 ({event}, {room}): {str(e)}")
+
+
+_batcher = RoomEventBatcher()
+# 워커 재시작 등으로 프로세스가 끝날 때 남은 이벤트 전송
+atexit.register(_batcher.flush)
+
+
+def emit_batched(event, data, room):
+    """묶음 전송 (SOCKETIO_BATCH_INTERVAL이 0이면 바로 전송)"""
+    if SOCKETIO_BATCH_INTERVAL <= 0:
+        emit(event, data, room)
+    else:
+        _batcher.add(event, room, data)
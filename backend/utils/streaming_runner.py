@@ -0,0 +1,210 @@
+"""
+스트리밍 프로세스 실행기
+subprocess.run(capture_output=True) 대신 Popen으로 실행하면서 출력을 줄 단위로 읽어 처리
+
+- stdout/stderr는 파이프별 읽기 스레드가 줄(최대 EXECUTION_STREAM_MAX_LINE_BYTES) 단위로 제한 크기 큐에 넣고,
+  실행 스레드는 큐를 타임아웃 대기로 꺼내므로 타임아웃 검사가 출력 대기로 막히지 않는다.
+  큐가 가득 차면 읽기 스레드가 멈추고 자식 프로세스도 파이프 쓰기에서 대기한다 (backpressure).
+- 전체 출력은 gzip 로그 파일(EXECUTION_LOG_DIR)에 순서대로 기록하고, 메모리에는 스트림별 마지막
+  EXECUTION_OUTPUT_TAIL_BYTES만 보관한다 (응답/notes용).
+- on_output 콜백에는 EXECUTION_STREAM_INTERVAL(기본 0.5초)마다 모은 줄을 한 번에 전달한다.
+  한 번에 EXECUTION_STREAM_MAX_FRAME_BYTES를 넘는 줄은 실시간 전송에서만 건너뛰고 건너뛴 줄 수를 함께 전달한다
+  (로그 파일에는 모두 남음).
+"""
+import gzip
+import os
+import queue
+import signal
+import subprocess
+import threading
+import time
+import uuid
+from collections import deque
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+EXECUTION_LOG_DIR = os.environ.get(
+    'EXECUTION_LOG_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'execution_logs')
+)
+STREAM_INTERVAL = float(os.environ.get('EXECUTION_STREAM_INTERVAL', 0.5))
+STREAM_MAX_FRAME_BYTES = int(os.environ.get('EXECUTION_STREAM_MAX_FRAME_BYTES', 64 * 1024))
+MAX_LINE_BYTES = int(os.environ.get('EXECUTION_STREAM_MAX_LINE_BYTES', 8 * 1024))
+OUTPUT_TAIL_BYTES = int(os.environ.get('EXECUTION_OUTPUT_TAIL_BYTES', 256 * 1024))
+# 읽기 스레드와 실행 스레드 사이 큐 크기 (줄 수)
+QUEUE_MAX_LINES = 1000
+
+_EOF = object()
+
+
+class StreamResult:
+    """실행 결과 (stdout/stderr는 마지막 OUTPUT_TAIL_BYTES만, 전체 출력은 log_path)"""
+
+    def __init__(self, args, returncode, stdout, stderr, log_path, truncated):
+        self.args = args
+        self.returncode = returncode
+        self.stdout = stdout
+        self.stderr = stderr
+        self.log_path = log_path
+        self.truncated = truncated
+
+
+class _Tail:
+    """바이트 상한이 있는 마지막 출력 버퍼"""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.lines = deque()
+        self.size = 0
+        self.truncated = False
+
+    def append(self, line):
+        self.lines.append(line)
+        self.size += len(line)
+        while self.size > self.limit and len(self.lines) > 1:
+            self.size -= len(self.lines.popleft())
+            self.truncated = True
+
+    def text(self):
+        return ''.join(self.lines)
+
+
+def _read_pipe(pipe, stream, lines):
+    try:
+        for chunk in iter(lambda: pipe.readline(MAX_LINE_BYTES), b''):
+            lines.put((stream, chunk.decode('utf-8', errors='replace')))
+    except Exception as e:
+        logger.warning(f"출력 읽기 중단 ({stream}): {str(e)}")
+    finally:
+        lines.put((stream, _EOF))
+
+
+def _kill(process):
+    """프로세스 그룹 종료 (npx처럼 자식을 띄우는 명령이 파이프를 계속 잡고 있지 않도록)"""
+    try:
+        if os.name == 'posix':
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def _drain(lines, readers, wait=5.0):
+    """종료 후 읽기 스레드가 큐 대기로 남지 않도록 비움 (최대 wait초)"""
+    deadline = time.monotonic() + wait
+    while any(reader.is_alive() for reader in readers) and time.monotonic() < deadline:
+        try:
+            lines.get(timeout=0.1)
+        except queue.Empty:
+            pass
+
+
+def new_log_path(prefix):
+    """로그 파일 경로 (EXECUTION_LOG_DIR/<prefix>_<시각>_<랜덤>.log.gz)"""
+    os.makedirs(EXECUTION_LOG_DIR, exist_ok=True)
+    name = f"{prefix}_{time.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}.log.gz"
+    return os.path.join(EXECUTION_LOG_DIR, name)
+
+
+def resolve_log_path(log_path):
+    """저장된 로그 경로가 EXECUTION_LOG_DIR 안의 파일이면 절대 경로, 아니면 None"""
+    if not log_path:
+        return None
+    path = os.path.realpath(log_path)
+    if os.path.commonpath([path, os.path.realpath(EXECUTION_LOG_DIR)]) != os.path.realpath(EXECUTION_LOG_DIR):
+        return None
+    return path if os.path.isfile(path) else None
+
+
+def run_streaming(args, timeout=None, cwd=None, env=None, on_output=None, log_prefix='execution'):
+    """
+    프로세스 실행 (출력 스트리밍 + gzip 로그)
+
+    Args:
+        args: 실행 명령 리스트
+        timeout: 초 (초과 시 프로세스를 종료하고 subprocess.TimeoutExpired 발생 - log_path 속성 포함)
+        on_output: on_output(lines, dropped) - lines는 [{'stream': 'stdout'|'stderr', 'line': str}]
+        log_prefix: 로그 파일명 접두어
+
+    Returns:
+        StreamResult
+    """
+    log_path = new_log_path(log_prefix)
+    process = subprocess.Popen(args, cwd=cwd, env=env, stdin=subprocess.DEVNULL,
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                               start_new_session=(os.name == 'posix'))
+    lines = queue.Queue(maxsize=QUEUE_MAX_LINES)
+    readers = [
+        threading.Thread(target=_read_pipe, args=(process.stdout, 'stdout', lines), daemon=True),
+        threading.Thread(target=_read_pipe, args=(process.stderr, 'stderr', lines), daemon=True),
+    ]
+    for reader in readers:
+        reader.start()
+
+    tails = {'stdout': _Tail(OUTPUT_TAIL_BYTES), 'stderr': _Tail(OUTPUT_TAIL_BYTES)}
+    frame, frame_bytes, dropped = [], 0, 0
+    deadline = time.monotonic() + timeout if timeout else None
+    next_flush = time.monotonic() + STREAM_INTERVAL
+    open_streams = 2
+
+    def flush_frame():
+        nonlocal frame, frame_bytes, dropped
+        if on_output and (frame or dropped):
+            try:
+                on_output(frame, dropped)
+            except Exception as e:
+                logger.warning(f"실행 출력 전송 실패: {str(e)}")
+        frame, frame_bytes, dropped = [], 0, 0
+
+    try:
+        with gzip.open(log_path, 'wt', encoding='utf-8') as log_file:
+            while open_streams:
+                now = time.monotonic()
+                if deadline and now >= deadline:
+                    raise subprocess.TimeoutExpired(args, timeout, output=tails['stdout'].text(),
+                                                    stderr=tails['stderr'].text())
+                wait = next_flush - now
+                if deadline:
+                    wait = min(wait, deadline - now)
+                # 첫 줄을 기다린 뒤 이미 쌓인 줄은 한 번에 처리
+                items = []
+                try:
+                    items.append(lines.get(timeout=max(wait, 0.01)))
+                    while len(items) < QUEUE_MAX_LINES:
+                        items.append(lines.get_nowait())
+                except queue.Empty:
+                    pass
+                for stream, line in items:
+                    if line is _EOF:
+                        open_streams -= 1
+                        continue
+                    log_file.write(line if stream == 'stdout' else f"[stderr] {line}")
+                    tails[stream].append(line)
+                    if frame_bytes + len(line) <= STREAM_MAX_FRAME_BYTES:
+                        frame.append({'stream': stream, 'line': line.rstrip('\n')})
+                        frame_bytes += len(line)
+                    else:
+                        dropped += 1
+                if time.monotonic() >= next_flush:
+                    flush_frame()
+                    next_flush = time.monotonic() + STREAM_INTERVAL
+            flush_frame()
+            remaining = deadline - time.monotonic() if deadline else None
+            returncode = process.wait(timeout=max(remaining, 0) if remaining is not None else None)
+    except subprocess.TimeoutExpired as e:
+        e.log_path = log_path
+        raise
+    finally:
+        # 정상 종료 후에도 남은 자식 프로세스(그룹)는 정리
+        _kill(process)
+        process.wait()
+        _drain(lines, readers)
+        for pipe in (process.stdout, process.stderr):
+            pipe.close()
+
+    return StreamResult(
+        args, returncode, tails['stdout'].text(), tails['stderr'].text(), log_path,
+        tails['stdout'].truncated or tails['stderr'].truncated
+    )
@@ -0,0 +1,51 @@
+"""
+UPSERT 헬퍼
+유니크 키가 같은 행이 있으면 기존 값과 병합하고 없으면 삽입 (카운터/집계 테이블 증분 갱신용)
+
+- MySQL: INSERT ... ON DUPLICATE KEY UPDATE, PostgreSQL/SQLite: INSERT ... ON CONFLICT DO UPDATE (executemany 1회)
+- 그 밖의 DB: 행마다 UPDATE 후 갱신된 행이 없으면 INSERT
+"""
+from sqlalchemy import and_, bindparam
+
+
+def merge_rows(connection, table, key_columns, rows, merge):
+    """
+    행 병합
+
+    Args:
+        key_columns: 유니크 키 컬럼 이름 목록
+        rows: 삽입할 값 dict 목록
+        merge: merge(incoming) -> {컬럼 이름: 병합 식}, incoming[컬럼 이름]은 새로 들어온 값
+    """
+    if not rows:
+        return
+    dialect = connection.dialect.name
+
+    if dialect == 'mysql':
+        from sqlalchemy.dialects.mysql import insert
+        stmt = insert(table)
+        connection.execute(stmt.on_duplicate_key_update(**merge(stmt.inserted)), rows)
+    elif dialect in ('postgresql', 'sqlite'):
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        stmt = insert(table)
+        connection.execute(
+            stmt.on_conflict_do_update(index_elements=list(key_columns), set_=merge(stmt.excluded)),
+            rows
+        )
+    else:
+        _merge_rows_each(connection, table, key_columns, rows, merge)
+
+
+def _merge_rows_each(connection, table, key_columns, rows, merge):
+    """UPSERT 구문이 없는 DB용 (행마다 UPDATE → 없으면 INSERT)"""
+    incoming = {column.name: bindparam(f'in_{column.name}', type_=column.type) for column in table.columns}
+    update = table.update().where(
+        and_(*[table.c[name] == incoming[name] for name in key_columns])
+    ).values(merge(incoming))
+    for row in rows:
+        result = connection.execute(update, {f'in_{name}': value for name, value in row.items()})
+        if result.rowcount == 0:
+            connection.execute(table.insert(), row)
@@ -0,0 +1,44 @@
+"""
+운영 서버 진입점 (gunicorn)
+python app.py(Werkzeug 개발 서버, threading)는 개발용이고, 운영에서는 gunicorn의 eventlet/gevent 워커로 실행한다.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+그린 스레드 워커에서는 앱과 DB 드라이버를 임포트하기 전에 표준 라이브러리를 몽키패치해야 한다.
+PyMySQL/redis/requests는 순수 파이썬 소켓을 쓰므로 패치만으로 협력적으로 동작하고,
+psycopg2(C 확장)는 psycogreen이 설치되어 있으면 대기 콜백을 등록한다.
+SERVER_ASYNC_MODE(eventlet | gevent | threading)는 gunicorn.conf.py의 워커 종류와 같아야 한다.
+"""
+import os
+
+SERVER_ASYNC_MODE = os.environ.get('SERVER_ASYNC_MODE', 'eventlet').lower()
+
+if SERVER_ASYNC_MODE == 'eventlet':
+    import eventlet
+    eventlet.monkey_patch()
+    try:
+        from psycogreen.eventlet import patch_psycopg
+        patch_psycopg()
+    except ImportError:
+        pass
+elif SERVER_ASYNC_MODE == 'gevent':
+    from gevent import monkey
+    monkey.patch_all()
+    try:
+        from psycogreen.gevent import patch_psycopg
+        patch_psycopg()
+    except ImportError:
+        pass
+
+# Socket.IO 비동기 모드를 워커 종류에 맞춤 (app.py가 읽음)
+os.environ.setdefault('SOCKETIO_ASYNC_MODE', SERVER_ASYNC_MODE)
+if SERVER_ASYNC_MODE != 'threading':
+    # watchdog 감시 스레드는 블로킹 시스템 호출로 허브를 멈출 수 있으므로 mtime 폴링 사용
+    os.environ.setdefault('SCRIPT_TREE_WATCH', '0')
+
+from app import app, socketio, db, load_existing_schedules  # noqa: E402,F401
+
+# python app.py 실행 시와 같은 시작 작업 (워커 프로세스마다 실행되므로 APScheduler 스케줄도 워커마다 등록됨)
+with app.app_context():
+    db.create_all()
+    load_existing_schedules()
@@ -2,6 +2,20 @@ import { useState, useEffect, useCallback } from 'react';
 import axios from 'axios';
 import config from '../config';
 
+// 테스트 케이스 목록은 키셋 커서 페이지 단위로 끝까지 조회
+const fetchAllTestCases = async () => {
+  const items = [];
+  let after = null;
+  do {
+    const params = { limit: 1000 };
+    if (after) params.after = after;
+    const res = await axios.get(`${config.apiUrl}/testcases`, { params });
+    items.push(...(res.data.items || []));
+    after = res.data.pagination?.next_cursor || null;
+  } while (after);
+  return items;
+};
+
 export const useTestCaseData = () => {
   const [testCases, setTestCases] = useState([]);
   const [folderTree, setFolderTree] = useState([]);
@@ -14,14 +28,14 @@ export const useTestCaseData = () => {
     try {
       setLoading(true);
       
-      const [testCasesRes, treeRes, foldersRes, usersRes] = await Promise.all([
-        axios.get(`${config.apiUrl}/testcases`),
+      const [testCases, treeRes, foldersRes, usersRes] = await Promise.all([
+        fetchAllTestCases(),
         axios.get(`${config.apiUrl}/folders/tree`),
         axios.get(`${config.apiUrl}/folders`),
         axios.get(`${config.apiUrl}/users/list`)
       ]);
 
-      setTestCases(testCasesRes.data);
+      setTestCases(testCases);
       setFolderTree(treeRes.data);
       setAllFolders(foldersRes.data);
       setUsers(usersRes.data);
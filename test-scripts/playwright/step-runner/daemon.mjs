@@ -0,0 +1,243 @@
+#!/usr/bin/env node
+/**
+ * Playwright 단계 실행 데몬 (상주 브라우저 + 컨텍스트 풀)
+ *
+ * 브라우저를 한 번만 띄워 두고 브라우저 컨텍스트를 재사용하면서 test_steps JSON을 실행한다.
+ * 요청/응답은 줄 단위 JSON(NDJSON)이며 로컬 TCP 소켓, 유닉스 소켓 또는 stdin/stdout으로 주고받는다.
+ *
+ * 사용:
+ *   node daemon.mjs            # 127.0.0.1:9323 에서 대기
+ *   node daemon.mjs --stdio    # stdin으로 요청을 받아 stdout으로 응답
+ *
+ * 요청: {"id": "...", "steps": [...], "base_url": "...", "timeout": 300}
+ *       {"id": "...", "type": "ping"}
+ * 응답: {"id": "...", "status": "Pass"|"Fail", "output": "...", "error": null|"..."}
+ *
+ * 환경변수:
+ *   STEP_RUNNER_HOST / STEP_RUNNER_PORT  TCP 주소 (기본 127.0.0.1 / 9323)
+ *   STEP_RUNNER_SOCKET                   유닉스 소켓 경로 (지정 시 TCP 대신 사용)
+ *   STEP_RUNNER_POOL_SIZE                동시 실행(컨텍스트) 최대 수 (기본 4)
+ *   STEP_RUNNER_MAX_RUNS_PER_CONTEXT     컨텍스트 재사용 횟수 상한 (기본 50)
+ *   BASE_URL / PLAYWRIGHT_BASE_URL       요청에 base_url이 없을 때 사용할 기본 URL
+ *   HEADLESS                             false면 브라우저 창 표시 (기본 true)
+ */
+
+import { chromium } from 'playwright';
+import { createServer } from 'net';
+import { createInterface } from 'readline';
+import { existsSync, unlinkSync } from 'fs';
+import { executeSteps } from './steps.mjs';
+
+const HOST = process.env.STEP_RUNNER_HOST || '127.0.0.1';
+const PORT = parseInt(process.env.STEP_RUNNER_PORT || '9323', 10);
+const SOCKET_PATH = process.env.STEP_RUNNER_SOCKET || '';
+const POOL_SIZE = Math.max(1, parseInt(process.env.STEP_RUNNER_POOL_SIZE || '4', 10));
+const MAX_RUNS_PER_CONTEXT = Math.max(1, parseInt(process.env.STEP_RUNNER_MAX_RUNS_PER_CONTEXT || '50', 10));
+const BASE_URL = process.env.BASE_URL || process.env.PLAYWRIGHT_BASE_URL || 'http://localhost:3000';
+const HEADLESS = process.env.HEADLESS !== 'false';
+const DEFAULT_TIMEOUT_SEC = 300;
+
+function log(message) {
+  console.error(`[step-runner] ${message}`);
+}
+
+/**
+ * 브라우저 컨텍스트 풀
+ * - 최대 POOL_SIZE개의 컨텍스트만 존재하며, 초과 요청은 대기열에서 순서대로 기다린다.
+ * - 실행이 끝나면 페이지를 닫고 쿠키/권한을 초기화한 뒤, 저장소가 깨끗한 경우에만 재사용한다.
+ * - 실패/타임아웃/재사용 상한 초과 시에는 컨텍스트를 폐기하고 새로 만든다.
+ */
+class ContextPool {
+  constructor(size, maxRuns) {
+    this.size = size;
+    this.maxRuns = maxRuns;
+    this.browser = null;
+    this.launching = null;
+    this.idle = [];
+    this.total = 0;
+    this.waiters = [];
+    this.completed = 0;
+  }
+
+  async getBrowser() {
+    if (this.browser && this.browser.isConnected()) return this.browser;
+    if (!this.launching) {
+      this.launching = chromium.launch({ headless: HEADLESS })
+        .then((browser) => {
+          browser.on('disconnected', () => {
+            log('브라우저 연결이 끊어졌습니다. 다음 요청 시 다시 실행합니다.');
+            this.browser = null;
+            this.idle = [];
+          });
+          this.browser = browser;
+          return browser;
+        })
+        .finally(() => {
+          this.launching = null;
+        });
+    }
+    return this.launching;
+  }
+
+  async acquire() {
+    while (this.idle.length > 0) {
+      const entry = this.idle.pop();
+      if (entry.browser.isConnected()) return entry;
+      this.total -= 1;
+    }
+    if (this.total < this.size) {
+      this.total += 1;
+      try {
+        const browser = await this.getBrowser();
+        const context = await browser.newContext();
+        return { browser, context, runs: 0 };
+      } catch (err) {
+        this.total -= 1;
+        this.wake();
+        throw err;
+      }
+    }
+    await new Promise((resolve) => this.waiters.push(resolve));
+    return this.acquire();
+  }
+
+  async release(entry, healthy) {
+    entry.runs += 1;
+    this.completed += 1;
+    let reusable = healthy && entry.runs < this.maxRuns && entry.browser.isConnected();
+    if (reusable) {
+      try {
+        await Promise.all(entry.context.pages().map((page) => page.close()));
+        await entry.context.clearCookies();
+        await entry.context.clearPermissions();
+        const state = await entry.context.storageState();
+        reusable = state.cookies.length === 0 && state.origins.length === 0;
+      } catch (err) {
+        reusable = false;
+      }
+    }
+    if (reusable) {
+      this.idle.push(entry);
+    } else {
+      this.total -= 1;
+      entry.context.close().catch(() => {});
+    }
+    this.wake();
+  }
+
+  wake() {
+    const next = this.waiters.shift();
+    if (next) next();
+  }
+
+  stats() {
+    return {
+      pool_size: this.size,
+      contexts: this.total,
+      idle: this.idle.length,
+      waiting: this.waiters.length,
+      completed: this.completed,
+      browser_connected: Boolean(this.browser && this.browser.isConnected())
+    };
+  }
+
+  async close() {
+    if (this.browser) await this.browser.close().catch(() => {});
+  }
+}
+
+const pool = new ContextPool(POOL_SIZE, MAX_RUNS_PER_CONTEXT);
+
+async function runRequest(request) {
+  const timeoutMs = (request.timeout || DEFAULT_TIMEOUT_SEC) * 1000;
+  const entry = await pool.acquire();
+  let healthy = false;
+  let timer = null;
+  try {
+    const page = await entry.context.newPage();
+    const timeout = new Promise((_, reject) => {
+      timer = setTimeout(() => reject(new Error('단계 실행 시간이 초과되었습니다.')), timeoutMs);
+    });
+    await Promise.race([executeSteps(page, request.steps, request.base_url || BASE_URL), timeout]);
+    healthy = true;
+    return { status: 'Pass', output: 'STDOUT: 모든 단계 실행 완료.\n', error: null };
+  } catch (err) {
+    return { status: 'Fail', output: '', error: `STDERR: ${err.message}\n` };
+  } finally {
+    clearTimeout(timer);
+    await pool.release(entry, healthy);
+  }
+}
+
+async function handleLine(line, write) {
+  if (!line.trim()) return;
+  let request;
+  try {
+    request = JSON.parse(line);
+  } catch (err) {
+    write({ id: null, status: 'Fail', output: '', error: `잘못된 요청 JSON: ${err.message}` });
+    return;
+  }
+  if (request.type === 'ping') {
+    write({ id: request.id ?? null, type: 'pong', ...pool.stats() });
+    return;
+  }
+  const result = await runRequest(request);
+  write({ id: request.id ?? null, ...result });
+}
+
+function serveStdio() {
+  const write = (message) => process.stdout.write(`${JSON.stringify(message)}\n`);
+  const rl = createInterface({ input: process.stdin });
+  const inflight = new Set();
+  rl.on('line', (line) => {
+    const task = handleLine(line, write).finally(() => inflight.delete(task));
+    inflight.add(task);
+  });
+  rl.on('close', async () => {
+    await Promise.all(inflight);
+    await shutdown();
+  });
+  log(`stdin 모드로 대기 중 (pool size ${POOL_SIZE})`);
+}
+
+function serveSocket() {
+  const server = createServer((socket) => {
+    const write = (message) => {
+      if (!socket.destroyed) socket.write(`${JSON.stringify(message)}\n`);
+    };
+    const rl = createInterface({ input: socket });
+    rl.on('line', (line) => {
+      handleLine(line, write).catch((err) => write({ id: null, status: 'Fail', output: '', error: err.message }));
+    });
+    socket.on('error', () => {});
+  });
+
+  if (SOCKET_PATH) {
+    if (existsSync(SOCKET_PATH)) unlinkSync(SOCKET_PATH);
+    server.listen(SOCKET_PATH, () => log(`${SOCKET_PATH} 에서 대기 중 (pool size ${POOL_SIZE})`));
+  } else {
+    server.listen(PORT, HOST, () => log(`${HOST}:${PORT} 에서 대기 중 (pool size ${POOL_SIZE})`));
+  }
+  server.on('error', (err) => {
+    log(`서버 시작 실패: ${err.message}`);
+    process.exit(1);
+  });
+}
+
+async function shutdown() {
+  await pool.close();
+  process.exit(0);
+}
+
+process.on('SIGINT', shutdown);
+process.on('SIGTERM', shutdown);
+
+// 첫 요청이 브라우저 기동을 기다리지 않도록 미리 실행
+pool.getBrowser().catch((err) => log(`브라우저 실행 실패: ${err.message}`));
+
+if (process.argv.includes('--stdio')) {
+  serveStdio();
+} else {
+  serveSocket();
+}
@@ -0,0 +1,93 @@
+/**
+ * Playwright 단계 실행 공통 모듈
+ * run-steps.mjs(1회 실행)와 daemon.mjs(상주 브라우저 풀)에서 함께 사용
+ */
+
+export class StepError extends Error {
+  constructor(index, step, cause) {
+    super(`단계 ${index + 1} 실패 (action: ${step.action}): ${cause.message}`);
+    this.index = index;
+    this.step = step;
+  }
+}
+
+export function resolveUrl(baseUrl, url) {
+  if (!url) return baseUrl;
+  if (url.startsWith('http://') || url.startsWith('https://')) return url;
+  const base = baseUrl.replace(/\/$/, '');
+  return url.startsWith('/') ? `${base}${url}` : `${base}/${url}`;
+}
+
+export function validateSteps(steps) {
+  if (!Array.isArray(steps) || steps.length === 0) {
+    throw new Error('steps는 비어 있지 않은 배열이어야 합니다.');
+  }
+}
+
+async function runStep(page, step, baseUrl) {
+  const action = (step.action || '').toLowerCase();
+
+  if (action === 'navigate' || action === 'goto') {
+    const url = resolveUrl(baseUrl, step.url);
+    await page.goto(url, { timeout: step.timeout || 30000, waitUntil: step.waitUntil || 'domcontentloaded' });
+  } else if (action === 'click') {
+    if (step.text) {
+      await page.getByText(step.text, step.exact ? { exact: true } : {}).click({ timeout: step.timeout || 10000 });
+    } else if (step.selector) {
+      await page.locator(step.selector).first().click({ timeout: step.timeout || 10000 });
+    } else {
+      throw new Error('click 단계에는 selector 또는 text가 필요합니다.');
+    }
+  } else if (action === 'fill' || action === 'type') {
+    const selector = step.selector;
+    if (!selector) throw new Error('fill/type 단계에는 selector가 필요합니다.');
+    await page.locator(selector).first().fill(step.value ?? '', { timeout: step.timeout || 10000 });
+  } else if (action === 'press') {
+    const selector = step.selector;
+    const key = step.key || step.value;
+    if (!key) throw new Error('press 단계에는 key가 필요합니다.');
+    if (selector) {
+      await page.locator(selector).first().press(key, { timeout: step.timeout || 10000 });
+    } else {
+      await page.keyboard.press(key);
+    }
+  } else if (action === 'waitfortimeout' || action === 'wait_for_timeout') {
+    const ms = step.timeout ?? step.ms ?? 1000;
+    await page.waitForTimeout(ms);
+  } else if (action === 'waitforselector' || action === 'wait_for_selector') {
+    const selector = step.selector;
+    if (!selector) throw new Error('waitForSelector 단계에는 selector가 필요합니다.');
+    await page.waitForSelector(selector, { timeout: step.timeout || 10000, state: step.state || 'visible' });
+  } else if (action === 'asserttext' || action === 'assert_text') {
+    const selector = step.selector;
+    const text = step.text ?? step.value;
+    if (!text) throw new Error('assertText 단계에는 text가 필요합니다.');
+    const locator = selector ? page.locator(selector).first() : page.getByText(text, step.exact ? { exact: true } : {});
+    await locator.waitFor({ state: 'visible', timeout: step.timeout || 10000 });
+    const content = await locator.textContent();
+    if (!content || (step.exact ? content.trim() !== text : !content.includes(text))) {
+      throw new Error(`assertText 실패: 기대 "${text}", 실제 "${(content || '').trim().slice(0, 200)}"`);
+    }
+  } else if (action === 'selectoption') {
+    const selector = step.selector;
+    const values = step.values || (step.value != null ? [step.value] : []);
+    if (!selector || !values.length) throw new Error('selectOption 단계에는 selector와 values가 필요합니다.');
+    await page.locator(selector).first().selectOption(values, { timeout: step.timeout || 10000 });
+  } else {
+    throw new Error(`알 수 없는 action: ${step.action}`);
+  }
+}
+
+/**
+ * 주어진 page에서 단계를 순서대로 실행. 실패 시 StepError를 던진다.
+ */
+export async function executeSteps(page, steps, baseUrl) {
+  validateSteps(steps);
+  for (let i = 0; i < steps.length; i++) {
+    try {
+      await runStep(page, steps[i], baseUrl);
+    } catch (err) {
+      throw new StepError(i, steps[i], err);
+    }
+  }
+}